@@ -0,0 +1,488 @@
+"""
+Analytics pipeline for GolfIMU backend
+
+Analyzers declare the named values they consume and produce. The
+scheduler resolves them into a dependency DAG and runs it once per swing,
+memoizing every intermediate (orientation, velocity, phases...) so no
+value is computed twice. Independent branches run concurrently on a
+thread pool - the NumPy kernels release the GIL.
+
+Every run starts with two base values:
+
+- ``batch``: the swing as an IMUBatch
+- ``session``: the SessionConfig the swing belongs to
+
+An analyzer function receives its declared inputs as keyword arguments
+and returns a dict with its declared outputs. It may also return a
+``metrics`` dict which is merged into the swing's ProcessedMetrics.
+
+Each analyzer carries a version number. Bump it whenever its output
+changes. The pipeline version is a digest over the versions of every
+analyzer it runs, and stored metrics with a different version are
+recomputed.
+"""
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .imu_batch import IMUBatch
+from .impact_metrics import (
+    club_head_velocity, compute_impact_metrics, find_impact_index, get_impact_calibration
+)
+from .kinematics import WORLD_UP, normalize_quaternions, quaternion_to_matrix
+from .models import ProcessedMetrics, SessionConfig, SwingData
+from .runtime_profiler import PROFILER
+from .swing_quality import compute_contact_quality, compute_smoothness, detect_swing_phases
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import ANALYTICS_WORKER_THREADS, PROFILE_STOP_TIMEOUT_S
+
+BASE_INPUTS = ("batch", "session")
+
+ANALYZER_SECONDS = TELEMETRY.histogram("golfimu_analyzer_seconds", "Runtime of each analyzer",
+                                       labels=("analyzer",))
+PIPELINE_SECONDS = TELEMETRY.histogram("golfimu_analytics_seconds", "Runtime of the analyzer DAG per swing")
+
+
+class Analyzer:
+    """A named analytics step with declared inputs and outputs"""
+
+    __slots__ = ("name", "inputs", "outputs", "func", "version")
+
+    def __init__(self, name: str, inputs: Sequence[str], outputs: Sequence[str],
+                 func: Callable[..., Dict[str, Any]], version: int = 1):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.func = func
+        self.version = version
+
+    def __repr__(self) -> str:
+        return (f"Analyzer({self.name} v{self.version}: "
+                f"{', '.join(self.inputs)} -> {', '.join(self.outputs)})")
+
+
+class AnalyzerRegistry:
+    """Registry of analyzers that can be resolved into an execution DAG"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._analyzers: Dict[str, Analyzer] = {}
+        self._producers: Dict[str, str] = {}
+
+    def add(self, analyzer: Analyzer) -> Analyzer:
+        """Add an analyzer.
+
+        Raises:
+            ValueError: If the name is taken or an output is already produced
+        """
+        if analyzer.name in self._analyzers:
+            raise ValueError(f"Analyzer already registered: {analyzer.name}")
+
+        for output in analyzer.outputs:
+            if output in BASE_INPUTS or output in self._producers:
+                raise ValueError(f"Output '{output}' of {analyzer.name} is already provided")
+
+        self._analyzers[analyzer.name] = analyzer
+        for output in analyzer.outputs:
+            self._producers[output] = analyzer.name
+        return analyzer
+
+    def register(self, name: str, inputs: Sequence[str], outputs: Sequence[str] = (),
+                 version: int = 1):
+        """Decorator registering a function as an analyzer"""
+        def decorator(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+            self.add(Analyzer(name, inputs, outputs, func, version))
+            return func
+        return decorator
+
+    def get(self, name: str) -> Analyzer:
+        """Get an analyzer by name"""
+        return self._analyzers[name]
+
+    @property
+    def names(self) -> List[str]:
+        """Names of all registered analyzers"""
+        return list(self._analyzers)
+
+    def dependencies(self, name: str) -> List[str]:
+        """Names of the analyzers producing the inputs of ``name``"""
+        analyzer = self._analyzers[name]
+        deps = []
+        for value in analyzer.inputs:
+            if value in BASE_INPUTS:
+                continue
+            if value not in self._producers:
+                raise ValueError(f"No analyzer produces '{value}' needed by {name}")
+            deps.append(self._producers[value])
+        return deps
+
+    def resolve(self, targets: Optional[Iterable[str]] = None) -> List[str]:
+        """Topologically order the analyzers needed for ``targets``.
+
+        Args:
+            targets: Analyzer names to run (all analyzers if None)
+
+        Returns:
+            Analyzer names, dependencies first
+
+        Raises:
+            ValueError: On unknown analyzers, missing inputs or cycles
+        """
+        order: List[str] = []
+        state: Dict[str, str] = {}
+
+        def visit(name: str):
+            if name not in self._analyzers:
+                raise ValueError(f"Unknown analyzer: {name}")
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Analyzer dependency cycle through {name}")
+            state[name] = "visiting"
+            for dep in self.dependencies(name):
+                visit(dep)
+            state[name] = "done"
+            order.append(name)
+
+        for name in (targets if targets is not None else self._analyzers):
+            visit(name)
+        return order
+
+    def version(self, names: Iterable[str]) -> str:
+        """Digest of the versions of ``names``, changing when any of them is bumped"""
+        signature = ",".join(f"{name}:{self._analyzers[name].version}" for name in sorted(names))
+        return hashlib.blake2b(signature.encode(), digest_size=8).hexdigest()
+
+
+def swing_samples_hash(batch: IMUBatch) -> str:
+    """Digest of a swing's samples (kept in its summary, see ``calibrated_input_hash``)"""
+    return hashlib.blake2b(batch.to_bytes(), digest_size=16).hexdigest()
+
+
+def calibrated_input_hash(samples_hash: str, session_config: SessionConfig) -> str:
+    """Input hash of a swing from its samples digest and the session's current calibration.
+
+    Args:
+        samples_hash: ``swing_samples_hash`` of the swing
+        session_config: Session the swing belongs to
+
+    Returns:
+        Hex digest identifying the analysis inputs
+    """
+    digest = hashlib.blake2b(samples_hash.encode(), digest_size=16)
+    digest.update(json.dumps([session_config.face_normal_calibration,
+                              session_config.club_length]).encode())
+    return digest.hexdigest()
+
+
+def swing_input_hash(batch: IMUBatch, session_config: SessionConfig) -> str:
+    """Digest of everything the analyzers read: the samples and the calibration.
+
+    Args:
+        batch: Swing samples
+        session_config: Session the swing belongs to
+
+    Returns:
+        Hex digest identifying the analysis inputs
+    """
+    return calibrated_input_hash(swing_samples_hash(batch), session_config)
+
+
+class AnalyticsPipeline:
+    """Runs an analyzer DAG once per swing"""
+
+    def __init__(self, registry: Optional["AnalyzerRegistry"] = None,
+                 max_workers: int = ANALYTICS_WORKER_THREADS,
+                 targets: Optional[Iterable[str]] = None):
+        """Initialize the pipeline.
+
+        Args:
+            registry: Analyzer registry (the default analyzers if None)
+            max_workers: Thread pool size; 1 runs analyzers inline
+            targets: Analyzers to run (all registered if None)
+        """
+        self.registry = registry or DEFAULT_REGISTRY
+        self.order = self.registry.resolve(targets)
+        self.version = self.registry.version(self.order)
+        self._deps = {name: set(self.registry.dependencies(name)) for name in self.order}
+        self._max_workers = max_workers
+        # Analyzer runs submitted to the pool that no worker has started yet
+        self._queued = 0
+        self._queued_lock = threading.Lock()
+        self._executor: Optional[Executor] = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analytics")
+            if max_workers > 1 else None
+        )
+        if self._executor is not None:
+            PROFILER.register_pool(self)
+
+    def checkpoint_workers(self):
+        """Run a profiler checkpoint on every worker thread, idle ones included.
+
+        Each task waits at a barrier until all have started, so every
+        worker takes exactly one. Returns without waiting for them.
+        """
+        if self._executor is None:
+            return
+        barrier = threading.Barrier(self._max_workers)
+
+        def checkpoint():
+            PROFILER.checkpoint()
+            try:
+                barrier.wait(PROFILE_STOP_TIMEOUT_S)
+            except threading.BrokenBarrierError:
+                pass
+
+        try:
+            for _ in range(self._max_workers):
+                self._executor.submit(checkpoint)
+        except RuntimeError:
+            # Shut down: its workers are gone
+            pass
+
+    def _run_queued(self, name: str, memo: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one analyzer on a pool worker, counting it off the queue"""
+        with self._queued_lock:
+            self._queued -= 1
+        return self._run_analyzer(name, memo)
+
+    def _run_analyzer(self, name: str, memo: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one analyzer against the memo"""
+        PROFILER.checkpoint()
+        analyzer = self.registry.get(name)
+        start = time.perf_counter()
+        result = analyzer.func(**{value: memo[value] for value in analyzer.inputs}) or {}
+        ANALYZER_SECONDS.labels(name).observe(time.perf_counter() - start)
+
+        missing = set(analyzer.outputs) - set(result)
+        if missing:
+            raise ValueError(f"Analyzer {name} did not produce {sorted(missing)}")
+
+        return result
+
+    def run_batch(self, batch: IMUBatch, session_config: SessionConfig) -> Dict[str, Any]:
+        """Run the DAG on one swing.
+
+        Args:
+            batch: Swing samples
+            session_config: Session the swing belongs to
+
+        Returns:
+            Merged metrics of all analyzers
+        """
+        start = time.perf_counter()
+        memo: Dict[str, Any] = {"batch": batch, "session": session_config}
+        metrics: Dict[str, Any] = {}
+
+        def collect(name: str, result: Dict[str, Any]):
+            for output in self.registry.get(name).outputs:
+                memo[output] = result[output]
+            metrics.update(result.get("metrics", {}))
+
+        if self._executor is None:
+            for name in self.order:
+                collect(name, self._run_analyzer(name, memo))
+            PIPELINE_SECONDS.observe(time.perf_counter() - start)
+            return metrics
+
+        done: set = set()
+        pending = {}
+        remaining = list(self.order)
+        while remaining or pending:
+            # Submit every analyzer whose dependencies have all finished
+            for name in [n for n in remaining if self._deps[n] <= done]:
+                remaining.remove(name)
+                with self._queued_lock:
+                    self._queued += 1
+                pending[self._executor.submit(self._run_queued, name, memo)] = name
+
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = pending.pop(future)
+                collect(name, future.result())
+                done.add(name)
+
+        PIPELINE_SECONDS.observe(time.perf_counter() - start)
+        return metrics
+
+    def run(self, swing_data: SwingData, session_config: SessionConfig) -> ProcessedMetrics:
+        """Run the DAG on a swing and wrap the result.
+
+        Args:
+            swing_data: Complete swing data
+            session_config: Session the swing belongs to
+
+        Returns:
+            ProcessedMetrics for the swing, stamped with the pipeline version
+            and input hash
+        """
+        return self.run_swing_batch(IMUBatch.from_swing(swing_data), swing_data.swing_id, session_config)
+
+    def run_swing_batch(self, batch: IMUBatch, swing_id: str, session_config: SessionConfig) -> ProcessedMetrics:
+        """Run the DAG on a swing already in columnar form and wrap the result.
+
+        Args:
+            batch: Samples of the swing
+            swing_id: Swing the samples belong to
+            session_config: Session the swing belongs to
+
+        Returns:
+            ProcessedMetrics for the swing, as ``run`` would produce
+        """
+        return ProcessedMetrics(
+            swing_id=swing_id,
+            session_id=session_config.session_id,
+            metrics=self.run_batch(batch, session_config),
+            analyzer_version=self.version,
+            input_hash=swing_input_hash(batch, session_config)
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Analyzer runs waiting for a worker thread"""
+        return self._queued
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+
+# =============================================================================
+# DEFAULT ANALYZERS
+# =============================================================================
+
+DEFAULT_REGISTRY = AnalyzerRegistry()
+
+
+@DEFAULT_REGISTRY.register("resampling", inputs=["batch"], outputs=["uniform"])
+def resample_analyzer(batch: IMUBatch) -> Dict[str, Any]:
+    """Resample onto a uniform time grid (serial timestamps jitter).
+
+    ``np.interp`` needs increasing times, so out-of-order samples are
+    sorted and repeated timestamps keep their first sample.
+
+    Raises:
+        ValueError: If the swing has fewer than two distinct timestamps
+    """
+    if len(batch) < 3:
+        return {"uniform": batch}
+
+    if np.any(np.diff(batch.t) <= 0):
+        _, keep = np.unique(batch.t, return_index=True)
+        if len(keep) < 2:
+            raise ValueError("Swing timestamps do not advance, it cannot be resampled")
+        batch = IMUBatch.from_rows(batch.to_rows()[keep])
+        if len(batch) < 3:
+            return {"uniform": batch}
+
+    dt = np.diff(batch.t)
+    step = float(np.median(dt))
+    if step <= 0 or np.abs(dt - step).max() <= 0.01 * step:
+        return {"uniform": batch}
+
+    t = batch.t[0] + step * np.arange(int(round((batch.t[-1] - batch.t[0]) / step)) + 1)
+
+    def interp(channel: np.ndarray) -> np.ndarray:
+        return np.column_stack([np.interp(t, batch.t, channel[:, i]) for i in range(channel.shape[1])])
+
+    # Keep quaternion signs continuous before interpolating (q and -q are equal)
+    quat = batch.quat.copy()
+    flips = np.cumprod(np.where(np.einsum("ij,ij->i", quat[1:], quat[:-1]) < 0, -1.0, 1.0))
+    quat[1:] *= flips[:, None]
+
+    return {"uniform": IMUBatch(
+        t=t,
+        accel=interp(batch.accel),
+        gyro=interp(batch.gyro),
+        mag=interp(batch.mag),
+        quat=normalize_quaternions(interp(quat))
+    )}
+
+
+@DEFAULT_REGISTRY.register("fusion", inputs=["uniform"], outputs=["rotations"])
+def fusion_analyzer(uniform: IMUBatch) -> Dict[str, Any]:
+    """Sensor → world rotation matrices from the fused orientation"""
+    return {"rotations": quaternion_to_matrix(uniform.quat)}
+
+
+@DEFAULT_REGISTRY.register("calibration", inputs=["session"], outputs=["calibration"])
+def calibration_analyzer(session: SessionConfig) -> Dict[str, Any]:
+    """Cached per-session impact geometry"""
+    return {"calibration": get_impact_calibration(session)}
+
+
+@DEFAULT_REGISTRY.register("kinematics", inputs=["uniform", "rotations", "calibration"],
+                           outputs=["head_velocity"])
+def kinematics_analyzer(uniform: IMUBatch, rotations: np.ndarray, calibration) -> Dict[str, Any]:
+    """World-frame club-head velocity and peak speed"""
+    velocity = club_head_velocity(uniform.gyro, rotations, calibration)
+    speed = np.linalg.norm(velocity, axis=1)
+    return {
+        "head_velocity": velocity,
+        "metrics": {"peak_club_head_speed": float(speed.max()) if len(speed) else 0.0}
+    }
+
+
+@DEFAULT_REGISTRY.register("phases", inputs=["uniform"], outputs=["impact_index", "top_index"])
+def phases_analyzer(uniform: IMUBatch) -> Dict[str, Any]:
+    """Impact and top-of-backswing indices plus tempo"""
+    impact_index = find_impact_index(uniform)
+    top_index, _ = detect_swing_phases(uniform, impact_index)
+
+    t = uniform.t
+    backswing_time = float(t[top_index] - t[0])
+    downswing_time = float(t[impact_index] - t[top_index])
+
+    return {
+        "impact_index": impact_index,
+        "top_index": top_index,
+        "metrics": {
+            "backswing_time": backswing_time,
+            "downswing_time": downswing_time,
+            "tempo": backswing_time / downswing_time if downswing_time > 0 else None
+        }
+    }
+
+
+@DEFAULT_REGISTRY.register("plane", inputs=["head_velocity", "top_index", "impact_index"])
+def plane_analyzer(head_velocity: np.ndarray, top_index: int, impact_index: int) -> Dict[str, Any]:
+    """Downswing plane tilt from the principal axes of the head velocity"""
+    downswing = head_velocity[top_index:impact_index]
+    if len(downswing) < 3:
+        return {"metrics": {"swing_plane_tilt": None}}
+
+    # Velocities lie in the swing plane: the least-variance axis is its normal
+    _, _, vt = np.linalg.svd(downswing, full_matrices=False)
+    normal = vt[-1]
+    tilt = math.degrees(math.acos(min(abs(float(normal @ WORLD_UP)), 1.0)))
+
+    return {"metrics": {"swing_plane_tilt": tilt}}
+
+
+@DEFAULT_REGISTRY.register("impact", inputs=["uniform", "calibration", "impact_index",
+                                              "rotations", "head_velocity"])
+def impact_analyzer(uniform: IMUBatch, calibration, impact_index: int,
+                    rotations: np.ndarray, head_velocity: np.ndarray) -> Dict[str, Any]:
+    """Attack angle, club path and face angle at impact"""
+    return {"metrics": compute_impact_metrics(
+        uniform, calibration, impact_index, rotations=rotations, velocity=head_velocity
+    )}
+
+
+@DEFAULT_REGISTRY.register("quality", inputs=["uniform", "impact_index", "top_index"])
+def quality_analyzer(uniform: IMUBatch, impact_index: int, top_index: int) -> Dict[str, Any]:
+    """Jerk smoothness and FFT contact quality"""
+    metrics = compute_smoothness(uniform, impact_index, top_index=top_index)
+    metrics.update(compute_contact_quality(uniform, impact_index))
+    return {"metrics": metrics}
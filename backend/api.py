@@ -0,0 +1,314 @@
+"""
+HTTP API for GolfIMU backend
+
+Sessions, swings and metrics over FastAPI. Endpoints are plain functions
+run in FastAPI's thread pool, since the Redis client is synchronous.
+
+- ``POST /sessions``, ``GET /sessions``, ``GET /sessions/{id}``
+- ``GET /sessions/{id}/summary``: cached counts and running statistics
+- ``GET /sessions/{id}/swings?limit=&cursor=&preview=``: swing summaries, newest first
+- ``GET /sessions/{id}/swings/{swing_id}``: the swing's samples
+- ``GET /sessions/{id}/swings/{swing_id}/preview``: the swing's downsampled preview
+- ``GET /sessions/{id}/swings/{swing_id}/metrics``: the swing's processed metrics
+- ``WS /sessions/{id}/live?mode=&rate=``: live samples and events (see ``live_feed``)
+- ``GET /swings?user_id=&club_id=&since=&until=&metric=&limit=&cursor=&detail=``: swings
+  across sessions, newest first (see ``swing_query``)
+
+Swing samples are served as a NumPy ``.npy`` structured array by default
+(float32 fields ``t`` in seconds from the swing start, ``ax`` .. ``qz``),
+about a seventh of the stored JSON. Clients that want JSON ask for it with
+``?format=json`` or ``Accept: application/json`` and get one array per
+column. Summaries and previews (see ``swing_preview``) are stored as JSON
+when the swing is stored, so the list and summary endpoints pass them
+through without re-encoding or reading the samples.
+
+The live feed only carries what is ingested in the same process, so the
+backend serves the API itself with the ``serve_api`` command.
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket
+from pydantic import BaseModel
+
+from .imu_batch import IMUBatch, ROW_NAMES
+from .live_feed import LIVE_FEED, LiveFeed
+from .redis_manager import RedisManager
+from .session_manager import SessionManager
+from .structured_log import get_logger
+from .swing_query import SwingQueryEngine
+from .telemetry import PROMETHEUS_CONTENT_TYPE, TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    API_HOST, API_MAX_PAGE_SIZE, API_PAGE_SIZE, API_PORT, DEFAULT_IMPACT_THRESHOLD_G, LIVE_FEED_SLOW_CLIENT_S
+)
+
+logger = get_logger("api")
+
+NPY_CONTENT_TYPE = "application/x-npy"
+SAMPLE_FIELDS = ROW_NAMES
+SAMPLE_DTYPE = np.dtype([(name, "<f4") for name in SAMPLE_FIELDS])
+
+API_REQUESTS = TELEMETRY.counter("golfimu_api_requests_total", "API requests served",
+                                 labels=("endpoint",))
+
+
+class SessionCreate(BaseModel):
+    """Body of ``POST /sessions``"""
+    user_id: str
+    club_id: str
+    club_length: float
+    club_mass: float
+    face_normal_calibration: Optional[List[float]] = None
+    impact_threshold: float = DEFAULT_IMPACT_THRESHOLD_G
+
+
+def _relative_rows(batch: IMUBatch) -> np.ndarray:
+    """Sample rows with ``t`` in seconds from the first sample"""
+    rows = batch.to_rows()
+    if len(rows):
+        rows[:, 0] -= rows[0, 0]
+    return rows
+
+
+def encode_samples_npy(batch: IMUBatch) -> bytes:
+    """Encode a swing's samples as a ``.npy`` structured float32 array.
+
+    Args:
+        batch: The swing's samples
+
+    Returns:
+        ``.npy`` file contents, with ``t`` relative to the first sample
+    """
+    rows = _relative_rows(batch)
+    samples = np.empty(len(rows), dtype=SAMPLE_DTYPE)
+    for i, name in enumerate(SAMPLE_FIELDS):
+        samples[name] = rows[:, i]
+
+    buffer = io.BytesIO()
+    np.save(buffer, samples, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def decode_samples_npy(data: bytes) -> np.ndarray:
+    """Decode ``encode_samples_npy`` output (a structured array with ``SAMPLE_FIELDS``)"""
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+def _wants_json(request: Request, format: Optional[str]) -> bool:
+    """Whether the client opted into JSON samples"""
+    if format is not None:
+        return format == "json"
+    return "application/json" in request.headers.get("accept", "")
+
+
+async def _stream_live(websocket: WebSocket, live_feed: LiveFeed, session_id: str, mode: str,
+                       rate: Optional[float]):
+    """Push a session's live feed to one WebSocket client until it leaves or falls behind"""
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    try:
+        subscription = live_feed.subscribe(session_id, mode, rate,
+                                           notify=lambda: loop.call_soon_threadsafe(wakeup.set))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    async def watch_disconnect():
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.ensure_future(watch_disconnect())
+    disconnected.add_done_callback(lambda _: wakeup.set())
+    try:
+        await websocket.send_json({"type": "subscribed", "session_id": session_id,
+                                   "mode": subscription.mode, "rate": subscription.rate})
+        while not disconnected.done():
+            message = subscription.get()
+            if message is None:
+                wakeup.clear()
+                subscription.waiting = True
+                message = subscription.get()
+                if message is None:
+                    await wakeup.wait()
+                    continue
+                subscription.waiting = False
+
+            lagging_since = subscription.lagging_since
+            if lagging_since is not None and time.monotonic() - lagging_since > LIVE_FEED_SLOW_CLIENT_S:
+                await websocket.close(code=1013, reason="Client too slow")
+                break
+            dropped = subscription.take_dropped()
+            if dropped:
+                await websocket.send_json({"type": "dropped", "messages": dropped})
+            send = websocket.send_bytes(message) if isinstance(message, bytes) else websocket.send_text(message)
+            await asyncio.wait_for(send, LIVE_FEED_SLOW_CLIENT_S)
+    except asyncio.TimeoutError:
+        logger.warning("Live feed client of session %s too slow, disconnecting", session_id)
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(websocket.close(code=1013, reason="Client too slow"), 1.0)
+    except Exception as e:
+        logger.debug("Live feed client of session %s left: %s", session_id, e)
+    finally:
+        live_feed.unsubscribe(subscription)
+        disconnected.cancel()
+
+
+def create_app(redis_manager: Optional[RedisManager] = None, live_feed: Optional[LiveFeed] = None) -> FastAPI:
+    """Build the API application.
+
+    Args:
+        redis_manager: Redis access shared by all requests (a new one if None)
+        live_feed: Feed the WebSocket endpoint subscribes to (``LIVE_FEED`` if None)
+
+    Returns:
+        The FastAPI application
+    """
+    redis_manager = redis_manager or RedisManager()
+    live_feed = live_feed or LIVE_FEED
+    app = FastAPI(title="GolfIMU API")
+    app.state.redis_manager = redis_manager
+    query_engine = SwingQueryEngine(redis_manager)
+
+    def session_or_404(session_id: str):
+        session_config = redis_manager.get_session_config(session_id)
+        if session_config is None:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        return session_config
+
+    @app.post("/sessions", status_code=201)
+    def create_session(body: SessionCreate):
+        API_REQUESTS.labels("create_session").inc()
+        try:
+            session_config = SessionManager(redis_manager).create_session(
+                body.user_id, body.club_id, body.club_length, body.club_mass,
+                body.face_normal_calibration, body.impact_threshold)
+        except Exception as e:
+            logger.error("Error creating session: %s", e)
+            raise HTTPException(status_code=503, detail="Session could not be stored")
+        return session_config.model_dump(mode="json")
+
+    @app.get("/sessions")
+    def list_sessions():
+        API_REQUESTS.labels("list_sessions").inc()
+        return {"sessions": redis_manager.list_session_ids()}
+
+    @app.get("/sessions/{session_id}")
+    def load_session(session_id: str):
+        API_REQUESTS.labels("load_session").inc()
+        return session_or_404(session_id).model_dump(mode="json")
+
+    @app.get("/sessions/{session_id}/summary")
+    def session_summary(session_id: str):
+        API_REQUESTS.labels("session_summary").inc()
+        aggregates = redis_manager.get_session_aggregates(session_id)
+        if not aggregates:
+            raise HTTPException(status_code=404, detail=f"Session {session_id} not found")
+        return aggregates
+
+    @app.get("/sessions/{session_id}/swings")
+    def list_swings(session_id: str, limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE_SIZE),
+                    cursor: Optional[str] = None, preview: bool = False):
+        API_REQUESTS.labels("list_swings").inc()
+        try:
+            summaries, next_cursor = redis_manager.get_swing_page(session_id, cursor, limit, preview)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not summaries and cursor is None:
+            session_or_404(session_id)
+        body = '{"swings": [%s], "next_cursor": %s}' % (",".join(summaries), json.dumps(next_cursor))
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/swings")
+    def query_swings(user_id: Optional[str] = None, club_id: Optional[str] = None,
+                     since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     metric: List[str] = Query([]), limit: int = Query(API_PAGE_SIZE, ge=1, le=API_MAX_PAGE_SIZE),
+                     cursor: Optional[str] = None, detail: str = "ids"):
+        API_REQUESTS.labels("query_swings").inc()
+        try:
+            metric_ranges = {}
+            for entry in metric:
+                name, low, high = entry.split(":")
+                metric_ranges[name] = (float(low) if low else None, float(high) if high else None)
+            swings, next_cursor = query_engine.query(user_id, club_id, since, until, metric_ranges,
+                                                     cursor, limit, detail)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid swing query ({e}); metrics are name:low:high")
+        body = '{"swings": [%s], "next_cursor": %s}' % (",".join(swings), json.dumps(next_cursor))
+        return Response(content=body, media_type="application/json")
+
+    @app.get("/users/{user_id}/clubs/{club_id}/trends/{metric}")
+    def get_trend(user_id: str, club_id: str, metric: str, period: str = "week",
+                  since: Optional[datetime] = None, until: Optional[datetime] = None):
+        API_REQUESTS.labels("get_trend").inc()
+        try:
+            trend = redis_manager.get_rollup_trend(user_id, club_id, metric, period, since, until)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"user_id": user_id, "club_id": club_id, "metric": metric, "period": period, "buckets": trend}
+
+    @app.get("/sessions/{session_id}/swings/{swing_id}")
+    def get_swing(session_id: str, swing_id: str, request: Request,
+                  format: Optional[str] = Query(None, pattern="^(npy|json)$")):
+        API_REQUESTS.labels("get_swing").inc()
+        swing = redis_manager.get_swing(session_id, swing_id)
+        if swing is None:
+            raise HTTPException(status_code=404, detail=f"Samples of swing {swing_id} not found")
+
+        batch = IMUBatch.from_swing(swing)
+        start_time = swing.swing_start_time.isoformat()
+        headers = {"X-Swing-Start-Time": start_time}
+        if _wants_json(request, format):
+            rows = _relative_rows(batch)
+            columns = {name: rows[:, i].tolist() for i, name in enumerate(SAMPLE_FIELDS)}
+            body = json.dumps({"swing_id": swing_id, "swing_start_time": start_time, "columns": columns})
+            return Response(content=body, media_type="application/json", headers=headers)
+        return Response(content=encode_samples_npy(batch), media_type=NPY_CONTENT_TYPE, headers=headers)
+
+    @app.get("/sessions/{session_id}/swings/{swing_id}/preview")
+    def get_preview(session_id: str, swing_id: str):
+        API_REQUESTS.labels("get_preview").inc()
+        preview = redis_manager.get_swing_preview(session_id, swing_id)
+        if preview is None:
+            raise HTTPException(status_code=404, detail=f"Preview of swing {swing_id} not found")
+        return Response(content=preview, media_type="application/json")
+
+    @app.get("/sessions/{session_id}/swings/{swing_id}/metrics")
+    def get_metrics(session_id: str, swing_id: str):
+        API_REQUESTS.labels("get_metrics").inc()
+        metrics = redis_manager.get_processed_metrics(session_or_404(session_id), swing_id)
+        if metrics is None:
+            raise HTTPException(status_code=404, detail=f"Metrics of swing {swing_id} not found")
+        return metrics.model_dump(mode="json")
+
+    @app.websocket("/sessions/{session_id}/live")
+    async def live(websocket: WebSocket, session_id: str, mode: str = "full", rate: Optional[float] = None):
+        API_REQUESTS.labels("live").inc()
+        await websocket.accept()
+        await _stream_live(websocket, live_feed, session_id, mode, rate)
+
+    @app.get("/metrics")
+    def telemetry():
+        return Response(content=TELEMETRY.render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return app
+
+
+def main():
+    """Serve the API with uvicorn"""
+    import uvicorn
+
+    uvicorn.run(create_app(), host=API_HOST, port=API_PORT, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Serial frame encoding for GolfIMU
+
+The firmware streams one frame per IMU sample in one of two formats.
+
+JSON, as printed by ``GolfIMU_Firmware.ino`` (one line per sample)::
+
+    {"t":1234,"ax":0.123,...,"mz":0.000,"qw":1.0000,...,"qz":0.0000}\\r\\n
+
+Binary, 59 bytes per sample, little-endian::
+
+    0xA5 0x5A | uint32 t (ms) | 13 x float32 (ax..mz, qw..qz) | uint8 checksum
+
+The checksum is the XOR of the 56 bytes between the sync word and itself.
+0xA5 never occurs in the ASCII status lines the firmware prints, so a
+reader can resynchronize on the sync word after garbage or dropped bytes.
+"""
+import json
+from typing import Optional, Tuple
+
+import numpy as np
+
+FRAME_FIELDS = ("ax", "ay", "az", "gx", "gy", "gz", "mx", "my", "mz", "qw", "qx", "qy", "qz")
+
+BINARY_SYNC = b"\xa5\x5a"
+BINARY_FRAME_DTYPE = np.dtype([
+    ("sync", "u1", (2,)),
+    ("t", "<u4"),
+    ("values", "<f4", (len(FRAME_FIELDS),)),
+    ("checksum", "u1")
+])
+BINARY_FRAME_SIZE = BINARY_FRAME_DTYPE.itemsize
+
+_JSON_TEMPLATE = (
+    '{{"t":{},"ax":{:.3f},"ay":{:.3f},"az":{:.3f},"gx":{:.3f},"gy":{:.3f},"gz":{:.3f},'
+    '"mx":{:.3f},"my":{:.3f},"mz":{:.3f},"qw":{:.4f},"qx":{:.4f},"qy":{:.4f},"qz":{:.4f}}}\r\n'
+)
+
+
+def encode_json_frames(t_ms: np.ndarray, values: np.ndarray) -> bytes:
+    """Encode samples as firmware JSON lines.
+
+    Args:
+        t_ms: Firmware timestamps in milliseconds, shape (N,)
+        values: Channel values in ``FRAME_FIELDS`` order, shape (N, 13)
+
+    Returns:
+        Concatenated JSON lines
+    """
+    values = np.asarray(values, dtype=np.float64).reshape(-1, len(FRAME_FIELDS))
+    return "".join(
+        _JSON_TEMPLATE.format(int(t), *row) for t, row in zip(t_ms, values.tolist())
+    ).encode("ascii")
+
+
+def encode_binary_frames(t_ms: np.ndarray, values: np.ndarray) -> bytes:
+    """Encode samples as binary frames.
+
+    Args:
+        t_ms: Firmware timestamps in milliseconds, shape (N,)
+        values: Channel values in ``FRAME_FIELDS`` order, shape (N, 13)
+
+    Returns:
+        Concatenated binary frames
+    """
+    values = np.asarray(values, dtype=np.float32).reshape(-1, len(FRAME_FIELDS))
+    frames = np.zeros(len(values), dtype=BINARY_FRAME_DTYPE)
+    frames["sync"] = np.frombuffer(BINARY_SYNC, dtype=np.uint8)
+    frames["t"] = np.asarray(t_ms, dtype=np.uint32)
+    frames["values"] = values
+
+    raw = frames.view(np.uint8).reshape(-1, BINARY_FRAME_SIZE)
+    raw[:, -1] = np.bitwise_xor.reduce(raw[:, 2:-1], axis=1)
+    return raw.tobytes()
+
+
+def decode_binary_frames(buffer: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Decode every valid binary frame in a byte buffer.
+
+    Bytes that are not part of a valid frame (status lines, corrupted
+    frames) are skipped. A frame cut off at the end of the buffer is left
+    unconsumed so it can be completed by the next read.
+
+    Args:
+        buffer: Raw bytes read from the serial port or a capture file
+
+    Returns:
+        Tuple of (t_ms (N,), values (N, 13) float64, bytes consumed)
+    """
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    n = len(data)
+    empty = (np.zeros(0, dtype=np.int64), np.zeros((0, len(FRAME_FIELDS))))
+    if n < 2:
+        return empty + (0 if n and data[-1] == BINARY_SYNC[0] else n,)
+
+    starts = np.flatnonzero((data[:-1] == BINARY_SYNC[0]) & (data[1:] == BINARY_SYNC[1]))
+    complete = starts[starts + BINARY_FRAME_SIZE <= n]
+
+    accepted = np.zeros(0, dtype=np.int64)
+    if len(complete):
+        windows = np.lib.stride_tricks.sliding_window_view(data, BINARY_FRAME_SIZE)[complete]
+        valid = complete[np.bitwise_xor.reduce(windows[:, 2:-1], axis=1) == windows[:, -1]]
+
+        # Sync words inside a valid frame's payload are not frame starts
+        if len(valid) and np.any(np.diff(valid) < BINARY_FRAME_SIZE):
+            keep, end = [], -1
+            for start in valid.tolist():
+                if start >= end:
+                    keep.append(start)
+                    end = start + BINARY_FRAME_SIZE
+            valid = np.array(keep, dtype=np.int64)
+        accepted = valid
+
+    last_end = int(accepted[-1]) + BINARY_FRAME_SIZE if len(accepted) else 0
+    partial = starts[(starts + BINARY_FRAME_SIZE > n) & (starts >= last_end)]
+    if len(partial):
+        consumed = int(partial[0])
+    elif data[-1] == BINARY_SYNC[0]:
+        consumed = n - 1
+    else:
+        consumed = n
+
+    if not len(accepted):
+        return empty + (consumed,)
+
+    frames = np.lib.stride_tricks.sliding_window_view(data, BINARY_FRAME_SIZE)[accepted]
+    frames = np.ascontiguousarray(frames).view(BINARY_FRAME_DTYPE).reshape(-1)
+    return frames["t"].astype(np.int64), frames["values"].astype(np.float64), consumed
+
+
+def decode_json_frame(line: str) -> Optional[Tuple[int, np.ndarray]]:
+    """Decode one firmware JSON line.
+
+    Returns:
+        Tuple of (t_ms, values (13,)) or None for non-sample lines
+    """
+    line = line.strip()
+    if not line.startswith("{") or not line.endswith("}"):
+        return None
+
+    try:
+        frame = json.loads(line)
+        return int(frame.get("t", 0)), np.array([frame[name] for name in FRAME_FIELDS], dtype=np.float64)
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def decode_json_frames(buffer: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Decode every complete firmware JSON line in a byte buffer.
+
+    Non-sample lines (status messages, command replies) are skipped. A line
+    cut off at the end of the buffer is left unconsumed.
+
+    Args:
+        buffer: Raw bytes read from the serial port
+
+    Returns:
+        Tuple of (t_ms (N,), values (N, 13) float64, bytes consumed)
+    """
+    consumed = buffer.rfind(b"\n") + 1
+    t_ms, rows = [], []
+    for line in buffer[:consumed].decode("utf-8", errors="replace").split("\n"):
+        frame = decode_json_frame(line)
+        if frame is not None:
+            t_ms.append(frame[0])
+            rows.append(frame[1])
+
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, len(FRAME_FIELDS))), consumed
+    return np.array(t_ms, dtype=np.int64), np.vstack(rows), consumed
@@ -0,0 +1,221 @@
+"""
+Impact-window metrics for GolfIMU backend
+
+Computes attack angle, club path and face angle at impact from the fused
+orientation and the club-head velocity (rigid-body ω × r along the shaft)
+in a short window just before the impact spike.
+"""
+import math
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .imu_batch import IMUBatch
+from .kinematics import (
+    WORLD_UP, average_quaternion, cross_matrix, horizontal_unit,
+    quaternion_to_matrix, rotate_vectors
+)
+from .models import IMUData, ProcessedMetrics, SessionConfig, SwingData
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    CLUB_SHAFT_AXIS, CLUB_FACE_AXIS, IMPACT_WINDOW_MS, ADDRESS_WINDOW_MS
+)
+
+
+class ImpactCalibration:
+    """Per-session geometry precomputed for impact metrics.
+
+    ``face_normal`` is the unit face normal in the sensor frame and
+    ``lever_cross`` is the matrix that maps gyro rows to club-head velocity
+    in the sensor frame (``gyro @ lever_cross == cross(gyro, r)``), so a swing
+    only needs one rotation per window sample.
+    """
+
+    __slots__ = ("face_normal", "lever_cross", "calibrated")
+
+    def __init__(self, face_normal: np.ndarray, lever_cross: np.ndarray, calibrated: bool):
+        self.face_normal = face_normal
+        self.lever_cross = lever_cross
+        self.calibrated = calibrated
+
+
+@lru_cache(maxsize=32)
+def _build_calibration(session_id: str,
+                       face_normal: Optional[Tuple[float, ...]],
+                       club_length: float) -> ImpactCalibration:
+    """Build (and cache) the impact geometry for one session configuration"""
+    calibrated = face_normal is not None
+    normal = np.array(face_normal if calibrated else CLUB_FACE_AXIS, dtype=np.float64)
+    norm = np.linalg.norm(normal)
+    if norm == 0:
+        raise ValueError("Face normal calibration must be a non-zero vector")
+
+    lever_arm = club_length * np.array(CLUB_SHAFT_AXIS, dtype=np.float64)
+    return ImpactCalibration(
+        face_normal=normal / norm,
+        lever_cross=cross_matrix(lever_arm),
+        calibrated=calibrated
+    )
+
+
+def get_impact_calibration(session_config: SessionConfig) -> ImpactCalibration:
+    """Get the cached impact geometry for a session.
+
+    The cache is keyed on the calibration values themselves, so updating a
+    session's face normal or club length transparently rebuilds it.
+
+    Args:
+        session_config: Session configuration
+
+    Returns:
+        ImpactCalibration for the session
+    """
+    face_normal = session_config.face_normal_calibration
+    return _build_calibration(
+        session_config.session_id,
+        tuple(face_normal) if face_normal is not None else None,
+        float(session_config.club_length)
+    )
+
+
+def calibrate_face_normal(address_points: List[IMUData]) -> List[float]:
+    """Derive the sensor-frame face normal from an address-position capture.
+
+    At address the face is square to the target, so the horizontal
+    projection of the nominal face axis is taken as the true face normal
+    and rotated back into the sensor frame.
+
+    Args:
+        address_points: IMU samples captured while holding the club at address
+
+    Returns:
+        Unit face normal [x, y, z] in the sensor frame
+
+    Raises:
+        ValueError: If no samples are given or the face axis is vertical
+    """
+    if not address_points:
+        raise ValueError("No address samples to calibrate from")
+
+    batch = IMUBatch.from_imu_points(address_points)
+    rotation = quaternion_to_matrix(average_quaternion(batch.quat))
+
+    target = horizontal_unit(rotation @ np.array(CLUB_FACE_AXIS, dtype=np.float64))
+    if not target.any():
+        raise ValueError("Face axis is vertical at address - cannot calibrate")
+
+    return (rotation.T @ target).tolist()
+
+
+def find_impact_index(batch: IMUBatch) -> int:
+    """Index of the impact spike (peak acceleration magnitude)"""
+    return int(np.argmax(np.einsum("ij,ij->i", batch.accel, batch.accel)))
+
+
+def club_head_velocity(gyro: np.ndarray, rotations: np.ndarray,
+                       calibration: ImpactCalibration) -> np.ndarray:
+    """World-frame club-head velocity from the rigid-body relation ω × r.
+
+    Args:
+        gyro: Angular velocity in the sensor frame, shape (N, 3)
+        rotations: Sensor → world rotation matrices, shape (N, 3, 3)
+        calibration: Session impact geometry
+
+    Returns:
+        Club-head velocity in m/s, shape (N, 3)
+    """
+    return rotate_vectors(rotations, gyro @ calibration.lever_cross)
+
+
+def compute_impact_metrics(batch: IMUBatch,
+                           calibration: ImpactCalibration,
+                           impact_index: Optional[int] = None,
+                           rotations: Optional[np.ndarray] = None,
+                           velocity: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """Compute attack angle, club path and face angle at impact.
+
+    Angles are in degrees relative to the target line established at
+    address. Club path and face angle are positive to the right of the
+    target line (in-to-out / open for a right-handed golfer).
+
+    Args:
+        batch: Swing samples
+        calibration: Session impact geometry
+        impact_index: Impact sample index (peak acceleration if None)
+        rotations: Precomputed rotation matrices for every sample (only the
+            address and impact windows are converted if None)
+        velocity: Precomputed world-frame club-head velocity for every sample
+
+    Returns:
+        Dictionary of impact metrics
+    """
+    if len(batch) < 2:
+        raise ValueError("Need at least two samples to compute impact metrics")
+
+    if impact_index is None:
+        impact_index = find_impact_index(batch)
+
+    t = batch.t
+    t_impact = t[impact_index]
+
+    # Pre-impact window (the impact sample itself is contaminated by the spike)
+    window = np.nonzero((t >= t_impact - IMPACT_WINDOW_MS / 1000.0) & (t < t_impact))[0]
+    if len(window) == 0:
+        window = np.array([max(impact_index - 1, 0)])
+
+    # Target line from the orientation held at address
+    address = np.nonzero(t <= t[0] + ADDRESS_WINDOW_MS / 1000.0)[0]
+    address_rotation = quaternion_to_matrix(average_quaternion(batch.quat[address]))
+    target = horizontal_unit(address_rotation @ calibration.face_normal)
+    if not target.any():
+        target = np.array([1.0, 0.0, 0.0])
+    right = np.cross(target, WORLD_UP)
+
+    window_rotations = (rotations[window] if rotations is not None
+                        else quaternion_to_matrix(batch.quat[window]))
+    if velocity is not None:
+        velocity = velocity[window].mean(axis=0)
+    else:
+        velocity = club_head_velocity(batch.gyro[window], window_rotations, calibration).mean(axis=0)
+    face = (window_rotations @ calibration.face_normal).mean(axis=0)
+
+    forward, lateral = float(velocity @ target), float(velocity @ right)
+
+    attack_angle = math.degrees(math.atan2(velocity[2], math.hypot(forward, lateral)))
+    club_path = math.degrees(math.atan2(lateral, forward))
+    face_angle = math.degrees(math.atan2(float(face @ right), float(face @ target)))
+
+    return {
+        "impact_index": int(impact_index),
+        "club_head_speed": float(np.linalg.norm(velocity)),
+        "attack_angle": attack_angle,
+        "club_path": club_path,
+        "face_angle": face_angle,
+        "face_to_path": face_angle - club_path,
+        "face_calibrated": calibration.calibrated
+    }
+
+
+def analyze_impact(swing_data: SwingData, session_config: SessionConfig) -> ProcessedMetrics:
+    """Compute impact metrics for a swing.
+
+    Args:
+        swing_data: Complete swing data
+        session_config: Session the swing belongs to
+
+    Returns:
+        ProcessedMetrics with the impact metrics
+    """
+    metrics = compute_impact_metrics(
+        IMUBatch.from_swing(swing_data),
+        get_impact_calibration(session_config)
+    )
+    return ProcessedMetrics(
+        swing_id=swing_data.swing_id,
+        session_id=swing_data.session_id,
+        metrics=metrics
+    )
@@ -0,0 +1,150 @@
+"""
+Columnar IMU sample batches for GolfIMU analytics
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .models import IMUData, SwingData
+
+# Column layout of the row / binary form: t, ax..az, gx..gz, mx..mz, qw..qz
+ROW_FIELDS = 14
+ROW_NAMES = ("t", "ax", "ay", "az", "gx", "gy", "gz", "mx", "my", "mz", "qw", "qx", "qy", "qz")
+
+
+class IMUBatch:
+    """Columnar (structure-of-arrays) view of a sequence of IMU samples.
+
+    Analytics work on whole swings at once, so instead of iterating over
+    ``IMUData`` objects every channel is held in a contiguous float64 array:
+
+    - ``t``: sample times in seconds, shape (N,)
+    - ``accel``: accelerometer, m/s², shape (N, 3)
+    - ``gyro``: gyroscope, rad/s, shape (N, 3)
+    - ``mag``: magnetometer, μT, shape (N, 3)
+    - ``quat``: fused orientation [w, x, y, z] (sensor → world), shape (N, 4)
+    """
+
+    __slots__ = ("t", "accel", "gyro", "mag", "quat")
+
+    def __init__(self, t: np.ndarray, accel: np.ndarray, gyro: np.ndarray,
+                 mag: np.ndarray, quat: np.ndarray):
+        """Initialize batch from channel arrays"""
+        self.t = np.asarray(t, dtype=np.float64)
+        self.accel = np.asarray(accel, dtype=np.float64).reshape(-1, 3)
+        self.gyro = np.asarray(gyro, dtype=np.float64).reshape(-1, 3)
+        self.mag = np.asarray(mag, dtype=np.float64).reshape(-1, 3)
+        self.quat = np.asarray(quat, dtype=np.float64).reshape(-1, 4)
+
+        n = len(self.t)
+        if not (len(self.accel) == len(self.gyro) == len(self.mag) == len(self.quat) == n):
+            raise ValueError("All IMU channels must have the same number of samples")
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+    @classmethod
+    def from_imu_points(cls, points: List[IMUData]) -> "IMUBatch":
+        """Build a batch from a list of IMUData points.
+
+        Args:
+            points: IMU samples in chronological order
+
+        Returns:
+            IMUBatch holding the same samples
+        """
+        rows = np.array([
+            (p.timestamp.timestamp(),
+             p.ax, p.ay, p.az, p.gx, p.gy, p.gz,
+             p.mx, p.my, p.mz, p.qw, p.qx, p.qy, p.qz)
+            for p in points
+        ], dtype=np.float64)
+
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_point_dicts(cls, points: List[Dict[str, Any]]) -> "IMUBatch":
+        """Build a batch from stored IMU point dicts without model validation.
+
+        Args:
+            points: Dicts with the IMUData fields and an ISO ``timestamp``
+
+        Returns:
+            IMUBatch holding the same samples
+        """
+        rows = np.array([
+            (datetime.fromisoformat(p["timestamp"]).timestamp(),
+             p["ax"], p["ay"], p["az"], p["gx"], p["gy"], p["gz"],
+             p["mx"], p["my"], p["mz"], p["qw"], p["qx"], p["qy"], p["qz"])
+            for p in points
+        ], dtype=np.float64)
+
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray) -> "IMUBatch":
+        """Build a batch from an (N, 14) array in ``ROW_FIELDS`` order"""
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, ROW_FIELDS)
+        return cls(
+            t=rows[:, 0],
+            accel=rows[:, 1:4],
+            gyro=rows[:, 4:7],
+            mag=rows[:, 7:10],
+            quat=rows[:, 10:14]
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "IMUBatch":
+        """Decode a batch produced by ``to_bytes``"""
+        return cls.from_rows(np.frombuffer(data, dtype=np.float64))
+
+    def to_rows(self) -> np.ndarray:
+        """All channels as one contiguous (N, 14) array"""
+        return np.column_stack((self.t, self.accel, self.gyro, self.mag, self.quat))
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form (raw float64 rows) for shipping between processes"""
+        return self.to_rows().tobytes()
+
+    def to_imu_points(self) -> List[IMUData]:
+        """The samples as IMUData points (inverse of ``from_imu_points``)"""
+        return [
+            IMUData(ax=row[1], ay=row[2], az=row[3], gx=row[4], gy=row[5], gz=row[6],
+                    mx=row[7], my=row[8], mz=row[9], qw=row[10], qx=row[11], qy=row[12], qz=row[13],
+                    timestamp=datetime.fromtimestamp(row[0]))
+            for row in self.to_rows().tolist()
+        ]
+
+    @classmethod
+    def from_swing(cls, swing_data: SwingData) -> "IMUBatch":
+        """Build a batch from all IMU points of a swing"""
+        return cls.from_imu_points(swing_data.imu_data_points)
+
+    def sample_rate(self, default: Optional[float] = None) -> Optional[float]:
+        """Estimate the sample rate from the timestamps.
+
+        Args:
+            default: Value returned when the rate cannot be estimated
+
+        Returns:
+            Sample rate in Hz, or ``default``
+        """
+        if len(self.t) < 2:
+            return default
+
+        duration = self.t[-1] - self.t[0]
+        if duration <= 0:
+            return default
+
+        return (len(self.t) - 1) / duration
+
+    def slice(self, start: int, stop: int) -> "IMUBatch":
+        """Return a view of samples ``start:stop``"""
+        return IMUBatch(
+            t=self.t[start:stop],
+            accel=self.accel[start:stop],
+            gyro=self.gyro[start:stop],
+            mag=self.mag[start:stop],
+            quat=self.quat[start:stop]
+        )
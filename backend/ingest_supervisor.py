@@ -0,0 +1,454 @@
+"""
+Multi-process ingest for GolfIMU backend
+
+Serial reading, Redis I/O and analytics each get their own process, so they
+no longer share one GIL. The processes share samples through a
+``SharedRing``:
+
+- ingest (the ring's writer) reads the serial port, decodes whole buffers
+  of frames at once and appends them as rows
+- persistence (reader 0) pushes each new chunk of rows to the Redis IMU
+  buffer in one round trip
+- analytics (reader 1) scans the rows for impacts. It cuts each swing
+  straight out of the ring, pre-impact history included, then stores the
+  swing and its metrics
+
+``IngestSupervisor`` owns the ring and starts the workers. It restarts any
+worker that dies. Readers commit their cursors to the ring header, so a
+restarted worker carries on where the crashed one stopped. The analytics
+cursor passes a swing only once the swing is stored (``RingSwingScanner.ack``),
+so a swing is stored at least once. The ring itself lives on in the
+supervisor's shared memory.
+"""
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .frame_codec import decode_binary_frames, decode_json_frames
+from .imu_batch import IMUBatch
+from .models import SessionConfig, SwingData
+from .shared_ring import SharedRing
+from .structured_log import get_logger
+from .swing_quality import QUALITY_SCORES
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    GRAVITY_MS2, IMU_SAMPLE_RATE_HZ, SEGMENT_POST_IMPACT_MS, SEGMENT_PRE_IMPACT_MS, SHARED_RING_CAPACITY,
+    SHARED_RING_POLL_INTERVAL_S, SHARED_RING_READ_CHUNK, SUPERVISOR_MAX_RESTARTS, SUPERVISOR_POLL_INTERVAL_S,
+    SUPERVISOR_RESTART_DELAY_S
+)
+
+logger = get_logger("ingest")
+
+PERSISTENCE_READER = 0
+ANALYTICS_READER = 1
+
+RING_WRITE_SEQ = TELEMETRY.gauge("golfimu_ring_write_seq", "Rows written to the shared ingest ring")
+RING_LAG = TELEMETRY.gauge("golfimu_ring_reader_lag_rows", "Rows a ring reader is behind the writer",
+                           labels=("worker",))
+RING_LOST = TELEMETRY.gauge("golfimu_ring_reader_lost_rows", "Rows a ring reader lost to overwrites",
+                            labels=("worker",))
+WORKER_RESTARTS = TELEMETRY.counter("golfimu_worker_restarts_total", "Ingest worker processes restarted",
+                                    labels=("worker",))
+
+
+class FrameClock:
+    """Maps firmware millisecond timestamps onto host epoch seconds.
+
+    The offset is taken from the host clock at the first frame. It is taken
+    again whenever the firmware clock jumps back (reset) or stalls (firmware
+    without timestamps).
+    """
+
+    def __init__(self):
+        self._offset: Optional[float] = None
+        self._last_ms: Optional[int] = None
+
+    def to_host(self, t_ms: np.ndarray, received: float) -> np.ndarray:
+        """Host times of frames whose last one was received at ``received``"""
+        if self._offset is None or t_ms[0] < self._last_ms or t_ms[-1] == self._last_ms:
+            self._offset = received - t_ms[-1] / 1000.0
+        self._last_ms = int(t_ms[-1])
+        return self._offset + t_ms / 1000.0
+
+
+def ingest_worker(ring_name: str, stop_event, port: str, baudrate: int, frame_format: str):
+    """Read the serial port and append decoded frames to the ring (ring writer).
+
+    Args:
+        ring_name: Shared memory name of the ring
+        stop_event: Set to stop the worker
+        port: Serial port of the device
+        baudrate: Serial baud rate
+        frame_format: "json" or "binary" frames
+    """
+    import serial
+
+    decode = decode_binary_frames if frame_format == "binary" else decode_json_frames
+    ring = SharedRing.attach(ring_name)
+    connection = serial.Serial(port=port, baudrate=baudrate, timeout=SUPERVISOR_POLL_INTERVAL_S)
+    clock = FrameClock()
+    pending = b""
+    try:
+        while not stop_event.is_set():
+            data = connection.read(max(1, connection.in_waiting))
+            if not data:
+                continue
+            received = time.time()
+            pending += data
+            t_ms, values, consumed = decode(pending)
+            pending = pending[consumed:]
+            if len(t_ms):
+                ring.write(np.column_stack((clock.to_host(t_ms, received), values)))
+    finally:
+        connection.close()
+        ring.close()
+
+
+def persistence_worker(ring_name: str, stop_event, session_config: SessionConfig,
+                       reader: int = PERSISTENCE_READER):
+    """Push new ring rows to the Redis IMU buffer, one round trip per chunk.
+
+    Args:
+        ring_name: Shared memory name of the ring
+        stop_event: Set to stop the worker
+        session_config: Session the samples belong to
+        reader: Reader slot of this worker
+    """
+    from .redis_manager import RedisManager
+
+    ring = SharedRing.attach(ring_name)
+    redis_manager = RedisManager()
+    cursor = ring.cursor(reader)
+    try:
+        while not stop_event.is_set():
+            rows, start, lost = ring.read(cursor, SHARED_RING_READ_CHUNK)
+            if not len(rows):
+                time.sleep(SHARED_RING_POLL_INTERVAL_S)
+                continue
+
+            entries = redis_manager._serialize_imu_rows(rows)
+            if not ring.is_intact(start, len(rows)):
+                lost += len(rows)
+            elif not redis_manager.store_imu_entries(entries, session_config):
+                # Redis is down: retry the same rows
+                time.sleep(SUPERVISOR_RESTART_DELAY_S)
+                continue
+
+            if lost:
+                ring.add_lost(reader, lost)
+            cursor = start + len(rows)
+            ring.commit(reader, cursor)
+    finally:
+        ring.close()
+
+
+class RingSwingScanner:
+    """Finds impacts in the ring and cuts out the swing around each one
+
+    The committed cursor stays at the impact of every swing returned by
+    ``poll`` until the caller acknowledges it with ``ack`` (once the swing
+    is stored), so a scanner restarted in between cuts the swing out again.
+    Swings may be acknowledged in any order, from any thread.
+    """
+
+    def __init__(self, ring: SharedRing, session_config: SessionConfig, reader: int = ANALYTICS_READER,
+                 pre_impact_ms: float = SEGMENT_PRE_IMPACT_MS, post_impact_ms: float = SEGMENT_POST_IMPACT_MS,
+                 sample_rate: float = IMU_SAMPLE_RATE_HZ):
+        """Initialize the scanner at the reader's committed cursor.
+
+        Args:
+            ring: Ring to scan
+            session_config: Session the swings belong to (impact threshold)
+            reader: Reader slot of the scanner
+            pre_impact_ms: Samples kept before the impact
+            post_impact_ms: Samples collected after the impact
+            sample_rate: Highest expected sample rate in Hz (bounds the look-back)
+        """
+        self.ring = ring
+        self.reader = reader
+        self.pre_impact = pre_impact_ms / 1000.0
+        self.post_impact = post_impact_ms / 1000.0
+        self.max_pre_rows = int(2 * self.pre_impact * sample_rate) + 1
+        self._threshold_squared = (session_config.impact_threshold * GRAVITY_MS2) ** 2
+        self.cursor = ring.cursor(reader)
+        # Sequence and time of the open swing's impact
+        self._impact: Optional[Tuple[int, float]] = None
+        # Impact sequences of swings returned and not acknowledged yet
+        self._unacked: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def poll(self) -> Optional[Tuple[np.ndarray, int, int]]:
+        """Scan the rows written since the last call.
+
+        Returns:
+            (swing rows, index of the impact row, impact sequence) when a
+            swing completed, None otherwise. The rows are a copy, safe to
+            keep. Pass the impact sequence to ``ack`` once the swing is stored.
+        """
+        with self._lock:
+            return self._poll()
+
+    def ack(self, impact_seq: int):
+        """Acknowledge a swing from ``poll`` as stored, letting the committed cursor pass it"""
+        with self._lock:
+            self._unacked.discard(impact_seq)
+            self._commit()
+
+    def _poll(self) -> Optional[Tuple[np.ndarray, int, int]]:
+        rows, start, lost = self.ring.read(self.cursor, SHARED_RING_READ_CHUNK)
+        if lost:
+            self.ring.add_lost(self.reader, lost)
+        if not len(rows):
+            self.cursor = start
+            return None
+
+        if self._impact is None:
+            accel = rows[:, 1:4]
+            hits = np.flatnonzero(np.einsum("ij,ij->i", accel, accel) >= self._threshold_squared)
+            impact = (start + int(hits[0]), float(rows[hits[0], 0])) if len(hits) else None
+            if not self.ring.is_intact(start, len(rows)):
+                self.ring.add_lost(self.reader, len(rows))
+                impact = None
+            if impact is None:
+                self._advance(start + len(rows))
+                return None
+            # A restarted scanner re-detects this impact
+            self._impact = impact
+            self._advance(impact[0])
+            rows, start = rows[hits[0]:], impact[0]
+
+        impact_seq, impact_t = self._impact
+        after = np.flatnonzero(rows[:, 0] - impact_t >= self.post_impact)
+        if not len(after):
+            # Keep the commit at the impact; scan on from here next time
+            self.cursor = start + len(rows)
+            return None
+
+        end = start + int(after[0]) + 1
+        window = self.ring.copy_range(max(self.ring.oldest_seq, impact_seq - self.max_pre_rows), end)
+        self._impact = None
+        if window is None:
+            self._advance(end)
+            logger.warning("Swing at %.3f was overwritten before it could be cut out", impact_t)
+            return None
+        # Committed past the swing once it is acknowledged
+        self._unacked.add(impact_seq)
+        self._advance(end)
+
+        first = int(np.searchsorted(window[:, 0], impact_t - self.pre_impact))
+        window = window[first:]
+        return window, int(np.searchsorted(window[:, 0], impact_t)), impact_seq
+
+    def _advance(self, cursor: int):
+        self.cursor = cursor
+        self._commit()
+
+    def _commit(self):
+        """Commit the scan position, held at the open swing's impact and unacknowledged swings (lock held)"""
+        holds = set(self._unacked)
+        if self._impact is not None:
+            holds.add(self._impact[0])
+        self.ring.commit(self.reader, min(holds, default=self.cursor))
+
+
+def ring_swing_data(rows: np.ndarray, impact_index: int, session_config: SessionConfig) -> SwingData:
+    """SwingData for a swing cut out of the ring (as ``SwingSegmenter`` would build it)"""
+    points = IMUBatch.from_rows(rows).to_imu_points()
+    accel = rows[impact_index:, 1:4]
+    return SwingData(
+        swing_id=str(uuid.uuid4()),
+        session_id=session_config.session_id,
+        imu_data_points=points,
+        swing_start_time=points[0].timestamp,
+        swing_end_time=points[impact_index].timestamp,
+        swing_duration=(points[impact_index].timestamp - points[0].timestamp).total_seconds(),
+        impact_g_force=float(np.sqrt(np.einsum("ij,ij->i", accel, accel).max()) / GRAVITY_MS2)
+    )
+
+
+def analytics_worker(ring_name: str, stop_event, session_config: SessionConfig,
+                     reader: int = ANALYTICS_READER):
+    """Segment swings out of the ring, analyze them and store swing and metrics.
+
+    Args:
+        ring_name: Shared memory name of the ring
+        stop_event: Set to stop the worker
+        session_config: Session the swings belong to
+        reader: Reader slot of this worker
+    """
+    from .analytics_pipeline import AnalyticsPipeline
+    from .redis_manager import RedisManager
+
+    ring = SharedRing.attach(ring_name)
+    redis_manager = RedisManager()
+    pipeline = AnalyticsPipeline()
+    scanner = RingSwingScanner(ring, session_config, reader)
+    try:
+        while not stop_event.is_set():
+            swing = scanner.poll()
+            if swing is None:
+                if scanner.cursor >= ring.write_seq:
+                    time.sleep(SHARED_RING_POLL_INTERVAL_S)
+                continue
+
+            rows, impact_index, impact_seq = swing
+            swing_data = ring_swing_data(rows, impact_index, session_config)
+            stored = redis_manager.store_swing_data(swing_data, session_config)
+            while not stored and not stop_event.wait(SUPERVISOR_RESTART_DELAY_S):
+                # Redis failed: store the same swing again, its cursor held at the impact meanwhile
+                stored = redis_manager.store_swing_data(swing_data, session_config)
+            if not stored:
+                break
+            scanner.ack(impact_seq)
+            processed = pipeline.run_swing_batch(IMUBatch.from_rows(rows), swing_data.swing_id, session_config)
+            metrics = processed.metrics
+            redis_manager.store_processed_metrics(processed, session_config, {
+                name: metrics[name] for name in QUALITY_SCORES if metrics.get(name) is not None
+            }, swing_start_time=swing_data.swing_start_time)
+            logger.info("Swing %s: %.1f m/s", swing_data.swing_id, metrics["club_head_speed"])
+    finally:
+        pipeline.shutdown()
+        ring.close()
+
+
+class Worker:
+    """A supervised worker process"""
+
+    def __init__(self, name: str, target: Callable, args: tuple = (), reader: Optional[int] = None):
+        """Describe a worker.
+
+        Args:
+            name: Worker name (process name and telemetry label)
+            target: Function run as ``target(ring_name, stop_event, *args)``
+            args: Further arguments for ``target`` (picklable)
+            reader: Ring reader slot the worker uses, if any
+        """
+        self.name = name
+        self.target = target
+        self.args = args
+        self.reader = reader
+        self.process: Optional[multiprocessing.Process] = None
+        self.restarts = 0
+        self.failed = False
+        self.died_at: Optional[float] = None
+
+
+def ingest_workers(port: str, baudrate: int, frame_format: str, session_config: SessionConfig) -> List[Worker]:
+    """The standard ingest, persistence and analytics workers"""
+    return [
+        Worker("ingest", ingest_worker, (port, baudrate, frame_format)),
+        Worker("persistence", persistence_worker, (session_config, PERSISTENCE_READER), PERSISTENCE_READER),
+        Worker("analytics", analytics_worker, (session_config, ANALYTICS_READER), ANALYTICS_READER),
+    ]
+
+
+class IngestSupervisor:
+    """Owns the shared ring and keeps its worker processes running"""
+
+    def __init__(self, workers: List[Worker], capacity: int = SHARED_RING_CAPACITY,
+                 restart_delay: float = SUPERVISOR_RESTART_DELAY_S, max_restarts: int = SUPERVISOR_MAX_RESTARTS):
+        """Initialize the supervisor.
+
+        Args:
+            workers: Worker processes to run
+            capacity: Ring capacity in rows
+            restart_delay: Wait after a worker dies before restarting it
+            max_restarts: Restarts per worker before giving up on it
+        """
+        self.workers = workers
+        self.capacity = capacity
+        self.restart_delay = restart_delay
+        self.max_restarts = max_restarts
+        self.ring: Optional[SharedRing] = None
+        # Spawned workers do not inherit the parent's threads or locks
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+
+    def start(self):
+        """Create the ring and start every worker"""
+        self.ring = SharedRing.create(self.capacity)
+        self._stop_event.clear()
+        RING_WRITE_SEQ.set_function(lambda: self.ring.write_seq if self.ring else 0)
+        for worker in self.workers:
+            if worker.reader is not None:
+                RING_LAG.labels(worker.name).set_function(
+                    lambda reader=worker.reader: self.ring.write_seq - self.ring.cursor(reader) if self.ring else 0)
+                RING_LOST.labels(worker.name).set_function(
+                    lambda reader=worker.reader: self.ring.lost(reader) if self.ring else 0)
+            self._spawn(worker)
+
+    def _spawn(self, worker: Worker):
+        worker.process = self._context.Process(
+            target=worker.target, args=(self.ring.name, self._stop_event) + tuple(worker.args),
+            name=f"golfimu-{worker.name}", daemon=True)
+        worker.process.start()
+        worker.died_at = None
+
+    def poll(self) -> bool:
+        """Restart workers that died.
+
+        Returns:
+            False once every worker has failed for good, True otherwise
+        """
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.failed or worker.process is None or worker.process.is_alive():
+                continue
+            if worker.died_at is None:
+                worker.died_at = now
+                logger.warning("Worker %s exited with code %s", worker.name, worker.process.exitcode)
+                if worker.restarts >= self.max_restarts:
+                    worker.failed = True
+                    logger.error("Worker %s failed %d times, not restarting", worker.name, worker.restarts + 1)
+            elif now - worker.died_at >= self.restart_delay:
+                worker.restarts += 1
+                WORKER_RESTARTS.labels(worker.name).inc()
+                self._spawn(worker)
+        return not all(worker.failed for worker in self.workers)
+
+    def run(self, should_continue: Callable[[], bool] = lambda: True):
+        """Supervise until ``should_continue`` returns False or every worker has failed"""
+        while should_continue() and self.poll():
+            time.sleep(SUPERVISOR_POLL_INTERVAL_S)
+
+    def status(self) -> Dict[str, Any]:
+        """Ring position and per-worker state"""
+        if self.ring is None:
+            return {}
+        write_seq = self.ring.write_seq
+        workers = {}
+        for worker in self.workers:
+            state = {
+                "pid": worker.process.pid if worker.process else None,
+                "alive": bool(worker.process and worker.process.is_alive()),
+                "restarts": worker.restarts,
+                "failed": worker.failed,
+            }
+            if worker.reader is not None:
+                state["lag_rows"] = write_seq - self.ring.cursor(worker.reader)
+                state["lost_rows"] = self.ring.lost(worker.reader)
+            workers[worker.name] = state
+        return {"ring": self.ring.name, "capacity": self.capacity, "write_seq": write_seq, "workers": workers}
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers and free the ring"""
+        self._stop_event.set()
+        for worker in self.workers:
+            if worker.process is None:
+                continue
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+        if self.ring is not None:
+            ring, self.ring = self.ring, None
+            ring.close()
+            ring.unlink()
@@ -0,0 +1,131 @@
+"""
+Rigid-body kinematics helpers for GolfIMU analytics
+"""
+import numpy as np
+
+# World frame used by the fused orientation: z points up
+WORLD_UP = np.array([0.0, 0.0, 1.0])
+
+
+def normalize_quaternions(quat: np.ndarray) -> np.ndarray:
+    """Normalize quaternions to unit length.
+
+    Args:
+        quat: Quaternions [w, x, y, z], shape (N, 4) or (4,)
+
+    Returns:
+        Unit quaternions with the same shape (zero rows become identity)
+    """
+    quat = np.asarray(quat, dtype=np.float64)
+    norms = np.linalg.norm(quat, axis=-1, keepdims=True)
+    identity = np.zeros_like(quat)
+    identity[..., 0] = 1.0
+    return np.where(norms > 0, quat / np.where(norms > 0, norms, 1.0), identity)
+
+
+def quaternion_to_matrix(quat: np.ndarray) -> np.ndarray:
+    """Convert quaternions to rotation matrices (sensor → world).
+
+    Args:
+        quat: Quaternions [w, x, y, z], shape (N, 4) or (4,)
+
+    Returns:
+        Rotation matrices, shape (N, 3, 3) or (3, 3)
+    """
+    q = normalize_quaternions(quat)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    matrix = np.empty(q.shape[:-1] + (3, 3))
+    matrix[..., 0, 0] = 1 - 2 * (yy + zz)
+    matrix[..., 0, 1] = 2 * (xy - wz)
+    matrix[..., 0, 2] = 2 * (xz + wy)
+    matrix[..., 1, 0] = 2 * (xy + wz)
+    matrix[..., 1, 1] = 1 - 2 * (xx + zz)
+    matrix[..., 1, 2] = 2 * (yz - wx)
+    matrix[..., 2, 0] = 2 * (xz - wy)
+    matrix[..., 2, 1] = 2 * (yz + wx)
+    matrix[..., 2, 2] = 1 - 2 * (xx + yy)
+    return matrix
+
+
+def quaternion_multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product ``a ⊗ b`` (apply ``b`` first, then ``a``).
+
+    Args:
+        a: Quaternions [w, x, y, z], shape (..., 4)
+        b: Quaternions [w, x, y, z], broadcastable against ``a``
+
+    Returns:
+        Product quaternions with the broadcast shape
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+    return np.stack([
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw
+    ], axis=-1)
+
+
+def average_quaternion(quat: np.ndarray) -> np.ndarray:
+    """Average a short run of similar orientations.
+
+    Quaternions are sign-aligned to the first sample before averaging so
+    that q and -q (the same rotation) do not cancel out.
+
+    Args:
+        quat: Quaternions [w, x, y, z], shape (N, 4)
+
+    Returns:
+        Unit mean quaternion, shape (4,)
+    """
+    q = normalize_quaternions(np.asarray(quat, dtype=np.float64).reshape(-1, 4))
+    signs = np.where(q @ q[0] < 0, -1.0, 1.0)
+    return normalize_quaternions((q * signs[:, None]).sum(axis=0))
+
+
+def rotate_vectors(matrices: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """Rotate vectors by matching rotation matrices.
+
+    Args:
+        matrices: Rotation matrices, shape (N, 3, 3)
+        vectors: Vectors, shape (N, 3) or a single (3,) vector applied to all
+
+    Returns:
+        Rotated vectors, shape (N, 3)
+    """
+    if np.ndim(vectors) == 1:
+        return matrices @ vectors
+    return np.einsum("nij,nj->ni", matrices, vectors)
+
+
+def cross_matrix(vector: np.ndarray) -> np.ndarray:
+    """Skew-symmetric matrix ``[v]x`` so that ``[v]x @ u == cross(v, u)``"""
+    x, y, z = vector
+    return np.array([
+        [0.0, -z, y],
+        [z, 0.0, -x],
+        [-y, x, 0.0]
+    ])
+
+
+def horizontal_unit(vectors: np.ndarray) -> np.ndarray:
+    """Project vectors onto the horizontal plane and normalize them.
+
+    Args:
+        vectors: World-frame vectors, shape (N, 3) or (3,)
+
+    Returns:
+        Unit horizontal vectors (zero vectors stay zero)
+    """
+    projected = np.array(vectors, dtype=np.float64)
+    projected[..., 2] = 0.0
+    norms = np.linalg.norm(projected, axis=-1, keepdims=True)
+    return np.where(norms > 0, projected / np.where(norms > 0, norms, 1.0), 0.0)
@@ -0,0 +1,159 @@
+"""
+Impact-to-metrics latency tracing for GolfIMU backend
+
+A swing's trace records when its impact reached each stage of the data
+path, on the ``time.perf_counter`` clock:
+
+- impact: the ball strike itself (only known when injected by a harness)
+- serial_receive: the impact sample's line came off the serial link
+- parse: the impact sample was decoded into ``IMUData``
+- segment: the segmenter closed the swing around the impact
+- store: the swing was written to Redis
+- analytics: the analytics pipeline finished the swing
+- published: the swing's metrics were written to Redis
+- available: the metrics were first read back through the query API
+
+Serial reads stamp every sample cheaply; the segmenter opens a trace from
+the impact sample's stamps, and later stages mark it by swing id. The
+stage hooks are always on, so ``LATENCY_TRACER.report()`` gives the same
+breakdown in production as under the latency harness.
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import LATENCY_TRACE_HISTORY
+
+LATENCY_STAGES = ("impact", "serial_receive", "parse", "segment", "store", "analytics", "published", "available")
+
+
+def summarize_latencies(seconds: List[float]) -> Dict[str, float]:
+    """Millisecond p50 / p95 / p99 / max of a list of durations"""
+    if not seconds:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99]) * 1000.0
+    return {"p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+            "max_ms": float(max(seconds)) * 1000.0}
+
+
+def latency_breakdown(traces: List[Dict[str, float]]) -> Dict[str, Any]:
+    """Latency breakdown over many traces.
+
+    Each trace is measured from its ``impact`` stage, or from its earliest
+    stage when the impact instant is unknown.
+
+    Args:
+        traces: Stage times per swing
+
+    Returns:
+        Dictionary with the number of swings and, per stage in pipeline
+        order, the latency since impact and the step from the previous
+        stage (each as p50 / p95 / p99 / max in ms)
+    """
+    since_impact: Dict[str, List[float]] = {stage: [] for stage in LATENCY_STAGES}
+    step: Dict[str, List[float]] = {stage: [] for stage in LATENCY_STAGES}
+
+    for trace in traces:
+        stages = [stage for stage in LATENCY_STAGES if stage in trace]
+        if not stages:
+            continue
+        origin = trace[stages[0]]
+        previous = origin
+        for stage in stages[1:]:
+            since_impact[stage].append(trace[stage] - origin)
+            step[stage].append(trace[stage] - previous)
+            previous = trace[stage]
+
+    return {
+        "swings": len(traces),
+        "stages": {
+            stage: {"since_impact": summarize_latencies(since_impact[stage]),
+                    "step": summarize_latencies(step[stage])}
+            for stage in LATENCY_STAGES if since_impact[stage]
+        }
+    }
+
+
+class LatencyTracer:
+    """Per-swing stage timestamps for the most recent swings"""
+
+    def __init__(self, history: int = LATENCY_TRACE_HISTORY):
+        """Initialize the tracer.
+
+        Args:
+            history: Number of swings whose traces are kept
+        """
+        self.history = history
+        self._traces: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._sample: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def stamp_sample(self, received: float, parsed: float):
+        """Record when the latest sample was received and parsed.
+
+        Called for every sample, so it only keeps the latest stamps.
+
+        Args:
+            received: ``perf_counter`` time its line came off the link
+            parsed: ``perf_counter`` time it was decoded
+        """
+        self._sample = {"serial_receive": received, "parse": parsed}
+
+    def start(self, trace_id: str, impact: Optional[float] = None):
+        """Open a trace from the latest sample's stamps.
+
+        Args:
+            trace_id: Swing id
+            impact: ``perf_counter`` time of the ball strike, if known
+        """
+        trace = dict(self._sample)
+        if impact is not None:
+            trace["impact"] = impact
+        with self._lock:
+            self._traces[trace_id] = trace
+            while len(self._traces) > self.history:
+                self._traces.popitem(last=False)
+
+    def mark(self, trace_id: str, stage: str, when: Optional[float] = None):
+        """Record a stage of a traced swing (first time only).
+
+        Swings without an open trace are ignored.
+
+        Args:
+            trace_id: Swing id
+            stage: One of ``LATENCY_STAGES``
+            when: ``perf_counter`` time (now if None)
+        """
+        trace = self._traces.get(trace_id)
+        if trace is not None and stage not in trace:
+            trace[stage] = time.perf_counter() if when is None else when
+
+    def set_impact(self, trace_id: str, impact: float):
+        """Set the ball-strike instant of a traced swing"""
+        trace = self._traces.get(trace_id)
+        if trace is not None:
+            trace["impact"] = impact
+
+    def traces(self) -> Dict[str, Dict[str, float]]:
+        """Copy of the kept traces by swing id, oldest first"""
+        with self._lock:
+            return OrderedDict((trace_id, dict(trace)) for trace_id, trace in self._traces.items())
+
+    def reset(self):
+        """Drop every trace"""
+        with self._lock:
+            self._traces.clear()
+            self._sample = {}
+
+    def report(self) -> Dict[str, Any]:
+        """Latency breakdown of the kept traces (see ``latency_breakdown``)"""
+        return latency_breakdown(list(self.traces().values()))
+
+
+LATENCY_TRACER = LatencyTracer()
@@ -0,0 +1,320 @@
+"""
+Live IMU and swing event feed for GolfIMU backend
+
+Ingest paths publish samples and events per session; WebSocket clients
+subscribe to a session at the rate they want:
+
+- ``full``: every sample
+- ``decimate``: one sample per ``sample_rate / rate`` samples
+- ``minmax``: per bucket of that many samples, the per-channel minimum and
+  maximum (two rows), so peaks such as impacts survive the downsampling
+
+Samples are coalesced into batches of ``LIVE_FEED_FLUSH_INTERVAL_S``. Each
+(mode, rate) in use is a tier: a batch is downsampled and encoded once per
+tier and the same message is queued to every subscriber of that tier.
+
+Publishing never waits for a client. Every subscriber has a bounded queue;
+when it is full the oldest message is dropped and counted, and the
+WebSocket handler disconnects a subscriber that keeps dropping. With no
+subscriber for a session, publishing is one dict lookup.
+
+Sample messages are binary (little endian): a header of float64 ``t0``
+(epoch seconds of the first row), uint32 row count, uint16 column count and
+uint16 mode, then float32 rows in ``ROW_FIELDS`` order with ``t`` relative
+to ``t0``. Events are JSON text with a ``type`` field.
+"""
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .imu_batch import ROW_FIELDS
+from .models import IMUData
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    IMU_SAMPLE_RATE_HZ, LIVE_FEED_DEFAULT_RATE_HZ, LIVE_FEED_FLUSH_INTERVAL_S, LIVE_FEED_MAX_PENDING
+)
+
+MODES = ("full", "decimate", "minmax")
+HEADER = struct.Struct("<dIHH")
+
+LIVE_MESSAGES = TELEMETRY.counter("golfimu_live_messages_total", "Messages queued to live subscribers")
+LIVE_DROPPED = TELEMETRY.counter("golfimu_live_dropped_total", "Messages dropped for slow live subscribers")
+
+
+def encode_samples(rows: np.ndarray, mode: str) -> bytes:
+    """Encode sample rows as a binary live feed message.
+
+    Args:
+        rows: (N, ``ROW_FIELDS``) rows with absolute ``t`` in column 0
+        mode: Mode the rows were downsampled with
+
+    Returns:
+        Header followed by float32 rows
+    """
+    t0 = float(rows[0, 0]) if len(rows) else 0.0
+    body = rows.astype(np.float32)
+    body[:, 0] = rows[:, 0] - t0
+    return HEADER.pack(t0, len(rows), ROW_FIELDS, MODES.index(mode)) + body.tobytes()
+
+
+def decode_samples(message: bytes) -> Tuple[np.ndarray, str]:
+    """Decode ``encode_samples`` output.
+
+    Returns:
+        (float64 rows with absolute ``t``, mode)
+    """
+    t0, count, columns, mode = HEADER.unpack_from(message)
+    rows = np.frombuffer(message, dtype=np.float32, offset=HEADER.size).reshape(count, columns)
+    rows = rows.astype(np.float64)
+    rows[:, 0] += t0
+    return rows, MODES[mode]
+
+
+class Subscription:
+    """One client's queue of live messages (bytes for samples, str for events)"""
+
+    def __init__(self, session_id: str, mode: str, rate: float, step: int, max_pending: int,
+                 notify: Optional[Callable[[], None]] = None):
+        """Initialize the subscription.
+
+        Args:
+            session_id: Session followed
+            mode: One of ``MODES``
+            rate: Requested sample rate (Hz)
+            step: Samples per output bucket
+            max_pending: Messages queued before the oldest is dropped
+            notify: Called from the publishing thread when a message arrives
+                while ``waiting`` is set
+        """
+        self.session_id = session_id
+        self.mode = mode
+        self.rate = rate
+        self.step = step
+        self.notify = notify
+        self.waiting = False
+        self.dropped = 0
+        self.lagging_since: Optional[float] = None
+        self._queue: deque = deque()
+        self._max_pending = max_pending
+
+    def put(self, message):
+        """Queue a message, dropping the oldest if the client is behind"""
+        if len(self._queue) >= self._max_pending:
+            self._queue.popleft()
+            self.dropped += 1
+            LIVE_DROPPED.inc()
+            if self.lagging_since is None:
+                self.lagging_since = time.monotonic()
+        self._queue.append(message)
+        LIVE_MESSAGES.inc()
+        if self.waiting and self.notify is not None:
+            self.waiting = False
+            self.notify()
+
+    def get(self):
+        """Next queued message, or None"""
+        try:
+            return self._queue.popleft()
+        except IndexError:
+            self.lagging_since = None
+            return None
+
+    def take_dropped(self) -> int:
+        """Messages dropped since the last call"""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class _Tier:
+    """Subscribers sharing one mode and bucket size, and the rows carried between batches"""
+
+    def __init__(self, mode: str, step: int):
+        self.mode = mode
+        self.step = step
+        self.subscribers: List[Subscription] = []
+        self.carry: Optional[np.ndarray] = None
+
+    def encode(self, rows: np.ndarray) -> Optional[bytes]:
+        """Downsample and encode a batch (None until a whole bucket is in)"""
+        if self.step > 1:
+            if self.carry is not None:
+                rows = np.vstack((self.carry, rows))
+            whole = len(rows) // self.step * self.step
+            self.carry = rows[whole:]
+            if not whole:
+                return None
+            buckets = rows[:whole].reshape(-1, self.step, ROW_FIELDS)
+            if self.mode == "decimate":
+                rows = buckets[:, 0]
+            else:
+                extremes = np.stack((buckets.min(axis=1), buckets.max(axis=1)), axis=1)
+                extremes[:, :, 0] = buckets[:, :1, 0]
+                rows = extremes.reshape(-1, ROW_FIELDS)
+        return encode_samples(rows, self.mode)
+
+
+class _SessionFeed:
+    """Tiers of one session and the samples not yet pushed to them"""
+
+    def __init__(self):
+        self.tiers: Dict[Tuple[str, int], _Tier] = {}
+        self.pending: List[Any] = []
+        self.pending_since = time.monotonic()
+
+
+class LiveFeed:
+    """Fan-out of live samples and events to per-session subscribers"""
+
+    def __init__(self, sample_rate: float = IMU_SAMPLE_RATE_HZ,
+                 flush_interval: float = LIVE_FEED_FLUSH_INTERVAL_S,
+                 max_pending: int = LIVE_FEED_MAX_PENDING):
+        """Initialize the feed.
+
+        Args:
+            sample_rate: Rate samples are published at (Hz)
+            flush_interval: Samples are pushed in batches this long (s)
+            max_pending: Messages queued per subscriber
+        """
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._sessions: Dict[str, _SessionFeed] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, session_id: str, mode: str = "full", rate: Optional[float] = None,
+                  notify: Optional[Callable[[], None]] = None) -> Subscription:
+        """Follow a session's samples and events.
+
+        Args:
+            session_id: Session to follow
+            mode: One of ``MODES``
+            rate: Sample rate wanted by ``decimate`` and ``minmax`` (Hz)
+            notify: See ``Subscription``
+
+        Returns:
+            The subscription (pass it to ``unsubscribe`` when done)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown live feed mode: {mode}")
+        if rate is not None and rate <= 0:
+            raise ValueError(f"Live feed rate must be positive: {rate}")
+        if mode == "full":
+            rate, step = self.sample_rate, 1
+        else:
+            rate = rate or LIVE_FEED_DEFAULT_RATE_HZ
+            step = max(1, int(round(self.sample_rate / rate)))
+
+        subscription = Subscription(session_id, mode, rate, step, self.max_pending, notify)
+        with self._lock:
+            feed = self._sessions.setdefault(session_id, _SessionFeed())
+            tier = feed.tiers.setdefault((mode, step), _Tier(mode, step))
+            tier.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscription"""
+        with self._lock:
+            feed = self._sessions.get(subscription.session_id)
+            if feed is None:
+                return
+            key = (subscription.mode, subscription.step)
+            tier = feed.tiers.get(key)
+            if tier is not None and subscription in tier.subscribers:
+                tier.subscribers.remove(subscription)
+                if not tier.subscribers:
+                    del feed.tiers[key]
+            if not feed.tiers:
+                del self._sessions[subscription.session_id]
+
+    def subscriber_count(self) -> int:
+        """Subscribers of every session"""
+        with self._lock:
+            return sum(len(tier.subscribers) for feed in self._sessions.values() for tier in feed.tiers.values())
+
+    def has_subscribers(self, session_id: str) -> bool:
+        """Whether anyone follows the session"""
+        return session_id in self._sessions
+
+    def publish_samples(self, session_id: str, rows):
+        """Publish samples of a session.
+
+        Args:
+            session_id: Session the samples belong to
+            rows: (N, ``ROW_FIELDS``) rows, or one row as a sequence, with
+                epoch seconds in column 0
+        """
+        feed = self._sessions.get(session_id)
+        if feed is None:
+            return
+        with self._lock:
+            feed.pending.append(rows)
+            if time.monotonic() - feed.pending_since >= self.flush_interval:
+                self._flush(feed)
+
+    def publish_imu(self, session_id: str, imu_data: IMUData):
+        """Publish one streamed sample"""
+        if session_id not in self._sessions:
+            return
+        self.publish_samples(session_id, (
+            imu_data.timestamp.timestamp(), imu_data.ax, imu_data.ay, imu_data.az,
+            imu_data.gx, imu_data.gy, imu_data.gz, imu_data.mx, imu_data.my, imu_data.mz,
+            imu_data.qw, imu_data.qx, imu_data.qy, imu_data.qz))
+
+    def publish_event(self, session_id: str, event_type: str, data: Optional[Dict[str, Any]] = None):
+        """Publish an event (impact, swing, metrics) to every subscriber of a session.
+
+        Samples still batched are pushed first, so the event follows them.
+        """
+        feed = self._sessions.get(session_id)
+        if feed is None:
+            return
+        message = json.dumps({"type": event_type, **(data or {})}, default=str)
+        with self._lock:
+            self._flush(feed)
+            for tier in feed.tiers.values():
+                for subscription in tier.subscribers:
+                    subscription.put(message)
+
+    def _flush(self, feed: _SessionFeed):
+        """Encode pending samples once per tier and queue them (lock held)"""
+        feed.pending_since = time.monotonic()
+        if not feed.pending:
+            return
+        rows = np.vstack(feed.pending).astype(np.float64, copy=False)
+        feed.pending = []
+        for tier in feed.tiers.values():
+            message = tier.encode(rows)
+            if message is None:
+                continue
+            for subscription in tier.subscribers:
+                subscription.put(message)
+
+    def status(self) -> Dict[str, Any]:
+        """Subscribers per session and tier"""
+        with self._lock:
+            return {
+                session_id: {
+                    f"{mode}@{self.sample_rate / step:g}Hz": {
+                        "subscribers": len(tier.subscribers),
+                        "queued": sum(len(s) for s in tier.subscribers),
+                    }
+                    for (mode, step), tier in feed.tiers.items()
+                }
+                for session_id, feed in self._sessions.items()
+            }
+
+
+LIVE_FEED = LiveFeed()
+TELEMETRY.gauge("golfimu_live_subscribers", "Live feed subscribers").set_function(LIVE_FEED.subscriber_count)
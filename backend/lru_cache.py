@@ -0,0 +1,135 @@
+"""
+Byte-bounded LRU cache for GolfIMU backend
+
+Holds decoded Redis values (session configs, stored swings) so repeated
+reads skip the round trip and the JSON decoding. The cache is bounded by
+the summed size of its entries, as estimated by the caller, and evicts
+the least recently used entries first. Entries may carry a time to live
+for values another process may change behind the cache's back.
+
+Thread safe: one cache is shared by the REPL, the runner threads and the
+API of a backend.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .telemetry import TELEMETRY
+
+CACHE_HITS = TELEMETRY.counter("golfimu_cache_hits_total", "Cache lookups answered from memory",
+                               labels=("cache",))
+CACHE_MISSES = TELEMETRY.counter("golfimu_cache_misses_total", "Cache lookups that went to Redis",
+                                 labels=("cache",))
+CACHE_EVICTIONS = TELEMETRY.counter("golfimu_cache_evictions_total", "Entries evicted to stay in the byte budget",
+                                    labels=("cache",))
+CACHE_BYTES = TELEMETRY.gauge("golfimu_cache_bytes", "Estimated bytes held by caches", labels=("cache",))
+
+
+class ByteLRUCache:
+    """LRU cache bounded by the estimated bytes of its entries"""
+
+    def __init__(self, max_bytes: int, name: str = "cache"):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Budget for the summed entry sizes (0 disables the cache)
+            name: Label of the cache's metrics
+        """
+        self.max_bytes = max_bytes
+        self.name = name
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (value, size, expiry on the monotonic clock or None)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = CACHE_HITS.labels(name)
+        self._misses = CACHE_MISSES.labels(name)
+        self._evicted = CACHE_EVICTIONS.labels(name)
+        self._bytes = CACHE_BYTES.labels(name)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value of ``key``, or None (counted as a miss)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                self._misses.inc()
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self._hits.inc()
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int, ttl: Optional[float] = None):
+        """Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value (treated as immutable by readers)
+            size: Estimated bytes of the value
+            ttl: Seconds the value stays valid (None: until evicted or invalidated)
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            expiry = None if ttl is None else time.monotonic() + ttl
+            self._entries[key] = (value, size, expiry)
+            self.bytes += size
+            self._bytes.inc(size)
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+                self._evicted.inc()
+
+    def invalidate(self, key: Hashable):
+        """Drop ``key`` if cached"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every key ``predicate`` accepts.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self):
+        """Drop every entry"""
+        self.invalidate_where(lambda key: True)
+
+    def _remove(self, key: Hashable):
+        """Remove an entry (lock held)"""
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
+        self._bytes.dec(size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries, bytes, hits, misses, evictions and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
@@ -2,18 +2,47 @@
 Main GolfIMU backend application
 """
 import time
+import queue
 import signal
 import sys
+import threading
 import json
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import os
 
 from .config import settings
+from .ingest_supervisor import IngestSupervisor, ingest_workers
 from .redis_manager import RedisManager
+from .runtime_profiler import PROFILER
+from .sensor_hub import SensorHub
 from .serial_manager import SerialManager
 from .session_manager import SessionManager
-from .models import IMUData, SessionConfig, SwingData
+from .models import IMUData, ProcessedMetrics, SessionConfig, SwingData
+from .analytics_pipeline import AnalyticsPipeline, calibrated_input_hash
+from .latency_trace import LATENCY_TRACER
+from .live_feed import LIVE_FEED
+from .redis_spool import ResilientRedis
+from .retention import RetentionManager
+from .session_cleanup import SessionPurger
+from .session_replay import SessionReplay
+from .structured_log import configure_logging, get_logger, shutdown_logging
+from .swing_segmenter import SwingSegmenter
+from .telemetry import TELEMETRY, start_http_server
+from .swing_quality import QUALITY_SCORES
+
+# Import analytics constants
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    API_HOST, API_PORT, CALIBRATION_SAMPLE_COUNT, EMULATOR_FRAME_FORMAT, REPLAY_SPEED, RETENTION_INTERVAL_S,
+    SEGMENT_MAX_PENDING_SWINGS, TELEMETRY_HTTP_HOST, TELEMETRY_HTTP_PORT
+)
+
+QUEUE_DEPTH = TELEMETRY.gauge("golfimu_queue_depth", "Items waiting in each backend queue", labels=("queue",))
+SERIAL_INPUT_WAITING = TELEMETRY.gauge("golfimu_serial_input_waiting_bytes",
+                                       "Bytes received by the OS but not yet read from the serial port")
+
+logger = get_logger("backend")
 
 
 class GolfIMUBackend:
@@ -24,7 +53,24 @@ class GolfIMUBackend:
         self.redis_manager = RedisManager()
         self.serial_manager = SerialManager()
         self.session_manager = SessionManager(self.redis_manager)
+        self.analytics_pipeline = AnalyticsPipeline()
+        self.swing_segmenter: Optional[SwingSegmenter] = None
+        self.sensor_hub = SensorHub(self.redis_manager, self.analytics_pipeline)
+        self.telemetry_server = None
+        self.api_server = None
+        self.session_purger = SessionPurger(self.redis_manager)
+        self.retention = RetentionManager(self.redis_manager, active_sessions=self._active_session_ids)
         self.running = False
+        # Swings segmented from the stream, stored and analyzed off the read loop
+        self._swing_queue: "queue.Queue[SwingData]" = queue.Queue(maxsize=SEGMENT_MAX_PENDING_SWINGS)
+        self._swing_thread: Optional[threading.Thread] = None
+        self._swing_lock = threading.Lock()
+        
+        # Queue depths are read when telemetry is collected
+        QUEUE_DEPTH.labels("imu_disk_buffer").set_function(lambda: len(self.redis_manager._imu_buffer))
+        QUEUE_DEPTH.labels("analytics").set_function(lambda: self.analytics_pipeline.queue_depth)
+        QUEUE_DEPTH.labels("segmented_swings").set_function(lambda: self._swing_queue.qsize())
+        SERIAL_INPUT_WAITING.set_function(self._serial_input_waiting)
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -175,6 +221,7 @@ class GolfIMUBackend:
         
         try:
             while self.running:
+                PROFILER.checkpoint()
                 swing_data = self.wait_for_swing_data()
                 if swing_data:
                     # Process swing data (placeholder for analyzer functions)
@@ -192,21 +239,432 @@ class GolfIMUBackend:
             self.stop_swing_monitoring()
     
     def _process_swing_data(self, swing_data: SwingData):
-        """Process swing data (placeholder for analysis functions).
+        """Process swing data and store the resulting metrics.
         
         :param swing_data: Swing data to process
         """
-        # TODO: Implement swing analysis
         print(f"Processing swing: {swing_data.swing_id}")
         print(f"  Duration: {swing_data.swing_duration:.2f}s")
         print(f"  Impact g-force: {swing_data.impact_g_force:.1f}g")
         print(f"  Data points: {len(swing_data.imu_data_points)}")
+        
+        current_session = self.session_manager.get_current_session()
+        if not current_session:
+            return
+        
+        try:
+            processed = self.analytics_pipeline.run(swing_data, current_session)
+        except Exception as e:
+            print(f"Error analyzing swing {swing_data.swing_id}: {e}")
+            return
+        LATENCY_TRACER.mark(swing_data.swing_id, "analytics")
+        
+        metrics = processed.metrics
+        print(f"  Club head speed: {metrics['club_head_speed']:.1f} m/s")
+        print(f"  Attack angle: {metrics['attack_angle']:+.1f}°")
+        print(f"  Club path: {metrics['club_path']:+.1f}°")
+        print(f"  Face angle: {metrics['face_angle']:+.1f}°")
+        if metrics["smoothness"] is not None:
+            print(f"  Smoothness: {metrics['smoothness']:.2f}")
+        if metrics["contact_quality"] is not None:
+            print(f"  Contact quality: {metrics['contact_quality']:.2f}")
+        
+        self.redis_manager.store_processed_metrics(processed, current_session, {
+            name: metrics[name] for name in QUALITY_SCORES if metrics.get(name) is not None
+        }, swing_start_time=swing_data.swing_start_time)
+    
+    def start_stream_monitoring(self):
+        """Monitor the raw IMU stream and segment swings on the host.
+        
+        Every sample goes through impact detection and the Redis IMU buffer;
+        swings cut out around each impact are stored and analyzed on a
+        background thread, so the stream keeps being read meanwhile.
+        """
+        current_session = self.session_manager.get_current_session()
+        if not current_session:
+            print("No active session. Please start a session first.")
+            return
+        
+        if not self.serial_manager.is_connected:
+            print("Arduino not connected. Please connect first.")
+            return
+        
+        print("Starting stream monitoring...")
+        self.running = True
+        
+        try:
+            for imu_data in self.serial_manager.imu_data_stream():
+                PROFILER.checkpoint()
+                self._detect_impact(imu_data)
+                self.redis_manager.store_imu_data(imu_data, current_session)
+                LIVE_FEED.publish_imu(current_session.session_id, imu_data)
+                swing_data = self._segment_sample(imu_data, current_session)
+                if swing_data:
+                    self._handle_segmented_swing(swing_data)
+                if not self.running:
+                    break
+        except KeyboardInterrupt:
+            print("\nStream monitoring stopped by user")
+        except Exception as e:
+            print(f"Error during stream monitoring: {e}")
+        finally:
+            self.running = False
+            self.wait_for_swings()
+    
+    def start_multiprocess_monitoring(self, frame_format: str = EMULATOR_FRAME_FORMAT) -> Optional[dict]:
+        """Monitor the raw IMU stream with dedicated ingest, persistence and analytics processes.
+        
+        The processes share decoded samples through a shared-memory ring and
+        are restarted if they crash. The serial port is handed over to the
+        ingest process for the duration.
+        
+        :param frame_format: "json" or "binary" frames on the serial port
+        :return: Final supervisor status, None if monitoring could not start
+        """
+        current_session = self.session_manager.get_current_session()
+        if not current_session:
+            print("No active session. Please start a session first.")
+            return None
+        
+        if not self.serial_manager.is_connected:
+            print("Arduino not connected. Please connect first.")
+            return None
+        
+        port = self.serial_manager.serial_connection.port
+        self.serial_manager.disconnect()
+        supervisor = IngestSupervisor(ingest_workers(port, settings.serial_baudrate, frame_format, current_session))
+        
+        print(f"Starting multi-process monitoring on {port} ({frame_format} frames)...")
+        self.running = True
+        status = None
+        try:
+            supervisor.start()
+            supervisor.run(lambda: self.running)
+        except KeyboardInterrupt:
+            print("\nMulti-process monitoring stopped by user")
+        finally:
+            status = supervisor.status()
+            supervisor.stop()
+            self.running = False
+        return status
+    
+    def add_sensor(self, port: str, user_id: str, club_id: str, club_length: float, club_mass: float,
+                   frame_format: str = EMULATOR_FRAME_FORMAT) -> Optional[SessionConfig]:
+        """Add a sensor to the multi-sensor hub, bound to a new session of its own.
+        
+        :param port: Serial port of the sensor (also its name)
+        :param user_id: User swinging the club
+        :param club_id: Club identifier
+        :param club_length: Club length in meters
+        :param club_mass: Club mass in kg
+        :param frame_format: "json" or "binary" frames on the port
+        :return: The sensor's session, None if it could not be added
+        """
+        session_config = SessionConfig(user_id=user_id, club_id=club_id,
+                                       club_length=club_length, club_mass=club_mass)
+        if not self.redis_manager.store_session_config(session_config):
+            print(f"Failed to create a session for sensor {port}")
+            return None
+        if not self.sensor_hub.add_sensor(port, port, session_config, frame_format, settings.serial_baudrate):
+            print(f"Failed to add sensor {port}")
+            return None
+        print(f"Sensor {port} added: session {session_config.session_id} ({user_id}, {club_id})")
+        return session_config
+    
+    def start_hub_monitoring(self) -> Optional[dict]:
+        """Monitor every added sensor concurrently until stopped.
+        
+        :return: Final hub status, None if no sensors were added
+        """
+        if not self.sensor_hub.sensors:
+            print("No sensors added. Use add_sensor first.")
+            return None
+        
+        print(f"Starting hub monitoring of {len(self.sensor_hub.sensors)} sensors...")
+        self.running = True
+        status = None
+        try:
+            self.sensor_hub.start()
+            while self.running:
+                time.sleep(0.1)
+        except KeyboardInterrupt:
+            print("\nHub monitoring stopped by user")
+        finally:
+            status = self.sensor_hub.status()
+            self.sensor_hub.stop()
+            self.running = False
+        return status
+    
+    def _segment_sample(self, imu_data: IMUData, session_config: SessionConfig) -> Optional[SwingData]:
+        """Feed one streamed sample to the session's swing segmenter.
+        
+        :param imu_data: Streamed IMU sample
+        :param session_config: Current session
+        :return: Swing completed by this sample, if any
+        """
+        if self.swing_segmenter is None or self.swing_segmenter.session_config is not session_config:
+            self.swing_segmenter = SwingSegmenter(session_config)
+        return self.swing_segmenter.add(imu_data)
+    
+    def _handle_segmented_swing(self, swing_data: SwingData):
+        """Queue a swing cut out of the sample stream to be stored and analyzed.
+        
+        Only waits, pausing the stream read, while ``SEGMENT_MAX_PENDING_SWINGS``
+        swings are already queued. The worker starts on first use.
+        
+        :param swing_data: Segmented swing
+        """
+        self._swing_queue.put(swing_data)
+        with self._swing_lock:
+            if self._swing_thread is None:
+                self._swing_thread = threading.Thread(target=self._swing_worker, name="swing-analytics",
+                                                      daemon=True)
+                self._swing_thread.start()
+    
+    def _swing_worker(self):
+        """Store and analyze queued swings, exiting once the queue stays empty for a second"""
+        while True:
+            try:
+                swing_data = self._swing_queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._swing_lock:
+                    if self._swing_queue.empty():
+                        self._swing_thread = None
+                        return
+                continue
+            try:
+                if self.session_manager.store_swing_data(swing_data):
+                    self._process_swing_data(swing_data)
+                else:
+                    print(f"Failed to store swing {swing_data.swing_id}")
+            except Exception as e:
+                print(f"Error handling swing {swing_data.swing_id}: {e}")
+            finally:
+                self._swing_queue.task_done()
+    
+    def wait_for_swings(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued segmented swing is stored and analyzed.
+        
+        :param timeout: Longest wait in seconds (None waits for as long as it takes)
+        :return: True if the queue drained within ``timeout``
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._swing_queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+    
+    def start_profiling(self, mode: str = "sampling") -> bool:
+        """Start profiling the running backend.
+        
+        :param mode: "sampling" (stack samples of every thread) or "cprofile"
+            (deterministic, ingest and analytics threads)
+        :return: True if started, False otherwise
+        """
+        if not PROFILER.start(mode):
+            return False
+        print(f"Profiling started ({mode}); 'profile stop' writes the report")
+        return True
+    
+    def stop_profiling(self) -> Optional[dict]:
+        """Stop profiling and write the report to ``PROFILE_OUTPUT_DIR``.
+        
+        :return: Paths of the written files by kind, None if not profiling
+        """
+        paths = PROFILER.stop()
+        if paths:
+            for kind, path in paths.items():
+                print(f"  {kind}: {path}")
+        return paths
+    
+    def purge_sessions(self, session_ids: List[str]) -> int:
+        """Delete sessions in the background with SCAN/UNLINK.
+        
+        The active session is never purged.
+        
+        :param session_ids: Sessions to delete, or ["all"] for every stored session
+        :return: Number of sessions queued
+        """
+        if session_ids == ["all"]:
+            session_ids = self.redis_manager.list_session_ids()
+        current_session = self.session_manager.get_current_session()
+        if current_session is not None:
+            session_ids = [s for s in session_ids if s != current_session.session_id]
+        queued = self.session_purger.purge(session_ids)
+        print(f"Purging {queued} session(s) in the background")
+        return queued
+    
+    def rebuild_query_indexes(self) -> int:
+        """Add the swings of every stored session to the user, club and metric indexes.
+        
+        Sessions stored before the indexes existed become searchable by swing queries.
+        
+        :return: Number of swings indexed
+        """
+        indexed = sum(self.redis_manager.rebuild_query_indexes(session_id)
+                      for session_id in self.redis_manager.list_session_ids())
+        print(f"Indexed {indexed} swing(s) for cross-session queries")
+        return indexed
+    
+    def rebuild_rollups(self, user_id: str, club_id: str) -> int:
+        """Recompute a user's day and week trend rollups of a club from the stored metrics.
+        
+        :param user_id: User
+        :param club_id: Club
+        :return: Number of swings counted
+        """
+        counted = self.redis_manager.rebuild_rollups(user_id, club_id)
+        print(f"Rebuilt rollups of {user_id}/{club_id} from {counted} swing(s)")
+        return counted
+    
+    def get_trend(self, user_id: str, club_id: str, metric: str, period: str = "week") -> list:
+        """Get a user's trend of one metric with a club.
+        
+        :param user_id: User
+        :param club_id: Club
+        :param metric: Metric with rollups (see ROLLUP_METRICS)
+        :param period: "day" or "week"
+        :return: Per bucket its first day, count, mean, std and percentiles
+        """
+        return self.redis_manager.get_rollup_trend(user_id, club_id, metric, period)
+    
+    def memory_snapshot(self) -> str:
+        """Write the top allocation sites (and growth since the last snapshot).
+        
+        :return: Path of the written report
+        """
+        path = PROFILER.memory_snapshot()
+        print(f"Memory snapshot written to {path}")
+        return path
+    
+    def get_latency_report(self) -> dict:
+        """Get the impact-to-metrics latency breakdown of recent swings.
+        
+        :return: Per-stage latency since impact and per-step latency
+        """
+        return LATENCY_TRACER.report()
+    
+    def calibrate_face_normal(self, sample_count: int = CALIBRATION_SAMPLE_COUNT) -> Optional[list]:
+        """Calibrate the club face normal from the address position.
+        
+        Hold the club square to the target at address while samples are read.
+        
+        :param sample_count: Number of IMU samples to average
+        :return: Calibrated face normal, or None on failure
+        """
+        if not self.session_manager.get_current_session():
+            print("No active session. Please start a session first.")
+            return None
+        
+        if not self.serial_manager.is_connected:
+            print("Arduino not connected. Please connect first.")
+            return None
+        
+        print(f"Hold the club at address... capturing {sample_count} samples")
+        address_points = []
+        misses = 0
+        while len(address_points) < sample_count and misses < sample_count:
+            imu_data = self.serial_manager.read_imu_data()
+            if imu_data is not None:
+                address_points.append(imu_data)
+            else:
+                misses += 1
+        
+        return self.session_manager.calibrate_face_normal(address_points)
+    
+    def _serial_input_waiting(self) -> int:
+        """Bytes waiting in the serial port's OS input buffer"""
+        connection = self.serial_manager.serial_connection
+        if not self.serial_manager.is_connected or connection is None:
+            return 0
+        return connection.in_waiting
+    
+    def _active_session_ids(self) -> List[str]:
+        """Sessions being recorded: the current one and those of hub sensors"""
+        session_ids = [channel.session_config.session_id for channel in list(self.sensor_hub.sensors.values())]
+        current_session = self.session_manager.get_current_session()
+        if current_session is not None:
+            session_ids.append(current_session.session_id)
+        return session_ids
+    
+    def run_retention(self) -> dict:
+        """Run a retention pass now (demote swings to disk by age, count and size).
+        
+        :return: Report of the pass
+        """
+        report = self.retention.run_once()
+        print(f"Retention: {report['demoted_swings']} swings of {len(report['demoted_sessions'])} sessions "
+              f"and {report['demoted_fields']} summaries, previews and metrics demoted, "
+              f"{report['hot_bytes'] / 1e6:.1f} MB of sessions and indexes in Redis")
+        return report
+    
+    def start_telemetry_server(self, port: int = TELEMETRY_HTTP_PORT) -> bool:
+        """Serve telemetry as Prometheus text on ``http://TELEMETRY_HTTP_HOST:<port>/metrics``.
+        
+        :param port: Port to listen on
+        :return: True if the server is running, False otherwise
+        """
+        if self.telemetry_server is not None:
+            return True
+        try:
+            self.telemetry_server = start_http_server(TELEMETRY, TELEMETRY_HTTP_HOST, port)
+        except OSError as e:
+            print(f"Failed to start telemetry server on port {port}: {e}")
+            return False
+        host, port = self.telemetry_server.server_address[:2]
+        print(f"Telemetry at http://{host}:{port}/metrics")
+        return True
+    
+    def start_api_server(self, port: int = API_PORT) -> bool:
+        """Serve the HTTP API, including the live feed, on ``http://API_HOST:<port>``.
+        
+        The API runs in this process so its live feed sees the samples
+        ingested here.
+        
+        :param port: Port to listen on
+        :return: True if the server is running, False otherwise
+        """
+        if self.api_server is not None:
+            return True
+        import uvicorn
+        from .api import create_app
+        
+        server = uvicorn.Server(uvicorn.Config(create_app(self.redis_manager), host=API_HOST, port=port,
+                                               log_level="warning"))
+        thread = threading.Thread(target=server.run, name="api-server", daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5.0
+        while not server.started and thread.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if not server.started:
+            server.should_exit = True
+            print(f"Failed to start API server on port {port}")
+            return False
+        self.api_server = (server, thread)
+        print(f"API at http://{API_HOST}:{port} (live feed: ws://{API_HOST}:{port}/sessions/<id>/live)")
+        return True
     
     def stop(self):
         """Stop the backend"""
         self.running = False
         self.stop_swing_monitoring()
         self.disconnect_arduino()
+        self.wait_for_swings(timeout=5.0)
+        self.analytics_pipeline.shutdown()
+        if PROFILER.active:
+            self.stop_profiling()
+        if self.telemetry_server is not None:
+            self.telemetry_server.shutdown()
+            self.telemetry_server.server_close()
+            self.telemetry_server = None
+        if self.api_server is not None:
+            server, thread = self.api_server
+            server.should_exit = True
+            thread.join(timeout=5)
+            self.api_server = None
+        self.session_purger.stop()
+        self.retention.stop()
         print("GolfIMU backend stopped")
     
     def get_status(self) -> dict:
@@ -225,7 +683,13 @@ class GolfIMUBackend:
             "user_id": current_session.user_id if current_session else None,
             "club_id": current_session.club_id if current_session else None,
             "monitoring_running": self.running,
-            "data_collection_running": self.running
+            "data_collection_running": self.running,
+            "cache": self.redis_manager.cache.stats(),
+            "cleanup": self.session_purger.status(),
+            "retention": self.retention.status(),
+            "spool": (self.redis_manager.redis_client.status()
+                      if isinstance(self.redis_manager.redis_client, ResilientRedis) else None),
+            "telemetry": TELEMETRY.snapshot()
         }
     
     def get_session_summary(self) -> dict:
@@ -245,27 +709,62 @@ class GolfIMUBackend:
     def get_recent_swings(self, count: int = 5) -> list:
         """Get recent swings for current session.
         
+        Summaries and previews are read from the swing index without
+        touching the samples. Metrics come from the metrics cache in one
+        round trip; only swings without metrics of the current analyzer
+        version and inputs (samples hash from the summary, current
+        calibration) are loaded and analyzed.
+        
         :param count: Number of recent swings to retrieve
-        :return: List of recent swing data
+        :return: List of recent swing summaries with their previews and metrics
         """
-        swings = self.session_manager.get_swing_data(count=count)
+        current_session = self.session_manager.get_current_session()
+        if not current_session:
+            return []
+        
+        pages, _ = self.redis_manager.get_swing_page(current_session.session_id, limit=count, previews=True)
+        summaries = [json.loads(page) for page in pages]
+        swing_ids = [summary["swing_id"] for summary in summaries]
+        metrics = self.redis_manager.get_processed_metrics_bulk(current_session, swing_ids)
+        stale = {summary["swing_id"] for summary in summaries if not self._metrics_current(
+            metrics.get(summary["swing_id"]), summary.get("samples_hash"), current_session)}
+        if stale:
+            swings = [swing for swing in self.session_manager.get_swing_data(count=count) if swing.swing_id in stale]
+            computed = self.redis_manager.get_or_compute_metrics(current_session, swings, self.analytics_pipeline)
+            metrics.update({swing.swing_id: result for swing, result in zip(swings, computed) if result})
+        
         return [
             {
-                "swing_id": swing.swing_id,
-                "duration": swing.swing_duration,
-                "impact_g_force": swing.impact_g_force,
-                "swing_type": swing.swing_type,
-                "data_points": len(swing.imu_data_points),
-                "start_time": swing.swing_start_time.isoformat(),
-                "end_time": swing.swing_end_time.isoformat()
+                "swing_id": summary["swing_id"],
+                "duration": summary["swing_duration"],
+                "impact_g_force": summary["impact_g_force"],
+                "swing_type": summary["swing_type"],
+                "data_points": summary["samples"],
+                "start_time": summary["swing_start_time"],
+                "end_time": summary["swing_end_time"],
+                "preview": summary["preview"],
+                "metrics": metrics[summary["swing_id"]].metrics if summary["swing_id"] in metrics else None
             }
-            for swing in swings
+            for summary in summaries
         ]
 
 
 
 
 
+    def _metrics_current(self, metrics: Optional[ProcessedMetrics], samples_hash: Optional[str],
+                         session_config: SessionConfig) -> bool:
+        """Whether cached metrics were produced by this analyzer version from the swing's current inputs.
+        
+        :param metrics: Cached metrics of the swing, if any
+        :param samples_hash: Samples digest from the swing's summary (None for swings stored without one)
+        :param session_config: Session with its current calibration
+        :return: True if the metrics need not be recomputed
+        """
+        return (metrics is not None and samples_hash is not None
+                and metrics.analyzer_version == self.analytics_pipeline.version
+                and metrics.input_hash == calibrated_input_hash(samples_hash, session_config))
+    
     def _detect_impact(self, imu_data: IMUData):
         """Detect impact based on acceleration threshold.
         
@@ -291,7 +790,67 @@ class GolfIMUBackend:
                 "timestamp": imu_data.timestamp.isoformat(),
                 "accel_magnitude": accel_magnitude
             })
-            print(f"Impact detected! G-force: {g_force:.1f}g")
+            # Called per sample, so through the rate-limited logger rather than the terminal
+            logger.info("Impact detected! G-force: %.1fg", g_force)
+
+    def replay_session(self, path: str, speed: float = REPLAY_SPEED) -> dict:
+        """Replay a recorded session through the live sample path.
+
+        Samples go through impact detection, the Redis IMU buffer and swing
+        segmentation exactly as streamed device data would. Segmented swings
+        are analyzed in the background; the replay waits for them before
+        reporting.
+
+        :param path: ``imu_{session}.jsonl`` file or C reader capture
+        :param speed: Playback speed multiplier (0 = as fast as possible)
+        :return: Replay report (achieved vs target rate, per-stage lag)
+        """
+        current_session = self.session_manager.get_current_session()
+        if not current_session:
+            print("No active session. Please start a session first.")
+            return {}
+
+        try:
+            replay = SessionReplay(path, speed)
+        except (OSError, ValueError) as e:
+            print(f"Error loading recording: {e}")
+            return {}
+
+        print(f"Replaying {len(replay)} samples from {path} "
+              f"({replay.recorded_rate:.0f} Hz, {'max' if not speed else f'{speed:g}x'} speed)...")
+        self.running = True
+
+        try:
+            for imu_data in replay.imu_data_stream():
+                PROFILER.checkpoint()
+                with replay.stage("impact"):
+                    self._detect_impact(imu_data)
+                with replay.stage("store"):
+                    self.redis_manager.store_imu_data(imu_data, current_session)
+                    LIVE_FEED.publish_imu(current_session.session_id, imu_data)
+                with replay.stage("segment"):
+                    swing_data = self._segment_sample(imu_data, current_session)
+                if swing_data:
+                    with replay.stage("swing"):
+                        self._handle_segmented_swing(swing_data)
+                if not self.running:
+                    replay.stop()
+        except KeyboardInterrupt:
+            print("\nReplay stopped by user")
+        finally:
+            self.running = False
+            self.wait_for_swings()
+
+        report = replay.report()
+        target = f"{report['target_rate']:.0f} Hz" if report["target_rate"] else "max"
+        print(f"Replayed {report['samples']} samples in {report['elapsed']:.2f}s: "
+              f"{report['achieved_rate']:.0f} Hz achieved / {target} target")
+        print(f"  Schedule lag: p50 {report['schedule_lag']['p50_ms']:.2f} ms, "
+              f"p95 {report['schedule_lag']['p95_ms']:.2f} ms")
+        for name, stage in report["stages"].items():
+            print(f"  {name}: {stage['time']['p50_ms']:.3f} ms/sample, "
+                  f"lag p95 {stage['lag']['p95_ms']:.2f} ms")
+        return report
 
     def start_data_collection_c(self):
         """Start data collection using C program for maximum speed."""
@@ -444,9 +1003,16 @@ class GolfIMUBackend:
 
 def main():
     """Main entry point"""
+    configure_logging()
     print("GolfIMU Backend Starting...")
     
     backend = GolfIMUBackend()
+    if TELEMETRY_HTTP_PORT:
+        backend.start_telemetry_server()
+    if RETENTION_INTERVAL_S:
+        backend.retention.start()
+    # Writes spooled by a backend that died before Redis came back
+    backend.redis_manager.redis_client.adopt_orphans()
     
     # Example usage - you can modify this or create a proper CLI interface
     print("\nGolfIMU Backend Ready!")
@@ -454,14 +1020,28 @@ def main():
     print("  start_session <user_id> <club_id> <club_length> <club_mass>")
     print("  connect_arduino [port]")
     print("  send_config")
+    print("  calibrate [samples]")
     print("  start_monitoring")
     print("  wait_swing")
     print("  continuous_monitoring")
+    print("  stream_monitoring")
+    print("  multiprocess_monitoring [json|binary]")
+    print("  add_sensor <port> <user_id> <club_id> <club_length> <club_mass> [json|binary]")
+    print("  hub_monitoring")
     print("  start_data_collection_c") # Added new command
+    print("  replay <file> [speed|max]")
     print("  status")
     print("  summary")
     print("  statistics")
     print("  recent_swings [count]")
+    print("  latency")
+    print("  profile start [sampling|cprofile] / profile stop")
+    print("  memsnap")
+    print("  serve_api [port]")
+    print("  purge <session_id...|all>")
+    print("  retention")
+    print("  reindex")
+    print("  trend <user_id> <club_id> <metric> [day|week] [rebuild]")
     print("  quit")
     
     while True:
@@ -493,6 +1073,11 @@ def main():
                 else:
                     print("Failed to send session config")
             
+            elif cmd == "calibrate":
+                sample_count = int(command[1]) if len(command) > 1 else CALIBRATION_SAMPLE_COUNT
+                if backend.calibrate_face_normal(sample_count) is None:
+                    print("Face calibration failed")
+            
             elif cmd == "start_monitoring":
                 if backend.start_swing_monitoring():
                     print("Swing monitoring started on Arduino")
@@ -509,15 +1094,43 @@ def main():
             elif cmd == "continuous_monitoring":
                 backend.start_continuous_monitoring()
             
+            elif cmd == "stream_monitoring":
+                backend.start_stream_monitoring()
+            
+            elif cmd == "multiprocess_monitoring":
+                status = backend.start_multiprocess_monitoring(command[1] if len(command) > 1 else EMULATOR_FRAME_FORMAT)
+                for name, worker in (status or {}).get("workers", {}).items():
+                    print(f"  {name}: restarts={worker['restarts']} lag={worker.get('lag_rows', 0)} "
+                          f"lost={worker.get('lost_rows', 0)}")
+            
+            elif cmd == "add_sensor" and len(command) >= 6:
+                backend.add_sensor(command[1], command[2], command[3], float(command[4]), float(command[5]),
+                                   command[6] if len(command) > 6 else EMULATOR_FRAME_FORMAT)
+            
+            elif cmd == "hub_monitoring":
+                status = backend.start_hub_monitoring()
+                for name, sensor in (status or {}).get("sensors", {}).items():
+                    print(f"  {name}: samples={sensor['samples']} swings={sensor['swings_analyzed']} "
+                          f"pending={sensor['pending_swings']}")
+            
             elif cmd == "start_data_collection_c": # Added new command
                 backend.start_data_collection_c()
             
+            elif cmd == "replay" and len(command) >= 2:
+                speed = command[2] if len(command) > 2 else REPLAY_SPEED
+                backend.replay_session(command[1], 0.0 if speed == "max" else float(speed))
+            
 
             
             elif cmd == "status":
                 status = backend.get_status()
+                telemetry = status.pop("telemetry")
                 for key, value in status.items():
                     print(f"  {key}: {value}")
+                for key, value in telemetry.items():
+                    if isinstance(value, dict):
+                        value = f"count={value['count']} mean={value['mean'] * 1000:.3f} ms"
+                    print(f"  {key}: {value}")
             
             elif cmd == "summary":
                 summary = backend.get_session_summary()
@@ -533,7 +1146,49 @@ def main():
                 count = int(command[1]) if len(command) > 1 else 5
                 swings = backend.get_recent_swings(count)
                 for i, swing in enumerate(swings, 1):
-                    print(f"  Swing {i}: {swing['swing_id'][:8]}... - {swing['duration']:.2f}s - {swing['impact_g_force']:.1f}g")
+                    line = f"  Swing {i}: {swing['swing_id'][:8]}... - {swing['duration']:.2f}s - {swing['impact_g_force']:.1f}g"
+                    if swing['metrics']:
+                        line += f" - {swing['metrics']['club_head_speed']:.1f} m/s"
+                    print(line)
+            
+            elif cmd == "latency":
+                report = backend.get_latency_report()
+                print(f"  Traced swings: {report['swings']}")
+                for stage, latency in report["stages"].items():
+                    since, step = latency["since_impact"], latency["step"]
+                    print(f"  {stage:15s} p50 {since['p50_ms']:8.1f} ms  p95 {since['p95_ms']:8.1f} ms  "
+                          f"p99 {since['p99_ms']:8.1f} ms  (step p50 {step['p50_ms']:.1f} ms)")
+            
+            elif cmd == "profile":
+                if len(command) >= 2 and command[1] == "start":
+                    backend.start_profiling(command[2] if len(command) > 2 else "sampling")
+                elif len(command) >= 2 and command[1] == "stop":
+                    backend.stop_profiling()
+                else:
+                    print("Usage: profile start [sampling|cprofile] | profile stop")
+            
+            elif cmd == "memsnap":
+                backend.memory_snapshot()
+            
+            elif cmd == "serve_api":
+                backend.start_api_server(int(command[1]) if len(command) > 1 else API_PORT)
+            
+            elif cmd == "purge" and len(command) >= 2:
+                backend.purge_sessions(command[1:])
+            
+            elif cmd == "retention":
+                backend.run_retention()
+            
+            elif cmd == "reindex":
+                backend.rebuild_query_indexes()
+            
+            elif cmd == "trend" and len(command) >= 4:
+                if "rebuild" in command[4:]:
+                    backend.rebuild_rollups(command[1], command[2])
+                period = command[4] if len(command) > 4 and command[4] != "rebuild" else "week"
+                for bucket in backend.get_trend(command[1], command[2], command[3], period):
+                    print(f"  {bucket['bucket']}  n={bucket['count']:4d}  mean {bucket['mean']:8.2f}  "
+                          f"std {bucket['std']:6.2f}  p50 {bucket.get('p50', float('nan')):8.2f}")
             
             elif cmd == "quit":
                 backend.stop()
@@ -547,6 +1202,8 @@ def main():
             break
         except Exception as e:
             print(f"Error: {e}")
+    
+    shutdown_logging()
 
 
 if __name__ == "__main__":
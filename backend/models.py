@@ -59,11 +59,13 @@ class SwingEvent(BaseModel):
 
 
 class ProcessedMetrics(BaseModel):
-    """Processed swing metrics (placeholder for future analyzer functions)"""
+    """Processed swing metrics produced by the analytics pipeline"""
     swing_id: str
     session_id: str
     timestamp: datetime = Field(default_factory=datetime.now)
     metrics: Dict[str, Any] = Field(default_factory=dict, description="Calculated metrics")
+    analyzer_version: Optional[str] = Field(None, description="Version of the analyzers that produced the metrics")
+    input_hash: Optional[str] = Field(None, description="Hash of the swing samples and calibration analyzed")
 
 
 class RedisKey(BaseModel):
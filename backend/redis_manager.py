@@ -2,34 +2,145 @@
 Redis manager for GolfIMU backend - High Performance Version
 """
 import json
+import math
 import redis
 import os
 import pickle
 import threading
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
 from datetime import datetime
 
+import numpy as np
+
 from .config import settings
+from .analytics_pipeline import swing_input_hash, swing_samples_hash
+from .imu_batch import IMUBatch
+from .latency_trace import LATENCY_TRACER
+from .live_feed import LIVE_FEED
+from .lru_cache import ByteLRUCache
 from .models import IMUData, SessionConfig, SwingEvent, ProcessedMetrics, RedisKey, SwingData
+from .redis_scripts import INGEST_SWING
+from .redis_spool import ResilientRedis
+from .rollups import (
+    ROLLUP_PERIODS, ROLLUP_STALE_KEY, bucket_fields, bucket_start, bucket_statistics, rollup_increments,
+    rollup_index_key, rollup_key, rollup_stale_member, rollup_values
+)
+from .session_cleanup import CLEANUP_SCANS, scan_keys, session_registry_key, unlink_keys
+from .structured_log import get_logger
+from .swing_preview import build_preview
+from .swing_segments import SwingSegmentStore
+from .telemetry import TELEMETRY
 
 # Import performance constants
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from global_config import IMU_TRIM_INTERVAL, IMU_MAX_BUFFER_SIZE
+from global_config import (
+    IMU_TRIM_INTERVAL, IMU_MAX_BUFFER_SIZE, QUERY_INDEXED_METRICS, REDIS_CACHE_CONFIG_TTL_S, REDIS_CACHE_MAX_BYTES,
+    REDIS_CONNECT_TIMEOUT_S, RETENTION_PROMOTED_TTL_S, ROLLUP_METRICS
+)
+
+logger = get_logger("redis")
+
+# Swings kept with their samples per session (older ones keep summary, preview and metrics)
+SWINGS_KEPT = 100
+# Estimated memory of one decoded IMUData point (about 4x its JSON, measured with tracemalloc)
+DECODED_POINT_BYTES = 1600
+# Keys every session may have under session:{id}: (the IMU buffer key also names user and club)
+SESSION_KEY_NAMES = ("swings", "events", "metrics", "running_stats", "swing_index", "swing_summaries",
+                     "swing_previews", "swing_stats", "promoted")
+# Per-swing hashes of a session that go to the cold tier with its swings when it is demoted whole
+COLD_HASH_NAMES = ("swing_summaries", "swing_previews", "metrics")
+# Swing fields whose min and max are kept per session in session:{id}:swing_stats (and that have metric indexes)
+SWING_RANGE_FIELDS = ("impact_g_force", "swing_duration")
+
+REDIS_ROUND_TRIPS = TELEMETRY.counter("golfimu_redis_round_trips_total", "Redis round trips",
+                                      labels=("operation",))
+REDIS_SECONDS = TELEMETRY.histogram("golfimu_redis_seconds", "Duration of Redis operations",
+                                    labels=("operation",))
+REDIS_ERRORS = TELEMETRY.counter("golfimu_redis_errors_total", "Failed Redis operations",
+                                 labels=("operation",))
+SWINGS_DEMOTED = TELEMETRY.counter("golfimu_swings_demoted_total", "Swings moved from Redis to segment files")
+SWINGS_PROMOTED = TELEMETRY.counter("golfimu_swings_promoted_total", "Cold swings read back from segment files")
+SESSIONS_PROMOTED = TELEMETRY.counter("golfimu_session_hashes_promoted_total",
+                                      "Cold sessions whose summaries, previews and metrics were read back")
+
+
+def _record_redis(operation: str, start: float, round_trips: int = 1):
+    """Count a finished Redis operation and its duration"""
+    REDIS_SECONDS.labels(operation).observe(time.perf_counter() - start)
+    REDIS_ROUND_TRIPS.labels(operation).inc(round_trips)
+
+
+def user_swing_index_key(user_id: str) -> str:
+    """Key of the sorted set of a user's swings, across sessions, scored by start time"""
+    return f"user:{user_id}:swing_index"
+
+
+def club_swing_index_key(club_id: str) -> str:
+    """Key of the sorted set of a club's swings, across sessions, scored by start time"""
+    return f"club:{club_id}:swing_index"
+
+
+def metric_swing_index_key(name: str) -> str:
+    """Key of the sorted set of every swing, across sessions, scored by one metric"""
+    return f"metric:{name}:swing_index"
+
+
+def swing_index_member(session_id: str, swing_id: str) -> str:
+    """Member naming a swing in the user, club and metric indexes"""
+    return f"{session_id}:{swing_id}"
+
+
+def page_cursor(score: float, member: str) -> str:
+    """Cursor of a newest-first page ending at ``member`` (scored ``score``)
+
+    The member is part of the cursor since swings may share a start time:
+    the next page resumes after it among the swings tied with it.
+    """
+    return f"{float(score)!r}:{member}"
+
+
+def parse_page_cursor(cursor: str) -> Tuple[float, str]:
+    """Score and member of a ``page_cursor``
+
+    Raises:
+        ValueError: Not a page cursor
+    """
+    score, separator, member = cursor.partition(":")
+    if not separator or not member:
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return float(score), member
+
+
+def _stored_swing_id(swing_json: str) -> str:
+    """Id of a stored swing document without decoding it (``swing_id`` is serialized first)"""
+    start = len('{"swing_id": "')
+    return swing_json[start:swing_json.index('"', start)]
 
 
 class RedisManager:
     """Manages all Redis operations for GolfIMU with high-performance disk storage"""
     
     def __init__(self):
-        """Initialize Redis connection"""
-        self.redis_client = redis.Redis(
+        """Initialize Redis connection (writes are spooled to disk while Redis is unavailable)"""
+        self.redis_client = ResilientRedis(redis.Redis(
             host=settings.redis_host,
             port=settings.redis_port,
             db=settings.redis_db,
             password=settings.redis_password,
-            decode_responses=True
-        )
+            decode_responses=True,
+            socket_connect_timeout=REDIS_CONNECT_TIMEOUT_S
+        ))
+        
+        # Decoded session configs and swings, shared by every thread using this manager
+        self.cache = ByteLRUCache(REDIS_CACHE_MAX_BYTES, "redis")
+        
+        # Keys this manager already added to their session's key registry
+        self._registered_keys = set()
+        
+        # Cold tier: swings demoted from Redis by the retention manager
+        self.cold_store = SwingSegmentStore()
         
         # Performance optimization: track operations to reduce trimming frequency
         self._imu_operation_count = 0
@@ -52,7 +163,7 @@ class RedisManager:
                 for imu_dict in batch_data:
                     f.write(json.dumps(imu_dict) + '\n')
         except Exception as e:
-            print(f"Error writing IMU data to disk: {e}")
+            logger.error("Error writing IMU data to disk: %s", e)
     
     def _write_imu_batch(self, batch_data):
         """Write IMU batch to disk with optimized buffering"""
@@ -66,8 +177,21 @@ class RedisManager:
                     f.write(json.dumps(imu_dict) + '\n')
                     
         except Exception as e:
-            print(f"Error writing IMU data to disk: {e}")
+            logger.error("Error writing IMU data to disk: %s", e)
     
+    def _register_keys(self, target, session_id: str, *keys: str):
+        """Add keys to the session's key registry the first time this manager writes them
+
+        Args:
+            target: Pipeline to queue the SADD on, or the client
+            session_id: Session the keys belong to
+            keys: Keys being written
+        """
+        new_keys = [key for key in keys if key not in self._registered_keys]
+        if new_keys:
+            target.sadd(session_registry_key(session_id), *new_keys)
+            self._registered_keys.update(new_keys)
+
     def store_imu_data(self, imu_data: IMUData, session_config: SessionConfig) -> bool:
         """Store IMU data in Redis
         
@@ -97,17 +221,86 @@ class RedisManager:
             })
             
             # Store in Redis
+            start = time.perf_counter()
+            self._register_keys(self.redis_client, session_config.session_id, redis_key.to_key())
             self.redis_client.lpush(redis_key.to_key(), imu_json)
             
             # Keep only last 1000 samples
             self.redis_client.ltrim(redis_key.to_key(), 0, 999)
+            _record_redis("store_imu_data", start, 2)
             
             return True
             
         except Exception as e:
-            print(f"Error storing IMU data: {e}")
+            REDIS_ERRORS.labels("store_imu_data").inc()
+            logger.error("Error storing IMU data: %s", e)
             return False
     
+    @staticmethod
+    def _serialize_imu_rows(rows: np.ndarray) -> List[str]:
+        """IMU buffer entries (as ``store_imu_data`` writes them) for (N, 14) sample rows"""
+        return [
+            json.dumps({
+                "ax": row[1], "ay": row[2], "az": row[3],
+                "gx": row[4], "gy": row[5], "gz": row[6],
+                "mx": row[7], "my": row[8], "mz": row[9],
+                "qw": row[10], "qx": row[11], "qy": row[12], "qz": row[13],
+                "timestamp": datetime.fromtimestamp(row[0]).isoformat()
+            })
+            for row in np.asarray(rows)[-1000:].tolist()
+        ]
+
+    def store_imu_entries(self, entries: List[str], session_config: SessionConfig) -> bool:
+        """Push serialized IMU samples to the IMU buffer in one round trip.
+
+        Args:
+            entries: Samples from ``_serialize_imu_rows``, oldest first
+            session_config: Current session configuration
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        return self.store_imu_entries_batch([(entries, session_config)])
+
+    def _queue_imu_entries(self, pipe, entries: List[str], session_config: SessionConfig):
+        """Queue pushing serialized IMU samples to a session's IMU buffer on a pipeline"""
+        key = RedisKey(
+            session_id=session_config.session_id,
+            user_id=session_config.user_id,
+            club_id=session_config.club_id,
+            data_type="imu_buffer"
+        ).to_key()
+        self._register_keys(pipe, session_config.session_id, key)
+        pipe.lpush(key, *entries)
+        # Keep only last 1000 samples
+        pipe.ltrim(key, 0, 999)
+
+    def store_imu_entries_batch(self, batches: List[Tuple[List[str], SessionConfig]]) -> bool:
+        """Push serialized IMU samples of several sessions in one round trip.
+
+        Args:
+            batches: (entries, session) pairs, entries oldest first
+
+        Returns:
+            True if stored successfully, False otherwise
+        """
+        batches = [(entries, session_config) for entries, session_config in batches if entries]
+        if not batches:
+            return True
+        try:
+            start = time.perf_counter()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for entries, session_config in batches:
+                self._queue_imu_entries(pipe, entries, session_config)
+            pipe.execute()
+            _record_redis("store_imu_entries", start)
+            return True
+
+        except Exception as e:
+            REDIS_ERRORS.labels("store_imu_entries").inc()
+            logger.error("Error storing IMU data: %s", e)
+            return False
+
     def get_imu_buffer(self, session_config: SessionConfig, count: Optional[int] = None) -> List[IMUData]:
         """Get IMU data from Redis"""
         try:
@@ -138,55 +331,119 @@ class RedisManager:
                     )
                     imu_data_list.append(imu_data)
                 except Exception as e:
-                    print(f"Error parsing IMU data: {e}")
+                    logger.error("Error parsing IMU data: %s", e)
                     continue
             
             return imu_data_list
             
         except Exception as e:
-            print(f"Error getting IMU buffer: {e}")
+            logger.error("Error getting IMU buffer: %s", e)
             return []
     
+    def _serialize_swing_data(self, swing_data: SwingData) -> str:
+        """Serialize swing data to the JSON stored in Redis"""
+        return json.dumps({
+            "swing_id": swing_data.swing_id,
+            "session_id": swing_data.session_id,
+            "imu_data_points": [{
+                "ax": imu.ax, "ay": imu.ay, "az": imu.az,
+                "gx": imu.gx, "gy": imu.gy, "gz": imu.gz,
+                "mx": imu.mx, "my": imu.my, "mz": imu.mz,
+                "qw": imu.qw, "qx": imu.qx, "qy": imu.qy, "qz": imu.qz,
+                "timestamp": imu.timestamp.isoformat()
+            } for imu in swing_data.imu_data_points],
+            "swing_start_time": swing_data.swing_start_time.isoformat(),
+            "swing_end_time": swing_data.swing_end_time.isoformat(),
+            "swing_duration": swing_data.swing_duration,
+            "impact_g_force": swing_data.impact_g_force,
+            "swing_type": swing_data.swing_type
+        })
+    
+    @staticmethod
+    def _swing_summary(swing_data: SwingData, batch: IMUBatch) -> Dict[str, Any]:
+        """Swing fields without the samples, for listing a session's swings
+
+        ``samples_hash`` lets cached metrics be checked against the current
+        calibration without loading the samples (``calibrated_input_hash``).
+        """
+        return {
+            "swing_id": swing_data.swing_id,
+            "swing_start_time": swing_data.swing_start_time.isoformat(),
+            "swing_end_time": swing_data.swing_end_time.isoformat(),
+            "swing_duration": swing_data.swing_duration,
+            "impact_g_force": swing_data.impact_g_force,
+            "swing_type": swing_data.swing_type,
+            "samples": len(swing_data.imu_data_points),
+            "samples_hash": swing_samples_hash(batch)
+        }
+
+    def _queue_swing_index(self, pipe, session_id: str, summary: Dict[str, Any], batch: IMUBatch):
+        """Queue a swing's index entry (scored by start time), summary and preview on a pipeline"""
+        self._register_keys(pipe, session_id, f"session:{session_id}:swings", f"session:{session_id}:swing_index",
+                            f"session:{session_id}:swing_summaries", f"session:{session_id}:swing_previews")
+        score = datetime.fromisoformat(summary["swing_start_time"]).timestamp()
+        pipe.zadd(f"session:{session_id}:swing_index", {summary["swing_id"]: score})
+        pipe.hset(f"session:{session_id}:swing_summaries", summary["swing_id"], json.dumps(summary))
+        preview = self._swing_preview(summary["swing_id"], batch)
+        if preview:
+            pipe.hset(f"session:{session_id}:swing_previews", summary["swing_id"], preview)
+
+    @staticmethod
+    def _swing_preview(swing_id: str, batch: IMUBatch) -> str:
+        """Preview JSON of a swing ('' if it cannot be built)"""
+        try:
+            return json.dumps(build_preview(batch))
+        except Exception as e:
+            logger.error("Error building preview of swing %s: %s", swing_id, e)
+            return ""
+
     def store_swing_data(self, swing_data: SwingData, session_config: SessionConfig) -> bool:
-        """Store complete swing data in Redis"""
+        """Store complete swing data in Redis
+
+        One script call (``INGEST_SWING``) pushes the samples and trims the
+        list to SWINGS_KEPT, writes the session index, summary and preview,
+        adds the swing to its user, club and metric indexes and updates
+        the session's swing counter and min/max ranges, without other
+        commands in between (a command failing partway keeps the writes
+        before it; see ``redis_scripts``). Swings with a non-finite range
+        field are refused before the script runs, since its score ZADD
+        would fail after the swing was already pushed and indexed.
+        """
+        ranges = {field: float(getattr(swing_data, field)) for field in SWING_RANGE_FIELDS}
+        bad = sorted(field for field, value in ranges.items() if not math.isfinite(value))
+        if bad:
+            logger.error("Not storing swing %s: non-finite %s", swing_data.swing_id, ", ".join(bad))
+            return False
         try:
-            # Create Redis key
-            redis_key = RedisKey(
-                session_id=session_config.session_id,
-                user_id=session_config.user_id,
-                club_id=session_config.club_id,
-                data_type="swing_data"
-            )
-            
-            # Convert to JSON
-            swing_json = json.dumps({
-                "swing_id": swing_data.swing_id,
-                "session_id": swing_data.session_id,
-                "imu_data_points": [{
-                    "ax": imu.ax, "ay": imu.ay, "az": imu.az,
-                    "gx": imu.gx, "gy": imu.gy, "gz": imu.gz,
-                    "mx": imu.mx, "my": imu.my, "mz": imu.mz,
-                    "qw": imu.qw, "qx": imu.qx, "qy": imu.qy, "qz": imu.qz,
-                    "timestamp": imu.timestamp.isoformat()
-                } for imu in swing_data.imu_data_points],
-                "swing_start_time": swing_data.swing_start_time.isoformat(),
-                "swing_end_time": swing_data.swing_end_time.isoformat(),
-                "swing_duration": swing_data.swing_duration,
-                "impact_g_force": swing_data.impact_g_force,
-                "swing_type": swing_data.swing_type
-            })
-            
-            # Store in Redis
-            key = f"session:{session_config.session_id}:swings"
-            self.redis_client.lpush(key, swing_json)
-            
-            # Keep only last 100 swings
-            self.redis_client.ltrim(key, 0, 99)
+            session_id = session_config.session_id
+            swing_json = self._serialize_swing_data(swing_data)
+            batch = IMUBatch.from_swing(swing_data)
+            summary = self._swing_summary(swing_data, batch)
+            score = swing_data.swing_start_time.timestamp()
+
+            keys = [f"session:{session_id}:{name}"
+                    for name in ("swings", "swing_index", "swing_summaries", "swing_previews", "swing_stats")]
+            keys += [user_swing_index_key(session_config.user_id), club_swing_index_key(session_config.club_id),
+                     session_registry_key(session_id)]
+            keys += [metric_swing_index_key(field) for field in SWING_RANGE_FIELDS]
+            args = [swing_data.swing_id, repr(score), swing_json, json.dumps(summary),
+                    self._swing_preview(swing_data.swing_id, batch),
+                    SWINGS_KEPT, swing_index_member(session_id, swing_data.swing_id)]
+            for field, value in ranges.items():
+                args += [field, repr(value)]
+
+            start = time.perf_counter()
+            INGEST_SWING(self.redis_client, keys, args)
+            _record_redis("store_swing_data", start)
+
+            LIVE_FEED.publish_event(session_id, "swing", summary)
             
+            LATENCY_TRACER.mark(swing_data.swing_id, "store")
             return True
             
         except Exception as e:
-            print(f"Error storing swing data: {e}")
+            REDIS_ERRORS.labels("store_swing_data").inc()
+            logger.error("Error storing swing data: %s", e)
             return False
     
     def store_swing_event(self, event: SwingEvent, session_config: SessionConfig) -> bool:
@@ -208,58 +465,761 @@ class RedisManager:
             })
             
             key = f"session:{session_config.session_id}:events"
+            start = time.perf_counter()
+            self._register_keys(self.redis_client, session_config.session_id, key)
             self.redis_client.lpush(key, event_json)
             self.redis_client.ltrim(key, 0, 999)
+            _record_redis("store_swing_event", start, 2)
             
             return True
             
         except Exception as e:
-            print(f"Error storing swing event: {e}")
+            REDIS_ERRORS.labels("store_swing_event").inc()
+            logger.error("Error storing swing event: %s", e)
             return False
     
-    def get_recent_swings(self, session_config: SessionConfig, count: int = 10) -> List[SwingData]:
-        """Get recent swing data from Redis"""
+    def _serialize_processed_metrics(self, metrics: ProcessedMetrics) -> str:
+        """Encode processed metrics for the session metrics hash"""
+        return json.dumps({
+            "swing_id": metrics.swing_id,
+            "session_id": metrics.session_id,
+            "timestamp": metrics.timestamp.isoformat(),
+            "metrics": metrics.metrics,
+            "analyzer_version": metrics.analyzer_version,
+            "input_hash": metrics.input_hash
+        })
+
+    def _parse_processed_metrics(self, metrics_json: str) -> ProcessedMetrics:
+        """Decode processed metrics from the session metrics hash"""
+        metrics_dict = json.loads(metrics_json)
+        return ProcessedMetrics(
+            swing_id=metrics_dict["swing_id"],
+            session_id=metrics_dict["session_id"],
+            timestamp=datetime.fromisoformat(metrics_dict["timestamp"]),
+            metrics=metrics_dict["metrics"],
+            analyzer_version=metrics_dict.get("analyzer_version"),
+            input_hash=metrics_dict.get("input_hash")
+        )
+
+    @staticmethod
+    def _queue_metric_indexes(pipe, session_id: str, metrics: ProcessedMetrics):
+        """Queue a swing's entries in the metric indexes of ``QUERY_INDEXED_METRICS``"""
+        member = swing_index_member(session_id, metrics.swing_id)
+        for name in QUERY_INDEXED_METRICS:
+            value = metrics.metrics.get(name)
+            if isinstance(value, (int, float)):
+                pipe.zadd(metric_swing_index_key(name), {member: float(value)})
+
+    def store_processed_metrics(self, metrics: ProcessedMetrics, session_config: SessionConfig,
+                                running_values: Optional[Dict[str, float]] = None,
+                                swing_start_time: Optional[datetime] = None) -> bool:
+        """Store processed swing metrics in Redis
+
+        Metrics for a session live in one hash keyed by swing id. When
+        ``running_values`` is given they are folded into the session running
+        statistics in the same pipelined round trip. Metrics named in
+        ``QUERY_INDEXED_METRICS`` are added to their metric indexes, and
+        those in ``ROLLUP_METRICS`` to the user's day and week rollups of the
+        club, bucketed by ``swing_start_time`` (the metrics timestamp when
+        not given). Metrics stored before mark the rollups stale instead.
+        """
         try:
-            redis_key = RedisKey(
-                session_id=session_config.session_id,
-                user_id=session_config.user_id,
-                club_id=session_config.club_id,
-                data_type="swing_data"
-            )
-            
-            swing_data_list = []
-            swing_jsons = self.redis_client.lrange(redis_key.to_key(), 0, count - 1)
-            
-            for swing_json in swing_jsons:
+            metrics_json = self._serialize_processed_metrics(metrics)
+            values = rollup_values(metrics.metrics)
+
+            key = f"session:{session_config.session_id}:metrics"
+            start = time.perf_counter()
+            new = values and self._swings_without_metrics(session_config.session_id, [metrics.swing_id])
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._register_keys(pipe, session_config.session_id, key)
+            pipe.hset(key, metrics.swing_id, metrics_json)
+            self._queue_metric_indexes(pipe, session_config.session_id, metrics)
+            if new:
+                self._queue_rollups(pipe, session_config, swing_start_time or metrics.timestamp, values)
+            elif values:
+                self._queue_stale_rollups(pipe, session_config)
+            if running_values:
+                self._queue_running_statistics(pipe, session_config, running_values)
+            pipe.execute()
+            _record_redis("store_processed_metrics", start, 1 + bool(values))
+
+            LATENCY_TRACER.mark(metrics.swing_id, "published")
+            LIVE_FEED.publish_event(session_config.session_id, "metrics",
+                                    {"swing_id": metrics.swing_id, "metrics": metrics.metrics})
+            return True
+
+        except Exception as e:
+            REDIS_ERRORS.labels("store_processed_metrics").inc()
+            logger.error("Error storing processed metrics: %s", e)
+            return False
+
+    def get_processed_metrics(self, session_config: SessionConfig, swing_id: str) -> Optional[ProcessedMetrics]:
+        """Get processed metrics for a swing from Redis"""
+        try:
+            key = f"session:{session_config.session_id}:metrics"
+            start = time.perf_counter()
+            metrics_json = self.redis_client.hget(key, swing_id)
+            if metrics_json is None and self.promote_session_hashes(session_config.session_id):
+                metrics_json = self.redis_client.hget(key, swing_id)
+            _record_redis("get_processed_metrics", start)
+
+            if metrics_json:
+                LATENCY_TRACER.mark(swing_id, "available")
+                return self._parse_processed_metrics(metrics_json)
+
+            return None
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_processed_metrics").inc()
+            logger.error("Error getting processed metrics: %s", e)
+            return None
+
+    def get_processed_metrics_bulk(self, session_config: SessionConfig,
+                                   swing_ids: List[str]) -> Dict[str, ProcessedMetrics]:
+        """Get processed metrics for many swings with one HMGET
+
+        Returns:
+            Processed metrics by swing id (swings without metrics are omitted)
+        """
+        try:
+            if not swing_ids:
+                return {}
+
+            key = f"session:{session_config.session_id}:metrics"
+            start = time.perf_counter()
+            values = self.redis_client.hmget(key, swing_ids)
+            if None in values and self.promote_session_hashes(session_config.session_id):
+                values = self.redis_client.hmget(key, swing_ids)
+            _record_redis("get_processed_metrics", start)
+
+            for swing_id, metrics_json in zip(swing_ids, values):
+                if metrics_json:
+                    LATENCY_TRACER.mark(swing_id, "available")
+            return {
+                swing_id: self._parse_processed_metrics(metrics_json)
+                for swing_id, metrics_json in zip(swing_ids, values)
+                if metrics_json
+            }
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_processed_metrics").inc()
+            logger.error("Error getting processed metrics: %s", e)
+            return {}
+
+    def get_or_compute_metrics(self, session_config: SessionConfig, swings: List[SwingData],
+                               pipeline) -> List[Optional[ProcessedMetrics]]:
+        """Get processed metrics for swings, computing only what is stale
+
+        Cached metrics are used when they were produced by the same
+        analyzer version from the same input hash. Everything is read with
+        one HMGET. Missing or stale entries are computed and written back
+        with one pipelined write.
+
+        Args:
+            session_config: Session the swings belong to
+            swings: Swings to get metrics for
+            pipeline: AnalyticsPipeline computing missing metrics
+
+        Returns:
+            Processed metrics per swing, in order (None if analysis failed)
+        """
+        batches = [IMUBatch.from_swing(swing) for swing in swings]
+        hashes = [swing_input_hash(batch, session_config) for batch in batches]
+        cached = self.get_processed_metrics_bulk(session_config, [swing.swing_id for swing in swings])
+
+        results: List[Optional[ProcessedMetrics]] = []
+        computed: List[ProcessedMetrics] = []
+        for swing, batch, input_hash in zip(swings, batches, hashes):
+            metrics = cached.get(swing.swing_id)
+            if metrics is None or metrics.analyzer_version != pipeline.version or metrics.input_hash != input_hash:
                 try:
-                    data = json.loads(swing_json)
-                    # Parse IMU data points
-                    imu_data_points = []
-                    for imu_dict in data["imu_data_points"]:
-                        imu_data = IMUData(**imu_dict)
-                        imu_data_points.append(imu_data)
-                    
-                    swing_data = SwingData(
-                        swing_id=data["swing_id"],
-                        session_id=data["session_id"],
-                        imu_data_points=imu_data_points,
-                        swing_start_time=datetime.fromisoformat(data["swing_start_time"]),
-                        swing_end_time=datetime.fromisoformat(data["swing_end_time"]),
-                        swing_duration=data["swing_duration"],
-                        impact_g_force=data["impact_g_force"],
-                        swing_type=data["swing_type"]
+                    metrics = ProcessedMetrics(
+                        swing_id=swing.swing_id,
+                        session_id=swing.session_id,
+                        metrics=pipeline.run_batch(batch, session_config),
+                        analyzer_version=pipeline.version,
+                        input_hash=input_hash
                     )
-                    swing_data_list.append(swing_data)
+                    computed.append(metrics)
                 except Exception as e:
-                    print(f"Error parsing swing data: {e}")
-                    continue
+                    logger.error("Error analyzing swing %s: %s", swing.swing_id, e)
+                    metrics = None
+            results.append(metrics)
+
+        if computed:
+            self.store_processed_metrics_batch(session_config, computed,
+                                               {swing.swing_id: swing.swing_start_time for swing in swings})
+
+        return results
+
+    def _queue_running_statistics(self, pipe, session_config: SessionConfig, values: Dict[str, float]):
+        """Queue running statistics updates on a pipeline"""
+        key = f"session:{session_config.session_id}:running_stats"
+        self._register_keys(pipe, session_config.session_id, key)
+        for name, value in values.items():
+            pipe.hincrby(key, f"{name}:count", 1)
+            pipe.hincrbyfloat(key, f"{name}:sum", value)
+            pipe.hincrbyfloat(key, f"{name}:sumsq", value * value)
+    
+    def update_running_statistics(self, session_config: SessionConfig, values: Dict[str, float]) -> bool:
+        """Fold per-swing scores into the session running statistics
+        
+        Count, sum and sum of squares are kept per score in one hash, so
+        mean and standard deviation never require re-reading the swings.
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._queue_running_statistics(pipe, session_config, values)
+            pipe.execute()
+            
+            return True
             
-            return swing_data_list
+        except Exception as e:
+            logger.error("Error updating running statistics: %s", e)
+            return False
+    
+    @staticmethod
+    def _parse_running_statistics(raw: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+        """Turn the running statistics hash into count, mean and std per score"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for field, value in raw.items():
+            name, _, part = field.rpartition(":")
+            totals.setdefault(name, {})[part] = float(value)
+
+        statistics = {}
+        for name, parts in totals.items():
+            count = parts.get("count", 0)
+            if count <= 0:
+                continue
+            mean = parts.get("sum", 0.0) / count
+            variance = max(parts.get("sumsq", 0.0) / count - mean * mean, 0.0)
+            statistics[name] = {"count": int(count), "mean": mean, "std": variance ** 0.5}
+
+        return statistics
+
+    def get_running_statistics(self, session_config: SessionConfig) -> Dict[str, Dict[str, float]]:
+        """Get the session running statistics (count, mean, std per score)"""
+        try:
+            key = f"session:{session_config.session_id}:running_stats"
+            return self._parse_running_statistics(self.redis_client.hgetall(key))
             
         except Exception as e:
-            print(f"Error getting recent swings: {e}")
+            logger.error("Error getting running statistics: %s", e)
+            return {}
+
+    def store_processed_metrics_batch(self, session_config: SessionConfig, metrics_list: List[ProcessedMetrics],
+                                      swing_start_times: Optional[Dict[str, datetime]] = None) -> bool:
+        """Store processed metrics for many swings of a session in one round trip
+
+        Swings stored for the first time with a start time in
+        ``swing_start_times`` are added to the rollups; any other swing with
+        rollup metrics (reprocessed ones) marks the rollups stale.
+        """
+        try:
+            if not metrics_list:
+                return True
+
+            mapping = {
+                metrics.swing_id: self._serialize_processed_metrics(metrics)
+                for metrics in metrics_list
+            }
+            values = {metrics.swing_id: rollup_values(metrics.metrics) for metrics in metrics_list}
+            values = {swing_id: swing_values for swing_id, swing_values in values.items() if swing_values}
+
+            key = f"session:{session_config.session_id}:metrics"
+            start = time.perf_counter()
+            swing_start_times = swing_start_times or {}
+            timed = [swing_id for swing_id in values if swing_id in swing_start_times]
+            new = self._swings_without_metrics(session_config.session_id, timed) if timed else set()
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._register_keys(pipe, session_config.session_id, key)
+            pipe.hset(key, mapping=mapping)
+            for metrics in metrics_list:
+                self._queue_metric_indexes(pipe, session_config.session_id, metrics)
+            for swing_id in new:
+                self._queue_rollups(pipe, session_config, swing_start_times[swing_id], values[swing_id])
+            if len(new) < len(values):
+                self._queue_stale_rollups(pipe, session_config)
+            pipe.execute()
+            _record_redis("store_processed_metrics", start, 1 + bool(timed))
+
+            return True
+
+        except Exception as e:
+            REDIS_ERRORS.labels("store_processed_metrics").inc()
+            logger.error("Error storing processed metrics batch: %s", e)
+            return False
+
+    def rebuild_running_statistics(self, session_config: SessionConfig, names: List[str]) -> bool:
+        """Recompute the session running statistics from its stored metrics
+
+        Used after reprocessing, when the incremental sums no longer match
+        the metrics hash.
+        """
+        try:
+            metrics_key = f"session:{session_config.session_id}:metrics"
+            stats_key = f"session:{session_config.session_id}:running_stats"
+
+            totals: Dict[str, float] = {}
+            self.promote_session_hashes(session_config.session_id)
+            for metrics_json in self.redis_client.hvals(metrics_key):
+                metrics = json.loads(metrics_json)["metrics"]
+                for name in names:
+                    value = metrics.get(name)
+                    if value is None:
+                        continue
+                    totals[f"{name}:count"] = totals.get(f"{name}:count", 0) + 1
+                    totals[f"{name}:sum"] = totals.get(f"{name}:sum", 0.0) + value
+                    totals[f"{name}:sumsq"] = totals.get(f"{name}:sumsq", 0.0) + value * value
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._register_keys(pipe, session_config.session_id, stats_key)
+            pipe.delete(stats_key)
+            if totals:
+                pipe.hset(stats_key, mapping=totals)
+            pipe.execute()
+
+            return True
+
+        except Exception as e:
+            logger.error("Error rebuilding running statistics: %s", e)
+            return False
+
+    def _queue_rollups(self, pipe, session_config: SessionConfig, swing_start_time: datetime,
+                       values: Dict[str, float]):
+        """Queue one swing's day and week rollup updates on a pipeline"""
+        if not values:
+            return
+        increments = rollup_increments(values)
+        for period in ROLLUP_PERIODS:
+            start = bucket_start(swing_start_time, period)
+            bucket = start.date().isoformat()
+            key = rollup_key(session_config.user_id, session_config.club_id, period, bucket)
+            for field, amount in increments.items():
+                if isinstance(amount, int):
+                    pipe.hincrby(key, field, amount)
+                else:
+                    pipe.hincrbyfloat(key, field, amount)
+            pipe.zadd(rollup_index_key(session_config.user_id, session_config.club_id, period),
+                      {bucket: start.timestamp()})
+
+    def _queue_stale_rollups(self, pipe, session_config: SessionConfig):
+        """Queue marking the session's user's rollups of its club for a rebuild"""
+        pipe.sadd(ROLLUP_STALE_KEY, rollup_stale_member(session_config.user_id, session_config.club_id))
+
+    def _swings_without_metrics(self, session_id: str, swing_ids: List[str]) -> Set[str]:
+        """Swings of a session whose metrics were never stored
+
+        Empty when Redis cannot be read (during an outage), so those swings
+        mark the rollups stale rather than risk counting them twice. Metrics
+        of a cold session are promoted before they are checked.
+        """
+        try:
+            key = f"session:{session_id}:metrics"
+            missing = swing_ids
+            for _ in range(2):
+                pipe = self.redis_client.pipeline(transaction=False)
+                for swing_id in missing:
+                    pipe.hexists(key, swing_id)
+                missing = [swing_id for swing_id, exists in zip(missing, pipe.execute()) if not exists]
+                if not missing or not self.promote_session_hashes(session_id):
+                    break
+            return set(missing)
+
+        except Exception as e:
+            logger.warning("Error checking stored metrics of session %s: %s", session_id, e)
+            return set()
+
+    def rebuild_rollups(self, user_id: str, club_id: str) -> int:
+        """Recompute a user's day and week rollups of a club from the stored metrics
+
+        Used for stale rollups, after reprocessing and for swings stored
+        before rollups existed. Rollups otherwise outlive their sessions; a
+        rebuild only counts swings still in the user index.
+
+        Returns:
+            Number of swings counted
+        """
+        try:
+            start = time.perf_counter()
+            # Cleared first: a swing marking the rollups stale during the rebuild gets another one
+            self.redis_client.srem(ROLLUP_STALE_KEY, rollup_stale_member(user_id, club_id))
+            members = self.redis_client.zrange(user_swing_index_key(user_id), 0, -1, withscores=True)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for member, _ in members:
+                pipe.zscore(club_swing_index_key(club_id), member)
+            with_club = pipe.execute() if members else []
+            swings: Dict[str, List[Tuple[str, float]]] = {}
+            for (member, score), club_score in zip(members, with_club):
+                if club_score is not None:
+                    session_id, _, swing_id = member.rpartition(":")
+                    swings.setdefault(session_id, []).append((swing_id, float(score)))
+
+            for session_id in swings:
+                self.promote_session_hashes(session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for session_id, session_swings in swings.items():
+                pipe.hmget(f"session:{session_id}:metrics", [swing_id for swing_id, _ in session_swings])
+            for period in ROLLUP_PERIODS:
+                pipe.zrange(rollup_index_key(user_id, club_id, period), 0, -1)
+            replies = pipe.execute()
+            metrics_replies, old_buckets = replies[:len(swings)], replies[len(swings):]
+
+            buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            scores: Dict[Tuple[str, str], float] = {}
+            counted = 0
+            for session_swings, metrics_jsons in zip(swings.values(), metrics_replies):
+                for (_, score), metrics_json in zip(session_swings, metrics_jsons):
+                    if metrics_json is None:
+                        continue
+                    values = rollup_values(json.loads(metrics_json)["metrics"])
+                    if not values:
+                        continue
+                    counted += 1
+                    increments = rollup_increments(values)
+                    for period in ROLLUP_PERIODS:
+                        bucket_time = bucket_start(datetime.fromtimestamp(score), period)
+                        bucket = (period, bucket_time.date().isoformat())
+                        scores[bucket] = bucket_time.timestamp()
+                        totals = buckets.setdefault(bucket, {})
+                        for field, amount in increments.items():
+                            totals[field] = totals.get(field, 0) + amount
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for period, names in zip(ROLLUP_PERIODS, old_buckets):
+                stale = [rollup_key(user_id, club_id, period, name) for name in names]
+                pipe.delete(rollup_index_key(user_id, club_id, period), *stale)
+            for (period, name), totals in buckets.items():
+                pipe.hset(rollup_key(user_id, club_id, period, name), mapping=totals)
+                pipe.zadd(rollup_index_key(user_id, club_id, period), {name: scores[(period, name)]})
+            pipe.execute()
+            _record_redis("rebuild_rollups", start, 4 + bool(members))
+            return counted
+
+        except Exception as e:
+            REDIS_ERRORS.labels("rebuild_rollups").inc()
+            logger.error("Error rebuilding rollups of user %s, club %s: %s", user_id, club_id, e)
+            return 0
+
+    def get_rollup_trend(self, user_id: str, club_id: str, metric: str, period: str = "week",
+                         since: Optional[datetime] = None, until: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get a user's trend of one metric with a club, one entry per day or week
+
+        Reads one hash per bucket, however many swings the buckets hold.
+        Stale rollups are rebuilt first.
+
+        Args:
+            user_id: User
+            club_id: Club
+            metric: One of ``ROLLUP_METRICS``
+            period: "day" or "week"
+            since: Only buckets holding or after this time
+            until: Only buckets starting at or before this time
+
+        Returns:
+            Oldest first, per bucket its first day (``bucket``), count, mean,
+            std and percentiles; buckets without the metric are left out
+
+        Raises:
+            ValueError: An unknown metric or period
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unknown period {period!r}, expected one of {', '.join(ROLLUP_PERIODS)}")
+        if metric not in ROLLUP_METRICS:
+            raise ValueError(f"Metric {metric!r} has no rollups")
+        fields = bucket_fields(metric)
+        try:
+            start = time.perf_counter()
+            index_key = rollup_index_key(user_id, club_id, period)
+            low = "-inf" if since is None else bucket_start(since, period).timestamp()
+            high = "+inf" if until is None else until.timestamp()
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.sismember(ROLLUP_STALE_KEY, rollup_stale_member(user_id, club_id))
+            pipe.zrangebyscore(index_key, low, high)
+            stale, names = pipe.execute()
+            if stale:
+                self.rebuild_rollups(user_id, club_id)
+                names = self.redis_client.zrangebyscore(index_key, low, high)
+            if not names:
+                _record_redis("get_rollup_trend", start)
+                return []
+            pipe = self.redis_client.pipeline(transaction=False)
+            for name in names:
+                pipe.hmget(rollup_key(user_id, club_id, period, name), fields)
+            trend = []
+            for name, values in zip(names, pipe.execute()):
+                statistics = bucket_statistics(metric, values)
+                if statistics["count"]:
+                    trend.append({"bucket": name, **statistics})
+            _record_redis("get_rollup_trend", start, 2)
+            return trend
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_rollup_trend").inc()
+            logger.error("Error getting %s trend of user %s, club %s: %s", metric, user_id, club_id, e)
+            return []
+
+    def list_session_ids(self) -> List[str]:
+        """List the ids of all stored sessions"""
+        try:
+            prefix = "session_config:"
+            return sorted(
+                key[len(prefix):]
+                for key in self.redis_client.scan_iter(match=f"{prefix}*", count=1000)
+            )
+        except Exception as e:
+            logger.error("Error listing sessions: %s", e)
+            return []
+
+    def get_raw_swings(self, session_id: str) -> List[str]:
+        """Get the stored swing JSON documents of a session, undecoded
+
+        Swings in Redis come first, then demoted ones, both newest first.
+        """
+        try:
+            documents = self.redis_client.lrange(f"session:{session_id}:swings", 0, -1)
+            cold_ids = self.cold_store.swing_ids(session_id)
+            if cold_ids:
+                hot_ids = {_stored_swing_id(document) for document in documents}
+                cold = self.cold_store.read(session_id, [swing_id for swing_id in cold_ids if swing_id not in hot_ids])
+                documents = documents + [cold[swing_id] for swing_id in cold_ids if swing_id in cold]
+            return documents
+        except Exception as e:
+            logger.error("Error getting raw swings: %s", e)
             return []
     
+    def get_swing_page(self, session_id: str, cursor: Optional[str] = None, limit: int = 20,
+                       previews: bool = False) -> Tuple[List[str], Optional[str]]:
+        """Get one page of a session's swing summaries, newest first
+
+        Pages are cut from the swing index by start time and swing id (see
+        ``page_cursor``), so a cursor stays valid while new swings arrive and
+        after old samples are trimmed, and swings sharing a start time are
+        never skipped. Sessions stored before the index existed are indexed
+        on first use.
+
+        Args:
+            session_id: Session to list
+            cursor: ``next_cursor`` of the previous page (None for the first page)
+            limit: Most swings on the page
+            previews: Add each swing's stored preview to its summary as
+                ``preview`` (null for swings stored before previews existed)
+
+        Returns:
+            Summary JSON documents, and the cursor of the next page (None on the last page)
+
+        Raises:
+            ValueError: An invalid cursor
+        """
+        after = parse_page_cursor(cursor) if cursor is not None else None
+        try:
+            index_key = f"session:{session_id}:swing_index"
+            start = time.perf_counter()
+            if after is None:
+                entries = self.redis_client.zrevrangebyscore(index_key, "+inf", "-inf", start=0, num=limit + 1,
+                                                             withscores=True)
+            else:
+                # Swings tied with the cursor's (newest first: lower ids) come before the older ones
+                score, swing_id = after
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.zrevrangebyscore(index_key, score, score, withscores=True)
+                pipe.zrevrangebyscore(index_key, f"({score!r}", "-inf", start=0, num=limit + 1, withscores=True)
+                ties, older = pipe.execute()
+                entries = [(member, tied) for member, tied in ties if member < swing_id] + older
+            if not entries and cursor is None and self.rebuild_swing_index(session_id):
+                entries = self.redis_client.zrevrangebyscore(index_key, "+inf", "-inf", start=0,
+                                                             num=limit + 1, withscores=True)
+            page = entries[:limit]
+            summaries = []
+            if page:
+                swing_ids = [swing_id for swing_id, _ in page]
+                for _ in range(2):
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.hmget(f"session:{session_id}:swing_summaries", swing_ids)
+                    if previews:
+                        pipe.hmget(f"session:{session_id}:swing_previews", swing_ids)
+                    values, *preview_values = pipe.execute()
+                    if None not in values or not self.promote_session_hashes(session_id):
+                        break
+                if previews:
+                    # Summaries are JSON objects: splice the preview in without decoding either
+                    values = [f'{value[:-1]}, "preview": {preview or "null"}}}' if value else value
+                              for value, preview in zip(values, preview_values[0])]
+                summaries = [value for value in values if value]
+            _record_redis("get_swing_page", start, 1 + bool(page))
+
+            next_cursor = page_cursor(page[-1][1], page[-1][0]) if len(entries) > limit else None
+            return summaries, next_cursor
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_swing_page").inc()
+            logger.error("Error getting swing page: %s", e)
+            return [], None
+
+    def rebuild_swing_index(self, session_id: str) -> int:
+        """Index the stored swings of a session that has no swing index yet
+
+        Returns:
+            Number of swings indexed
+        """
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            count = 0
+            for swing_json in self.get_raw_swings(session_id):
+                swing_dict = json.loads(swing_json)
+                summary = {name: swing_dict[name] for name in
+                           ("swing_id", "swing_start_time", "swing_end_time", "swing_duration",
+                            "impact_g_force", "swing_type")}
+                batch = IMUBatch.from_point_dicts(swing_dict["imu_data_points"])
+                summary["samples"] = len(swing_dict["imu_data_points"])
+                summary["samples_hash"] = swing_samples_hash(batch)
+                self._queue_swing_index(pipe, session_id, summary, batch)
+                count += 1
+            if count:
+                pipe.execute()
+            return count
+
+        except Exception as e:
+            logger.error("Error rebuilding swing index: %s", e)
+            return 0
+
+    def get_swing_preview(self, session_id: str, swing_id: str) -> Optional[str]:
+        """Get a swing's stored preview JSON, undecoded (None if it has none)"""
+        try:
+            start = time.perf_counter()
+            preview = self.redis_client.hget(f"session:{session_id}:swing_previews", swing_id)
+            if preview is None and self.promote_session_hashes(session_id):
+                preview = self.redis_client.hget(f"session:{session_id}:swing_previews", swing_id)
+            _record_redis("get_swing_preview", start)
+            return preview
+        except Exception as e:
+            REDIS_ERRORS.labels("get_swing_preview").inc()
+            logger.error("Error getting preview of swing %s: %s", swing_id, e)
+            return None
+
+    def get_raw_swing(self, session_id: str, swing_id: str) -> Optional[str]:
+        """Get one stored swing JSON document, undecoded
+
+        The swings list and the index are both newest first, so the swing's
+        rank in the index is its position in the list. The document is
+        checked against the id and the list is scanned if they disagree.
+
+        Returns:
+            The swing document, or None if unknown or its samples were trimmed
+        """
+        try:
+            start = time.perf_counter()
+            rank = self.redis_client.zrevrank(f"session:{session_id}:swing_index", swing_id)
+            if rank is None:
+                _record_redis("get_raw_swing", start)
+                return None
+
+            swing_json, round_trips = self._fetch_raw_swing(session_id, swing_id, rank)
+            _record_redis("get_raw_swing", start, 1 + round_trips)
+            return swing_json
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_raw_swing").inc()
+            logger.error("Error getting swing %s: %s", swing_id, e)
+            return None
+
+    def _fetch_raw_swing(self, session_id: str, swing_id: str, rank: int) -> Tuple[Optional[str], int]:
+        """Read a swing document at its index rank, scanning the list if it is elsewhere
+
+        Returns:
+            The document (None if not in the list), and the round trips used
+        """
+        key = f"session:{session_id}:swings"
+        prefix = json.dumps({"swing_id": swing_id})[:-1]
+        swing_json = self.redis_client.lindex(key, rank)
+        if swing_json is not None and not swing_json.startswith(prefix):
+            swing_json = next((doc for doc in self.redis_client.lrange(key, 0, -1)
+                               if doc.startswith(prefix)), None)
+            return swing_json, 2
+        return swing_json, 1
+
+    def get_swing(self, session_id: str, swing_id: str) -> Optional[SwingData]:
+        """Get one stored swing, decoded, through the cache
+
+        Stored swings never change, so a cached swing is served after one
+        ZREVRANK that checks its samples have not been trimmed. Swings no
+        longer in Redis are promoted from the cold tier.
+
+        Returns:
+            The swing, or None if unknown or its samples were trimmed
+        """
+        try:
+            start = time.perf_counter()
+            rank = self.redis_client.zrevrank(f"session:{session_id}:swing_index", swing_id)
+            hot = rank is not None and rank < SWINGS_KEPT
+            if not hot and (rank is None or not self.cold_store.contains(session_id, swing_id)):
+                _record_redis("get_swing", start)
+                return None
+
+            swing = self.cache.get(("swing", session_id, swing_id))
+            round_trips = 1
+            if swing is None:
+                swing_json = None
+                if hot:
+                    swing_json, fetches = self._fetch_raw_swing(session_id, swing_id, rank)
+                    round_trips += fetches
+                if swing_json is None:
+                    swing_json = self._get_cold_swings(session_id, [swing_id]).get(swing_id)
+                    round_trips += 1
+                if swing_json is not None:
+                    swing = self._parse_swing_data(swing_json)
+                    self._cache_swing(swing)
+            _record_redis("get_swing", start, round_trips)
+            return swing
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_swing").inc()
+            logger.error("Error getting swing %s: %s", swing_id, e)
+            return None
+
+    def get_session_aggregates(self, session_id: str) -> Dict[str, Any]:
+        """Get a session's cached counts, running statistics and swing ranges in one round trip
+
+        Nothing is recomputed from the swings; the counts, statistics and
+        min/max ranges are the ones maintained as swings are stored and
+        analyzed.
+        """
+        try:
+            start = time.perf_counter()
+            self.promote_session_hashes(session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.exists(f"session_config:{session_id}")
+            pipe.zcard(f"session:{session_id}:swing_index")
+            pipe.llen(f"session:{session_id}:swings")
+            pipe.hlen(f"session:{session_id}:metrics")
+            pipe.hgetall(f"session:{session_id}:running_stats")
+            pipe.hgetall(f"session:{session_id}:swing_stats")
+            exists, indexed, stored, analyzed, running, swing_stats = pipe.execute()
+            _record_redis("get_session_aggregates", start)
+
+            if not exists:
+                return {}
+            return {
+                "session_id": session_id,
+                "swing_count": max(indexed, stored),
+                "swings_with_samples": stored,
+                "swings_analyzed": analyzed,
+                "statistics": self._parse_running_statistics(running),
+                "ranges": {
+                    field: {"min": float(swing_stats[f"{field}:min"]), "max": float(swing_stats[f"{field}:max"])}
+                    for field in SWING_RANGE_FIELDS if f"{field}:min" in swing_stats
+                }
+            }
+
+        except Exception as e:
+            REDIS_ERRORS.labels("get_session_aggregates").inc()
+            logger.error("Error getting session aggregates: %s", e)
+            return {}
+
+    def get_recent_swings(self, session_config: SessionConfig, count: int = 10) -> List[SwingData]:
+        """Get recent swing data from Redis (newest first, through the cache)"""
+        return self.get_swing_data(session_config, count)
+    
     def get_session_statistics(self, session_config: SessionConfig) -> Dict[str, Any]:
         """Get session statistics"""
         try:
@@ -286,7 +1246,7 @@ class RedisManager:
             }
             
         except Exception as e:
-            print(f"Error getting session statistics: {e}")
+            logger.error("Error getting session statistics: %s", e)
             return {}
     
     def _get_file_size(self, session_id: str) -> int:
@@ -309,10 +1269,10 @@ class RedisManager:
             
             # Clear Redis counters
             counter_key = f"imu_counter:{session_config.session_id}"
-            self.redis_client.delete(counter_key)
+            self.redis_client.unlink(counter_key)
             
         except Exception as e:
-            print(f"Error cleaning up session: {e}")
+            logger.error("Error cleaning up session: %s", e)
     
     def store_session_config(self, session_config: SessionConfig) -> bool:
         """Store session configuration in Redis"""
@@ -330,22 +1290,32 @@ class RedisManager:
                 "session_start_time": session_config.session_start_time.isoformat()
             })
             
+            self._register_keys(self.redis_client, session_config.session_id, redis_key)
             self.redis_client.set(redis_key, config_json)
+            self.cache.invalidate(("config", session_config.session_id))
             return True
             
         except Exception as e:
-            print(f"Error storing session config: {e}")
+            logger.error("Error storing session config: %s", e)
             return False
     
     def get_session_config(self, session_id: str) -> Optional[SessionConfig]:
-        """Get session configuration from Redis"""
+        """Get session configuration from Redis
+
+        Configs are cached for ``REDIS_CACHE_CONFIG_TTL_S``, as another
+        process may update them; callers get their own copy.
+        """
         try:
+            session_config = self.cache.get(("config", session_id))
+            if session_config is not None:
+                return session_config.model_copy(deep=True)
+            
             redis_key = f"session_config:{session_id}"
             config_json = self.redis_client.get(redis_key)
             
             if config_json:
                 config_dict = json.loads(config_json)
-                return SessionConfig(
+                session_config = SessionConfig(
                     session_id=config_dict["session_id"],
                     user_id=config_dict["user_id"],
                     club_id=config_dict["club_id"],
@@ -355,11 +1325,13 @@ class RedisManager:
                     impact_threshold=config_dict["impact_threshold"],
                     session_start_time=datetime.fromisoformat(config_dict["session_start_time"])
                 )
+                self.cache.put(("config", session_id), session_config, len(config_json), REDIS_CACHE_CONFIG_TTL_S)
+                return session_config.model_copy(deep=True)
             
             return None
             
         except Exception as e:
-            print(f"Error getting session config: {e}")
+            logger.error("Error getting session config: %s", e)
             return None 
 
     def save_session_data(self, session_config: SessionConfig) -> bool:
@@ -377,77 +1349,387 @@ class RedisManager:
                 for imu_dict in self._imu_buffer:
                     f.write(json.dumps(imu_dict) + '\n')
             
-            print(f"Saved {len(self._imu_buffer)} IMU data points to {file_path}")
+            logger.info("Saved %s IMU data points to %s", len(self._imu_buffer), file_path)
             return True
             
         except Exception as e:
-            print(f"Error saving session data: {e}")
+            logger.error("Error saving session data: %s", e)
             return False
 
     def clear_session_data(self, session_id: str) -> bool:
-        """Clear all data for a specific session"""
+        """Clear all data for a specific session (see ``purge_session``)"""
         try:
             # Check if session exists first
             session_config = self.get_session_config(session_id)
             if not session_config:
                 return False
             
-            pattern = f"session:{session_id}:*"
-            keys = self.redis_client.keys(pattern)
-            if keys and hasattr(keys, '__len__') and len(keys) > 0:
-                self.redis_client.delete(*keys)
-            
-            # Also clear session config
-            config_key = f"session_config:{session_id}"
-            self.redis_client.delete(config_key)
-            
-            # Clear IMU counter
-            counter_key = f"imu_counter:{session_id}"
-            self.redis_client.delete(counter_key)
-            
+            self.purge_session(session_id)
             return True
         except Exception as e:
-            print(f"Error clearing session data: {e}")
+            logger.error("Error clearing session data: %s", e)
             return False
 
-    def get_swing_data(self, session_config: SessionConfig, count: int = 100) -> List[SwingData]:
-        """Retrieve swing data for a session"""
+    def purge_session(self, session_id: str, scan: Optional[bool] = None) -> int:
+        """Delete every key of a session without blocking Redis
+
+        Keys come from the session's key registry and the names every
+        session has. Sessions written before the registry existed are
+        found with SCAN (never KEYS). Everything is removed with pipelined
+        UNLINK, so Redis frees the memory on a background thread.
+
+        Args:
+            session_id: Session to delete
+            scan: Also SCAN for the session's keys (None: only if it has no registry)
+
+        Returns:
+            Number of keys removed
+
+        Raises:
+            redis.RedisError: Redis failed; some keys may be left
+        """
+        start = time.perf_counter()
+        registry_key = session_registry_key(session_id)
+        registered = self.redis_client.smembers(registry_key)
+        keys = set(registered)
+        keys.update((f"session_config:{session_id}", f"imu_counter:{session_id}"))
+        keys.update(f"session:{session_id}:{name}" for name in SESSION_KEY_NAMES)
+        if scan or (scan is None and not registered):
+            CLEANUP_SCANS.inc()
+            keys.update(scan_keys(self.redis_client, f"session:{session_id}:*"))
+        keys.discard(registry_key)
+        self._unindex_session(session_id)
+
+        # The registry goes last, so a failed purge can be retried from it
+        removed = unlink_keys(self.redis_client, sorted(keys))
+        removed += unlink_keys(self.redis_client, [registry_key])
+        _record_redis("purge_session", start)
+
+        self._registered_keys.difference_update(keys)
+        self.cache.invalidate_where(lambda cache_key: cache_key[1] == session_id)
+        self.cold_store.delete_session(session_id)
+        return removed
+
+    def _unindex_session(self, session_id: str):
+        """Remove a session's swings from the user, club and metric indexes (before its index is deleted)"""
+        session_config = self.get_session_config(session_id)
+        swing_ids = self.redis_client.zrange(f"session:{session_id}:swing_index", 0, -1)
+        if not swing_ids:
+            return
+        members = [swing_index_member(session_id, swing_id) for swing_id in swing_ids]
+        index_keys = [metric_swing_index_key(name) for name in SWING_RANGE_FIELDS + tuple(QUERY_INDEXED_METRICS)]
+        if session_config is not None:
+            index_keys += [user_swing_index_key(session_config.user_id), club_swing_index_key(session_config.club_id)]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for index_key in index_keys:
+            pipe.zrem(index_key, *members)
+        pipe.execute()
+
+    def rebuild_query_indexes(self, session_id: str) -> int:
+        """Add a session's swings to the user, club and metric indexes
+
+        For sessions stored before those indexes existed; indexing a swing
+        twice changes nothing.
+
+        Returns:
+            Number of swings indexed
+        """
         try:
-            key = f"session:{session_config.session_id}:swings"
+            session_config = self.get_session_config(session_id)
+            if session_config is None:
+                return 0
+            self.promote_session_hashes(session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall(f"session:{session_id}:swing_summaries")
+            pipe.hgetall(f"session:{session_id}:metrics")
+            summaries, metrics = pipe.execute()
+
+            pipe = self.redis_client.pipeline(transaction=False)
+            for swing_id, summary_json in summaries.items():
+                summary = json.loads(summary_json)
+                member = swing_index_member(session_id, swing_id)
+                score = datetime.fromisoformat(summary["swing_start_time"]).timestamp()
+                pipe.zadd(user_swing_index_key(session_config.user_id), {member: score})
+                pipe.zadd(club_swing_index_key(session_config.club_id), {member: score})
+                for field in SWING_RANGE_FIELDS:
+                    pipe.zadd(metric_swing_index_key(field), {member: float(summary[field])})
+            for metrics_json in metrics.values():
+                self._queue_metric_indexes(pipe, session_id, self._parse_processed_metrics(metrics_json))
+            if summaries or metrics:
+                pipe.execute()
+            return len(summaries)
+
+        except Exception as e:
+            logger.error("Error rebuilding query indexes of session %s: %s", session_id, e)
+            return 0
+
+    def _parse_swing_data(self, swing_json: str) -> SwingData:
+        """Parse a stored swing JSON document"""
+        swing_dict = json.loads(swing_json)
+        # Parse IMU data points
+        imu_data_points = []
+        for imu_dict in swing_dict["imu_data_points"]:
+            imu_data = IMUData(
+                ax=imu_dict["ax"], ay=imu_dict["ay"], az=imu_dict["az"],
+                gx=imu_dict["gx"], gy=imu_dict["gy"], gz=imu_dict["gz"],
+                mx=imu_dict["mx"], my=imu_dict["my"], mz=imu_dict["mz"],
+                qw=imu_dict["qw"], qx=imu_dict["qx"], qy=imu_dict["qy"], qz=imu_dict["qz"],
+                timestamp=datetime.fromisoformat(imu_dict["timestamp"])
+            )
+            imu_data_points.append(imu_data)
+        
+        return SwingData(
+            swing_id=swing_dict["swing_id"],
+            session_id=swing_dict["session_id"],
+            imu_data_points=imu_data_points,
+            swing_start_time=datetime.fromisoformat(swing_dict["swing_start_time"]),
+            swing_end_time=datetime.fromisoformat(swing_dict["swing_end_time"]),
+            swing_duration=swing_dict["swing_duration"],
+            impact_g_force=swing_dict["impact_g_force"],
+            swing_type=swing_dict["swing_type"]
+        )
+
+    def _cache_swing(self, swing: SwingData):
+        """Cache a decoded swing (stored swings never change, so no expiry)"""
+        self.cache.put(("swing", swing.session_id, swing.swing_id), swing,
+                       DECODED_POINT_BYTES * (len(swing.imu_data_points) + 1))
+
+    def _get_indexed_swings(self, session_id: str, swing_ids: List[str]) -> Tuple[Optional[List[SwingData]], int]:
+        """Get swings by id, newest first: cached ones from memory, the rest with pipelined LINDEX
+
+        Returns:
+            The swings whose samples are stored (None if the swings list
+            does not follow the index order), and the round trips used
+        """
+        swings = [self.cache.get(("swing", session_id, swing_id)) for swing_id in swing_ids]
+        missing = [rank for rank, swing in enumerate(swings) if swing is None]
+        if missing:
+            key = f"session:{session_id}:swings"
+            pipe = self.redis_client.pipeline(transaction=False)
+            for rank in missing:
+                pipe.lindex(key, rank)
+            documents = dict(zip(missing, pipe.execute()))
+            for rank, swing_json in documents.items():
+                if swing_json is not None and not swing_json.startswith(json.dumps({"swing_id": swing_ids[rank]})[:-1]):
+                    return None, 1
+            # Swings past the end of the list were demoted (or trimmed)
+            demoted = [rank for rank, swing_json in documents.items() if swing_json is None]
+            if demoted:
+                cold = self._get_cold_swings(session_id, [swing_ids[rank] for rank in demoted])
+                documents.update((rank, cold.get(swing_ids[rank])) for rank in demoted)
+            for rank, swing_json in documents.items():
+                if swing_json is None:
+                    continue
+                try:
+                    swings[rank] = self._parse_swing_data(swing_json)
+                    self._cache_swing(swings[rank])
+                except Exception as e:
+                    logger.error("Error parsing swing data: %s", e)
+        return [swing for swing in swings if swing is not None], int(bool(missing))
+
+    def _get_cold_swings(self, session_id: str, swing_ids: List[str]) -> Dict[str, str]:
+        """Get demoted swings' documents, promoting them for ``RETENTION_PROMOTED_TTL_S``
+
+        Promoted copies live in a hash with a time to live, so other
+        processes read them from Redis and Redis may evict them.
+
+        Returns:
+            swing_id -> stored JSON document, for the swings found
+        """
+        swing_ids = [swing_id for swing_id in swing_ids if self.cold_store.contains(session_id, swing_id)]
+        if not swing_ids:
+            return {}
+        key = f"session:{session_id}:promoted"
+        documents = {swing_id: document
+                     for swing_id, document in zip(swing_ids, self.redis_client.hmget(key, swing_ids)) if document}
+        missing = [swing_id for swing_id in swing_ids if swing_id not in documents]
+        if missing:
+            cold = self.cold_store.read(session_id, missing)
+            if cold:
+                pipe = self.redis_client.pipeline(transaction=False)
+                self._register_keys(pipe, session_id, key)
+                pipe.hset(key, mapping=cold)
+                pipe.expire(key, int(RETENTION_PROMOTED_TTL_S))
+                pipe.execute()
+                SWINGS_PROMOTED.inc(len(cold))
+                documents.update(cold)
+        return documents
+
+    def demote_swings(self, session_id: str, keep: int = 0) -> int:
+        """Move a session's oldest stored swings from Redis to a segment file
+
+        The segment is written and synced before the swings are trimmed
+        from the list. The trim counts from the tail, so swings pushed
+        meanwhile stay. Index, summaries, previews and metrics stay in
+        Redis (see ``demote_session_hashes`` for sessions demoted whole).
+
+        Args:
+            session_id: Session to demote
+            keep: Newest swings left in Redis
+
+        Returns:
+            Number of swings demoted
+
+        Raises:
+            redis.RedisError, OSError: Nothing was trimmed
+        """
+        start = time.perf_counter()
+        key = f"session:{session_id}:swings"
+        documents = self.redis_client.lrange(key, keep, -1)
+        if not documents:
+            return 0
+        swing_ids = [_stored_swing_id(document) for document in documents]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for swing_id in swing_ids:
+            pipe.zscore(f"session:{session_id}:swing_index", swing_id)
+        scores = [score or 0.0 for score in pipe.execute()]
+
+        self.cold_store.write(session_id, list(zip(swing_ids, scores, documents)))
+        self.redis_client.ltrim(key, 0, -len(documents) - 1)
+        _record_redis("demote_swings", start, 3)
+        SWINGS_DEMOTED.inc(len(documents))
+        return len(documents)
+
+    def demote_session_hashes(self, session_id: str) -> int:
+        """Move a cold session's summaries, previews and metrics from Redis to its segment directory
+
+        The hashes file is written and synced before the fields are
+        deleted, and only the fields read are deleted: a field written
+        meanwhile stays in Redis and wins when the hashes are promoted
+        back (``promote_session_hashes``, on the first read that misses).
+
+        Returns:
+            Number of fields demoted
+
+        Raises:
+            redis.RedisError, OSError: Nothing was deleted
+        """
+        start = time.perf_counter()
+        keys = [f"session:{session_id}:{name}" for name in COLD_HASH_NAMES]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        hashes = {name: fields for name, fields in zip(COLD_HASH_NAMES, pipe.execute()) if fields}
+        if not hashes:
+            return 0
+
+        self.cold_store.write_hashes(session_id, hashes)
+        pipe = self.redis_client.pipeline(transaction=False)
+        for name, fields in hashes.items():
+            pipe.hdel(f"session:{session_id}:{name}", *fields)
+        pipe.execute()
+        _record_redis("demote_session_hashes", start, 2)
+        return sum(len(fields) for fields in hashes.values())
+
+    def promote_session_hashes(self, session_id: str) -> bool:
+        """Bring a cold session's summaries, previews and metrics back to Redis
+
+        Readers call this when a field is missing; it costs a file check for
+        sessions that are not cold. Fields written since the demotion are
+        kept (HSETNX). The session goes cold again on a later retention
+        pass if it stays idle.
+
+        Returns:
+            Whether any hashes were promoted
+        """
+        if not self.cold_store.has_hashes(session_id):
+            return False
+        try:
+            hashes = self.cold_store.read_hashes(session_id)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for name, fields in hashes.items():
+                key = f"session:{session_id}:{name}"
+                self._register_keys(pipe, session_id, key)
+                for field, value in fields.items():
+                    pipe.hsetnx(key, field, value)
+            pipe.execute()
+            self.cold_store.delete_hashes(session_id)
+            SESSIONS_PROMOTED.inc()
+            return True
+
+        except Exception as e:
+            logger.error("Error promoting hashes of session %s: %s", session_id, e)
+            return False
+
+    def expire_session_buffers(self, session_id: str, ttl: float) -> int:
+        """Give a session's IMU buffers and events a time to live
+
+        They are raw feeds of a session that is no longer active, so Redis
+        may drop them first (``volatile-lru``) or when they expire. Keys
+        that already have one keep it, so repeated retention passes do not
+        push the expiry back.
+
+        Returns:
+            Number of keys given a time to live
+        """
+        keys = [key for key in self.redis_client.smembers(session_registry_key(session_id))
+                if key.endswith(":imu_buffer")]
+        keys.append(f"session:{session_id}:events")
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        # -1: the key exists without a time to live
+        keys = [key for key, remaining in zip(keys, pipe.execute()) if remaining == -1]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.expire(key, int(ttl))
+        return sum(bool(result) for result in pipe.execute())
+
+    def hot_session_bytes(self, session_id: str) -> int:
+        """Redis memory used by a session's keys (sampled MEMORY USAGE)"""
+        keys = set(self.redis_client.smembers(session_registry_key(session_id)))
+        keys.update(f"session:{session_id}:{name}" for name in SESSION_KEY_NAMES)
+        keys.add(f"session_config:{session_id}")
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in sorted(keys):
+            pipe.memory_usage(key)
+        return sum(size or 0 for size in pipe.execute())
+
+    def query_index_bytes(self, user_ids: Iterable[str], club_ids: Iterable[str]) -> int:
+        """Redis memory used by the user, club and metric swing indexes (sampled MEMORY USAGE)
+
+        Those stay in Redis whatever the retention, as queries read them.
+        """
+        keys = [user_swing_index_key(user_id) for user_id in sorted(set(user_ids))]
+        keys += [club_swing_index_key(club_id) for club_id in sorted(set(club_ids))]
+        keys += [metric_swing_index_key(name) for name in SWING_RANGE_FIELDS + tuple(QUERY_INDEXED_METRICS)]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.memory_usage(key)
+        return sum(size or 0 for size in pipe.execute())
+
+    def get_swing_data(self, session_config: SessionConfig, count: Optional[int] = SWINGS_KEPT) -> List[SwingData]:
+        """Retrieve swing data for a session, newest first
+
+        Swing ids come from the swing index and decoded swings from the
+        cache; only swings not cached are read and parsed. Sessions without
+        an index, or whose list is out of index order, are read whole.
+        """
+        try:
+            count = min(count or SWINGS_KEPT, SWINGS_KEPT)
+            session_id = session_config.session_id
+            start = time.perf_counter()
+            swing_ids = self.redis_client.zrevrange(f"session:{session_id}:swing_index", 0, count - 1)
+            if swing_ids:
+                swings, round_trips = self._get_indexed_swings(session_id, swing_ids)
+                if swings is not None:
+                    _record_redis("get_swing_data", start, 1 + round_trips)
+                    return swings
+            
+            key = f"session:{session_id}:swings"
             data = self.redis_client.lrange(key, 0, count - 1)
             swings = []
             for item in data:
                 try:
-                    swing_dict = json.loads(item)
-                    # Parse IMU data points
-                    imu_data_points = []
-                    for imu_dict in swing_dict["imu_data_points"]:
-                        imu_data = IMUData(
-                            ax=imu_dict["ax"], ay=imu_dict["ay"], az=imu_dict["az"],
-                            gx=imu_dict["gx"], gy=imu_dict["gy"], gz=imu_dict["gz"],
-                            mx=imu_dict["mx"], my=imu_dict["my"], mz=imu_dict["mz"],
-                            qw=imu_dict["qw"], qx=imu_dict["qx"], qy=imu_dict["qy"], qz=imu_dict["qz"],
-                            timestamp=datetime.fromisoformat(imu_dict["timestamp"])
-                        )
-                        imu_data_points.append(imu_data)
-                    
-                    swing_data = SwingData(
-                        swing_id=swing_dict["swing_id"],
-                        session_id=swing_dict["session_id"],
-                        imu_data_points=imu_data_points,
-                        swing_start_time=datetime.fromisoformat(swing_dict["swing_start_time"]),
-                        swing_end_time=datetime.fromisoformat(swing_dict["swing_end_time"]),
-                        swing_duration=swing_dict["swing_duration"],
-                        impact_g_force=swing_dict["impact_g_force"],
-                        swing_type=swing_dict["swing_type"]
-                    )
+                    swing_data = self._parse_swing_data(item)
+                    self._cache_swing(swing_data)
                     swings.append(swing_data)
                 except Exception as e:
-                    print(f"Error parsing swing data: {e}")
+                    logger.error("Error parsing swing data: %s", e)
                     continue
             return swings
         except Exception as e:
-            print(f"Error getting swing data: {e}")
+            logger.error("Error getting swing data: %s", e)
             return []
 
     def get_session_swing_count(self, session_config: SessionConfig) -> int:
@@ -456,5 +1738,5 @@ class RedisManager:
             key = f"session:{session_config.session_id}:swings"
             return self.redis_client.llen(key)
         except Exception as e:
-            print(f"Error getting swing count: {e}")
+            logger.error("Error getting swing count: %s", e)
             return 0 
\ No newline at end of file
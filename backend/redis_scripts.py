@@ -0,0 +1,296 @@
+"""
+Server-side Lua scripts for GolfIMU backend
+
+Storing a swing touches the swing list, the session index, summary and
+preview hashes, the user, club and metric indexes, the session's swing
+counters and min/max ranges, and the key registry. As separate commands
+that was several round trips, and a reader could see the swing in one
+index and not the other. Querying swings across sessions intersects
+several indexes. The scripts here run both inside Redis in one round
+trip. Redis runs a script without interleaving other clients' commands,
+so no reader sees half of a swing's writes. A script is not a
+transaction, though: if one of its commands fails (a key holding another
+type, say), the script stops and the writes it made before stay.
+
+- each script is sent once with ``SCRIPT LOAD`` and invoked with
+  ``EVALSHA`` afterwards; a Redis that lost its script cache (a restart
+  or ``SCRIPT FLUSH``) answers ``NOSCRIPT`` and the script is loaded again
+- ``script_source`` maps a SHA back to its source, so writes spooled
+  during an outage (see ``redis_spool.py``) are replayed with ``EVAL``
+- clients without scripting (the in-memory clients of the tests) get the
+  same writes from a pipeline, without the isolation
+
+Scripts declare every key they touch in ``KEYS``.
+"""
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import redis
+
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+logger = get_logger("redis_scripts")
+
+SCRIPT_LOADS = TELEMETRY.counter("golfimu_redis_script_loads_total",
+                                 "Lua scripts sent to Redis with SCRIPT LOAD", labels=("script",))
+
+# KEYS: swings, swing_index, swing_summaries, swing_previews, swing_stats, user index, club index, key registry,
+#       then one metric index per (field, value) pair
+# ARGV: swing_id, start time, swing JSON, summary JSON, preview JSON ('' for none), swings kept,
+#       user/club index member, then (field, value) pairs folded into the min/max ranges and metric indexes
+INGEST_SWING_SOURCE = """
+redis.call('LPUSH', KEYS[1], ARGV[3])
+redis.call('LTRIM', KEYS[1], 0, tonumber(ARGV[6]) - 1)
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+if ARGV[5] ~= '' then
+    redis.call('HSET', KEYS[4], ARGV[1], ARGV[5])
+end
+redis.call('ZADD', KEYS[6], ARGV[2], ARGV[7])
+redis.call('ZADD', KEYS[7], ARGV[2], ARGV[7])
+redis.call('SADD', KEYS[8], KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5])
+for i = 8, #ARGV, 2 do
+    local value = tonumber(ARGV[i + 1])
+    local low = tonumber(redis.call('HGET', KEYS[5], ARGV[i] .. ':min'))
+    local high = tonumber(redis.call('HGET', KEYS[5], ARGV[i] .. ':max'))
+    if low == nil or value < low then
+        redis.call('HSET', KEYS[5], ARGV[i] .. ':min', ARGV[i + 1])
+    end
+    if high == nil or value > high then
+        redis.call('HSET', KEYS[5], ARGV[i] .. ':max', ARGV[i + 1])
+    end
+    redis.call('ZADD', KEYS[9 + (i - 8) / 2], ARGV[i + 1], ARGV[7])
+end
+return redis.call('HINCRBY', KEYS[5], 'swings', 1)
+"""
+
+# Members fetched per ZREVRANGEBYSCORE while a query scans its driving index
+QUERY_PAGE = 200
+# KEYS: index driving the scan (scored by start time), then indexes a swing must be in
+# ARGV: newest and oldest start time (ZREVRANGEBYSCORE bounds), most matches, most members examined,
+#       member the scan resumes after among those scored the newest start time ('' for none),
+#       then a (low, high) score bound per filter index ('' for unbounded)
+# Returns the matching members, newest first, and the score and member of the last member examined
+# ('' and '' once exhausted). Each page starts below the last score seen, after the members tied with
+# it, rather than at a growing offset. Ties come in descending byte order of the member, so the scan
+# resumes among them by comparing bytes (not with Lua's locale dependent string comparison).
+QUERY_SWINGS_SOURCE = """
+local limit, budget = tonumber(ARGV[3]), tonumber(ARGV[4])
+local max, after = ARGV[1], ARGV[5]
+local found, last_score, last_member = {}, '', ''
+
+local function older(member)
+    for i = 1, math.min(#member, #after) do
+        local a, b = string.byte(member, i), string.byte(after, i)
+        if a ~= b then
+            return a < b
+        end
+    end
+    return #member < #after
+end
+
+local function examine(member, score)
+    budget = budget - 1
+    last_score, last_member = score, member
+    local match = true
+    for k = 2, #KEYS do
+        local value = tonumber(redis.call('ZSCORE', KEYS[k], member))
+        local low, high = ARGV[2 * k + 2], ARGV[2 * k + 3]
+        if value == nil or (low ~= '' and value < tonumber(low)) or (high ~= '' and value > tonumber(high)) then
+            match = false
+            break
+        end
+    end
+    if match then
+        found[#found + 1] = member
+    end
+    return #found == limit or budget == 0
+end
+
+while true do
+    if after ~= '' then
+        for _, member in ipairs(redis.call('ZREVRANGEBYSCORE', KEYS[1], max, max)) do
+            if older(member) and examine(member, max) then
+                return {found, last_score, last_member}
+            end
+        end
+        max, after = '(' .. max, ''
+    end
+    local page = redis.call('ZREVRANGEBYSCORE', KEYS[1], max, ARGV[2], 'WITHSCORES',
+                            'LIMIT', 0, math.min(budget, %d))
+    if #page == 0 then
+        return {found, '', ''}
+    end
+    for i = 1, #page, 2 do
+        if examine(page[i], page[i + 1]) then
+            return {found, last_score, last_member}
+        end
+    end
+    max, after = page[#page], page[#page - 1]
+end
+""" % QUERY_PAGE
+
+
+def supports_scripts(client) -> bool:
+    """Whether the client can run Lua scripts (``EVALSHA``)"""
+    return callable(getattr(client, "evalsha", None))
+
+
+class RedisScript:
+    """A Lua script invoked by SHA, with a pipelined equivalent for clients without scripting"""
+
+    def __init__(self, name: str, source: str, fallback: Callable[[Any, Sequence[str], Sequence[Any]], Any],
+                 read_only: bool = False):
+        """Register a script.
+
+        Args:
+            name: Script name (telemetry label)
+            source: Lua source
+            fallback: ``fallback(client, keys, args)`` doing the same work without scripting
+            read_only: The script only reads (it is never spooled)
+        """
+        self.name = name
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+        self.fallback = fallback
+        self.read_only = read_only
+        _SCRIPTS[self.sha] = self
+
+    def load(self, client) -> str:
+        """Send the script to Redis, returning the SHA Redis computed"""
+        SCRIPT_LOADS.labels(self.name).inc()
+        return client.script_load(self.source)
+
+    def __call__(self, client, keys: Sequence[str], args: Sequence[Any]) -> Any:
+        """Run the script by SHA, loading it if Redis does not have it.
+
+        Args:
+            client: Redis client
+            keys: Keys the script touches
+            args: Script arguments
+
+        Returns:
+            The script's reply
+        """
+        if not supports_scripts(client):
+            return self.fallback(client, keys, args)
+        try:
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+        except redis.exceptions.NoScriptError:
+            logger.info("Loading script %s into Redis", self.name)
+            self.load(client)
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+
+
+# SHA -> script, for every script defined
+_SCRIPTS: Dict[str, RedisScript] = {}
+
+
+def script_source(sha: str) -> Optional[str]:
+    """Source of a script defined here, by SHA (None for unknown scripts)"""
+    script = _SCRIPTS.get(sha)
+    return script.source if script else None
+
+
+def script_read_only(sha: str) -> bool:
+    """Whether a script defined here only reads"""
+    script = _SCRIPTS.get(sha)
+    return script is not None and script.read_only
+
+
+def load_scripts(client) -> int:
+    """Load every script into Redis ahead of its first call, returning how many were loaded"""
+    if not supports_scripts(client):
+        return 0
+    for script in _SCRIPTS.values():
+        script.load(client)
+    return len(_SCRIPTS)
+
+
+def _ingest_swing_pipelined(client, keys: Sequence[str], args: Sequence[Any]) -> int:
+    """``INGEST_SWING_SOURCE`` as a pipeline followed by the min/max update"""
+    swings, index, summaries, previews, stats, user_index, club_index, registry = keys[:8]
+    metric_indexes = keys[8:]
+    swing_id, score, swing_json, summary_json, preview_json, kept, member = args[:7]
+    ranges: List[Any] = list(args[7:])
+
+    pipe = client.pipeline(transaction=False)
+    pipe.lpush(swings, swing_json)
+    pipe.ltrim(swings, 0, int(kept) - 1)
+    pipe.zadd(index, {swing_id: float(score)})
+    pipe.hset(summaries, swing_id, summary_json)
+    if preview_json:
+        pipe.hset(previews, swing_id, preview_json)
+    pipe.zadd(user_index, {member: float(score)})
+    pipe.zadd(club_index, {member: float(score)})
+    for metric_index, value in zip(metric_indexes, ranges[1::2]):
+        pipe.zadd(metric_index, {member: float(value)})
+    pipe.sadd(registry, swings, index, summaries, previews, stats)
+    pipe.hincrby(stats, "swings", 1)
+    count = pipe.execute()[-1]
+
+    # Read-modify-write: not atomic, and skipped while Redis is unavailable
+    try:
+        current = client.hgetall(stats)
+        updates = {}
+        for field, value in zip(ranges[::2], ranges[1::2]):
+            low, high = current.get(f"{field}:min"), current.get(f"{field}:max")
+            if low is None or float(value) < float(low):
+                updates[f"{field}:min"] = value
+            if high is None or float(value) > float(high):
+                updates[f"{field}:max"] = value
+        if updates:
+            client.hset(stats, mapping=updates)
+    except Exception as e:
+        logger.warning("Error updating swing ranges of %s: %s", stats, e)
+    return count
+
+
+def _query_swings_pipelined(client, keys: Sequence[str], args: Sequence[Any]) -> List[Any]:
+    """``QUERY_SWINGS_SOURCE`` with one ZSCORE round trip per page of candidates"""
+    newest, oldest, limit, budget, after = args[0], args[1], int(args[2]), int(args[3]), args[4]
+    bounds = [(float(low) if low != "" else None, float(high) if high != "" else None)
+              for low, high in zip(args[5::2], args[6::2])]
+    found: List[str] = []
+    last: List[Any] = ["", ""]
+
+    def examine(candidates: List[Tuple[str, Any]]) -> bool:
+        """Check candidates against the filter indexes until the page is full or the budget spent"""
+        nonlocal budget
+        pipe = client.pipeline(transaction=False)
+        for member, _ in candidates[:budget]:
+            for key in keys[1:]:
+                pipe.zscore(key, member)
+        scores = iter(pipe.execute())
+        for member, score in candidates[:budget]:
+            budget -= 1
+            last[:] = [repr(float(score)), member]
+            match = True
+            for low, high in bounds:
+                value = next(scores)
+                if value is None or (low is not None and value < low) or (high is not None and value > high):
+                    match = False
+            if match:
+                found.append(member)
+            if len(found) == limit or budget == 0:
+                return True
+        return False
+
+    while True:
+        if after != "":
+            ties = client.zrevrangebyscore(keys[0], newest, newest)
+            if examine([(member, newest) for member in ties if member < after]):
+                return [found, *last]
+            newest, after = f"({newest}", ""
+        page = client.zrevrangebyscore(keys[0], newest, oldest, start=0, num=min(budget, QUERY_PAGE),
+                                       withscores=True)
+        if not page:
+            return [found, "", ""]
+        if examine(page):
+            return [found, *last]
+        newest, after = repr(float(page[-1][1])), page[-1][0]
+
+
+INGEST_SWING = RedisScript("ingest_swing", INGEST_SWING_SOURCE, _ingest_swing_pipelined)
+QUERY_SWINGS = RedisScript("query_swings", QUERY_SWINGS_SOURCE, _query_swings_pipelined, read_only=True)
@@ -0,0 +1,416 @@
+"""
+Resilient Redis writes for GolfIMU backend
+
+When Redis goes away (a restart, or the runner stopping its own
+``redis-server``) writes used to fail and their data was dropped.
+``ResilientRedis`` wraps a client so that:
+
+- a write failing with a connection error, and every write after it, is
+  appended to a local spool file instead, so callers carry on at disk
+  speed and the serial reader is never held up by reconnect attempts
+- reads fail at once while Redis is down (callers already handle errors)
+- a background thread pings Redis with exponential backoff and, once it
+  answers, replays the spool in order with pipelines
+  (``RESILIENT_REPLAY_CHUNK`` batches per round trip)
+
+Writes keep their order: while a spool is being replayed, new writes are
+spooled behind it. A write or pipeline is one spool line (a JSON list of
+``[command, args, kwargs]``). The spool is bounded by
+``RESILIENT_SPOOL_MAX_BYTES``; batches past the bound are dropped and
+counted. A command whose connection broke after Redis ran it is replayed
+once more. Each client spools to its own ``<pid>-<n>.spool`` under
+``RESILIENT_SPOOL_DIR`` (relative to the project root, not the working
+directory), so the API, REPL and supervisor clients of one process never
+clear each other's spools; spools left by processes that died are adopted
+with ``adopt_orphans``. Lua scripts run
+by SHA are spooled with their source, since a restarted Redis has
+forgotten them.
+"""
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis
+
+from .redis_scripts import script_read_only, script_source
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    RESILIENT_BACKOFF_MAX_S, RESILIENT_BACKOFF_MIN_S, RESILIENT_REPLAY_CHUNK, RESILIENT_SPOOL_DIR,
+    RESILIENT_SPOOL_MAX_BYTES
+)
+
+logger = get_logger("spool")
+
+SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), RESILIENT_SPOOL_DIR)
+# Numbers the clients of this process, one spool file each
+_spool_numbers = itertools.count()
+
+SPOOL_DEPTH = TELEMETRY.gauge("golfimu_spool_depth", "Write batches spooled and not yet replayed")
+SPOOL_BYTES = TELEMETRY.gauge("golfimu_spool_bytes", "Bytes of spooled write batches not yet replayed")
+SPOOLED = TELEMETRY.counter("golfimu_spool_batches_total", "Write batches spooled while Redis was unavailable")
+SPOOL_DROPPED = TELEMETRY.counter("golfimu_spool_dropped_total", "Write batches dropped because the spool was full")
+SPOOL_REPLAYED = TELEMETRY.counter("golfimu_spool_replayed_total", "Spooled write batches replayed to Redis")
+SPOOL_REPLAY_RATE = TELEMETRY.gauge("golfimu_spool_replay_rate", "Batches per second of the last spool replay")
+REDIS_UP = TELEMETRY.gauge("golfimu_redis_up", "Whether Redis took the last write (1) or writes are spooled (0)")
+REDIS_RECONNECTS = TELEMETRY.counter("golfimu_redis_reconnects_total", "Times Redis came back after an outage")
+
+# Commands that change data and may be spooled; anything else is a read
+WRITE_COMMANDS = frozenset({
+    "set", "setex", "incr", "incrby", "expire", "delete", "unlink",
+    "lpush", "rpush", "ltrim", "hset", "hsetnx", "hdel", "hincrby", "hincrbyfloat",
+    "zadd", "zrem", "sadd", "srem", "eval", "evalsha"
+})
+# Errors meaning Redis could not be reached (BusyLoadingError is a ConnectionError)
+OUTAGE_ERRORS = (redis.ConnectionError, redis.TimeoutError)
+
+
+class CommandSpool:
+    """Append-only file of write batches, one JSON line each"""
+
+    def __init__(self, path: str, max_bytes: int = RESILIENT_SPOOL_MAX_BYTES):
+        """Open (or create on first append) a spool.
+
+        Args:
+            path: Spool file
+            max_bytes: Most bytes held; batches past it are dropped
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offset = 0  # Start of the first batch not replayed yet
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.pending = 0
+        if self.size:
+            with open(path, "rb") as f:
+                self.pending = sum(1 for _ in f)
+            SPOOL_DEPTH.inc(self.pending)
+            SPOOL_BYTES.inc(self.size)
+        self._file = None
+
+    def append(self, line: bytes) -> bool:
+        """Append one batch (a JSON line).
+
+        Returns:
+            False if the spool is full and the batch was dropped
+        """
+        if self.size + len(line) > self.max_bytes:
+            SPOOL_DROPPED.inc()
+            return False
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "ab")
+        self._file.write(line)
+        self._file.flush()
+        self.size += len(line)
+        self.pending += 1
+        SPOOLED.inc()
+        SPOOL_DEPTH.inc()
+        SPOOL_BYTES.inc(len(line))
+        return True
+
+    def read(self, count: int) -> Tuple[List[list], int]:
+        """Read up to ``count`` batches after the replayed ones.
+
+        Returns:
+            The batches, and the offset just past them
+        """
+        batches = []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for line in f:
+                batches.append(json.loads(line))
+                if len(batches) >= count:
+                    break
+            return batches, f.tell() if batches else self.offset
+
+    def mark_replayed(self, offset: int, batches: int):
+        """Record batches up to ``offset`` as replayed"""
+        SPOOL_BYTES.dec(offset - self.offset)
+        SPOOL_DEPTH.dec(batches)
+        SPOOL_REPLAYED.inc(batches)
+        self.pending -= batches
+        self.offset = offset
+
+    def drained(self) -> bool:
+        """Whether every batch was replayed"""
+        return self.offset >= self.size
+
+    def clear(self):
+        """Empty the spool file once it is drained"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.offset = self.size = self.pending = 0
+
+
+class ResilientPipeline:
+    """Pipeline queuing commands, run (or spooled) by ``ResilientRedis`` on execute"""
+
+    def __init__(self, owner: "ResilientRedis", transaction: bool):
+        self._owner = owner
+        self._transaction = transaction
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return self._owner._execute(commands, self._transaction)
+
+
+class ResilientRedis:
+    """Redis client wrapper spooling writes to disk while Redis is unavailable"""
+
+    def __init__(self, client, spool_path: Optional[str] = None, max_bytes: int = RESILIENT_SPOOL_MAX_BYTES,
+                 backoff_min: float = RESILIENT_BACKOFF_MIN_S, backoff_max: float = RESILIENT_BACKOFF_MAX_S,
+                 replay_chunk: int = RESILIENT_REPLAY_CHUNK):
+        """Wrap a client.
+
+        Args:
+            client: Redis client doing the work
+            spool_path: Spool file (``SPOOL_DIR/<pid>-<n>.spool`` by default)
+            max_bytes: Most bytes spooled
+            backoff_min: First wait before pinging Redis again (s)
+            backoff_max: Longest wait between pings (s)
+            replay_chunk: Spooled batches replayed per pipeline
+        """
+        self.client = client
+        self.spool = CommandSpool(
+            spool_path or os.path.join(SPOOL_DIR, f"{os.getpid()}-{next(_spool_numbers)}.spool"), max_bytes)
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.replay_chunk = replay_chunk
+        self.last_replay: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Writes go to the spool while Redis is down or a spool is left to replay
+        self.spooling = False
+        # Whether Redis answered since the last connection error (reads fail fast otherwise)
+        self.available = True
+        if self.spool.pending:
+            self._start_spooling()
+
+    # -- commands -------------------------------------------------------------
+
+    def __getattr__(self, name: str):
+        command = getattr(self.client, name)
+        if not callable(command):
+            return command
+        if name in WRITE_COMMANDS:
+            def write(*args, **kwargs):
+                if not _is_write(name, args):
+                    return self._read(command, args, kwargs)
+                return self._execute([(name, args, kwargs)], False)[0]
+            return write
+        return lambda *args, **kwargs: self._read(command, args, kwargs)
+
+    def pipeline(self, transaction: bool = True) -> ResilientPipeline:
+        return ResilientPipeline(self, transaction)
+
+    def _read(self, command, args: tuple, kwargs: dict):
+        """Run a read, failing at once while Redis is known to be down"""
+        if not self.available:
+            raise redis.ConnectionError("Redis is unavailable, writes are being spooled")
+        try:
+            return command(*args, **kwargs)
+        except OUTAGE_ERRORS:
+            self._mark_down()
+            raise
+
+    def _execute(self, commands: List[Tuple[str, tuple, dict]], transaction: bool) -> List[Any]:
+        """Run commands (in one pipeline if several), spooling them if Redis is unavailable"""
+        if not commands:
+            return []
+        writes_only = all(_is_write(name, args) for name, args, _ in commands)
+        if not self.spooling:
+            try:
+                if len(commands) == 1 and not transaction:
+                    name, args, kwargs = commands[0]
+                    return [getattr(self.client, name)(*args, **kwargs)]
+                pipe = self.client.pipeline(transaction=transaction)
+                for name, args, kwargs in commands:
+                    getattr(pipe, name)(*args, **kwargs)
+                return pipe.execute()
+            except OUTAGE_ERRORS:
+                self._mark_down()
+                if not writes_only:
+                    raise
+        elif not writes_only:
+            raise redis.ConnectionError("Redis is unavailable, writes are being spooled")
+
+        line = (json.dumps([_spooled(name, args, kwargs) for name, args, kwargs in commands]) + "\n").encode()
+        with self._lock:
+            if not self.spool.append(line):
+                logger.error("Spool full (%s bytes), dropped a batch of %s commands",
+                             self.spool.max_bytes, len(commands))
+        return [0] * len(commands)
+
+    # -- outage and recovery ----------------------------------------------------
+
+    def _mark_down(self):
+        with self._lock:
+            self.available = False
+            if not self.spooling:
+                logger.warning("Redis unavailable, spooling writes to %s", self.spool.path)
+            self._start_spooling()
+
+    def _start_spooling(self):
+        """Spool writes and start the recovery thread (lock held or during init)"""
+        self.spooling = True
+        REDIS_UP.set(0)
+        if self._thread is None and not self._closed.is_set():
+            self._thread = threading.Thread(target=self._recover, name="redis-recovery", daemon=True)
+            self._thread.start()
+
+    def _recover(self):
+        """Ping Redis with exponential backoff, then replay the spool"""
+        delay = self.backoff_min
+        while not self._closed.wait(delay * random.uniform(0.8, 1.2)):
+            try:
+                self.client.ping()
+                if self._replay():
+                    REDIS_RECONNECTS.inc()
+                    logger.info("Redis is back, replayed %s batches at %.0f batches/s",
+                                self.last_replay["batches"], self.last_replay["rate"])
+                return
+            except OUTAGE_ERRORS:
+                self.available = False
+                delay = min(delay * 2, self.backoff_max)
+            except Exception as e:
+                logger.error("Error replaying spool: %s", e)
+                delay = min(delay * 2, self.backoff_max)
+
+    def _replay(self) -> bool:
+        """Replay spooled batches in order until the spool is drained.
+
+        Returns:
+            True once drained (writes go to Redis again and the thread
+            exits), False if stopped
+        """
+        start = time.perf_counter()
+        replayed = 0
+        # Redis answered: reads go through while the spool is replayed
+        self.available = True
+        while not self._closed.is_set():
+            with self._lock:
+                if self.spool.drained():
+                    self.spool.clear()
+                    self.spooling = False
+                    self._thread = None
+                    REDIS_UP.set(1)
+                    break
+                batches, offset = self.spool.read(self.replay_chunk)
+            pipe = self.client.pipeline(transaction=False)
+            for batch in batches:
+                for name, args, kwargs in batch:
+                    getattr(pipe, name)(*args, **kwargs)
+            # A command Redis rejects (e.g. a key of another type) must not block the rest
+            failed = [result for result in pipe.execute(raise_on_error=False) if isinstance(result, Exception)]
+            if failed:
+                logger.error("%s spooled commands failed on replay, first: %s", len(failed), failed[0])
+            with self._lock:
+                self.spool.mark_replayed(offset, len(batches))
+            replayed += len(batches)
+        else:
+            return False
+        elapsed = time.perf_counter() - start
+        self.last_replay = {"batches": replayed, "seconds": elapsed,
+                            "rate": replayed / elapsed if elapsed > 0 else 0.0}
+        SPOOL_REPLAY_RATE.set(self.last_replay["rate"])
+        return True
+
+    def adopt_orphans(self) -> int:
+        """Take over spools left by processes that died, to replay them first.
+
+        Returns:
+            Number of batches adopted
+        """
+        directory = os.path.dirname(self.spool.path) or "."
+        if not os.path.isdir(directory):
+            return 0
+        adopted = 0
+        for name in sorted(os.listdir(directory), key=lambda name: os.path.getmtime(os.path.join(directory, name))):
+            path = os.path.join(directory, name)
+            owner = name[:-len(".spool")].split("-")[0]
+            if not name.endswith(".spool") or path == self.spool.path or _pid_alive(owner):
+                continue
+            with open(path, "rb") as f, self._lock:
+                for line in f:
+                    adopted += self.spool.append(line)
+                self._start_spooling()
+            os.remove(path)
+            logger.info("Adopted spool %s", path)
+        return adopted
+
+    def wait_replayed(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the spool is replayed.
+
+        Returns:
+            True if nothing is left to replay
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.spooling:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self):
+        """Stop the recovery thread (the spool file stays for the next start)"""
+        self._closed.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def status(self) -> Dict[str, Any]:
+        """Whether writes are spooled, spool depth and size, and the last replay"""
+        return {
+            "spooling": self.spooling,
+            "available": self.available,
+            "depth": self.spool.pending,
+            "bytes": self.spool.size - self.spool.offset,
+            "path": self.spool.path,
+            "last_replay": self.last_replay
+        }
+
+
+def _is_write(name: str, args: tuple) -> bool:
+    """Whether a command changes data (scripts defined as read-only do not)"""
+    if name == "evalsha" and script_read_only(args[0]):
+        return False
+    return name in WRITE_COMMANDS
+
+
+def _spooled(name: str, args: tuple, kwargs: dict) -> list:
+    """Spool entry of a command; EVALSHA is spooled as EVAL, as Redis may lose its scripts before the replay"""
+    if name == "evalsha" and script_source(args[0]) is not None:
+        return ["eval", [script_source(args[0])] + list(args[1:]), kwargs]
+    return [name, list(args), kwargs]
+
+
+def _pid_alive(pid: str) -> bool:
+    """Whether a spool's owner process is running"""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,259 @@
+"""
+Batch reprocessing of stored swings for GolfIMU backend
+
+When analyzers change, every stored swing has to be re-analyzed. Swings are
+enumerated per session straight from Redis. Each is decoded into columnar
+rows without pydantic validation. Swings go to a process pool in chunks of
+REPROCESS_CHUNK_SIZE, as raw float64 buffers rather than pickled IMUData
+lists. Each finished chunk is written back with one pipelined round trip
+while the workers carry on. Swings whose stored metrics already carry the
+current analyzer version and input hash are skipped. A checkpoint file
+records the finished swings, so an interrupted run resumes where it
+stopped.
+"""
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .analytics_pipeline import AnalyticsPipeline, swing_input_hash
+from .imu_batch import IMUBatch
+from .models import ProcessedMetrics, SessionConfig
+from .redis_manager import RedisManager
+from .swing_quality import QUALITY_SCORES
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import REPROCESS_WORKERS, REPROCESS_CHUNK_SIZE, REPROCESS_CHECKPOINT_FILE
+
+CHECKPOINT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               REPROCESS_CHECKPOINT_FILE)
+
+# (swing_id, float64 row bytes) pairs shipped to a worker
+WorkUnit = List[Tuple[str, bytes]]
+
+# (swing_id, metrics or None, error or None) per swing of a work unit
+ChunkResult = List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]
+
+_worker_pipeline: Optional[AnalyticsPipeline] = None
+
+
+def _init_worker():
+    """Build the per-process pipeline once, not per chunk"""
+    global _worker_pipeline
+    _worker_pipeline = AnalyticsPipeline(max_workers=1)
+
+
+def process_chunk(session_config: SessionConfig, swings: WorkUnit) -> ChunkResult:
+    """Analyze one work unit (runs in a worker process).
+
+    Args:
+        session_config: Session the swings belong to
+        swings: (swing_id, IMUBatch.to_bytes()) pairs
+
+    Returns:
+        (swing_id, metrics, error) per swing
+    """
+    pipeline = _worker_pipeline or AnalyticsPipeline(max_workers=1)
+
+    results: ChunkResult = []
+    for swing_id, payload in swings:
+        try:
+            metrics = pipeline.run_batch(IMUBatch.from_bytes(payload), session_config)
+            results.append((swing_id, metrics, None))
+        except Exception as e:
+            results.append((swing_id, None, str(e)))
+    return results
+
+
+class SwingReprocessor:
+    """Recomputes processed metrics for every stored swing"""
+
+    def __init__(self, redis_manager: Optional[RedisManager] = None,
+                 workers: int = REPROCESS_WORKERS,
+                 chunk_size: int = REPROCESS_CHUNK_SIZE,
+                 checkpoint_path: Optional[str] = CHECKPOINT_FILE):
+        """Initialize the reprocessor.
+
+        Args:
+            redis_manager: Redis manager to read swings from and write to
+            workers: Worker processes; 1 analyzes inline
+            chunk_size: Swings per work unit and per write
+            checkpoint_path: Checkpoint file (no checkpointing if None)
+        """
+        self.redis_manager = redis_manager or RedisManager()
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.checkpoint_path = checkpoint_path
+        self.completed: Dict[str, Set[str]] = {}
+        self.analyzer_version = AnalyticsPipeline(max_workers=1).version
+
+    def load_checkpoint(self):
+        """Load the finished swings of a previous run"""
+        self.completed = {}
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                data = json.load(f)
+            self.completed = {sid: set(ids) for sid, ids in data.get("completed", {}).items()}
+        except Exception as e:
+            print(f"Error loading reprocessing checkpoint: {e}")
+
+    def save_checkpoint(self):
+        """Atomically write the finished swings"""
+        if not self.checkpoint_path:
+            return
+
+        try:
+            directory = os.path.dirname(self.checkpoint_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{self.checkpoint_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"completed": {sid: sorted(ids) for sid, ids in self.completed.items()}}, f)
+            os.replace(tmp_path, self.checkpoint_path)
+        except Exception as e:
+            print(f"Error saving reprocessing checkpoint: {e}")
+
+    def clear_checkpoint(self):
+        """Forget previous progress so every swing is reprocessed"""
+        self.completed = {}
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    def iter_work_units(self, session_ids: Iterable[str]
+                        ) -> Iterator[Tuple[SessionConfig, WorkUnit, Dict[str, str]]]:
+        """Yield chunks of stale swings with their input hashes, session by session"""
+        for session_id in session_ids:
+            session_config = self.redis_manager.get_session_config(session_id)
+            if session_config is None:
+                continue
+
+            done = self.completed.get(session_id, set())
+            swings = []
+            for swing_json in self.redis_manager.get_raw_swings(session_id):
+                try:
+                    swing_dict = json.loads(swing_json)
+                    if swing_dict["swing_id"] in done:
+                        continue
+                    batch = IMUBatch.from_point_dicts(swing_dict["imu_data_points"])
+                except Exception as e:
+                    print(f"Error decoding stored swing in session {session_id}: {e}")
+                    continue
+                swings.append((swing_dict["swing_id"], batch))
+
+            stored = self.redis_manager.get_processed_metrics_bulk(
+                session_config, [swing_id for swing_id, _ in swings])
+
+            chunk: WorkUnit = []
+            hashes: Dict[str, str] = {}
+            for swing_id, batch in swings:
+                input_hash = swing_input_hash(batch, session_config)
+                current = stored.get(swing_id)
+                if (current is not None and current.analyzer_version == self.analyzer_version
+                        and current.input_hash == input_hash):
+                    continue
+
+                chunk.append((swing_id, batch.to_bytes()))
+                hashes[swing_id] = input_hash
+                if len(chunk) >= self.chunk_size:
+                    yield session_config, chunk, hashes
+                    chunk, hashes = [], {}
+
+            if chunk:
+                yield session_config, chunk, hashes
+
+    def _write_results(self, session_config: SessionConfig, results: ChunkResult,
+                       hashes: Dict[str, str], report: Dict[str, Any]):
+        """Write one finished chunk back and checkpoint it"""
+        processed = [
+            ProcessedMetrics(swing_id=swing_id, session_id=session_config.session_id, metrics=metrics,
+                             analyzer_version=self.analyzer_version, input_hash=hashes[swing_id])
+            for swing_id, metrics, error in results if error is None
+        ]
+        for swing_id, _, error in results:
+            if error is not None:
+                print(f"Error reprocessing swing {swing_id}: {error}")
+
+        if not self.redis_manager.store_processed_metrics_batch(session_config, processed):
+            report["failed"] += len(results)
+            return
+
+        report["swings"] += len(processed)
+        report["failed"] += len(results) - len(processed)
+        self.completed.setdefault(session_config.session_id, set()).update(
+            metrics.swing_id for metrics in processed
+        )
+        self.save_checkpoint()
+
+    def run(self, session_ids: Optional[Iterable[str]] = None, resume: bool = True) -> Dict[str, Any]:
+        """Reprocess stored swings.
+
+        Args:
+            session_ids: Sessions to reprocess (all stored sessions if None)
+            resume: Skip swings recorded in the checkpoint
+
+        Returns:
+            Report with swing counts, elapsed time and swings per second
+        """
+        if resume:
+            self.load_checkpoint()
+        else:
+            self.clear_checkpoint()
+
+        session_ids = list(session_ids) if session_ids is not None else self.redis_manager.list_session_ids()
+        report: Dict[str, Any] = {"sessions": 0, "swings": 0, "failed": 0}
+        touched: Dict[str, SessionConfig] = {}
+        start = time.perf_counter()
+
+        units = self.iter_work_units(session_ids)
+        if self.workers == 1:
+            for session_config, chunk, hashes in units:
+                touched[session_config.session_id] = session_config
+                self._write_results(session_config, process_chunk(session_config, chunk), hashes, report)
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+                pending = {}
+                exhausted = False
+                while not exhausted or pending:
+                    # Keep a bounded number of chunks in flight so decoding,
+                    # analysis and writes overlap without buffering every swing
+                    while not exhausted and len(pending) < 2 * self.workers:
+                        unit = next(units, None)
+                        if unit is None:
+                            exhausted = True
+                            break
+                        session_config, chunk, hashes = unit
+                        touched[session_config.session_id] = session_config
+                        pending[pool.submit(process_chunk, session_config, chunk)] = (session_config, hashes)
+
+                    if not pending:
+                        break
+
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        session_config, hashes = pending.pop(future)
+                        try:
+                            results = future.result()
+                        except Exception as e:
+                            print(f"Error in reprocessing worker: {e}")
+                            report["failed"] += len(hashes)
+                            continue
+                        self._write_results(session_config, results, hashes, report)
+
+        # Incremental running sums no longer match the rewritten metrics
+        for session_config in touched.values():
+            self.redis_manager.rebuild_running_statistics(session_config, list(QUALITY_SCORES))
+        # ... and so do the trend rollups of their users and clubs
+        for user_id, club_id in sorted({(config.user_id, config.club_id) for config in touched.values()}):
+            self.redis_manager.rebuild_rollups(user_id, club_id)
+
+        elapsed = time.perf_counter() - start
+        report["sessions"] = len(touched)
+        report["elapsed"] = elapsed
+        report["swings_per_second"] = report["swings"] / elapsed if elapsed > 0 else 0.0
+        return report
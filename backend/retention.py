@@ -0,0 +1,224 @@
+"""
+Retention and hot/cold tiering for GolfIMU backend
+
+Redis runs with ``maxmemory-policy volatile-lru``: only keys with a time
+to live may be evicted, so session configs, indexes and metrics are never
+dropped behind the backend's back (a write past ``maxmemory`` fails with
+OOM instead). Memory is instead kept bounded by a background pass that
+moves sessions to segment files (see ``swing_segments.py``):
+
+- age: sessions idle longer than ``hot_age_s`` are demoted whole
+- count: only the newest ``hot_swings`` swings of a session stay in Redis
+- size: while sessions and the query indexes use more than
+  ``RETENTION_MAX_HOT_BYTES`` of Redis memory, the least recently active
+  sessions are demoted whole
+
+A session demoted whole leaves its swings, summaries, previews and
+metrics on disk, and its IMU buffers and events get
+``RETENTION_BUFFER_TTL_S``. What stays in Redis per swing is its member
+in the session, user, club and metric indexes and nothing else; those
+count against the budget. ``hot_age_s`` and ``hot_swings`` can be set
+per user in ``RETENTION_USER_POLICIES``. Active sessions are never
+demoted whole. Demoted swings are promoted back when read
+(``RedisManager.get_swing``), and a cold session's hashes on the first
+read that misses them (``RedisManager.promote_session_hashes``).
+"""
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    RETENTION_BUFFER_TTL_S, RETENTION_HOT_AGE_S, RETENTION_HOT_SWINGS, RETENTION_INTERVAL_S,
+    RETENTION_MAX_HOT_BYTES, RETENTION_USER_POLICIES
+)
+
+logger = get_logger("retention")
+
+RETENTION_PASSES = TELEMETRY.counter("golfimu_retention_passes_total", "Retention passes run")
+RETENTION_HOT_BYTES = TELEMETRY.gauge("golfimu_retention_hot_bytes",
+                                      "Redis memory of sessions and query indexes after the last retention pass")
+
+
+class RetentionManager:
+    """Background task demoting swings from Redis to segment files by policy"""
+
+    def __init__(self, redis_manager, active_sessions: Optional[Callable[[], Iterable[str]]] = None,
+                 interval: float = RETENTION_INTERVAL_S, hot_age_s: float = RETENTION_HOT_AGE_S,
+                 hot_swings: int = RETENTION_HOT_SWINGS, max_hot_bytes: int = RETENTION_MAX_HOT_BYTES,
+                 user_policies: Optional[Dict[str, Dict[str, Any]]] = None):
+        """Initialize the manager.
+
+        Args:
+            redis_manager: RedisManager holding the sessions and the cold store
+            active_sessions: Ids of sessions being recorded (never demoted whole)
+            interval: Seconds between passes of the background thread
+            hot_age_s: Idle time after which a session is demoted whole
+            hot_swings: Newest swings per session kept in Redis
+            max_hot_bytes: Redis memory budget of all sessions and the query indexes
+            user_policies: user_id -> overrides of ``hot_age_s`` and ``hot_swings``
+        """
+        self.redis_manager = redis_manager
+        self.active_sessions = active_sessions or (lambda: ())
+        self.interval = interval
+        self.hot_age_s = hot_age_s
+        self.hot_swings = hot_swings
+        self.max_hot_bytes = max_hot_bytes
+        self.user_policies = RETENTION_USER_POLICIES if user_policies is None else user_policies
+        self.last_report: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def policy_for(self, user_id: str) -> Dict[str, Any]:
+        """``hot_age_s`` and ``hot_swings`` applying to a user's sessions"""
+        policy = {"hot_age_s": self.hot_age_s, "hot_swings": self.hot_swings}
+        policy.update(self.user_policies.get(user_id, {}))
+        return policy
+
+    def _last_activity(self, session_id: str, session_start: float) -> float:
+        """Start time of the session's newest swing, or of the session if it has none"""
+        newest = self.redis_manager.redis_client.zrevrangebyscore(
+            f"session:{session_id}:swing_index", "+inf", "-inf", start=0, num=1, withscores=True)
+        return max([session_start] + [score for _, score in newest])
+
+    def _demote(self, session_id: str, keep: int, report: Dict[str, Any]) -> bool:
+        """Demote a session's swings past the newest ``keep``, counting them in the report"""
+        try:
+            demoted = self.redis_manager.demote_swings(session_id, keep)
+            report["demoted_swings"] += demoted
+            if demoted:
+                report["demoted_sessions"].append(session_id)
+            return True
+        except Exception as e:
+            report["errors"] += 1
+            logger.error("Error demoting swings of session %s: %s", session_id, e)
+            return False
+
+    def _demote_whole(self, session_id: str, report: Dict[str, Any]) -> bool:
+        """Demote a session's swings and hashes and let its raw feeds expire"""
+        if not self._demote(session_id, 0, report):
+            return False
+        try:
+            report["demoted_fields"] += self.redis_manager.demote_session_hashes(session_id)
+            self.redis_manager.expire_session_buffers(session_id, RETENTION_BUFFER_TTL_S)
+            return True
+        except Exception as e:
+            report["errors"] += 1
+            logger.error("Error demoting hashes of session %s: %s", session_id, e)
+            return False
+
+    def run_once(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """Apply the age, count and size policies to every stored session.
+
+        Args:
+            now: Current time (epoch seconds)
+
+        Returns:
+            Sessions seen, swings, hash fields and sessions demoted, errors,
+            and Redis bytes of sessions and query indexes left
+        """
+        now = time.time() if now is None else now
+        active = set(self.active_sessions())
+        report = {"sessions": 0, "demoted_swings": 0, "demoted_fields": 0, "demoted_sessions": [], "errors": 0,
+                  "hot_bytes": 0}
+        sessions: List[Dict[str, Any]] = []
+        user_ids, club_ids = set(), set()
+
+        for session_id in self.redis_manager.list_session_ids():
+            session_config = self.redis_manager.get_session_config(session_id)
+            if session_config is None:
+                continue
+            report["sessions"] += 1
+            user_ids.add(session_config.user_id)
+            club_ids.add(session_config.club_id)
+            policy = self.policy_for(session_config.user_id)
+            try:
+                last_activity = self._last_activity(session_id, session_config.session_start_time.timestamp())
+            except Exception as e:
+                report["errors"] += 1
+                logger.error("Error reading activity of session %s: %s", session_id, e)
+                continue
+
+            cold = session_id not in active and now - last_activity > policy["hot_age_s"]
+            if cold:
+                self._demote_whole(session_id, report)
+            else:
+                self._demote(session_id, policy["hot_swings"], report)
+            sessions.append({"session_id": session_id, "last_activity": last_activity,
+                             "active": session_id in active, "cold": cold})
+
+        # Size: least recently active sessions go cold until the budget is met
+        for session in sessions:
+            session["bytes"] = self._measure(session["session_id"], report)
+        try:
+            index_bytes = self.redis_manager.query_index_bytes(user_ids, club_ids)
+        except Exception as e:
+            report["errors"] += 1
+            index_bytes = 0
+            logger.error("Error measuring query indexes: %s", e)
+        hot_bytes = index_bytes + sum(session["bytes"] for session in sessions)
+        for session in sorted(sessions, key=lambda session: session["last_activity"]):
+            if hot_bytes <= self.max_hot_bytes:
+                break
+            if session["active"] or session["cold"] or not session["bytes"]:
+                continue
+            if self._demote_whole(session["session_id"], report):
+                hot_bytes -= session["bytes"] - self._measure(session["session_id"], report)
+        if hot_bytes > self.max_hot_bytes:
+            logger.warning("Active sessions, cold sessions' indexes and query indexes hold %s bytes, "
+                           "over the %s byte budget", hot_bytes, self.max_hot_bytes)
+
+        report["hot_bytes"] = hot_bytes
+        RETENTION_HOT_BYTES.set(hot_bytes)
+        RETENTION_PASSES.inc()
+        self.last_report = report
+        return report
+
+    def _measure(self, session_id: str, report: Dict[str, Any]) -> int:
+        """Redis bytes of a session's keys (0 if they cannot be measured)"""
+        try:
+            return self.redis_manager.hot_session_bytes(session_id)
+        except Exception as e:
+            report["errors"] += 1
+            logger.error("Error measuring session %s: %s", session_id, e)
+            return 0
+
+    def _run(self):
+        """Run a pass every ``interval`` seconds until stopped"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error("Error in retention pass: %s", e)
+
+    def start(self):
+        """Start the background thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="retention", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background thread (a running pass finishes first)"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def status(self) -> Dict[str, Any]:
+        """Whether the task runs, its policy and the last pass' report"""
+        return {
+            "running": self._thread is not None,
+            "interval_s": self.interval,
+            "hot_age_s": self.hot_age_s,
+            "hot_swings": self.hot_swings,
+            "max_hot_bytes": self.max_hot_bytes,
+            "last_pass": self.last_report
+        }
@@ -0,0 +1,115 @@
+"""
+Per-user, per-club trend rollups for GolfIMU backend
+
+Trend charts of speed, tempo and consistency over months would otherwise
+load every swing. As metrics are stored, each value in ``ROLLUP_METRICS``
+is folded into a day and a week bucket of the swing's user and club:
+
+- ``rollup:{user_id}:{club_id}:{period}:{bucket}`` hash holding, per
+  metric, ``count``, ``sum``, ``sumsq`` and the counts ``b0`` .. of a
+  fixed histogram (``ROLLUP_METRICS`` gives its range and bins; values
+  outside it land in the edge bins)
+- ``rollup:{user_id}:{club_id}:{period}`` sorted set of bucket names (the
+  bucket's first day, ISO), scored by the bucket's start time
+
+A trend reads one hash per bucket, whatever the number of swings in it:
+count, mean, standard deviation (consistency) and ``ROLLUP_PERCENTILES``
+interpolated from the histogram. Weeks start on Monday.
+
+Sums cannot take a value back, so only swings whose metrics are stored for
+the first time are added. Storing metrics again (reprocessing, a retry)
+instead marks the user's rollups of the club stale in ``ROLLUP_STALE_KEY``,
+and they are rebuilt from the stored metrics
+(``RedisManager.rebuild_rollups``) before the next trend is read.
+"""
+import json
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import ROLLUP_METRICS, ROLLUP_PERCENTILES
+
+ROLLUP_PERIODS = ("day", "week")
+# Set of (user, club) rollups to rebuild before they are read again
+ROLLUP_STALE_KEY = "rollups:stale"
+
+
+def bucket_start(when: datetime, period: str) -> datetime:
+    """Start of the day or week bucket holding ``when``"""
+    day = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday()) if period == "week" else day
+
+
+def rollup_key(user_id: str, club_id: str, period: str, bucket: str) -> str:
+    """Key of one bucket's hash"""
+    return f"rollup:{user_id}:{club_id}:{period}:{bucket}"
+
+
+def rollup_index_key(user_id: str, club_id: str, period: str) -> str:
+    """Key of the sorted set of a user's buckets for a club and period"""
+    return f"rollup:{user_id}:{club_id}:{period}"
+
+
+def rollup_stale_member(user_id: str, club_id: str) -> str:
+    """Member of ``ROLLUP_STALE_KEY`` naming a user's rollups of a club"""
+    return json.dumps([user_id, club_id])
+
+
+def rollup_values(metrics: Dict[str, Any]) -> Dict[str, float]:
+    """The finite numeric values of ``ROLLUP_METRICS`` in a swing's metrics"""
+    return {name: float(metrics[name]) for name in ROLLUP_METRICS
+            if isinstance(metrics.get(name), (int, float)) and math.isfinite(metrics[name])}
+
+
+def rollup_increments(values: Dict[str, float]) -> Dict[str, Any]:
+    """Bucket hash increments for one swing (ints for counts, floats for sums)"""
+    increments: Dict[str, Any] = {}
+    for name, value in values.items():
+        low, high, bins = ROLLUP_METRICS[name]
+        index = min(max(int((value - low) / (high - low) * bins), 0), bins - 1)
+        increments[f"{name}:count"] = 1
+        increments[f"{name}:sum"] = value
+        increments[f"{name}:sumsq"] = value * value
+        increments[f"{name}:b{index}"] = 1
+    return increments
+
+
+def bucket_fields(name: str) -> List[str]:
+    """Hash fields a trend of ``name`` reads from each bucket"""
+    bins = ROLLUP_METRICS[name][2]
+    return [f"{name}:count", f"{name}:sum", f"{name}:sumsq"] + [f"{name}:b{index}" for index in range(bins)]
+
+
+def bucket_statistics(name: str, values: Sequence[Optional[str]]) -> Dict[str, Any]:
+    """Count, mean, std and percentiles of a metric from its ``bucket_fields`` values.
+
+    Args:
+        name: Metric
+        values: Values of ``bucket_fields(name)`` (None for missing fields)
+
+    Returns:
+        count, mean, std and ``p<N>`` per ``ROLLUP_PERCENTILES`` (percentiles
+        are interpolated within histogram bins)
+    """
+    count = int(values[0] or 0)
+    if count <= 0:
+        return {"count": 0}
+    mean = float(values[1] or 0.0) / count
+    variance = max(float(values[2] or 0.0) / count - mean * mean, 0.0)
+    statistics = {"count": count, "mean": mean, "std": variance ** 0.5}
+
+    low, high, bins = ROLLUP_METRICS[name]
+    width = (high - low) / bins
+    counts = [int(value or 0) for value in values[3:]]
+    for percentile in ROLLUP_PERCENTILES:
+        target = percentile / 100.0 * count
+        cumulative = 0
+        for index, in_bin in enumerate(counts):
+            if in_bin and cumulative + in_bin >= target:
+                statistics[f"p{percentile}"] = low + width * (index + (target - cumulative) / in_bin)
+                break
+            cumulative += in_bin
+    return statistics
@@ -0,0 +1,299 @@
+"""
+On-demand runtime profiling for GolfIMU backend
+
+Profiling is toggled from the REPL while a session runs, with no restart:
+
+- ``sampling`` (default): a background thread reads every thread's stack
+  each ``PROFILE_SAMPLE_INTERVAL_MS``. The profiled threads do nothing extra,
+  so the ingest path keeps its speed. The report is collapsed stacks (for
+  flamegraph.pl / speedscope) plus the top functions by samples.
+- ``cprofile``: deterministic profiling of the ingest and analytics threads.
+  cProfile only sees the thread that enabled it, so those threads call
+  ``PROFILER.checkpoint()`` once per loop iteration and attach or detach
+  themselves there. The check is an attribute test while profiling is off.
+  Each run is a new generation: a thread still holding a profile of an
+  earlier run drops it at its next checkpoint. Thread pools registered with
+  ``register_pool`` have their idle workers run a checkpoint at stop, since
+  they would not reach one on their own. The profiling itself roughly
+  halves Python throughput, so prefer ``sampling`` at high sample rates.
+
+``memory_snapshot`` starts tracemalloc on first use and writes the top
+allocation sites, plus the growth since the previous snapshot.
+
+All reports go to timestamped files in ``PROFILE_OUTPUT_DIR``.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    PROFILE_OUTPUT_DIR, PROFILE_SAMPLE_INTERVAL_MS, PROFILE_STOP_TIMEOUT_S, PROFILE_TOP_N,
+    PROFILE_TRACEMALLOC_FRAMES
+)
+
+PROFILE_MODES = ("sampling", "cprofile")
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), PROFILE_OUTPUT_DIR)
+
+# Allocations made by the snapshot machinery itself
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+
+class RuntimeProfiler:
+    """Sampling / cProfile profiler and tracemalloc snapshots that can be toggled at runtime"""
+
+    def __init__(self, output_dir: str = PROFILE_DIR,
+                 sample_interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS):
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval_ms / 1000.0
+        self.mode: Optional[str] = None
+        self.started_at = 0.0
+        self._lock = threading.Lock()
+
+        # cProfile mode: per-thread (generation, profile), attached at checkpoints
+        self._cprofile_active = False
+        self._generation = 0
+        self._attached = 0  # Profiles of the current generation still enabled
+        self._enabled = 0   # Profiles of any generation still enabled
+        self._local = threading.local()
+        self._finished: List[cProfile.Profile] = []
+        self._threads: List[str] = []
+        self._pools: "weakref.WeakSet" = weakref.WeakSet()
+
+        # Sampling mode
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+
+    @property
+    def active(self) -> bool:
+        """Whether a profile is being recorded"""
+        return self.mode is not None
+
+    def start(self, mode: str = "sampling") -> bool:
+        """Start profiling.
+
+        Args:
+            mode: "sampling" or "cprofile"
+
+        Returns:
+            True if started, False if already running or the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            print(f"Unknown profile mode '{mode}' (use {' or '.join(PROFILE_MODES)})")
+            return False
+        with self._lock:
+            if self.mode is not None:
+                print(f"Profiler already running ({self.mode})")
+                return False
+            self.mode = mode
+            self.started_at = time.perf_counter()
+            if mode == "cprofile":
+                self._generation += 1
+                self._finished, self._threads, self._attached = [], [], 0
+                self._cprofile_active = True
+            else:
+                self._stacks, self._samples = Counter(), 0
+                self._stop_sampling.clear()
+                self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+                self._sampler.start()
+        return True
+
+    def stop(self) -> Optional[Dict[str, str]]:
+        """Stop profiling and write the report.
+
+        Returns:
+            Paths of the written files by kind, or None if not running
+        """
+        with self._lock:
+            mode, self.mode = self.mode, None
+            if mode is None:
+                print("Profiler is not running")
+                return None
+            duration = time.perf_counter() - self.started_at
+            if mode == "cprofile":
+                self._cprofile_active = False
+            else:
+                self._stop_sampling.set()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        if mode == "cprofile":
+            return self._write_cprofile(duration)
+        self._sampler.join()
+        return self._write_sampling(duration)
+
+    def register_pool(self, pool):
+        """Have a thread pool's idle workers detached when a cProfile run stops.
+
+        Args:
+            pool: Object whose ``checkpoint_workers()`` runs ``checkpoint`` on
+                each of its worker threads (held weakly)
+        """
+        self._pools.add(pool)
+
+    def checkpoint(self):
+        """Attach or detach the calling thread's cProfile.
+
+        Call once per iteration of a hot loop. Does nothing in sampling mode
+        or while profiling is off.
+        """
+        if not self._cprofile_active and not self._enabled:
+            return
+        state = getattr(self._local, "profile", None)
+        if state is not None and (not self._cprofile_active or state[0] != self._generation):
+            generation, profile = state
+            profile.disable()
+            self._local.profile = state = None
+            with self._lock:
+                self._enabled -= 1
+                # A profile of an earlier run missed its report and is dropped
+                if generation == self._generation:
+                    self._finished.append(profile)
+                    self._attached -= 1
+        if self._cprofile_active and state is None:
+            profile = cProfile.Profile()
+            with self._lock:
+                self._enabled += 1
+                self._attached += 1
+                self._threads.append(threading.current_thread().name)
+                self._local.profile = (self._generation, profile)
+            profile.enable()
+
+    def _write_cprofile(self, duration: float) -> Dict[str, str]:
+        # The calling thread may be one of the profiled ones; pool workers
+        # are handed a checkpoint and the others detach at their next one
+        self.checkpoint()
+        for pool in list(self._pools):
+            pool.checkpoint_workers()
+        deadline = time.perf_counter() + PROFILE_STOP_TIMEOUT_S
+        while self._attached and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+        with self._lock:
+            profiles, threads, missing = list(self._finished), list(self._threads), self._attached
+        base = os.path.join(self.output_dir, f"profile_{_timestamp()}")
+        paths = {"summary": base + ".txt"}
+
+        with open(paths["summary"], "w") as f:
+            f.write(f"cProfile over {duration:.1f}s of threads: {', '.join(threads) or 'none'}\n")
+            if missing:
+                f.write(f"{missing} thread(s) did not reach a checkpoint within {PROFILE_STOP_TIMEOUT_S}s "
+                        "and are not included\n")
+            if profiles:
+                stats = pstats.Stats(profiles[0], stream=f)
+                for profile in profiles[1:]:
+                    stats.add(profile)
+                paths["stats"] = base + ".prof"
+                stats.dump_stats(paths["stats"])
+                stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        return paths
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop_sampling.wait(self.sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self._samples += 1
+
+    def _write_sampling(self, duration: float) -> Dict[str, str]:
+        base = os.path.join(self.output_dir, f"profile_{_timestamp()}")
+        paths = {"stacks": base + ".folded", "summary": base + ".txt"}
+
+        with open(paths["stacks"], "w") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        per_thread: Counter = Counter()
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, count in self._stacks.items():
+            thread, *frames = stack.split(";")
+            per_thread[thread] += count
+            if frames:
+                own[f"{thread};{frames[-1]}"] += count
+            for function in set(frames):
+                inclusive[f"{thread};{function}"] += count
+
+        with open(paths["summary"], "w") as f:
+            f.write(f"{self._samples} samples over {duration:.1f}s "
+                    f"(every {self.sample_interval * 1000:.1f} ms)\n\nSamples per thread\n")
+            for thread, count in per_thread.most_common():
+                f.write(f"  {count:8d}  {thread}\n")
+            for title, counts in (("Top functions (own samples)", own),
+                                  ("Top functions (inclusive samples)", inclusive)):
+                f.write(f"\n{title}\n")
+                for key, count in counts.most_common(PROFILE_TOP_N):
+                    thread, function = key.split(";", 1)
+                    share = 100.0 * count / per_thread[thread]
+                    f.write(f"  {count:8d} {share:5.1f}%  [{thread}] {function}\n")
+        return paths
+
+    def memory_snapshot(self, limit: int = PROFILE_TOP_N) -> str:
+        """Write the top allocation sites and the growth since the last snapshot.
+
+        The first call starts tracemalloc, so it only sees allocations made
+        from then on.
+
+        Args:
+            limit: Allocation sites to list
+
+        Returns:
+            Path of the written report
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"memsnap_{_timestamp()}.txt")
+        with open(path, "w") as f:
+            f.write(f"Traced memory: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)\n")
+            if started:
+                f.write("tracemalloc started now; the next memsnap shows growth since this one\n")
+            f.write("\nTop allocation sites\n")
+            for stat in snapshot.statistics("lineno")[:limit]:
+                f.write(f"  {stat}\n")
+            if self._last_snapshot is not None:
+                f.write("\nGrowth since previous snapshot\n")
+                for stat in snapshot.compare_to(self._last_snapshot, "lineno")[:limit]:
+                    f.write(f"  {stat}\n")
+        self._last_snapshot = snapshot
+        return path
+
+    def stop_memory_tracing(self):
+        """Stop tracemalloc and drop the saved snapshot"""
+        tracemalloc.stop()
+        self._last_snapshot = None
+
+
+PROFILER = RuntimeProfiler()
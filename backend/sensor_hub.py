@@ -0,0 +1,424 @@
+"""
+Multi-sensor ingest hub for GolfIMU backend
+
+One backend serves several sensors at once, e.g. one per bay of a range.
+Each sensor is bound to its own session. All sensors share one Redis
+connection pool, one batch writer and one analytics worker pool:
+
+- the ingest thread waits on every sensor port with a single ``select``.
+  It reads the ready ports in round-robin order, at most
+  ``HUB_READ_QUANTUM_BYTES`` per sensor per turn, so a busy sensor cannot
+  starve the others. Decoded frames go to the sensor's ``SharedRing``, and
+  a ``RingSwingScanner`` cuts swings out of it.
+- the batch writer pushes the new samples of every sensor to their Redis
+  IMU buffers with one pipeline per ``HUB_FLUSH_INTERVAL_S``
+- the analytics workers take queued swings from the sensors in turn
+  (``FairQueue``), then store each swing and its metrics
+
+Backpressure is per sensor. While a sensor has ``HUB_MAX_PENDING_SWINGS``
+swings waiting for analytics, the ingest thread stops reading its port.
+Its samples then back up in the OS and firmware buffers, and the other
+sensors keep streaming.
+"""
+import os
+import select
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from .analytics_pipeline import AnalyticsPipeline
+from .frame_codec import decode_binary_frames, decode_json_frames
+from .imu_batch import IMUBatch
+from .ingest_supervisor import FrameClock, RingSwingScanner, ring_swing_data
+from .live_feed import LIVE_FEED
+from .models import SessionConfig
+from .redis_manager import RedisManager
+from .runtime_profiler import PROFILER
+from .shared_ring import SharedRing
+from .structured_log import get_logger
+from .swing_quality import QUALITY_SCORES
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    HUB_ANALYTICS_WORKERS, HUB_FLUSH_INTERVAL_S, HUB_MAX_PENDING_SWINGS, HUB_READ_QUANTUM_BYTES,
+    HUB_SELECT_TIMEOUT_S, HUB_SENSOR_RING_SECONDS, HUB_TURN_INTERVAL_S, IMU_SAMPLE_RATE_HZ, SERIAL_BAUDRATE
+)
+
+logger = get_logger("hub")
+
+# Rows the Redis IMU buffer keeps per session (see ``RedisManager.store_imu_data``)
+IMU_BUFFER_ROWS = 1000
+
+HUB_SAMPLES = TELEMETRY.counter("golfimu_hub_samples_total", "Samples ingested per sensor", labels=("sensor",))
+HUB_SWINGS = TELEMETRY.counter("golfimu_hub_swings_total", "Swings analyzed per sensor", labels=("sensor",))
+HUB_PENDING_SWINGS = TELEMETRY.gauge("golfimu_hub_pending_swings", "Swings of a sensor waiting for analytics",
+                                     labels=("sensor",))
+HUB_PAUSED = TELEMETRY.gauge("golfimu_hub_sensor_paused", "1 while a sensor's reads are paused by backpressure",
+                             labels=("sensor",))
+HUB_PAUSES = TELEMETRY.counter("golfimu_hub_pauses_total", "Times a sensor's reads were paused by backpressure",
+                               labels=("sensor",))
+
+
+class FairQueue:
+    """FIFO queues per key, served round-robin across the keys"""
+
+    def __init__(self):
+        self._queues: Dict[Hashable, deque] = {}
+        # Keys with queued items, in the order they are served next
+        self._ready: deque = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def put(self, key: Hashable, item: Any):
+        """Queue ``item`` behind the other items of ``key``"""
+        with self._condition:
+            queue = self._queues.setdefault(key, deque())
+            queue.append(item)
+            if len(queue) == 1:
+                self._ready.append(key)
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Tuple[Hashable, Any]]:
+        """Next item of the next key in turn.
+
+        Returns:
+            (key, item), or None if nothing arrived within ``timeout`` or
+            the queue was closed
+        """
+        with self._condition:
+            if not self._ready and not self._closed:
+                self._condition.wait(timeout)
+            if not self._ready:
+                return None
+            key = self._ready.popleft()
+            queue = self._queues[key]
+            item = queue.popleft()
+            if queue:
+                self._ready.append(key)
+            return key, item
+
+    def pending(self, key: Hashable) -> int:
+        """Items queued for ``key``"""
+        return len(self._queues.get(key, ()))
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in list(self._queues.values()))
+
+    def close(self):
+        """Wake every waiting ``get``"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class SensorChannel:
+    """One sensor: its serial port, session, sample ring and swing scanner"""
+
+    def __init__(self, name: str, connection, session_config: SessionConfig, frame_format: str,
+                 ring_capacity: int):
+        """Initialize the channel.
+
+        Args:
+            name: Sensor name (telemetry label)
+            connection: Open serial connection with a ``fileno()``
+            session_config: Session the sensor's samples and swings belong to
+            frame_format: "json" or "binary" frames
+            ring_capacity: Samples kept for swing look-back and the batch writer
+        """
+        self.name = name
+        self.connection = connection
+        self.session_config = session_config
+        self.decode = decode_binary_frames if frame_format == "binary" else decode_json_frames
+        self.clock = FrameClock()
+        self.ring = SharedRing.create(ring_capacity)
+        self.scanner = RingSwingScanner(self.ring, session_config)
+        self.pending = b""
+        self.flushed = 0
+        self.paused = False
+        self.bytes_read = 0
+        self.swings_analyzed = 0
+
+    def fileno(self) -> int:
+        return self.connection.fileno()
+
+    def ingest(self, data: bytes, received: float) -> List[Tuple[np.ndarray, int]]:
+        """Decode newly read bytes into the ring and cut out completed swings.
+
+        Args:
+            data: Bytes read from the port
+            received: Host time (epoch seconds) they were read
+
+        Returns:
+            (swing rows, impact index) of every swing completed by the data
+        """
+        self.bytes_read += len(data)
+        self.pending += data
+        t_ms, values, consumed = self.decode(self.pending)
+        self.pending = self.pending[consumed:]
+        if not len(t_ms):
+            return []
+
+        rows = np.column_stack((self.clock.to_host(t_ms, received), values))
+        self.ring.write(rows)
+        LIVE_FEED.publish_samples(self.session_config.session_id, rows)
+        HUB_SAMPLES.labels(self.name).inc(len(t_ms))
+        swings = []
+        while (swing := self.scanner.poll()) is not None or self.scanner.cursor < self.ring.write_seq:
+            if swing is not None:
+                swings.append(swing)
+        return swings
+
+    def unflushed_rows(self) -> Tuple[Optional[np.ndarray], int]:
+        """Samples not yet pushed to Redis, newest ``IMU_BUFFER_ROWS`` only.
+
+        Older samples would be trimmed from the IMU buffer straight away,
+        so they are never serialized.
+
+        Returns:
+            (rows copy or None, sequence the writer has flushed up to afterwards)
+        """
+        write_seq = self.ring.write_seq
+        start = max(self.flushed, write_seq - IMU_BUFFER_ROWS)
+        if start >= write_seq:
+            return None, write_seq
+        return self.ring.copy_range(start, write_seq), write_seq
+
+    def close(self):
+        """Close the port and free the ring"""
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.error("Error closing sensor %s: %s", self.name, e)
+        self.ring.close()
+        self.ring.unlink()
+
+
+class SensorHub:
+    """Concurrent ingest from several sensors into one Redis and analytics backend"""
+
+    def __init__(self, redis_manager: RedisManager, analytics_pipeline: AnalyticsPipeline,
+                 analytics_workers: int = HUB_ANALYTICS_WORKERS,
+                 max_pending_swings: int = HUB_MAX_PENDING_SWINGS,
+                 flush_interval: float = HUB_FLUSH_INTERVAL_S,
+                 read_quantum: int = HUB_READ_QUANTUM_BYTES,
+                 turn_interval: float = HUB_TURN_INTERVAL_S):
+        """Initialize the hub.
+
+        Args:
+            redis_manager: Shared Redis manager (one connection pool)
+            analytics_pipeline: Shared analytics pipeline
+            analytics_workers: Threads analyzing swings
+            max_pending_swings: Queued swings per sensor before its reads pause
+            flush_interval: Batch writer period in seconds
+            read_quantum: Most bytes read from one sensor per turn
+            turn_interval: Least time between ingest turns
+        """
+        self.redis_manager = redis_manager
+        self.analytics_pipeline = analytics_pipeline
+        self.analytics_workers = analytics_workers
+        self.max_pending_swings = max_pending_swings
+        self.flush_interval = flush_interval
+        self.read_quantum = read_quantum
+        self.turn_interval = turn_interval
+
+        self.sensors: Dict[str, SensorChannel] = {}
+        self.swing_queue = FairQueue()
+        self.flushes = 0
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the hub threads are running"""
+        return bool(self._threads)
+
+    def add_sensor(self, name: str, port: str, session_config: SessionConfig, frame_format: str = "json",
+                   baudrate: int = SERIAL_BAUDRATE,
+                   ring_seconds: float = HUB_SENSOR_RING_SECONDS) -> bool:
+        """Open a sensor's port and bind it to a session.
+
+        Args:
+            name: Unique sensor name
+            port: Serial port of the sensor
+            session_config: Session its samples and swings belong to
+            frame_format: "json" or "binary" frames
+            baudrate: Serial baud rate
+            ring_seconds: Seconds of samples kept at ``IMU_SAMPLE_RATE_HZ``
+
+        Returns:
+            True if the sensor was added, False otherwise
+        """
+        import serial
+
+        if name in self.sensors:
+            logger.warning("Sensor %s already added", name)
+            return False
+        try:
+            connection = serial.Serial(port=port, baudrate=baudrate, timeout=0)
+        except Exception as e:
+            logger.error("Error opening sensor %s on %s: %s", name, port, e)
+            return False
+
+        channel = SensorChannel(name, connection, session_config, frame_format,
+                                int(ring_seconds * IMU_SAMPLE_RATE_HZ))
+        HUB_PENDING_SWINGS.labels(name).set_function(lambda: self.swing_queue.pending(name))
+        HUB_PAUSED.labels(name).set_function(lambda: float(channel.paused))
+        self.sensors[name] = channel
+        logger.info("Sensor %s on %s bound to session %s", name, port, session_config.session_id)
+        return True
+
+    def start(self):
+        """Start the ingest, batch writer and analytics threads"""
+        if self._threads:
+            return
+        self._stop.clear()
+        self.swing_queue = FairQueue()
+        self._threads = [threading.Thread(target=self._ingest_loop, name="hub-ingest", daemon=True),
+                         threading.Thread(target=self._writer_loop, name="hub-writer", daemon=True)]
+        self._threads += [threading.Thread(target=self._analytics_loop, name=f"hub-analytics-{i}", daemon=True)
+                          for i in range(self.analytics_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Stop the threads, flush the last samples and close every sensor"""
+        self._stop.set()
+        self.swing_queue.close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        self.flush()
+        for channel in self.sensors.values():
+            channel.close()
+        self.sensors = {}
+
+    def _backlogged(self, channel: SensorChannel) -> bool:
+        """Update and return whether a sensor's reads are paused by backpressure"""
+        backlogged = self.swing_queue.pending(channel.name) >= self.max_pending_swings
+        if backlogged and not channel.paused:
+            HUB_PAUSES.labels(channel.name).inc()
+        channel.paused = backlogged
+        return backlogged
+
+    def _ingest_loop(self):
+        turn = 0
+        while not self._stop.is_set():
+            PROFILER.checkpoint()
+            channels = [channel for channel in list(self.sensors.values()) if not self._backlogged(channel)]
+            if not channels:
+                time.sleep(HUB_SELECT_TIMEOUT_S)
+                continue
+            try:
+                readable, _, _ = select.select(channels, [], [], HUB_SELECT_TIMEOUT_S)
+            except (OSError, ValueError) as e:
+                logger.error("Error waiting for sensor data: %s", e)
+                time.sleep(HUB_SELECT_TIMEOUT_S)
+                continue
+            if not readable:
+                continue
+
+            # Each ready sensor gets one read per turn; the first turn rotates
+            turn += 1
+            started = time.perf_counter()
+            start = turn % len(readable)
+            for channel in readable[start:] + readable[:start]:
+                try:
+                    data = os.read(channel.fileno(), self.read_quantum)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError as e:
+                    logger.error("Error reading sensor %s: %s", channel.name, e)
+                    continue
+                for swing in channel.ingest(data, time.time()):
+                    self.swing_queue.put(channel.name, swing)
+
+            # Decoding costs mostly per call, so let the next reads carry more frames
+            idle = started + self.turn_interval - time.perf_counter()
+            if idle > 0:
+                time.sleep(idle)
+
+    def flush(self) -> bool:
+        """Push every sensor's new samples to Redis in one pipeline.
+
+        Returns:
+            True if stored (or nothing to store), False if Redis failed; the
+            samples are then retried on the next flush
+        """
+        batches, flushed = [], []
+        for channel in list(self.sensors.values()):
+            rows, write_seq = channel.unflushed_rows()
+            if rows is not None:
+                batches.append((self.redis_manager._serialize_imu_rows(rows), channel.session_config))
+            flushed.append((channel, write_seq))
+        if not self.redis_manager.store_imu_entries_batch(batches):
+            return False
+        for channel, write_seq in flushed:
+            channel.flushed = write_seq
+        if batches:
+            self.flushes += 1
+        return True
+
+    def _writer_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            PROFILER.checkpoint()
+            self.flush()
+
+    def _analytics_loop(self):
+        while not self._stop.is_set():
+            PROFILER.checkpoint()
+            item = self.swing_queue.get(timeout=HUB_SELECT_TIMEOUT_S * 10)
+            if item is None:
+                continue
+            name, (rows, impact_index, impact_seq) = item
+            channel = self.sensors.get(name)
+            if channel is None:
+                continue
+            try:
+                self._analyze(channel, rows, impact_index, impact_seq)
+            except Exception as e:
+                logger.error("Error analyzing swing of sensor %s: %s", name, e)
+
+    def _analyze(self, channel: SensorChannel, rows: np.ndarray, impact_index: int, impact_seq: int):
+        """Store one swing of a sensor and its metrics, acknowledging it to the scanner once stored"""
+        session_config = channel.session_config
+        swing_data = ring_swing_data(rows, impact_index, session_config)
+        if not self.redis_manager.store_swing_data(swing_data, session_config):
+            logger.error("Swing of sensor %s not stored, its scanner stays at the impact", channel.name)
+            return
+        channel.scanner.ack(impact_seq)
+        processed = self.analytics_pipeline.run_swing_batch(IMUBatch.from_rows(rows), swing_data.swing_id,
+                                                            session_config)
+        metrics = processed.metrics
+        self.redis_manager.store_processed_metrics(processed, session_config, {
+            name: metrics[name] for name in QUALITY_SCORES if metrics.get(name) is not None
+        }, swing_start_time=swing_data.swing_start_time)
+        channel.swings_analyzed += 1
+        HUB_SWINGS.labels(channel.name).inc()
+        logger.info("Sensor %s swing %s: %.1f m/s", channel.name, swing_data.swing_id,
+                    metrics["club_head_speed"])
+
+    def status(self) -> Dict[str, Any]:
+        """Per-sensor ingest, backpressure and analytics counts"""
+        return {
+            "running": self.running,
+            "flushes": self.flushes,
+            "pending_swings": len(self.swing_queue),
+            "sensors": {
+                name: {
+                    "port": channel.connection.port,
+                    "session_id": channel.session_config.session_id,
+                    "samples": channel.ring.write_seq,
+                    "bytes": channel.bytes_read,
+                    "flushed": channel.flushed,
+                    "pending_swings": self.swing_queue.pending(name),
+                    "swings_analyzed": channel.swings_analyzed,
+                    "paused": channel.paused,
+                }
+                for name, channel in list(self.sensors.items())
+            }
+        }
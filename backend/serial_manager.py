@@ -9,7 +9,19 @@ import json
 from datetime import datetime
 
 from .config import settings
+from .latency_trace import LATENCY_TRACER
 from .models import IMUData, SwingData
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+logger = get_logger("serial")
+
+SERIAL_BYTES = TELEMETRY.counter("golfimu_serial_bytes_total", "Bytes read from the serial link")
+SERIAL_FRAMES = TELEMETRY.counter("golfimu_serial_frames_total", "IMU frames parsed from the serial link")
+SERIAL_PARSE_ERRORS = TELEMETRY.counter("golfimu_serial_parse_errors_total",
+                                        "Serial data lines that failed to parse")
+FIRMWARE_SWINGS = TELEMETRY.counter("golfimu_swings_total", "Complete swings detected",
+                                    labels=("source",)).labels("firmware")
 
 
 class SerialManager:
@@ -50,7 +62,7 @@ class SerialManager:
             if port is None:
                 port = self.find_arduino_port()
                 if port is None:
-                    print("No Arduino port found automatically")
+                    logger.warning("No Arduino port found automatically")
                     return False
             
             self.serial_connection = serial.Serial(
@@ -63,11 +75,11 @@ class SerialManager:
             time.sleep(2)
             
             self.is_connected = True
-            print(f"Connected to Arduino on {port}")
+            logger.info("Connected to Arduino on %s", port)
             return True
             
         except Exception as e:
-            print(f"Error connecting to Arduino: {e}")
+            logger.error("Error connecting to Arduino: %s", e)
             self.is_connected = False
             return False
     
@@ -76,7 +88,7 @@ class SerialManager:
         if self.serial_connection and self.serial_connection.is_open:
             self.serial_connection.close()
         self.is_connected = False
-        print("Disconnected from Arduino")
+        logger.info("Disconnected from Arduino")
     
     def wait_for_swing_data(self) -> Optional[SwingData]:
         """Wait for complete swing data from Arduino.
@@ -85,13 +97,16 @@ class SerialManager:
             SwingData object if received, None otherwise
         """
         if not self.is_connected or not self.serial_connection:
-            print("Not connected to Arduino - cannot wait for swing data")
+            logger.warning("Not connected to Arduino - cannot wait for swing data")
             return None
         
         try:
             # Wait for swing data transmission with timeout
             # Arduino will send a complete swing after impact detection
-            line = self.serial_connection.readline().decode('utf-8').strip()
+            raw = self.serial_connection.readline()
+            received = time.perf_counter()
+            SERIAL_BYTES.inc(len(raw))
+            line = raw.decode('utf-8').strip()
             
             if not line:
                 return None
@@ -132,16 +147,23 @@ class SerialManager:
                 swing_type=swing_dict.get("swing_type", "full_swing")
             )
             
+            # The firmware segmented the swing, so its trace starts here
+            LATENCY_TRACER.stamp_sample(received, time.perf_counter())
+            LATENCY_TRACER.start(swing_data.swing_id)
+            FIRMWARE_SWINGS.inc()
+            
             return swing_data
             
         except json.JSONDecodeError as e:
-            print(f"Error parsing swing data JSON: {e}")
+            SERIAL_PARSE_ERRORS.inc()
+            logger.error("Error parsing swing data JSON: %s", e)
             return None
         except KeyError as e:
-            print(f"Missing required field in swing data: {e}")
+            SERIAL_PARSE_ERRORS.inc()
+            logger.error("Missing required field in swing data: %s", e)
             return None
         except Exception as e:
-            print(f"Error reading swing data: {e}")
+            logger.error("Error reading swing data: %s", e)
             return None
     
     def send_session_config(self, session_config) -> bool:
@@ -171,7 +193,7 @@ class SerialManager:
             return True
             
         except Exception as e:
-            print(f"Error sending session config: {e}")
+            logger.error("Error sending session config: %s", e)
             return False
     
     def send_command(self, command: str) -> bool:
@@ -190,7 +212,7 @@ class SerialManager:
             self.serial_connection.write(f"{command}\n".encode('utf-8'))
             return True
         except Exception as e:
-            print(f"Error sending command: {e}")
+            logger.error("Error sending command: %s", e)
             return False
     
     def get_connection_status(self) -> tuple[bool, Optional[str]]:
@@ -238,7 +260,10 @@ class SerialManager:
         
         try:
             # Use timeout to prevent blocking indefinitely
-            line = self.serial_connection.readline().decode('utf-8').strip()
+            raw = self.serial_connection.readline()
+            received = time.perf_counter()
+            SERIAL_BYTES.inc(len(raw))
+            line = raw.decode('utf-8').strip()
             if not line:
                 return None
             
@@ -252,7 +277,7 @@ class SerialManager:
             # Use current time directly - minimal overhead
             timestamp = datetime.now()
             
-            return IMUData(
+            imu_data = IMUData(
                 ax=imu_dict["ax"],
                 ay=imu_dict["ay"],
                 az=imu_dict["az"],
@@ -268,14 +293,18 @@ class SerialManager:
                 qz=imu_dict["qz"],
                 timestamp=timestamp
             )
+            LATENCY_TRACER.stamp_sample(received, time.perf_counter())
+            SERIAL_FRAMES.inc()
+            return imu_data
         
         except (ValueError, KeyError, json.JSONDecodeError) as e:
             # Only print error for lines that look like JSON but failed to parse
             if line.startswith('{') and line.endswith('}'):
-                print(f"Error parsing IMU data: {e}")
+                SERIAL_PARSE_ERRORS.inc()
+                logger.warning("Error parsing IMU data: %s", e, extra={"line": line[:120]})
             return None
         except Exception as e:
-            print(f"Error reading IMU data: {e}")
+            logger.error("Error reading IMU data: %s", e)
             return None
 
     def imu_data_stream(self):
@@ -296,7 +325,7 @@ class SerialManager:
                     # Small delay to prevent busy waiting
                     time.sleep(0.001)
         except Exception as e:
-            print(f"Error in IMU data stream: {e}")
+            logger.error("Error in IMU data stream: %s", e)
             return
 
 
@@ -0,0 +1,168 @@
+"""
+Non-blocking session cleanup for GolfIMU backend
+
+``KEYS`` walks the whole keyspace and ``DEL`` frees every value before
+replying, both on Redis' single thread, so deleting a session stalled
+every client, the 1 kHz ingest writer included. Cleanup here:
+
+- finds keys from the session's key registry (a set every write path adds
+  its key to), and only falls back to ``SCAN MATCH ... COUNT`` for
+  sessions without one
+- removes them with ``UNLINK`` (memory is freed by a Redis background
+  thread), ``CLEANUP_UNLINK_CHUNK`` keys per command and
+  ``CLEANUP_PIPELINE_CHUNKS`` commands per round trip
+- runs bulk purges of many sessions on a background thread, pausing
+  between sessions so other clients keep their share of the server
+"""
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    CLEANUP_PAUSE_S, CLEANUP_PIPELINE_CHUNKS, CLEANUP_SCAN_COUNT, CLEANUP_UNLINK_CHUNK
+)
+
+logger = get_logger("cleanup")
+
+CLEANUP_SESSIONS = TELEMETRY.counter("golfimu_cleanup_sessions_total", "Sessions purged")
+CLEANUP_KEYS = TELEMETRY.counter("golfimu_cleanup_keys_total", "Keys unlinked by session cleanup")
+CLEANUP_SCANS = TELEMETRY.counter("golfimu_cleanup_scans_total", "Session purges that had to SCAN for keys")
+
+
+def session_registry_key(session_id: str) -> str:
+    """Key of the set holding every key a session wrote"""
+    return f"session:{session_id}:keys"
+
+
+def scan_keys(client, pattern: str, count: int = CLEANUP_SCAN_COUNT) -> Iterator[str]:
+    """Keys matching ``pattern``, found with incremental SCAN (never KEYS)"""
+    return client.scan_iter(match=pattern, count=count)
+
+
+def unlink_keys(client, keys: Iterable[str], chunk: int = CLEANUP_UNLINK_CHUNK,
+                chunks_per_pipeline: int = CLEANUP_PIPELINE_CHUNKS) -> int:
+    """Remove keys with pipelined UNLINK commands.
+
+    Args:
+        client: Redis client
+        keys: Keys to remove (consumed lazily, so a SCAN can feed it)
+        chunk: Keys per UNLINK
+        chunks_per_pipeline: UNLINK commands per round trip
+
+    Returns:
+        Number of keys that existed and were removed
+    """
+    removed = 0
+    batch: List[str] = []
+    batch_size = chunk * chunks_per_pipeline
+
+    def flush():
+        pipe = client.pipeline(transaction=False)
+        for i in range(0, len(batch), chunk):
+            pipe.unlink(*batch[i:i + chunk])
+        return sum(pipe.execute())
+
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= batch_size:
+            removed += flush()
+            batch = []
+    if batch:
+        removed += flush()
+    CLEANUP_KEYS.inc(removed)
+    return removed
+
+
+class SessionPurger:
+    """Background thread purging queued sessions one at a time"""
+
+    def __init__(self, redis_manager, pause: float = CLEANUP_PAUSE_S):
+        """Initialize the purger.
+
+        Args:
+            redis_manager: RedisManager whose ``purge_session`` is used
+            pause: Rest between two sessions (s)
+        """
+        self.redis_manager = redis_manager
+        self.pause = pause
+        self.purged = 0
+        self.keys_unlinked = 0
+        self.failed = 0
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def purge(self, session_ids: Iterable[str]) -> int:
+        """Queue sessions for purging (the worker starts on first use).
+
+        Returns:
+            Number of sessions queued
+        """
+        queued = 0
+        for session_id in session_ids:
+            self._queue.put(session_id)
+            queued += 1
+        with self._lock:
+            if queued and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-purger", daemon=True)
+                self._thread.start()
+        return queued
+
+    def _run(self):
+        """Purge queued sessions, exiting once the queue stays empty for a second"""
+        while True:
+            try:
+                session_id = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            try:
+                self.keys_unlinked += self.redis_manager.purge_session(session_id)
+                self.purged += 1
+                CLEANUP_SESSIONS.inc()
+            except Exception as e:
+                self.failed += 1
+                logger.error("Error purging session %s: %s", session_id, e)
+            finally:
+                self._queue.task_done()
+            time.sleep(self.pause)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued session is purged.
+
+        Returns:
+            True if the queue drained within ``timeout``
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout: float = 5.0):
+        """Let the sessions queued so far be purged and the worker exit"""
+        self.wait(timeout)
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=timeout)
+
+    def status(self) -> Dict[str, Any]:
+        """Sessions pending, purged and failed, and keys unlinked"""
+        return {
+            "pending": self._queue.unfinished_tasks,
+            "purged": self.purged,
+            "failed": self.failed,
+            "keys_unlinked": self.keys_unlinked
+        }
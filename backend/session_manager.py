@@ -5,8 +5,13 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime
 import uuid
 
-from .models import SessionConfig, SwingEvent, SwingData
+from .models import SessionConfig, SwingEvent, SwingData, IMUData
 from .redis_manager import RedisManager
+from .impact_metrics import calibrate_face_normal
+from .live_feed import LIVE_FEED
+from .structured_log import get_logger
+
+logger = get_logger("session")
 
 
 class SessionManager:
@@ -38,7 +43,7 @@ class SessionManager:
         # Store session config in Redis
         if self.redis_manager.store_session_config(session_config):
             self.current_session = session_config
-            print(f"Created session {session_config.session_id} for user {user_id} with club {club_id}")
+            logger.info("Created session %s for user %s with club %s", session_config.session_id, user_id, club_id)
             return session_config
         else:
             raise Exception("Failed to create session")
@@ -48,17 +53,17 @@ class SessionManager:
         session_config = self.redis_manager.get_session_config(session_id)
         if session_config:
             self.current_session = session_config
-            print(f"Loaded session {session_id}")
+            logger.info("Loaded session %s", session_id)
             return session_config
         else:
-            print(f"Session {session_id} not found")
+            logger.warning("Session %s not found", session_id)
             return None
     
     def end_session(self) -> bool:
         """End current session"""
         if self.current_session:
             # Could add session end time and summary here
-            print(f"Ended session {self.current_session.session_id}")
+            logger.info("Ended session %s", self.current_session.session_id)
             self.current_session = None
             return True
         return False
@@ -67,7 +72,7 @@ class SessionManager:
         """Clear all data for a session"""
         success = self.redis_manager.clear_session_data(session_id)
         if success:
-            print(f"Cleared data for session {session_id}")
+            logger.info("Cleared data for session %s", session_id)
         return success
     
     def get_current_session(self) -> Optional[SessionConfig]:
@@ -77,7 +82,7 @@ class SessionManager:
     def store_swing_data(self, swing_data: SwingData) -> bool:
         """Store complete swing data for current session"""
         if not self.current_session:
-            print("No active session")
+            logger.warning("No active session")
             return False
         
         # Ensure swing data belongs to current session
@@ -85,16 +90,17 @@ class SessionManager:
         
         success = self.redis_manager.store_swing_data(swing_data, self.current_session)
         if success:
-            print(f"Stored swing data: {swing_data.swing_id}")
+            logger.debug("Stored swing data: %s", swing_data.swing_id,
+                         extra={"session_id": swing_data.session_id, "swing_id": swing_data.swing_id})
         else:
-            print(f"Failed to store swing data: {swing_data.swing_id}")
+            logger.warning("Failed to store swing data: %s", swing_data.swing_id)
         
         return success
     
     def get_swing_data(self, count: Optional[int] = None) -> List[SwingData]:
         """Get swing data for current session"""
         if not self.current_session:
-            print("No active session")
+            logger.warning("No active session")
             return []
         
         return self.redis_manager.get_swing_data(self.current_session, count)
@@ -102,7 +108,7 @@ class SessionManager:
     def log_swing_event(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> Optional[SwingEvent]:
         """Log a swing event for current session"""
         if not self.current_session:
-            print("No active session")
+            logger.warning("No active session")
             return None
         
         event = SwingEvent(
@@ -111,11 +117,13 @@ class SessionManager:
             data=data
         )
         
+        LIVE_FEED.publish_event(event.session_id, event_type, data)
         if self.redis_manager.store_swing_event(event, self.current_session):
-            print(f"Logged swing event: {event_type}")
+            logger.debug("Logged swing event: %s", event_type,
+                         extra={"session_id": event.session_id, "event_type": event_type})
             return event
         else:
-            print(f"Failed to log swing event: {event_type}")
+            logger.warning("Failed to log swing event: %s", event_type)
             return None
     
     def get_session_summary(self) -> Dict[str, Any]:
@@ -150,7 +158,26 @@ class SessionManager:
         
         # Store updated config
         return self.redis_manager.store_session_config(self.current_session)
-    
+
+    def calibrate_face_normal(self, address_points: List[IMUData]) -> Optional[List[float]]:
+        """Calibrate the face normal from an address-position capture"""
+        if not self.current_session:
+            logger.warning("No active session")
+            return None
+
+        try:
+            face_normal = calibrate_face_normal(address_points)
+        except ValueError as e:
+            logger.warning("Face calibration failed: %s", e)
+            return None
+
+        if not self.update_session_config(face_normal_calibration=face_normal):
+            logger.warning("Failed to store face calibration")
+            return None
+
+        logger.info("Calibrated face normal: %s", face_normal)
+        return face_normal
+
     def get_swing_statistics(self) -> Dict[str, Any]:
         """Get swing statistics for current session"""
         if not self.current_session:
@@ -163,7 +190,7 @@ class SessionManager:
         total_duration = sum(swing.swing_duration for swing in swings)
         total_impact_g = sum(swing.impact_g_force for swing in swings)
         
-        return {
+        statistics = {
             "swing_count": len(swings),
             "average_duration": total_duration / len(swings),
             "average_impact_g": total_impact_g / len(swings),
@@ -171,6 +198,12 @@ class SessionManager:
             "max_impact_g": max(swing.impact_g_force for swing in swings),
             "swing_types": list(set(swing.swing_type for swing in swings))
         }
+        
+        quality = self.redis_manager.get_running_statistics(self.current_session)
+        if quality:
+            statistics["quality"] = quality
+        
+        return statistics
     
     def get_imu_buffer(self, count: Optional[int] = None) -> List:
         """Get IMU buffer for current session"""
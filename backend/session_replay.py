@@ -0,0 +1,209 @@
+"""
+Session replay for GolfIMU backend
+
+Streams a recorded session back through the live pipeline with the
+original inter-sample timing, at real time (1×), accelerated (N×) or as
+fast as the pipeline can consume it. Replay exposes the same generator
+interface as ``SerialManager.imu_data_stream`` so a consumer cannot tell a
+recording from the device, and it measures where the time goes:
+
+- schedule lag: how late each sample is delivered relative to its
+  replay-clock due time
+- per-stage lag: time from a sample's due time until each consumer stage
+  (``with replay.stage("store"): ...``) finishes with it
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .frame_codec import FRAME_FIELDS, decode_binary_frames
+from .latency_trace import LATENCY_TRACER, summarize_latencies
+from .models import IMUData
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import IMU_SAMPLE_RATE_HZ, REPLAY_SPEED
+
+
+def load_session_recording(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Load a recorded session with its sample times.
+
+    Accepts the C reader's captures (firmware JSON lines or binary frames,
+    timed by the firmware ``t`` in ms) and the backend's
+    ``imu_{session}.jsonl`` files (timed by the ISO ``timestamp``).
+
+    Args:
+        path: Recording file
+
+    Returns:
+        Tuple of (times in seconds from the first sample (N,),
+        frame values in ``FRAME_FIELDS`` order (N, 13))
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    t_ms, values, _ = decode_binary_frames(raw)
+    if len(values):
+        return _relative_times(t_ms / 1000.0), values
+
+    times, rows = [], []
+    for line in raw.decode('utf-8', errors='ignore').splitlines():
+        line = line.strip()
+        if not line.startswith("{"):
+            continue
+        try:
+            frame = json.loads(line)
+            rows.append([float(frame[name]) for name in FRAME_FIELDS])
+        except (ValueError, KeyError, TypeError):
+            continue
+        timestamp = frame.get("timestamp")
+        times.append(datetime.fromisoformat(timestamp).timestamp() if timestamp
+                     else float(frame.get("t", 0)) / 1000.0)
+
+    if not rows:
+        raise ValueError(f"No IMU frames found in {path}")
+    return _relative_times(np.array(times)), np.array(rows)
+
+
+def _relative_times(times: np.ndarray) -> np.ndarray:
+    """Sample times from zero, never running backwards.
+
+    Recordings without usable timing (all samples stamped alike) are spaced
+    at the configured IMU rate.
+    """
+    times = np.maximum.accumulate(np.asarray(times, dtype=np.float64))
+    if len(times) > 1 and times[-1] == times[0]:
+        return np.arange(len(times)) / IMU_SAMPLE_RATE_HZ
+    return times - times[0] if len(times) else times
+
+
+class SessionReplay:
+    """Replays a recorded session as a live IMU data stream"""
+
+    def __init__(self, path: Optional[str] = None, speed: float = REPLAY_SPEED,
+                 times: Optional[np.ndarray] = None, values: Optional[np.ndarray] = None):
+        """Initialize the replay.
+
+        Args:
+            path: Recording to replay (see ``load_session_recording``)
+            speed: Playback speed multiplier (0 replays as fast as possible)
+            times: Sample times in seconds, instead of ``path``
+            values: Frame values (N, 13), instead of ``path``
+        """
+        if path is not None:
+            times, values = load_session_recording(path)
+        if times is None or values is None:
+            raise ValueError("A recording path or times and values are required")
+        if speed < 0:
+            raise ValueError("Replay speed must be >= 0")
+
+        self.times = _relative_times(times)
+        self.values = np.asarray(values, dtype=np.float64).reshape(-1, len(FRAME_FIELDS))
+        self.speed = speed
+        self.is_connected = False
+
+        self._due = 0.0
+        self._schedule_lag: List[float] = []
+        self._stage_time: Dict[str, List[float]] = {}
+        self._stage_lag: Dict[str, List[float]] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._delivered = 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def recorded_rate(self) -> float:
+        """Sample rate of the recording in Hz"""
+        if len(self.times) < 2 or self.times[-1] <= 0:
+            return float(IMU_SAMPLE_RATE_HZ)
+        return (len(self.times) - 1) / float(self.times[-1])
+
+    def stop(self):
+        """Stop the stream after the current sample"""
+        self.is_connected = False
+
+    def imu_data_stream(self) -> Iterator[IMUData]:
+        """Generator that yields the recorded IMU data on the replay clock.
+
+        Sample timestamps keep the recorded spacing from the moment the
+        replay starts, whatever the playback speed.
+
+        Yields:
+            IMUData objects as they fall due
+        """
+        self.is_connected = True
+        self._started = time.perf_counter()
+        wall_start = datetime.now()
+        rows = self.values.tolist()
+
+        try:
+            for offset, row in zip(self.times.tolist(), rows):
+                if not self.is_connected:
+                    break
+
+                if self.speed:
+                    self._due = self._started + offset / self.speed
+                    wait = self._due - time.perf_counter()
+                    if wait > 0:
+                        time.sleep(wait)
+                else:
+                    self._due = time.perf_counter()
+                received = time.perf_counter()
+                self._schedule_lag.append(max(received - self._due, 0.0))
+
+                imu_data = IMUData(**dict(zip(FRAME_FIELDS, row)),
+                                   timestamp=wall_start + timedelta(seconds=offset))
+                LATENCY_TRACER.stamp_sample(received, time.perf_counter())
+                self._delivered += 1
+                yield imu_data
+        finally:
+            self._finished = time.perf_counter()
+            self.is_connected = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time one consumer stage for the sample just yielded.
+
+        Args:
+            name: Stage name used in the report
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._stage_time.setdefault(name, []).append(end - start)
+            self._stage_lag.setdefault(name, []).append(max(end - self._due, 0.0))
+
+    def report(self) -> Dict[str, Any]:
+        """Achieved versus target rate and lag statistics.
+
+        Returns:
+            Dictionary with sample counts, rates, schedule lag and, per stage,
+            the stage's own duration and the lag from due time to completion
+            (each as p50 / p95 / p99 / max in ms)
+        """
+        end = self._finished if self._finished is not None else time.perf_counter()
+        elapsed = end - self._started if self._started is not None else 0.0
+        target_rate = self.recorded_rate * self.speed if self.speed else None
+
+        return {
+            "samples": self._delivered,
+            "recorded_samples": len(self),
+            "speed": self.speed if self.speed else "max",
+            "elapsed": elapsed,
+            "target_rate": target_rate,
+            "achieved_rate": self._delivered / elapsed if elapsed > 0 else 0.0,
+            "schedule_lag": summarize_latencies(self._schedule_lag),
+            "stages": {
+                name: {"time": summarize_latencies(durations), "lag": summarize_latencies(self._stage_lag[name])}
+                for name, durations in self._stage_time.items()
+            }
+        }
@@ -0,0 +1,211 @@
+"""
+Shared-memory ring buffer of IMU sample rows for GolfIMU backend
+
+One writer (the ingest process) appends decoded samples. Any number of
+readers (persistence, analytics) in other processes read them directly
+from the shared block as numpy views, with no copying or pickling.
+
+Layout of the ``multiprocessing.shared_memory`` block::
+
+    header     HEADER_SLOTS x int64   magic, capacity, row width, write sequence,
+                                      reader cursors, reader lost counts
+    slot seqs  capacity x int64       sequence number of the row in each slot
+    rows       capacity x ROW_FIELDS x float64   t, ax..az, gx..gz, mx..mz, qw..qz
+
+Every row ever written has a sequence number. Row ``seq`` lives in slot
+``seq % capacity``. The writer marks the slots it is about to fill as
+invalid, fills them, and then stores the rows' sequence numbers in them.
+Only then does it publish the new write sequence in the header. A
+reader holds a cursor, which is the next sequence it wants. It reads up to
+the published write sequence. Afterwards it checks the slot sequence
+numbers to detect rows the writer overwrote while they were being read.
+
+The writer never waits for readers. A reader that falls more than
+``capacity`` rows behind loses the oldest rows. The loss is counted in the
+header. Readers commit their cursors to the header. A worker process
+restarted after a crash therefore resumes where it left off. Everything
+lives in the shared block, which outlives its workers.
+"""
+import os
+import sys
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .imu_batch import ROW_FIELDS
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import SHARED_RING_CAPACITY
+
+RING_MAGIC = 0x474F4C46494D5552  # "GOLFIMUR"
+MAX_READERS = 8
+HEADER_SLOTS = 32
+
+_MAGIC, _CAPACITY, _WIDTH, _WRITE_SEQ = 0, 1, 2, 3
+_CURSORS = 8
+_LOST = _CURSORS + MAX_READERS
+
+
+class SharedRing:
+    """Single-writer, multi-reader ring of sample rows in shared memory"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """Map the ring onto a shared memory block (use ``create`` or ``attach``)"""
+        self.shm = shm
+        self.owner = owner
+        self._header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        if self._header[_MAGIC] != RING_MAGIC:
+            raise ValueError(f"Shared memory block {shm.name} is not a GolfIMU ring")
+        self.capacity = int(self._header[_CAPACITY])
+        offset = HEADER_SLOTS * 8
+        self._slot_seqs = np.ndarray((self.capacity,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self.capacity * 8
+        self._rows = np.ndarray((self.capacity, ROW_FIELDS), dtype=np.float64, buffer=shm.buf, offset=offset)
+
+    @classmethod
+    def create(cls, capacity: int = SHARED_RING_CAPACITY, name: Optional[str] = None) -> "SharedRing":
+        """Allocate a new, empty ring.
+
+        Args:
+            capacity: Rows held before the oldest are overwritten
+            name: Shared memory name (generated if None)
+
+        Returns:
+            The ring; its owner must ``unlink()`` it when done
+        """
+        size = (HEADER_SLOTS + capacity + capacity * ROW_FIELDS) * 8
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = 0
+        header[_CAPACITY] = capacity
+        header[_WIDTH] = ROW_FIELDS
+        np.ndarray((capacity,), dtype=np.int64, buffer=shm.buf, offset=HEADER_SLOTS * 8)[:] = -1
+        header[_MAGIC] = RING_MAGIC
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRing":
+        """Map an existing ring created by another process"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        """Shared memory name other processes attach with"""
+        return self.shm.name
+
+    @property
+    def write_seq(self) -> int:
+        """Sequence number the next written row will get (= rows ever written)"""
+        return int(self._header[_WRITE_SEQ])
+
+    @property
+    def oldest_seq(self) -> int:
+        """Oldest sequence number still held"""
+        return max(0, self.write_seq - self.capacity)
+
+    def write(self, rows: np.ndarray) -> int:
+        """Append rows (writer only).
+
+        Args:
+            rows: (N, ROW_FIELDS) samples; beyond ``capacity`` only the last ones are kept
+
+        Returns:
+            The new write sequence
+        """
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, ROW_FIELDS)
+        seq = self.write_seq
+        if len(rows) > self.capacity:
+            seq += len(rows) - self.capacity
+            rows = rows[-self.capacity:]
+
+        done = 0
+        while done < len(rows):
+            slot = (seq + done) % self.capacity
+            count = min(len(rows) - done, self.capacity - slot)
+            # Invalidate the slots first so a reader copying them notices
+            self._slot_seqs[slot:slot + count] = -1
+            self._rows[slot:slot + count] = rows[done:done + count]
+            self._slot_seqs[slot:slot + count] = np.arange(seq + done, seq + done + count)
+            done += count
+
+        # Publish only after the rows are in place
+        self._header[_WRITE_SEQ] = seq + len(rows)
+        return seq + len(rows)
+
+    def read(self, cursor: int, max_rows: int) -> Tuple[np.ndarray, int, int]:
+        """Rows from ``cursor`` on, as a view into shared memory.
+
+        A read stops at the end of the ring, so the view is contiguous. The
+        rest follows on the next read. Check ``is_intact`` after using the
+        view.
+
+        Args:
+            cursor: Next sequence the reader wants
+            max_rows: Most rows to return
+
+        Returns:
+            Tuple of (rows view, sequence of its first row, rows lost because
+            the reader fell more than ``capacity`` behind)
+        """
+        write_seq = self.write_seq
+        start = max(cursor, write_seq - self.capacity)
+        slot = start % self.capacity
+        count = max(0, min(write_seq - start, max_rows, self.capacity - slot))
+        return self._rows[slot:slot + count], start, start - cursor
+
+    def _slots(self, start: int, stop: int):
+        """Slot slices holding sequences ``start .. stop`` (two when the range wraps)"""
+        first, last = start % self.capacity, (stop - 1) % self.capacity + 1
+        if stop - start <= self.capacity - first:
+            return (slice(first, first + stop - start),)
+        return slice(first, self.capacity), slice(0, last)
+
+    def is_intact(self, start: int, count: int) -> bool:
+        """Whether rows ``start .. start + count`` were not overwritten since being read"""
+        if count <= 0:
+            return True
+        if start < self.write_seq - self.capacity:
+            return False
+        # Slot sequences run consecutively within a slice, so its ends decide
+        for part in self._slots(start, start + count):
+            seqs = self._slot_seqs[part]
+            if seqs[0] != start or seqs[-1] != start + len(seqs) - 1:
+                return False
+            start += len(seqs)
+        return True
+
+    def copy_range(self, start: int, stop: int) -> Optional[np.ndarray]:
+        """Copy rows ``start .. stop`` (wrapping as needed), or None if no longer held"""
+        if start < self.oldest_seq or stop > self.write_seq:
+            return None
+        if stop <= start:
+            return self._rows[:0].copy()
+        rows = np.concatenate([self._rows[part] for part in self._slots(start, stop)])
+        return rows if self.is_intact(start, stop - start) else None
+
+    def cursor(self, reader: int) -> int:
+        """Committed cursor of reader slot ``reader``"""
+        return int(self._header[_CURSORS + reader])
+
+    def commit(self, reader: int, cursor: int):
+        """Record how far reader slot ``reader`` got"""
+        self._header[_CURSORS + reader] = cursor
+
+    def add_lost(self, reader: int, count: int):
+        """Count rows reader slot ``reader`` lost to overwrites"""
+        self._header[_LOST + reader] += count
+
+    def lost(self, reader: int) -> int:
+        """Rows reader slot ``reader`` lost to overwrites"""
+        return int(self._header[_LOST + reader])
+
+    def close(self):
+        """Unmap the block in this process"""
+        # The numpy views must go before the buffer can be released
+        self._header = self._slot_seqs = self._rows = None
+        self.shm.close()
+
+    def unlink(self):
+        """Free the block (owner only, after every process has closed it)"""
+        self.shm.unlink()
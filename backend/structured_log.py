@@ -0,0 +1,223 @@
+"""
+Structured, rate-limited logging for GolfIMU backend
+
+Backend modules log through ``get_logger`` instead of printing. Each call
+site may emit ``LOG_RATE_LIMIT_BURST`` records per ``LOG_RATE_LIMIT_WINDOW_S``.
+Anything beyond that is counted and dropped before a ``LogRecord`` is built.
+The next record let through from that call site then carries a "N similar
+messages suppressed" summary. This way a burst of corrupt serial frames costs
+about a microsecond per frame instead of a terminal write.
+
+``configure_logging`` puts a ``QueueHandler`` on the root logger. A
+``QueueListener`` thread does the console and file writes, so the ingest
+thread only builds the record and enqueues it. The file gets one JSON object per line,
+including any ``extra=`` fields. The console keeps the plain messages the
+REPL printed before.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    LOG_CONSOLE_FORMAT, LOG_FILE, LOG_LEVEL, LOG_QUEUE_SIZE, LOG_RATE_LIMIT_BURST, LOG_RATE_LIMIT_WINDOW_S
+)
+
+from .telemetry import TELEMETRY
+
+LOGS_SUPPRESSED = TELEMETRY.counter("golfimu_log_suppressed_total", "Log records dropped by rate limiting")
+LOGS_DROPPED = TELEMETRY.counter("golfimu_log_dropped_total", "Log records dropped because the log queue was full")
+
+# Attributes every LogRecord has; anything else came in through ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
+
+class RateLimiter:
+    """Lets through at most ``burst`` records per key per ``window`` seconds"""
+
+    def __init__(self, window: float = LOG_RATE_LIMIT_WINDOW_S, burst: int = LOG_RATE_LIMIT_BURST):
+        self.window = window
+        self.burst = burst
+        # key -> [window start, records let through, suppressed, last suppressed (logger, level, msg, args)]
+        self._sites: Dict[Tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def check(self, key: Tuple[str, str], suppressed_call: Optional[Tuple] = None) -> int:
+        """Count one record for ``key``.
+
+        Args:
+            key: Call site key
+            suppressed_call: What to summarize later if this record is dropped
+
+        Returns:
+            -1 to drop the record, otherwise the number of records dropped
+            since the last one let through
+        """
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None:
+                self._sites[key] = [now, 1, 0, None]
+                return 0
+            if now - site[0] >= self.window:
+                suppressed = site[2]
+                site[:] = [now, 1, 0, None]
+                return suppressed
+            if site[1] < self.burst:
+                site[1] += 1
+                return 0
+            site[2] += 1
+            site[3] = suppressed_call
+        LOGS_SUPPRESSED.inc()
+        return -1
+
+    def pending(self) -> List[Tuple[Tuple, int]]:
+        """(last dropped call, count) for keys with drops not yet reported.
+
+        Clears the counts, so each drop is reported once.
+        """
+        summaries = []
+        with self._lock:
+            for site in self._sites.values():
+                if site[2]:
+                    summaries.append((site[3], site[2]))
+                    site[2], site[3] = 0, None
+        return summaries
+
+    def reset(self):
+        """Forget all call sites"""
+        with self._lock:
+            self._sites.clear()
+
+
+RATE_LIMITER = RateLimiter()
+
+
+class RateLimitedLogger(logging.LoggerAdapter):
+    """Logger that drops records over the rate limit before they are built.
+
+    Records are keyed by logger and message template, which identifies
+    the call site since messages use ``%s`` arguments rather than
+    f-strings. A dropped record costs a dict lookup instead of a
+    ``LogRecord``, a caller lookup and a formatting pass.
+    """
+
+    def __init__(self, logger: logging.Logger, limiter: RateLimiter = RATE_LIMITER):
+        super().__init__(logger, {})
+        self.limiter = limiter
+
+    def log(self, level: int, msg, *args, **kwargs):
+        if not self.logger.isEnabledFor(level):
+            return
+        suppressed = self.limiter.check((self.logger.name, msg), (self.logger, level, msg, args))
+        if suppressed < 0:
+            return
+        if suppressed:
+            msg = f"{msg} ({suppressed} similar messages suppressed)"
+            kwargs["extra"] = dict(kwargs.get("extra") or {}, suppressed=suppressed)
+        # Report the caller, not this method
+        kwargs.setdefault("stacklevel", 2)
+        self.logger.log(level, msg, *args, **kwargs)
+
+
+def get_logger(name: str) -> RateLimitedLogger:
+    """Rate-limited logger for a backend component (``golfimu.<name>``)"""
+    return RateLimitedLogger(logging.getLogger(f"golfimu.{name}"))
+
+
+def flush_suppressed(limiter: RateLimiter = RATE_LIMITER):
+    """Log a summary for every call site with dropped records not yet reported"""
+    for (logger, level, msg, args), count in limiter.pending():
+        logger.log(level, f"{msg} ({count} similar messages suppressed)", *args, extra={"suppressed": count})
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, ``extra=`` fields included"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full"""
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOGS_DROPPED.inc()
+
+
+def configure_logging(level: str = LOG_LEVEL, log_file: Optional[str] = LOG_FILE, console: bool = True,
+                      console_format: str = LOG_CONSOLE_FORMAT) -> logging.handlers.QueueListener:
+    """Route all logging through a rate-limited queue to a writer thread.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level: Root log level name
+        log_file: JSON-lines log file (None for no file)
+        console: Also write to stdout
+        console_format: Format of the console lines
+
+    Returns:
+        The running listener
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    handlers: List[logging.Handler] = []
+    if console:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter(console_format))
+        handlers.append(stream)
+    if log_file:
+        file_handler = logging.FileHandler(log_file)
+        file_handler.setFormatter(JSONFormatter())
+        handlers.append(file_handler)
+
+    with _lock:
+        _queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, level))
+        root.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def shutdown_logging():
+    """Report outstanding suppressions, drain the queue and stop the writer thread"""
+    global _listener, _queue_handler
+    flush_suppressed()
+    with _lock:
+        if _queue_handler is None:
+            return
+        logging.getLogger().removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener, _queue_handler = None, None
@@ -0,0 +1,340 @@
+"""
+Synthetic golf swings for GolfIMU benchmarks and tests
+
+The club is modelled as a rigid body pivoting about the grip in a tilted
+swing plane, so every channel is derived from the same rotation:
+
+- ``θ(t)``: club angle in the swing plane (0 at address, negative at the
+  top, increasing through impact). The backswing is a half-cosine, the
+  downswing a power law that reaches the requested club-head speed at
+  impact, and the follow-through decelerates linearly to rest.
+- ``quat``: rotation about the plane normal by ``θ`` applied to the
+  address orientation (shaft in the plane, face on the target line).
+- ``gyro``: ``θ'`` about the sensor y axis (the plane normal is fixed in
+  the sensor frame for a planar swing).
+- ``accel``: tangential and centripetal acceleration of the sensor, plus
+  gravity, an impact spike against the face and damped shaft ringing.
+- ``mag``: the world field rotated into the sensor frame.
+
+Sensor noise and per-swing biases are added on top. Whole batches of
+swings are generated as (S, N, ...) arrays without Python loops.
+"""
+import math
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .frame_codec import FRAME_FIELDS, encode_binary_frames, encode_json_frames
+from .imu_batch import IMUBatch
+from .kinematics import quaternion_multiply
+from .models import IMUData, SwingData
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import (
+    IMU_SAMPLE_RATE_HZ, DEFAULT_CLUB_LENGTH_M, GRAVITY_MS2,
+    SYNTH_CLUB_HEAD_SPEED, SYNTH_TEMPO, SYNTH_DOWNSWING_TIME, SYNTH_BACKSWING_ANGLE_DEG,
+    SYNTH_SWING_PLANE_DEG, SYNTH_ADDRESS_TIME, SYNTH_FOLLOW_THROUGH_TIME,
+    SYNTH_SENSOR_OFFSET_M, SYNTH_IMPACT_G, SYNTH_VIBRATION_HZ, SYNTH_VIBRATION_G,
+    SYNTH_VIBRATION_DAMPING, SYNTH_EARTH_FIELD_UT
+)
+
+# Impact spike decay time constant (s)
+IMPACT_TIME_CONSTANT = 0.0005
+
+
+class SyntheticSwings:
+    """A batch of generated swings sharing one time grid.
+
+    All swings have the same number of samples and impact at the same
+    index; the address period absorbs differences in swing duration.
+
+    - ``t``: sample times in seconds from the first sample, shape (N,)
+    - ``accel`` / ``gyro`` / ``mag``: shape (S, N, 3)
+    - ``quat``: sensor → world [w, x, y, z], shape (S, N, 4)
+    - ``impact_index``: impact sample index
+    - ``top_index``: top-of-backswing sample index per swing, shape (S,)
+    - ``parameters``: per-swing generation parameters, each shape (S,)
+    """
+
+    __slots__ = ("t", "accel", "gyro", "mag", "quat", "impact_index", "top_index", "parameters")
+
+    def __init__(self, t: np.ndarray, accel: np.ndarray, gyro: np.ndarray, mag: np.ndarray,
+                 quat: np.ndarray, impact_index: int, top_index: np.ndarray,
+                 parameters: Dict[str, np.ndarray]):
+        self.t = t
+        self.accel = accel
+        self.gyro = gyro
+        self.mag = mag
+        self.quat = quat
+        self.impact_index = impact_index
+        self.top_index = top_index
+        self.parameters = parameters
+
+    def __len__(self) -> int:
+        return self.accel.shape[0]
+
+    def frames(self, index: int) -> np.ndarray:
+        """Channel values of one swing in ``FRAME_FIELDS`` order, shape (N, 13)"""
+        return np.concatenate(
+            (self.accel[index], self.gyro[index], self.mag[index], self.quat[index]), axis=1
+        )
+
+    def batch(self, index: int, start: float = 0.0) -> IMUBatch:
+        """One swing as an IMUBatch.
+
+        Args:
+            index: Swing index
+            start: Time of the first sample in seconds (e.g. a Unix timestamp)
+        """
+        return IMUBatch(t=self.t + start, accel=self.accel[index], gyro=self.gyro[index],
+                        mag=self.mag[index], quat=self.quat[index])
+
+    def batches(self, start: float = 0.0) -> List[IMUBatch]:
+        """Every swing as an IMUBatch"""
+        return [self.batch(i, start) for i in range(len(self))]
+
+    def to_swing_data(self, index: int, session_id: str,
+                      start_time: Optional[datetime] = None) -> SwingData:
+        """One swing as a SwingData record, as the backend would store it.
+
+        Args:
+            index: Swing index
+            session_id: Session the swing belongs to
+            start_time: Timestamp of the first sample (now if None)
+        """
+        start_time = start_time or datetime.now()
+        frames = self.frames(index).tolist()
+        points = [
+            IMUData(**dict(zip(FRAME_FIELDS, row)), timestamp=start_time + timedelta(seconds=float(t)))
+            for t, row in zip(self.t, frames)
+        ]
+        accel = self.accel[index]
+        return SwingData(
+            session_id=session_id,
+            imu_data_points=points,
+            swing_start_time=points[0].timestamp,
+            swing_end_time=points[self.impact_index].timestamp,
+            swing_duration=float(self.t[self.impact_index]),
+            impact_g_force=float(np.sqrt(np.einsum("ij,ij->i", accel, accel).max()) / GRAVITY_MS2)
+        )
+
+    def to_firmware_bytes(self, index: int, frame_format: str = "json", start_ms: int = 0) -> bytes:
+        """One swing encoded as the firmware would stream it.
+
+        Args:
+            index: Swing index
+            frame_format: "json" (firmware lines) or "binary" (59-byte frames)
+            start_ms: Firmware timestamp of the first sample
+        """
+        t_ms = start_ms + np.round(self.t * 1000.0).astype(np.int64)
+        if frame_format == "json":
+            return encode_json_frames(t_ms, self.frames(index))
+        if frame_format == "binary":
+            return encode_binary_frames(t_ms, self.frames(index))
+        raise ValueError(f"Unknown frame format: {frame_format}")
+
+
+def _per_swing(value: Any, count: int) -> np.ndarray:
+    """Broadcast a scalar or per-swing parameter to shape (count,)"""
+    return np.broadcast_to(np.asarray(value, dtype=np.float64), (count,)).copy()
+
+
+def sample_swing_parameters(count: int, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Draw plausible per-swing parameters around the configured defaults.
+
+    Returns:
+        Keyword arguments for ``generate_swings``
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        "club_head_speed": rng.uniform(0.75, 1.2, count) * SYNTH_CLUB_HEAD_SPEED,
+        "tempo": rng.normal(SYNTH_TEMPO, 0.3, count).clip(2.0, 4.5),
+        "downswing_time": rng.normal(SYNTH_DOWNSWING_TIME, 0.03, count).clip(0.2, 0.4),
+        "backswing_angle_deg": rng.normal(SYNTH_BACKSWING_ANGLE_DEG, 15.0, count),
+        "swing_plane_deg": rng.normal(SYNTH_SWING_PLANE_DEG, 4.0, count),
+        "attack_angle_deg": rng.normal(0.0, 2.5, count),
+        "impact_g": rng.uniform(0.6, 1.4, count) * SYNTH_IMPACT_G,
+        "vibration_hz": rng.uniform(0.7, 1.5, count) * SYNTH_VIBRATION_HZ,
+    }
+
+
+def generate_swings(count: int = 1,
+                    sample_rate: float = IMU_SAMPLE_RATE_HZ,
+                    club_head_speed: Any = SYNTH_CLUB_HEAD_SPEED,
+                    tempo: Any = SYNTH_TEMPO,
+                    downswing_time: Any = SYNTH_DOWNSWING_TIME,
+                    backswing_angle_deg: Any = SYNTH_BACKSWING_ANGLE_DEG,
+                    swing_plane_deg: Any = SYNTH_SWING_PLANE_DEG,
+                    attack_angle_deg: Any = 0.0,
+                    club_length: Any = DEFAULT_CLUB_LENGTH_M,
+                    sensor_offset: Any = SYNTH_SENSOR_OFFSET_M,
+                    impact_g: Any = SYNTH_IMPACT_G,
+                    vibration_hz: Any = SYNTH_VIBRATION_HZ,
+                    vibration_g: Any = SYNTH_VIBRATION_G,
+                    vibration_damping: Any = SYNTH_VIBRATION_DAMPING,
+                    accel_noise: float = 0.05,
+                    gyro_noise: float = 0.01,
+                    mag_noise: float = 0.5,
+                    accel_bias: float = 0.0,
+                    gyro_bias: float = 0.0,
+                    address_time: float = SYNTH_ADDRESS_TIME,
+                    follow_through_time: float = SYNTH_FOLLOW_THROUGH_TIME,
+                    seed: Optional[int] = None) -> SyntheticSwings:
+    """Generate a batch of physically consistent swings.
+
+    Swing-shape parameters accept a scalar (shared) or one value per swing.
+    Angles follow the analytics conventions: ``swing_plane_deg`` is the
+    plane tilt from horizontal and ``attack_angle_deg`` is positive when
+    the club head is moving up at impact.
+
+    Args:
+        count: Number of swings
+        sample_rate: Output sample rate in Hz
+        club_head_speed: Club-head speed at impact (m/s)
+        tempo: Backswing / downswing duration ratio
+        downswing_time: Top of backswing to impact (s)
+        backswing_angle_deg: Club rotation from address to the top
+        swing_plane_deg: Swing plane tilt from horizontal
+        attack_angle_deg: Club-head path angle at impact
+        club_length: Grip pivot to club head (m), as used by the analytics
+        sensor_offset: Sensor distance below the grip pivot (m)
+        impact_g: Peak impact deceleration (g)
+        vibration_hz: Post-impact ringing frequency
+        vibration_g: Initial ringing amplitude (g)
+        vibration_damping: Ringing damping ratio
+        accel_noise: Accelerometer white noise (m/s², 1σ)
+        gyro_noise: Gyroscope white noise (rad/s, 1σ)
+        mag_noise: Magnetometer white noise (μT, 1σ)
+        accel_bias: Per-swing accelerometer bias spread (m/s², 1σ per axis)
+        gyro_bias: Per-swing gyroscope bias spread (rad/s, 1σ per axis)
+        address_time: Minimum motionless address before the takeaway (s)
+        follow_through_time: Impact to the end of the follow-through (s)
+        seed: Random seed for noise and biases
+
+    Returns:
+        SyntheticSwings holding all channels
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    speed = _per_swing(club_head_speed, count)
+    t_down = _per_swing(downswing_time, count)
+    t_back = _per_swing(tempo, count) * t_down
+    plane = np.radians(_per_swing(swing_plane_deg, count))
+    attack = np.radians(_per_swing(attack_angle_deg, count))
+    length = _per_swing(club_length, count)
+    offset = _per_swing(sensor_offset, count)
+
+    # Impact away from the bottom of the arc tilts the head path by the attack angle
+    sin_impact = np.sin(attack) / np.sin(plane)
+    if np.any(np.abs(sin_impact) >= 1.0):
+        raise ValueError("Attack angle is too steep for the swing plane")
+    theta_top = -np.radians(_per_swing(backswing_angle_deg, count))
+    theta_impact = np.arcsin(sin_impact)
+    omega_impact = speed / length
+
+    # Downswing θ = θ_top + Δθ·τ^k with k chosen so that θ'(impact) = ω_impact
+    sweep = theta_impact - theta_top
+    k = omega_impact * t_down / sweep
+    if np.any(k <= 1.0):
+        raise ValueError("Club-head speed is too low to complete the downswing in time")
+
+    # Shared time grid: impact at the same index for every swing
+    impact_index = int(math.ceil((address_time + float((t_back + t_down).max())) * sample_rate))
+    n = impact_index + int(math.ceil(follow_through_time * sample_rate)) + 1
+    t = np.arange(n) / sample_rate
+    dt_pre = t[None, :impact_index] - t[impact_index]
+    dt_post = t[None, impact_index:] - t[impact_index]
+
+    col = np.s_[:, None]
+    theta = np.empty((count, n))
+    rate = np.empty((count, n))
+    rate_dot = np.empty((count, n))
+
+    # Address and backswing: half-cosine from address to the top
+    tau = np.clip((dt_pre + (t_back + t_down)[col]) / t_back[col], 0.0, 1.0)
+    phase = np.pi * tau
+    half = 0.5 * theta_top[col]
+    theta[:, :impact_index] = half * (1.0 - np.cos(phase))
+    rate[:, :impact_index] = half * np.pi * np.sin(phase) / t_back[col]
+    rate_dot[:, :impact_index] = np.where((tau > 0.0) & (tau < 1.0),
+                                          half * np.pi ** 2 * np.cos(phase) / t_back[col] ** 2, 0.0)
+
+    # Downswing: power-law acceleration into impact
+    first = impact_index - int(math.ceil(float(t_down.max()) * sample_rate))
+    dt = dt_pre[:, first:]
+    downswing = dt >= -t_down[col]
+    tau = np.clip(dt / t_down[col] + 1.0, 1.0 / (sample_rate * t_down[col]), 1.0)
+    power = tau ** (k[col] - 2.0)
+    for target, value in ((theta, theta_top[col] + sweep[col] * power * tau * tau),
+                          (rate, sweep[col] * k[col] * power * tau / t_down[col]),
+                          (rate_dot, sweep[col] * k[col] * (k[col] - 1.0) * power / t_down[col] ** 2)):
+        target[:, first:impact_index] = np.where(downswing, value, target[:, first:impact_index])
+
+    # Follow-through: linear deceleration to rest
+    tau = np.clip(dt_post / follow_through_time, 0.0, 1.0)
+    theta[:, impact_index:] = theta_impact[col] + omega_impact[col] * follow_through_time * (tau - 0.5 * tau * tau)
+    rate[:, impact_index:] = omega_impact[col] * (1.0 - tau)
+    rate_dot[:, impact_index:] = np.where(tau < 1.0, -omega_impact[col] / follow_through_time, 0.0)
+
+    # Address orientation: rotation about the target line (world x) by β puts
+    # sensor z (shaft) down the plane and sensor y on the plane normal. The
+    # swing adds a rotation by θ about the plane normal n, so
+    # q(θ) = cos(θ/2)·q_address + sin(θ/2)·(n ⊗ q_address)
+    beta = 0.5 * np.pi + plane
+    zeros = np.zeros(count)
+    normal = np.stack([zeros, -np.sin(plane), np.cos(plane)], axis=1)
+    address_quat = np.stack([np.cos(beta / 2), np.sin(beta / 2), zeros, zeros], axis=1)
+    swung_quat = quaternion_multiply(np.column_stack((zeros, normal)), address_quat)
+    half_cos, half_sin = np.cos(theta / 2)[..., None], np.sin(theta / 2)[..., None]
+    quat = half_cos * address_quat[:, None, :] + half_sin * swung_quat[:, None, :]
+
+    # World vectors in the sensor frame: undoing the swing rotation (Rodrigues)
+    # leaves a fixed part along n and a part rotating by -θ, each then undone by β
+    cos_t, sin_t = 1.0 - 2.0 * half_sin * half_sin, 2.0 * half_sin * half_cos
+    cos_b, sin_b = np.cos(beta)[:, None], np.sin(beta)[:, None]
+
+    def unrotate_address(vectors: np.ndarray) -> np.ndarray:
+        return np.column_stack((vectors[:, 0], cos_b[:, 0] * vectors[:, 1] + sin_b[:, 0] * vectors[:, 2],
+                                -sin_b[:, 0] * vectors[:, 1] + cos_b[:, 0] * vectors[:, 2]))
+
+    def to_sensor(world: np.ndarray) -> np.ndarray:
+        along = normal * (normal @ world)[:, None]
+        fixed = unrotate_address(along)[:, None, :]
+        radial = unrotate_address(world - along)[:, None, :]
+        tangent = unrotate_address(np.cross(normal, world))[:, None, :]
+        return fixed + radial * cos_t - tangent * sin_t
+
+    rng = np.random.default_rng(seed)
+    accel = to_sensor(np.array([0.0, 0.0, GRAVITY_MS2]))
+    accel[..., 0] += offset[col] * rate_dot
+    accel[..., 2] -= offset[col] * rate * rate
+
+    # Impact spike against the face, then damped ringing along the face normal
+    freq = _per_swing(vibration_hz, count)[col]
+    zeta = _per_swing(vibration_damping, count)[col]
+    ringing = _per_swing(vibration_g, count)[col] * np.exp(-zeta * 2.0 * np.pi * freq * dt_post) * np.sin(
+        2.0 * np.pi * freq * np.sqrt(1.0 - zeta * zeta) * dt_post
+    )
+    spike = _per_swing(impact_g, count)[col] * np.exp(-dt_post / IMPACT_TIME_CONSTANT)
+    accel[:, impact_index:, 0] -= (spike + ringing) * GRAVITY_MS2
+
+    gyro = np.zeros((count, n, 3))
+    gyro[..., 1] = rate
+
+    mag = to_sensor(np.array(SYNTH_EARTH_FIELD_UT, dtype=np.float64))
+
+    accel += accel_noise * rng.standard_normal(accel.shape) + accel_bias * rng.standard_normal((count, 1, 3))
+    gyro += gyro_noise * rng.standard_normal(gyro.shape) + gyro_bias * rng.standard_normal((count, 1, 3))
+    mag += mag_noise * rng.standard_normal(mag.shape)
+
+    top_index = impact_index - np.round(t_down * sample_rate).astype(np.int64)
+    parameters = {
+        "club_head_speed": speed, "tempo": t_back / t_down, "downswing_time": t_down,
+        "swing_plane_deg": np.degrees(plane), "attack_angle_deg": np.degrees(attack),
+        "club_length": length
+    }
+    return SyntheticSwings(t, accel, gyro, mag, quat, impact_index, top_index, parameters)
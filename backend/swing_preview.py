@@ -0,0 +1,129 @@
+"""
+Downsampled swing previews for GolfIMU backend
+
+Listing swings only needs sparklines, so when a swing is stored each
+channel in ``SWING_PREVIEW_CHANNELS`` is reduced to at most
+``SWING_PREVIEW_POINTS`` points and stored next to the swing's summary:
+
+- ``lttb``: Largest-Triangle-Three-Buckets; per bucket the sample forming
+  the largest triangle with its neighbours, which keeps the trace's shape
+- ``minmax``: per bucket the minimum and the maximum, in time order, so
+  every peak survives
+
+Points are samples of the swing, picked per channel, so every channel has
+its own times (ms from the swing start).
+"""
+import os
+import sys
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+from .imu_batch import IMUBatch, ROW_NAMES
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import SWING_PREVIEW_CHANNELS, SWING_PREVIEW_METHOD, SWING_PREVIEW_POINTS
+
+PREVIEW_METHODS = ("lttb", "minmax")
+
+
+def lttb_indices(t: np.ndarray, values: np.ndarray, points: int) -> np.ndarray:
+    """Pick samples with Largest-Triangle-Three-Buckets, every channel at once.
+
+    The first and last samples are kept; the others are split into
+    ``points - 2`` buckets and each bucket keeps the sample forming the
+    largest triangle with the previous pick and the next bucket's mean.
+
+    Args:
+        t: Sample times, shape (N,)
+        values: Channels, shape (N, C)
+        points: Samples kept per channel
+
+    Returns:
+        Picked sample indices, shape (min(points, N), C), increasing per channel
+    """
+    n, channels = values.shape
+    if points >= n or points < 3:
+        return np.repeat(np.arange(n)[:, None], channels, axis=1)
+
+    edges = np.linspace(1, n - 1, points - 1).astype(int)
+    # Mean of every bucket and of the last sample, the "next bucket" of the last bucket
+    sizes = np.diff(np.append(edges, n))[:, None]
+    mean_t = np.add.reduceat(t, edges) / sizes[:, 0]
+    mean_v = np.add.reduceat(values, edges, axis=0) / sizes
+
+    picked = np.empty((points, channels), dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+    columns = np.arange(channels)
+    previous = picked[0]
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        prev_t, prev_v = t[previous], values[previous, columns]
+        area = np.abs((prev_t - mean_t[i + 1]) * (values[lo:hi] - prev_v)
+                      - (prev_t - t[lo:hi, None]) * (mean_v[i + 1] - prev_v))
+        previous = lo + area.argmax(axis=0)
+        picked[i + 1] = previous
+    return picked
+
+
+def minmax_indices(values: np.ndarray, points: int) -> np.ndarray:
+    """Pick each bucket's minimum and maximum sample, every channel at once.
+
+    Args:
+        values: Channels, shape (N, C)
+        points: Samples kept per channel (two per bucket)
+
+    Returns:
+        Picked sample indices, shape (at most points, C), increasing per channel
+    """
+    n, channels = values.shape
+    buckets = points // 2
+    if points >= n or buckets < 1:
+        return np.repeat(np.arange(n)[:, None], channels, axis=1)
+
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    picked = np.empty((2 * buckets, channels), dtype=int)
+    for i in range(buckets):
+        lo, hi = edges[i], edges[i + 1]
+        low, high = lo + values[lo:hi].argmin(axis=0), lo + values[lo:hi].argmax(axis=0)
+        picked[2 * i], picked[2 * i + 1] = np.minimum(low, high), np.maximum(low, high)
+    return picked
+
+
+def build_preview(batch: IMUBatch, points: int = SWING_PREVIEW_POINTS, method: str = SWING_PREVIEW_METHOD,
+                  channels: Sequence[str] = SWING_PREVIEW_CHANNELS) -> Dict[str, Any]:
+    """Downsample a swing to a preview.
+
+    Args:
+        batch: The swing's samples
+        points: Most points per channel
+        method: One of ``PREVIEW_METHODS``
+        channels: Names of ``ROW_NAMES`` columns to preview
+
+    Returns:
+        ``{"method", "samples", "channels": {name: {"t": [ms], "v": [values]}}}``
+    """
+    if method not in PREVIEW_METHODS:
+        raise ValueError(f"Unknown preview method: {method}")
+
+    rows = batch.to_rows()
+    if not len(rows):
+        return {"method": method, "samples": 0, "channels": {name: {"t": [], "v": []} for name in channels}}
+
+    t = rows[:, 0]
+    values = rows[:, [ROW_NAMES.index(name) for name in channels]]
+    if method == "lttb":
+        picked = lttb_indices(t, values, points)
+    else:
+        picked = minmax_indices(values, points)
+
+    times_ms = np.round((t[picked] - t[0]) * 1000.0, 1)
+    picked_values = np.round(values[picked, np.arange(len(channels))], 3)
+    return {
+        "method": method,
+        "samples": len(rows),
+        "channels": {
+            name: {"t": times_ms[:, i].tolist(), "v": picked_values[:, i].tolist()}
+            for i, name in enumerate(channels)
+        }
+    }
@@ -0,0 +1,242 @@
+"""
+Swing quality scoring for GolfIMU backend
+
+Two families of scores:
+
+- Smoothness: normalized integrated jerk of the acceleration per swing
+  phase (backswing, downswing, follow-through). Lower jerk is smoother.
+- Contact quality: windowed real FFT of the post-impact vibration, giving
+  the dominant frequency, its damping ratio and band energy ratios.
+"""
+import math
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .config import settings
+from .imu_batch import IMUBatch
+from .impact_metrics import find_impact_index
+from .models import ProcessedMetrics, SwingData
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import FFT_WINDOW_SAMPLES, FFT_MIN_WINDOW_SAMPLES, FFT_BANDS_HZ
+
+
+# Scores folded into the session running statistics
+QUALITY_SCORES = (
+    "smoothness", "jerk_backswing", "jerk_downswing", "jerk_follow_through",
+    "dominant_frequency", "damping_ratio", "contact_quality"
+)
+
+
+class FFTPlan:
+    """Precomputed window and frequency bins for one (sample rate, length) pair"""
+
+    __slots__ = ("length", "window", "freqs", "band_masks")
+
+    def __init__(self, sample_rate: int, length: int):
+        self.length = length
+        self.window = np.hanning(length)
+        self.freqs = np.fft.rfftfreq(length, d=1.0 / sample_rate)
+        self.band_masks = {
+            name: (self.freqs >= low) & (self.freqs < high) & (self.freqs > 0)
+            for name, (low, high) in FFT_BANDS_HZ.items()
+        }
+
+
+@lru_cache(maxsize=16)
+def get_fft_plan(sample_rate: int, length: int) -> FFTPlan:
+    """Get the cached FFT plan for a sample rate and window length"""
+    return FFTPlan(sample_rate, length)
+
+
+def detect_swing_phases(batch: IMUBatch, impact_index: int) -> Tuple[int, int]:
+    """Find the top of the backswing.
+
+    The gyro is projected onto the dominant rotation axis before impact;
+    the top is the last sign reversal of that projection before impact.
+
+    Args:
+        batch: Swing samples
+        impact_index: Impact sample index
+
+    Returns:
+        Tuple of (top_index, impact_index)
+    """
+    if impact_index < 2:
+        return 0, impact_index
+
+    gyro = batch.gyro[:impact_index]
+    _, _, vt = np.linalg.svd(gyro - gyro.mean(axis=0), full_matrices=False)
+    projection = gyro @ vt[0]
+
+    downswing_sign = np.sign(projection[-1])
+    reversed_samples = np.nonzero(np.sign(projection) == -downswing_sign)[0]
+    top_index = int(reversed_samples[-1]) + 1 if len(reversed_samples) else 0
+
+    return top_index, impact_index
+
+
+def normalized_jerk(t: np.ndarray, accel: np.ndarray) -> Optional[float]:
+    """Dimensionless integrated jerk of an acceleration trace.
+
+    ``T * ∫|da/dt|² dt / a_peak²`` where ``a_peak`` is the peak deviation
+    from the mean acceleration (so gravity does not count as motion).
+
+    Args:
+        t: Sample times in seconds, shape (N,)
+        accel: Acceleration, shape (N, 3)
+
+    Returns:
+        Normalized jerk, or None if the phase is too short or motionless
+    """
+    if len(t) < 3:
+        return None
+
+    duration = t[-1] - t[0]
+    if duration <= 0:
+        return None
+
+    deviation = accel - accel.mean(axis=0)
+    peak_squared = float(np.einsum("ij,ij->i", deviation, deviation).max())
+    if peak_squared == 0:
+        return None
+
+    jerk = np.gradient(accel, t, axis=0)
+    jerk_squared = np.einsum("ij,ij->i", jerk, jerk)
+    integral = float(np.sum((jerk_squared[1:] + jerk_squared[:-1]) * np.diff(t)) / 2.0)
+
+    return duration * integral / peak_squared
+
+
+def compute_smoothness(batch: IMUBatch, impact_index: int,
+                       follow_through_start: Optional[int] = None,
+                       top_index: Optional[int] = None) -> Dict[str, Any]:
+    """Normalized integrated jerk per swing phase.
+
+    Args:
+        batch: Swing samples
+        impact_index: Impact sample index
+        follow_through_start: First follow-through sample (defaults to just
+            after the post-impact vibration window)
+        top_index: Top of the backswing (detected if None)
+
+    Returns:
+        Dictionary of per-phase jerk values and an overall smoothness score
+    """
+    if top_index is None:
+        top_index, _ = detect_swing_phases(batch, impact_index)
+    if follow_through_start is None:
+        follow_through_start = impact_index + 1 + FFT_WINDOW_SAMPLES
+
+    phases = {
+        "backswing": (0, top_index + 1),
+        "downswing": (top_index, impact_index),
+        "follow_through": (follow_through_start, len(batch))
+    }
+
+    result: Dict[str, Any] = {"top_index": top_index}
+    for name, (start, stop) in phases.items():
+        result[f"jerk_{name}"] = normalized_jerk(batch.t[start:stop], batch.accel[start:stop])
+
+    swing_jerk = [result[f"jerk_{name}"] for name in ("backswing", "downswing")
+                  if result[f"jerk_{name}"]]
+    # Log dimensionless jerk: higher (less negative) is smoother
+    result["smoothness"] = -math.log(sum(swing_jerk) / len(swing_jerk)) if swing_jerk else None
+
+    return result
+
+
+def _half_power_damping(power: np.ndarray, freqs: np.ndarray, peak: int) -> Optional[float]:
+    """Damping ratio from the half-power bandwidth around a spectral peak"""
+    half = power[peak] / 2.0
+
+    low = peak
+    while low > 1 and power[low - 1] > half:
+        low -= 1
+    high = peak
+    while high < len(power) - 1 and power[high + 1] > half:
+        high += 1
+
+    if low <= 1 or high >= len(power) - 1:
+        return None
+
+    # Interpolate the half-power crossings between bins
+    f_low = np.interp(half, [power[low - 1], power[low]], [freqs[low - 1], freqs[low]])
+    f_high = np.interp(half, [power[high + 1], power[high]], [freqs[high + 1], freqs[high]])
+
+    return float((f_high - f_low) / (2.0 * freqs[peak]))
+
+
+def compute_contact_quality(batch: IMUBatch, impact_index: int,
+                            sample_rate: Optional[float] = None) -> Dict[str, Any]:
+    """Spectral analysis of the post-impact vibration.
+
+    Args:
+        batch: Swing samples
+        impact_index: Impact sample index
+        sample_rate: Sample rate in Hz (estimated from timestamps if None)
+
+    Returns:
+        Dictionary with dominant frequency, damping ratio, band energy
+        ratios and a contact quality score (low-band energy share)
+    """
+    result: Dict[str, Any] = {"dominant_frequency": None, "damping_ratio": None,
+                              "contact_quality": None}
+    result.update({f"band_{name}": None for name in FFT_BANDS_HZ})
+
+    available = len(batch) - impact_index - 1
+    if available < FFT_MIN_WINDOW_SAMPLES:
+        return result
+
+    # Largest power-of-two window that fits keeps the number of plans small
+    length = min(FFT_WINDOW_SAMPLES, 1 << int(math.log2(available)))
+    rate = sample_rate or batch.sample_rate(default=settings.imu_sample_rate)
+    plan = get_fft_plan(int(round(rate)), length)
+
+    # Project onto the dominant vibration axis (the magnitude would rectify the ringing)
+    segment = batch.accel[impact_index + 1:impact_index + 1 + length]
+    segment = segment - segment.mean(axis=0)
+    _, _, vt = np.linalg.svd(segment, full_matrices=False)
+    spectrum = np.fft.rfft((segment @ vt[0]) * plan.window)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+
+    total = float(power[1:].sum())
+    if total == 0:
+        return result
+
+    peak = int(np.argmax(power[1:])) + 1
+    result["dominant_frequency"] = float(plan.freqs[peak])
+    result["damping_ratio"] = _half_power_damping(power, plan.freqs, peak)
+    for name, mask in plan.band_masks.items():
+        result[f"band_{name}"] = float(power[mask].sum()) / total
+    result["contact_quality"] = result["band_low"]
+
+    return result
+
+
+def analyze_quality(swing_data: SwingData, impact_index: Optional[int] = None) -> ProcessedMetrics:
+    """Compute smoothness and contact quality scores for a swing.
+
+    Args:
+        swing_data: Complete swing data
+        impact_index: Impact sample index (peak acceleration if None)
+
+    Returns:
+        ProcessedMetrics with the quality scores
+    """
+    batch = IMUBatch.from_swing(swing_data)
+    if impact_index is None:
+        impact_index = find_impact_index(batch)
+
+    metrics = compute_smoothness(batch, impact_index)
+    metrics.update(compute_contact_quality(batch, impact_index))
+
+    return ProcessedMetrics(
+        swing_id=swing_data.swing_id,
+        session_id=swing_data.session_id,
+        metrics=metrics
+    )
@@ -0,0 +1,160 @@
+"""
+Cross-session swing queries for GolfIMU backend
+
+Keys are laid out per session, so "driver swings of a user last month
+with club-head speed over 44.7 m/s" used to mean reading every session.
+Secondary indexes are now kept as swings and metrics are written (see
+``RedisManager.store_swing_data`` and ``store_processed_metrics``), each
+a sorted set of ``{session_id}:{swing_id}`` members:
+
+- ``user:{user_id}:swing_index`` and ``club:{club_id}:swing_index``,
+  scored by swing start time
+- ``metric:{name}:swing_index``, scored by the metric, for
+  ``impact_g_force``, ``swing_duration`` and ``QUERY_INDEXED_METRICS``
+
+A query walks the user's index (or the club's, without a user) newest
+first within the time range and keeps swings found in the club index and
+within every metric range, all inside Redis (``QUERY_SWINGS``). One call
+examines at most ``QUERY_SCAN_BUDGET`` swings; pages end with a start time
+and member cursor like ``RedisManager.get_swing_page``, so a page may hold
+fewer matches than asked for while later ones still exist.
+"""
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .redis_manager import (
+    REDIS_ERRORS, SWING_RANGE_FIELDS, _record_redis, club_swing_index_key, metric_swing_index_key, page_cursor,
+    parse_page_cursor, user_swing_index_key
+)
+from .redis_scripts import QUERY_SWINGS
+from .structured_log import get_logger
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import API_PAGE_SIZE, QUERY_INDEXED_METRICS, QUERY_SCAN_BUDGET
+
+logger = get_logger("swing_query")
+
+SWING_QUERIES = TELEMETRY.counter("golfimu_swing_queries_total", "Cross-session swing queries run")
+
+# Metrics a query may filter on
+QUERY_METRICS = SWING_RANGE_FIELDS + tuple(QUERY_INDEXED_METRICS)
+# What a query returns per swing
+QUERY_DETAILS = ("ids", "summary", "preview")
+
+
+def _bound(value: Optional[float]) -> str:
+    """Score bound argument of ``QUERY_SWINGS`` ('' for unbounded)"""
+    return "" if value is None else repr(float(value))
+
+
+class SwingQueryEngine:
+    """Finds swings across sessions by user, club, start time and metric ranges"""
+
+    def __init__(self, redis_manager, scan_budget: int = QUERY_SCAN_BUDGET):
+        """Initialize the engine.
+
+        Args:
+            redis_manager: RedisManager whose indexes are queried
+            scan_budget: Most swings one call examines
+        """
+        self.redis_manager = redis_manager
+        self.scan_budget = scan_budget
+
+    def query(self, user_id: Optional[str] = None, club_id: Optional[str] = None,
+              since: Optional[datetime] = None, until: Optional[datetime] = None,
+              metric_ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              cursor: Optional[str] = None, limit: int = API_PAGE_SIZE,
+              detail: str = "ids") -> Tuple[List[str], Optional[str]]:
+        """Get one page of matching swings, newest first.
+
+        Args:
+            user_id: Only this user's swings
+            club_id: Only swings with this club
+            since: Only swings starting at or after this time
+            until: Only swings starting at or before this time
+            metric_ranges: metric name -> (low, high), inclusive, None for unbounded
+            cursor: ``next_cursor`` of the previous page (None for the first page)
+            limit: Most swings on the page
+            detail: "ids" for session and swing ids, "summary" to add each
+                swing's summary, "preview" to add its preview as well
+
+        Returns:
+            JSON documents with ``session_id`` and ``swing_id``, and the
+            cursor of the next page (None once every swing was examined)
+
+        Raises:
+            ValueError: No user or club, an unknown metric or detail, an invalid cursor
+        """
+        if user_id is None and club_id is None:
+            raise ValueError("A swing query needs a user or a club")
+        if detail not in QUERY_DETAILS:
+            raise ValueError(f"Unknown detail {detail!r}, expected one of {', '.join(QUERY_DETAILS)}")
+        metric_ranges = metric_ranges or {}
+        unknown = sorted(set(metric_ranges) - set(QUERY_METRICS))
+        if unknown:
+            raise ValueError(f"Metrics {', '.join(unknown)} are not indexed")
+
+        keys = [user_swing_index_key(user_id) if user_id is not None else club_swing_index_key(club_id)]
+        args = ["+inf" if until is None else repr(until.timestamp()),
+                "-inf" if since is None else repr(since.timestamp()), limit, self.scan_budget, ""]
+        if cursor is not None:
+            score, member = parse_page_cursor(cursor)
+            args[0], args[4] = repr(score), member
+        if user_id is not None and club_id is not None:
+            keys.append(club_swing_index_key(club_id))
+            args += ["", ""]
+        for name, (low, high) in sorted(metric_ranges.items()):
+            keys.append(metric_swing_index_key(name))
+            args += [_bound(low), _bound(high)]
+
+        try:
+            start = time.perf_counter()
+            members, score, member = QUERY_SWINGS(self.redis_manager.redis_client, keys, args)
+            documents = self._documents(members, detail)
+            _record_redis("query_swings", start, 1 + (detail != "ids" and bool(members)))
+            SWING_QUERIES.inc()
+            return documents, page_cursor(float(score), member) if member != "" else None
+
+        except Exception as e:
+            REDIS_ERRORS.labels("query_swings").inc()
+            logger.error("Error querying swings: %s", e)
+            return [], None
+
+    def _documents(self, members: List[str], detail: str) -> List[str]:
+        """JSON documents of index members, with their summaries and previews if asked for"""
+        swings = [member.rpartition(":")[::2] for member in members]
+        ids = [f'{{"session_id": {json.dumps(session_id)}, "swing_id": {json.dumps(swing_id)}}}'
+               for session_id, swing_id in swings]
+        if detail == "ids" or not swings:
+            return ids
+
+        step = 2 if detail == "preview" else 1
+        for _ in range(2):
+            pipe = self.redis_manager.redis_client.pipeline(transaction=False)
+            for session_id, swing_id in swings:
+                pipe.hget(f"session:{session_id}:swing_summaries", swing_id)
+                if detail == "preview":
+                    pipe.hget(f"session:{session_id}:swing_previews", swing_id)
+            values = pipe.execute()
+            # Summaries of cold sessions are promoted, then read again
+            cold = {session_id for (session_id, _), summary in zip(swings, values[::step]) if summary is None}
+            if not any([self.redis_manager.promote_session_hashes(session_id) for session_id in sorted(cold)]):
+                break
+
+        # Summaries are JSON objects: splice the session id (and preview) in without decoding them
+        documents = []
+        for position, ((session_id, _), document) in enumerate(zip(swings, ids)):
+            summary = values[position * step]
+            if summary is None:
+                documents.append(document)
+                continue
+            summary = f'{{"session_id": {json.dumps(session_id)}, {summary[1:]}'
+            if detail == "preview":
+                summary = f'{summary[:-1]}, "preview": {values[position * step + 1] or "null"}}}'
+            documents.append(summary)
+        return documents
@@ -0,0 +1,117 @@
+"""
+Swing segmentation for GolfIMU backend
+
+Cuts complete swings out of a continuous IMU sample stream. The samples of
+the pre-impact window are kept at all times; when a sample crosses the
+session's impact threshold the swing stays open until the post-impact
+window has passed (by sample timestamps) and is then emitted as
+``SwingData``, the same record the firmware sends for a complete swing.
+"""
+import os
+import sys
+import uuid
+from collections import deque
+from datetime import timedelta
+from typing import List, Optional
+
+from .latency_trace import LATENCY_TRACER, LatencyTracer
+from .models import IMUData, SessionConfig, SwingData
+from .telemetry import TELEMETRY
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import GRAVITY_MS2, IMU_SAMPLE_RATE_HZ, SEGMENT_POST_IMPACT_MS, SEGMENT_PRE_IMPACT_MS
+
+IMPACTS = TELEMETRY.counter("golfimu_impacts_total", "Impacts detected in the sample stream")
+STREAM_SWINGS = TELEMETRY.counter("golfimu_swings_total", "Complete swings detected",
+                                  labels=("source",)).labels("stream")
+
+
+class SwingSegmenter:
+    """Segments streamed IMU samples into swings around detected impacts"""
+
+    def __init__(self, session_config: SessionConfig, sample_rate: float = IMU_SAMPLE_RATE_HZ,
+                 pre_impact_ms: float = SEGMENT_PRE_IMPACT_MS,
+                 post_impact_ms: float = SEGMENT_POST_IMPACT_MS,
+                 tracer: LatencyTracer = LATENCY_TRACER):
+        """Initialize the segmenter.
+
+        Args:
+            session_config: Session the swings belong to (impact threshold)
+            sample_rate: Highest expected sample rate in Hz (sizes the buffer)
+            pre_impact_ms: Samples kept before the impact
+            post_impact_ms: Samples collected after the impact
+            tracer: Latency tracer opened for each impact
+        """
+        self.session_config = session_config
+        self.pre_impact = timedelta(milliseconds=pre_impact_ms)
+        self.post_impact = timedelta(milliseconds=post_impact_ms)
+        self.tracer = tracer
+
+        self._threshold_squared = (session_config.impact_threshold * GRAVITY_MS2) ** 2
+        self._history: deque = deque(maxlen=max(1, int(round(pre_impact_ms * sample_rate / 1000.0))) + 1)
+        self._post_impact: Optional[List[IMUData]] = None
+        self._impact: Optional[IMUData] = None
+        self._peak_squared = 0.0
+        self._swing_id: Optional[str] = None
+
+    @property
+    def in_swing(self) -> bool:
+        """Whether an impact was detected and its swing is still open"""
+        return self._post_impact is not None
+
+    def add(self, imu_data: IMUData) -> Optional[SwingData]:
+        """Add one sample.
+
+        Args:
+            imu_data: Next sample of the stream
+
+        Returns:
+            The completed swing when this sample closes one, None otherwise
+        """
+        accel_squared = imu_data.ax ** 2 + imu_data.ay ** 2 + imu_data.az ** 2
+
+        if self._post_impact is not None:
+            self._post_impact.append(imu_data)
+            self._peak_squared = max(self._peak_squared, accel_squared)
+            if imu_data.timestamp - self._impact.timestamp >= self.post_impact:
+                return self._close_swing()
+            return None
+
+        self._history.append(imu_data)
+        if accel_squared >= self._threshold_squared:
+            self._swing_id = str(uuid.uuid4())
+            self._impact = imu_data
+            self._peak_squared = accel_squared
+            self._post_impact = []
+            self.tracer.start(self._swing_id)
+            IMPACTS.inc()
+        return None
+
+    def reset(self):
+        """Drop buffered samples and any open swing"""
+        self._history.clear()
+        self._post_impact = None
+        self._impact = None
+        self._swing_id = None
+
+    def _close_swing(self) -> SwingData:
+        """Build the swing from the pre- and post-impact samples"""
+        swing_start = self._impact.timestamp - self.pre_impact
+        points = [point for point in self._history if point.timestamp >= swing_start] + self._post_impact
+        swing = SwingData(
+            swing_id=self._swing_id,
+            session_id=self.session_config.session_id,
+            imu_data_points=points,
+            swing_start_time=points[0].timestamp,
+            swing_end_time=self._impact.timestamp,
+            swing_duration=(self._impact.timestamp - points[0].timestamp).total_seconds(),
+            impact_g_force=self._peak_squared ** 0.5 / GRAVITY_MS2
+        )
+        self.tracer.mark(swing.swing_id, "segment")
+        STREAM_SWINGS.inc()
+
+        self._history.clear()
+        self._post_impact = None
+        self._impact = None
+        self._swing_id = None
+        return swing
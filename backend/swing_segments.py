@@ -0,0 +1,259 @@
+"""
+On-disk swing segments for GolfIMU backend (the cold storage tier)
+
+Swings demoted from Redis are written to segment files, one file per
+demotion, under ``RETENTION_SEGMENT_DIR/<session_id>/``:
+
+- ``GSEG1\\n`` magic
+- a 4-byte big-endian header length and a JSON header:
+  ``{"session_id", "swings": [[swing_id, score, offset, length], ...]}``
+- the swings' stored JSON documents, each zlib-compressed, at ``offset``
+  from the end of the header
+
+Documents are kept byte for byte, so a promoted swing is exactly what
+Redis held. Files are written to a temporary name, synced and renamed,
+so a segment is either complete or absent. A swing demoted twice (after
+a crash between the write and the Redis trim) is read from its newest
+segment.
+
+Sessions demoted whole also leave their per-swing hashes (summaries,
+previews, metrics) in ``HASHES_NAME`` beside the segments: one
+zlib-compressed JSON object ``{hash name: {field: value}}``, written the
+same way and merged with any hashes demoted before.
+"""
+import json
+import os
+import struct
+import sys
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from .structured_log import get_logger
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import RETENTION_SEGMENT_COMPRESSION, RETENTION_SEGMENT_DIR
+
+logger = get_logger("segments")
+
+# The only copy of demoted swings: resolved against the project root, not the working directory
+SEGMENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), RETENTION_SEGMENT_DIR)
+
+SEGMENT_MAGIC = b"GSEG1\n"
+SEGMENT_SUFFIX = ".seg"
+HASHES_NAME = "hashes.z"
+_HEADER_LENGTH = struct.Struct(">I")
+
+
+class SwingSegmentStore:
+    """Segment files of demoted swings, with an in-memory index per session"""
+
+    def __init__(self, root: str = SEGMENT_DIR, level: int = RETENTION_SEGMENT_COMPRESSION):
+        """Initialize the store (nothing is read until a session is used).
+
+        Args:
+            root: Directory holding one directory of segments per session
+            level: zlib compression level of written documents
+        """
+        self.root = root
+        self.level = level
+        # session_id -> ({swing_id: (path, score, offset, length)}, segment files loaded)
+        self._index: Dict[str, Tuple[Dict[str, tuple], set]] = {}
+        self._lock = threading.Lock()
+
+    def _session_dir(self, session_id: str) -> str:
+        return os.path.join(self.root, session_id)
+
+    @staticmethod
+    def _read_header(f) -> Tuple[dict, int]:
+        """Read a segment's header, returning it and the offset of its first document"""
+        if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+            raise ValueError(f"Not a swing segment: {f.name}")
+        (length,) = _HEADER_LENGTH.unpack(f.read(_HEADER_LENGTH.size))
+        return json.loads(f.read(length)), len(SEGMENT_MAGIC) + _HEADER_LENGTH.size + length
+
+    def _session_index(self, session_id: str, refresh: bool = False) -> Dict[str, tuple]:
+        """Index of a session's demoted swings, loading segments not seen yet (lock held)"""
+        entry = self._index.get(session_id)
+        if entry is not None and not refresh:
+            return entry[0]
+        index, loaded = entry if entry is not None else ({}, set())
+        directory = self._session_dir(session_id)
+        names = sorted(name for name in os.listdir(directory)
+                       if name.endswith(SEGMENT_SUFFIX)) if os.path.isdir(directory) else []
+        for name in names:
+            if name in loaded:
+                continue
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "rb") as f:
+                    header, data_start = self._read_header(f)
+                for swing_id, score, offset, length in header["swings"]:
+                    index[swing_id] = (path, score, data_start + offset, length)
+                loaded.add(name)
+            except Exception as e:
+                logger.error("Error reading segment %s: %s", path, e)
+        self._index[session_id] = (index, loaded)
+        return index
+
+    def write(self, session_id: str, swings: List[Tuple[str, float, str]]) -> Optional[str]:
+        """Write swings to a new segment of their session.
+
+        Args:
+            session_id: Session the swings belong to
+            swings: (swing_id, index score, stored JSON document) of each swing
+
+        Returns:
+            Path of the segment (None if there was nothing to write)
+        """
+        if not swings:
+            return None
+        blobs = [zlib.compress(document.encode(), self.level) for _, _, document in swings]
+        entries, offset = [], 0
+        for (swing_id, score, _), blob in zip(swings, blobs):
+            entries.append([swing_id, score, offset, len(blob)])
+            offset += len(blob)
+        header = json.dumps({"session_id": session_id, "swings": entries}).encode()
+
+        directory = self._session_dir(session_id)
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            index = self._session_index(session_id, refresh=True)
+            loaded = self._index[session_id][1]
+            sequence = max((int(name[:-len(SEGMENT_SUFFIX)]) for name in os.listdir(directory)
+                            if name.endswith(SEGMENT_SUFFIX)), default=0) + 1
+            name = f"{sequence:08d}{SEGMENT_SUFFIX}"
+            path = os.path.join(directory, name)
+            temporary = f"{path}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(SEGMENT_MAGIC + _HEADER_LENGTH.pack(len(header)) + header)
+                for blob in blobs:
+                    f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, path)
+
+            data_start = len(SEGMENT_MAGIC) + _HEADER_LENGTH.size + len(header)
+            for swing_id, score, offset, length in entries:
+                index[swing_id] = (path, score, data_start + offset, length)
+            loaded.add(name)
+        return path
+
+    def read(self, session_id: str, swing_ids: List[str]) -> Dict[str, str]:
+        """Read demoted swings' documents.
+
+        Returns:
+            swing_id -> stored JSON document, for the ids found
+        """
+        with self._lock:
+            index = self._session_index(session_id)
+            if any(swing_id not in index for swing_id in swing_ids):
+                # Another process may have demoted them since the index was loaded
+                index = self._session_index(session_id, refresh=True)
+            locations = {swing_id: index[swing_id] for swing_id in swing_ids if swing_id in index}
+
+        documents = {}
+        by_path: Dict[str, List[str]] = {}
+        for swing_id, (path, _, _, _) in locations.items():
+            by_path.setdefault(path, []).append(swing_id)
+        for path, ids in by_path.items():
+            with open(path, "rb") as f:
+                for swing_id in sorted(ids, key=lambda swing_id: locations[swing_id][2]):
+                    _, _, offset, length = locations[swing_id]
+                    f.seek(offset)
+                    documents[swing_id] = zlib.decompress(f.read(length)).decode()
+        return documents
+
+    def swing_ids(self, session_id: str) -> List[str]:
+        """Ids of a session's demoted swings, newest first"""
+        with self._lock:
+            index = self._session_index(session_id, refresh=True)
+            return [swing_id for swing_id, _ in sorted(index.items(), key=lambda item: -item[1][1])]
+
+    def contains(self, session_id: str, swing_id: str) -> bool:
+        """Whether a swing was demoted"""
+        with self._lock:
+            return (swing_id in self._session_index(session_id)
+                    or swing_id in self._session_index(session_id, refresh=True))
+
+    def _read_hashes(self, session_id: str) -> Dict[str, Dict[str, str]]:
+        """A session's demoted hashes ({} if none, lock held)"""
+        path = os.path.join(self._session_dir(session_id), HASHES_NAME)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "rb") as f:
+            return json.loads(zlib.decompress(f.read()))
+
+    def write_hashes(self, session_id: str, hashes: Dict[str, Dict[str, str]]) -> Optional[str]:
+        """Write a session's hashes, merged over the ones demoted before.
+
+        Args:
+            session_id: Session the hashes belong to
+            hashes: Hash name -> {field: value}
+
+        Returns:
+            Path of the hashes file (None if there was nothing to write)
+        """
+        if not hashes:
+            return None
+        directory = self._session_dir(session_id)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, HASHES_NAME)
+        with self._lock:
+            merged = self._read_hashes(session_id)
+            for name, fields in hashes.items():
+                merged.setdefault(name, {}).update(fields)
+            temporary = f"{path}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(zlib.compress(json.dumps(merged).encode(), self.level))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, path)
+        return path
+
+    def read_hashes(self, session_id: str) -> Dict[str, Dict[str, str]]:
+        """A session's demoted hashes: hash name -> {field: value} ({} if none)"""
+        with self._lock:
+            return self._read_hashes(session_id)
+
+    def has_hashes(self, session_id: str) -> bool:
+        """Whether a session has demoted hashes"""
+        return os.path.exists(os.path.join(self._session_dir(session_id), HASHES_NAME))
+
+    def delete_hashes(self, session_id: str) -> bool:
+        """Delete a session's demoted hashes (once they are back in Redis)
+
+        Returns:
+            Whether there were any
+        """
+        with self._lock:
+            try:
+                os.remove(os.path.join(self._session_dir(session_id), HASHES_NAME))
+                return True
+            except FileNotFoundError:
+                return False
+
+    def session_bytes(self, session_id: str) -> int:
+        """Bytes of a session's segment and hashes files"""
+        with self._lock:
+            paths = {location[0] for location in self._session_index(session_id).values()}
+        paths.add(os.path.join(self._session_dir(session_id), HASHES_NAME))
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def delete_session(self, session_id: str) -> int:
+        """Delete a session's segments.
+
+        Returns:
+            Number of files removed
+        """
+        with self._lock:
+            self._index.pop(session_id, None)
+            directory = self._session_dir(session_id)
+            if not os.path.isdir(directory):
+                return 0
+            removed = 0
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+                removed += 1
+            os.rmdir(directory)
+            return removed
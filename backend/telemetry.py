@@ -0,0 +1,276 @@
+"""
+In-process telemetry for GolfIMU backend
+
+A small metrics registry (counters, gauges and fixed-bucket histograms)
+exposed as Prometheus text over HTTP and as a dict through
+``GolfIMUBackend.get_status``.
+
+Updates are plain attribute arithmetic under the GIL - no locks - so a
+hot-path ``inc()`` or ``observe()`` costs on the order of 100 ns. Two
+threads updating the same series can in rare cases lose an increment,
+which is acceptable for monitoring. Gauges can read their value from a
+callback at scrape time so queue depths cost nothing on the hot path.
+
+Modules declare their metrics at import time::
+
+    SERIAL_FRAMES = TELEMETRY.counter("golfimu_serial_frames_total", "IMU frames parsed")
+    SERIAL_FRAMES.inc()
+"""
+import bisect
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from global_config import TELEMETRY_HTTP_HOST, TELEMETRY_HTTP_PORT, TELEMETRY_LATENCY_BUCKETS_S
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    """Monotonically increasing value"""
+
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        """Add ``amount`` (must be >= 0)"""
+        self.value += amount
+
+
+class Gauge:
+    """Value that goes up and down, or is read from a callback"""
+
+    __slots__ = ("value", "function")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        """Set the value"""
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        """Add ``amount``"""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        """Subtract ``amount``"""
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Read the value from ``function`` whenever the gauge is collected"""
+        self.function = function
+
+    def get(self) -> float:
+        """Current value (the callback's result if one is set)"""
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception:
+            return float("nan")
+
+
+class Histogram:
+    """Observations counted into fixed buckets"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """(upper bound, cumulative count) per bucket, ending with +Inf"""
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+
+class MetricFamily:
+    """A named metric and its series, one per label value combination"""
+
+    def __init__(self, name: str, help_text: str, kind: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = TELEMETRY_LATENCY_BUCKETS_S):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str):
+        """Series for the given label values (created on first use).
+
+        Look the series up once and keep it when it is updated per sample.
+        """
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            with self._lock:
+                series = self._series.setdefault(values, self._new_series())
+        return series
+
+    def _new_series(self):
+        if self.kind == "counter":
+            return Counter()
+        if self.kind == "gauge":
+            return Gauge()
+        return Histogram(self.buckets)
+
+    def series(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        """(label values, series) pairs"""
+        with self._lock:
+            return list(self._series.items())
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        """Prometheus text exposition lines"""
+        lines = [f"# HELP {self.name} {_escape(self.help)}", f"# TYPE {self.name} {self.kind}"]
+        for values, series in self.series():
+            if self.kind == "counter":
+                lines.append(f"{self.name}{self._label_text(values)} {_number(series.value)}")
+            elif self.kind == "gauge":
+                lines.append(f"{self.name}{self._label_text(values)} {_number(series.get())}")
+            else:
+                for bound, count in series.cumulative():
+                    le = 'le="' + ("+Inf" if bound == float("inf") else _number(bound)) + '"'
+                    lines.append(f"{self.name}_bucket{self._label_text(values, le)} {count}")
+                lines.append(f"{self.name}_sum{self._label_text(values)} {_number(series.sum)}")
+                lines.append(f"{self.name}_count{self._label_text(values)} {series.count}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values keyed by series name"""
+        result = {}
+        for values, series in self.series():
+            key = f"{self.name}{self._label_text(values)}"
+            if self.kind == "counter":
+                result[key] = series.value
+            elif self.kind == "gauge":
+                result[key] = series.get()
+            else:
+                result[key] = {"count": series.count, "sum": series.sum,
+                               "mean": series.sum / series.count if series.count else 0.0}
+        return result
+
+
+def _escape(text: str) -> str:
+    return str(text).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value == value else "NaN"
+
+
+class TelemetryRegistry:
+    """All metric families of the process"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _family(self, name: str, help_text: str, kind: str, labels: Sequence[str],
+                buckets: Sequence[float] = TELEMETRY_LATENCY_BUCKETS_S):
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = MetricFamily(name, help_text, kind, labels, buckets)
+            elif family.kind != kind or family.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered as a different {family.kind}")
+        # Unlabeled metrics are used directly as their only series
+        return family if family.label_names else family.labels()
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        """Register (or get) a counter; labeled counters return their family"""
+        return self._family(name, help_text, "counter", labels)
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        """Register (or get) a gauge; labeled gauges return their family"""
+        return self._family(name, help_text, "gauge", labels)
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = TELEMETRY_LATENCY_BUCKETS_S):
+        """Register (or get) a histogram; labeled histograms return their family"""
+        return self._family(name, help_text, "histogram", labels, buckets)
+
+    def families(self) -> List[MetricFamily]:
+        """Registered metric families"""
+        with self._lock:
+            return list(self._families.values())
+
+    def render_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for family in self.families():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Every series' current value (histograms as count / sum / mean)"""
+        result: Dict[str, Any] = {}
+        for family in self.families():
+            result.update(family.snapshot())
+        return result
+
+
+def start_http_server(registry: Optional[TelemetryRegistry] = None, host: str = TELEMETRY_HTTP_HOST,
+                      port: int = TELEMETRY_HTTP_PORT) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` in Prometheus text format from a daemon thread.
+
+    Args:
+        registry: Registry to expose (``TELEMETRY`` if None)
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free one)
+
+    Returns:
+        The running server (``shutdown()`` stops it)
+    """
+    registry = registry or TELEMETRY
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="telemetry-http", daemon=True).start()
+    return server
+
+
+TELEMETRY = TelemetryRegistry()
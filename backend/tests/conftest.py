@@ -20,6 +20,13 @@ from backend.config import Settings
 from backend.main import GolfIMUBackend
 
 
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path, monkeypatch):
+    """Spool files of clients built by the tests go to a temporary directory"""
+    monkeypatch.setattr("backend.redis_spool.SPOOL_DIR", str(tmp_path / "spool"))
+    return tmp_path / "spool"
+
+
 @pytest.fixture
 def mock_redis_client():
     """Mock Redis client for testing"""
@@ -31,6 +38,11 @@ def mock_redis_client():
     mock_client.get.return_value = None
     mock_client.delete.return_value = 1
     mock_client.llen.return_value = 0
+    mock_client.hgetall.return_value = {}
+    mock_client.zrevrange.return_value = []
+    mock_client.zrange.return_value = []
+    mock_client.smembers.return_value = set()
+    mock_client.scan_iter.return_value = []
     return mock_client
 
 
@@ -0,0 +1,207 @@
+"""
+Tests for backend.analytics_pipeline module
+"""
+import threading
+import time
+from datetime import datetime
+import pytest
+import numpy as np
+from unittest.mock import Mock
+
+from backend.analytics_pipeline import (
+    AnalyticsPipeline, Analyzer, AnalyzerRegistry, resample_analyzer
+)
+from backend.imu_batch import IMUBatch
+from backend.models import ProcessedMetrics
+from backend.tests.test_swing_quality import make_swing_batch
+
+
+def make_registry(calls=None, delay=0.0):
+    """Diamond-shaped registry: a -> (b, c) -> d"""
+    calls = calls if calls is not None else []
+    registry = AnalyzerRegistry()
+
+    def step(name, **kwargs):
+        calls.append((name, threading.current_thread().name))
+        time.sleep(delay)
+        return sum(kwargs.values()) + 1
+
+    registry.add(Analyzer("a", ["batch"], ["x"], lambda batch: {"x": step("a", v=len(batch))}))
+    registry.add(Analyzer("b", ["x"], ["y"], lambda x: {"y": step("b", x=x)}))
+    registry.add(Analyzer("c", ["x"], ["z"], lambda x: {"z": step("c", x=x)}))
+    registry.add(Analyzer("d", ["y", "z"], [], lambda y, z: {"metrics": {"total": y + z}}))
+    return registry
+
+
+class TestAnalyzerRegistry:
+    """Test analyzer registration and DAG resolution"""
+
+    def test_resolve_orders_dependencies_first(self):
+        """Test analyzers come after everything they depend on"""
+        order = make_registry().resolve()
+
+        assert order.index("a") < order.index("b") < order.index("d")
+        assert order.index("a") < order.index("c") < order.index("d")
+
+    def test_resolve_only_needed_analyzers(self):
+        """Test targets pull in just their dependencies"""
+        assert make_registry().resolve(["b"]) == ["a", "b"]
+
+    def test_duplicate_output_rejected(self):
+        """Test two analyzers cannot produce the same value"""
+        registry = make_registry()
+        with pytest.raises(ValueError):
+            registry.add(Analyzer("e", ["batch"], ["x"], lambda batch: {"x": 0}))
+
+    def test_missing_input_rejected(self):
+        """Test inputs nobody produces are reported"""
+        registry = AnalyzerRegistry()
+        registry.add(Analyzer("a", ["nothing"], [], lambda nothing: {}))
+        with pytest.raises(ValueError, match="nothing"):
+            registry.resolve()
+
+    def test_cycle_rejected(self):
+        """Test dependency cycles are reported"""
+        registry = AnalyzerRegistry()
+        registry.add(Analyzer("a", ["q"], ["p"], lambda q: {"p": q}))
+        registry.add(Analyzer("b", ["p"], ["q"], lambda p: {"q": p}))
+        with pytest.raises(ValueError, match="cycle"):
+            registry.resolve()
+
+
+class TestAnalyticsPipeline:
+    """Test DAG execution"""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_each_analyzer_runs_once(self, workers, sample_session_config):
+        """Test shared intermediates are memoized"""
+        calls = []
+        pipeline = AnalyticsPipeline(make_registry(calls), max_workers=workers)
+
+        metrics = pipeline.run_batch(make_swing_batch(count=10, top=4, impact=7), sample_session_config)
+        pipeline.shutdown()
+
+        assert metrics == {"total": 24}
+        assert sorted(name for name, _ in calls) == ["a", "b", "c"]
+
+    def test_independent_branches_run_concurrently(self, sample_session_config):
+        """Test sibling analyzers run on different pool threads"""
+        calls = []
+        pipeline = AnalyticsPipeline(make_registry(calls, delay=0.05), max_workers=4)
+
+        pipeline.run_batch(make_swing_batch(count=10, top=4, impact=7), sample_session_config)
+        pipeline.shutdown()
+
+        threads = dict(calls)
+        assert threads["b"] != threads["c"]
+
+    def test_missing_output_reported(self, sample_session_config):
+        """Test analyzers must return their declared outputs"""
+        registry = AnalyzerRegistry()
+        registry.add(Analyzer("a", ["batch"], ["x"], lambda batch: {}))
+        pipeline = AnalyticsPipeline(registry, max_workers=1)
+
+        with pytest.raises(ValueError, match="did not produce"):
+            pipeline.run_batch(make_swing_batch(count=10, top=4, impact=7), sample_session_config)
+
+    def test_default_pipeline_metrics(self, sample_session_config):
+        """Test the default analyzers produce the full metric set"""
+        pipeline = AnalyticsPipeline(max_workers=1)
+        metrics = pipeline.run_batch(make_swing_batch(), sample_session_config)
+
+        for name in ("peak_club_head_speed", "tempo", "swing_plane_tilt", "attack_angle",
+                     "club_path", "face_angle", "smoothness", "dominant_frequency"):
+            assert name in metrics
+        assert metrics["impact_index"] == 400
+        assert metrics["top_index"] == 250
+        assert metrics["tempo"] == pytest.approx(250 / 150)
+
+    def test_threaded_matches_serial(self, sample_session_config):
+        """Test concurrent execution gives identical results"""
+        serial = AnalyticsPipeline(max_workers=1).run_batch(make_swing_batch(), sample_session_config)
+        threaded = AnalyticsPipeline(max_workers=4)
+        result = threaded.run_batch(make_swing_batch(), sample_session_config)
+        threaded.shutdown()
+
+        assert result == serial
+
+    def test_queue_depth(self):
+        """Test analyzer runs waiting for a busy pool are counted until a worker starts them"""
+        registry = AnalyzerRegistry()
+        release = threading.Event()
+        for name in ("a", "b", "c"):
+            registry.add(Analyzer(name, ["batch"], [], lambda batch: release.wait(5.0) and {}))
+        pipeline = AnalyticsPipeline(registry, max_workers=2)
+        runner = threading.Thread(target=pipeline.run_batch, args=(make_swing_batch(), None))
+        try:
+            runner.start()
+            deadline = time.monotonic() + 5.0
+            while pipeline.queue_depth != 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert pipeline.queue_depth == 1
+        finally:
+            release.set()
+            runner.join()
+            pipeline.shutdown()
+
+        assert pipeline.queue_depth == 0
+
+    def test_resampling_uniform_grid(self):
+        """Test jittered timestamps are resampled onto a uniform grid"""
+        batch = make_swing_batch(count=100, top=30, impact=60)
+        batch.t = batch.t + np.where(np.arange(100) % 2, 0.0003, 0.0)
+
+        uniform = resample_analyzer(batch)["uniform"]
+
+        assert np.allclose(np.diff(uniform.t), np.diff(uniform.t)[0])
+        assert np.allclose(np.linalg.norm(uniform.quat, axis=1), 1.0)
+
+    def test_resampling_unordered_timestamps(self):
+        """Test reordered and repeated timestamps are sorted and deduplicated before resampling"""
+        batch = make_swing_batch(count=100, top=30, impact=60)
+        t = batch.t.copy()
+        order = np.arange(100)
+        order[[40, 41]] = order[[41, 40]]
+        rows = batch.to_rows()[order]
+        rows[50, 0] = rows[49, 0]
+        shuffled = IMUBatch.from_rows(rows)
+
+        uniform = resample_analyzer(shuffled)["uniform"]
+
+        assert np.all(np.diff(uniform.t) > 0)
+        assert uniform.t[0] == t[0] and uniform.t[-1] == pytest.approx(t[-1])
+        assert np.allclose(uniform.accel[40], batch.accel[40])
+
+        rows[:, 0] = t[0]
+        with pytest.raises(ValueError):
+            resample_analyzer(IMUBatch.from_rows(rows))
+
+    def test_resampling_keeps_uniform_batch(self):
+        """Test already-uniform swings are passed through untouched"""
+        batch = make_swing_batch(count=100, top=30, impact=60)
+        assert resample_analyzer(batch)["uniform"] is batch
+
+    def test_process_swing_data_single_batched_write(self, backend_with_mocks, sample_session_config):
+        """Test metrics, running statistics and rollups of a new swing go out in one pipelined write"""
+        backend = backend_with_mocks
+        backend.session_manager.current_session = sample_session_config
+        pipe = Mock()
+        pipe.execute.return_value = [False]  # the swing has no stored metrics yet
+        backend.redis_manager.redis_client = Mock()
+        backend.redis_manager.redis_client.pipeline.return_value = pipe
+        backend.analytics_pipeline.run = Mock(return_value=ProcessedMetrics(
+            swing_id="s1", session_id="x",
+            metrics={"club_head_speed": 40.0, "attack_angle": 1.0, "club_path": 0.0,
+                     "face_angle": 0.0, "smoothness": 2.0, "contact_quality": 0.5}
+        ))
+
+        backend._process_swing_data(Mock(swing_id="s1", swing_duration=1.0, impact_g_force=30.0,
+                                         imu_data_points=[], swing_start_time=datetime(2023, 1, 4, 12)))
+
+        pipe.hset.assert_called_once()
+        # Running statistics count two scores; rollups a count and a bin per metric, per day and week
+        assert pipe.hincrby.call_count == 2 + 5 * 2 * 2
+        assert pipe.zadd.call_count == 5 + 2
+        # One read checking the metrics are new, then one write
+        pipe.hexists.assert_called_once()
+        assert pipe.execute.call_count == 2
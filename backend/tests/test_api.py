@@ -0,0 +1,405 @@
+"""
+Tests for backend.api module
+"""
+import fnmatch
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from backend.api import SAMPLE_FIELDS, create_app, decode_samples_npy
+from backend.models import IMUData, ProcessedMetrics, SwingData
+from backend.redis_manager import RedisManager
+
+START = datetime(2023, 1, 1, 12, 0, 0)
+
+
+class IndexedRedisClient:
+    """In-memory stand-in for the Redis commands the API reads and writes"""
+
+    def __init__(self):
+        self.values, self.lists, self.hashes, self.zsets, self.sets = {}, {}, {}, {}, {}
+        self.ttls = {}
+
+    def set(self, key, value):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def lpush(self, key, *values):
+        self.lists.setdefault(key, [])[:0] = reversed(values)
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:None if end == -1 else end + 1]
+
+    def lrange(self, key, start, end):
+        items = self.lists.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def lindex(self, key, index):
+        items = self.lists.get(key, [])
+        return items[index] if index < len(items) else None
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        self.hashes.setdefault(key, {}).update(mapping or {field: value})
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hmget(self, key, fields):
+        return [self.hget(key, field) for field in fields]
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hsetnx(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        if field in fields:
+            return 0
+        fields[field] = value
+        return 1
+
+    def hdel(self, key, *fields):
+        values = self.hashes.get(key, {})
+        removed = sum(values.pop(field, None) is not None for field in fields)
+        if not values:
+            self.hashes.pop(key, None)
+        return removed
+
+    def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    def hincrby(self, key, field, amount=1):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = int(fields.get(field, 0)) + amount
+        return fields[field]
+
+    def hincrbyfloat(self, key, field, amount=1.0):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = float(fields.get(field, 0.0)) + amount
+        return fields[field]
+
+    def hlen(self, key):
+        return len(self.hashes.get(key, {}))
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def _newest_first(self, key):
+        # Redis orders ties by member, so newest first is descending (score, member)
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+    def zrange(self, key, start, end, withscores=False):
+        entries = sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+        entries = entries[start:None if end == -1 else end + 1]
+        return entries if withscores else [member for member, _ in entries]
+
+    def zrangebyscore(self, key, min, max):
+        return [m for m, s in sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+                if float(min) <= s <= float(max)]
+
+    def zscan_iter(self, key, match="*"):
+        return [(m, s) for m, s in self.zsets.get(key, {}).items() if fnmatch.fnmatch(m, match)]
+
+    def zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        removed = sum(zset.pop(member, None) is not None for member in members)
+        if not zset:
+            self.zsets.pop(key, None)
+        return removed
+
+    def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    def zrevrank(self, key, member):
+        members = [m for m, _ in self._newest_first(key)]
+        return members.index(member) if member in members else None
+
+    def zrevrange(self, key, start, end):
+        members = [member for member, _ in self._newest_first(key)]
+        return members[start:None if end == -1 else end + 1]
+
+    def zrevrangebyscore(self, key, max, min, start=0, num=None, withscores=False):
+        high, low = float(str(max).lstrip("(")), float(str(min).lstrip("("))
+        entries = [(m, s) for m, s in self._newest_first(key)
+                   if (s < high or (s == high and not str(max).startswith("(")))
+                   and (s > low or (s == low and not str(min).startswith("(")))]
+        entries = entries[start:None if num is None else start + num]
+        return entries if withscores else [m for m, _ in entries]
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def sismember(self, key, member):
+        return member in self.sets.get(key, set())
+
+    def srem(self, key, *members):
+        members = set(members) & self.sets.get(key, set())
+        self.sets.get(key, set()).difference_update(members)
+        if key in self.sets and not self.sets[key]:
+            del self.sets[key]
+        return len(members)
+
+    def scan_iter(self, match, count=None):
+        stores = (self.values, self.lists, self.hashes, self.zsets, self.sets)
+        return [key for store in stores for key in store if fnmatch.fnmatch(key, match)]
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            for store in (self.values, self.lists, self.hashes, self.zsets, self.sets):
+                removed += store.pop(key, None) is not None
+        return removed
+
+    def unlink(self, *keys):
+        return self.delete(*keys)
+
+    def expire(self, key, seconds):
+        exists = any(key in store for store in (self.values, self.lists, self.hashes, self.zsets, self.sets))
+        if exists:
+            self.ttls[key] = seconds
+        return exists
+
+    def ttl(self, key):
+        if not any(key in store for store in (self.values, self.lists, self.hashes, self.zsets, self.sets)):
+            return -2
+        return self.ttls.get(key, -1)
+
+    def memory_usage(self, key):
+        """Bytes of the key's strings (scores count 8), None for a missing key"""
+        if key in self.values:
+            return len(str(self.values[key]))
+        if key in self.hashes:
+            return sum(len(field) + len(str(value)) for field, value in self.hashes[key].items())
+        if key in self.zsets:
+            return sum(len(member) + 8 for member in self.zsets[key])
+        items = self.lists.get(key) or self.sets.get(key)
+        return sum(len(item) for item in items) if items else None
+
+    def pipeline(self, transaction=True):
+        return IndexedPipeline(self)
+
+
+class IndexedPipeline:
+    """Pipeline running each command on the client as it is queued"""
+
+    def __init__(self, client):
+        self.client = client
+        self.results = []
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        return lambda *args, **kwargs: self.results.append(command(*args, **kwargs))
+
+    def execute(self):
+        results, self.results = self.results, []
+        return results
+
+
+def make_swing(index, session_id, samples=50):
+    """Stored swing ``index`` seconds after START"""
+    start = START + timedelta(seconds=index)
+    points = [IMUData(ax=float(index), ay=float(i), az=9.81, gx=0.0, gy=0.0, gz=0.0,
+                      mx=0.0, my=0.0, mz=0.0, qw=1.0, qx=0.0, qy=0.0, qz=0.0,
+                      timestamp=start + timedelta(milliseconds=i))
+              for i in range(samples)]
+    return SwingData(swing_id=f"swing{index:03d}", session_id=session_id, imu_data_points=points,
+                     swing_start_time=start, swing_end_time=points[-1].timestamp,
+                     swing_duration=0.049, impact_g_force=40.0 + index)
+
+
+@pytest.fixture
+def redis_manager():
+    manager = RedisManager()
+    manager.redis_client = IndexedRedisClient()
+    return manager
+
+
+@pytest.fixture
+def client(redis_manager):
+    return TestClient(create_app(redis_manager))
+
+
+@pytest.fixture
+def session_id(client):
+    response = client.post("/sessions", json={"user_id": "player1", "club_id": "driver",
+                                              "club_length": 1.07, "club_mass": 0.205})
+    assert response.status_code == 201
+    return response.json()["session_id"]
+
+
+def store_swings(redis_manager, session_id, indices):
+    session_config = redis_manager.get_session_config(session_id)
+    for index in indices:
+        assert redis_manager.store_swing_data(make_swing(index, session_id), session_config)
+    return session_config
+
+
+class TestSessions:
+    """Test creating and loading sessions"""
+
+    def test_create_and_load(self, client, session_id):
+        """Test a created session can be loaded and is listed"""
+        loaded = client.get(f"/sessions/{session_id}").json()
+
+        assert loaded["user_id"] == "player1"
+        assert loaded["impact_threshold"] == 30.0
+        assert client.get("/sessions/unknown").status_code == 404
+
+    def test_summary_reads_cached_aggregates(self, client, redis_manager, session_id):
+        """Test the summary comes from the counts and running statistics"""
+        store_swings(redis_manager, session_id, range(3))
+        redis_manager.redis_client.hset(f"session:{session_id}:running_stats", mapping={
+            "tempo_ratio:count": "2", "tempo_ratio:sum": "5.0", "tempo_ratio:sumsq": "13.0"})
+
+        summary = client.get(f"/sessions/{session_id}/summary").json()
+
+        assert summary["swing_count"] == 3
+        assert summary["swings_analyzed"] == 0
+        assert summary["statistics"]["tempo_ratio"] == {"count": 2, "mean": 2.5, "std": 0.5}
+        assert client.get("/sessions/unknown/summary").status_code == 404
+
+
+class TestSwings:
+    """Test swing listing and sample responses"""
+
+    def test_cursor_pagination(self, client, redis_manager, session_id):
+        """Test pages are newest first and a new swing does not shift the next page"""
+        store_swings(redis_manager, session_id, range(5))
+
+        first = client.get(f"/sessions/{session_id}/swings", params={"limit": 2}).json()
+        store_swings(redis_manager, session_id, [5])
+        second = client.get(f"/sessions/{session_id}/swings",
+                            params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        last = client.get(f"/sessions/{session_id}/swings",
+                          params={"limit": 2, "cursor": second["next_cursor"]}).json()
+
+        assert [s["swing_id"] for s in first["swings"]] == ["swing004", "swing003"]
+        assert [s["swing_id"] for s in second["swings"]] == ["swing002", "swing001"]
+        assert [s["swing_id"] for s in last["swings"]] == ["swing000"]
+        assert last["next_cursor"] is None
+        assert first["swings"][0]["samples"] == 50
+        assert client.get("/sessions/unknown/swings").status_code == 404
+
+    def test_tied_start_times_paged(self, client, redis_manager, session_id):
+        """Test swings sharing a start time are neither skipped nor repeated across pages"""
+        session_config = redis_manager.get_session_config(session_id)
+        for index in range(5):
+            swing = make_swing(index, session_id)
+            swing.swing_start_time = START
+            assert redis_manager.store_swing_data(swing, session_config)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            page = client.get(f"/sessions/{session_id}/swings", params=params).json()
+            seen += [s["swing_id"] for s in page["swings"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == ["swing004", "swing003", "swing002", "swing001", "swing000"]
+        assert client.get(f"/sessions/{session_id}/swings", params={"cursor": "bad"}).status_code == 400
+
+    def test_index_built_for_older_sessions(self, client, redis_manager, session_id):
+        """Test swings stored without an index are indexed on the first listing"""
+        store_swings(redis_manager, session_id, range(3))
+        redis_manager.redis_client.zsets.clear()
+        redis_manager.redis_client.hashes.clear()
+
+        page = client.get(f"/sessions/{session_id}/swings").json()
+
+        assert [s["swing_id"] for s in page["swings"]] == ["swing002", "swing001", "swing000"]
+
+    def test_binary_samples(self, client, redis_manager, session_id):
+        """Test samples are served as a structured float32 .npy array by default"""
+        store_swings(redis_manager, session_id, range(3))
+
+        response = client.get(f"/sessions/{session_id}/swings/swing001")
+        samples = decode_samples_npy(response.content)
+
+        assert response.headers["content-type"] == "application/x-npy"
+        assert samples.dtype.names == SAMPLE_FIELDS
+        assert len(samples) == 50
+        assert samples["t"][-1] == pytest.approx(0.049, abs=1e-6)
+        assert np.all(samples["ax"] == 1.0)
+        assert np.array_equal(samples["ay"], np.arange(50, dtype=np.float32))
+
+    def test_json_samples_opt_in(self, client, redis_manager, session_id):
+        """Test JSON samples are columnar, by query parameter or Accept header"""
+        store_swings(redis_manager, session_id, range(2))
+
+        by_query = client.get(f"/sessions/{session_id}/swings/swing000", params={"format": "json"})
+        by_header = client.get(f"/sessions/{session_id}/swings/swing000",
+                               headers={"Accept": "application/json"})
+
+        assert by_query.json() == by_header.json()
+        columns = by_query.json()["columns"]
+        assert list(columns) == list(SAMPLE_FIELDS)
+        assert columns["ay"] == [float(i) for i in range(50)]
+
+    def test_swing_lookup_survives_trimming(self, client, redis_manager, session_id):
+        """Test trimmed swings stay listed while their samples are gone"""
+        store_swings(redis_manager, session_id, range(102))
+
+        assert client.get(f"/sessions/{session_id}/swings/swing101").status_code == 200
+        assert client.get(f"/sessions/{session_id}/swings/swing002").status_code == 200
+        assert client.get(f"/sessions/{session_id}/swings/swing001").status_code == 404
+        first = client.get(f"/sessions/{session_id}/swings", params={"limit": 100}).json()
+        rest = client.get(f"/sessions/{session_id}/swings",
+                          params={"limit": 100, "cursor": first["next_cursor"]}).json()
+        assert [s["swing_id"] for s in rest["swings"]] == ["swing001", "swing000"]
+
+    def test_previews(self, client, redis_manager, session_id):
+        """Test previews are listed on request and served on their own"""
+        store_swings(redis_manager, session_id, range(2))
+
+        page = client.get(f"/sessions/{session_id}/swings", params={"preview": "true"}).json()
+        preview = client.get(f"/sessions/{session_id}/swings/swing001/preview").json()
+
+        assert page["swings"][0]["preview"] == preview
+        assert preview["channels"]["ay"]["v"] == [float(i) for i in range(50)]
+        assert "preview" not in client.get(f"/sessions/{session_id}/swings").json()["swings"][0]
+        assert client.get(f"/sessions/{session_id}/swings/missing/preview").status_code == 404
+
+    def test_metrics(self, client, redis_manager, session_id):
+        """Test a swing's processed metrics are served"""
+        session_config = store_swings(redis_manager, session_id, range(1))
+        redis_manager.store_processed_metrics(
+            ProcessedMetrics(swing_id="swing000", session_id=session_id, metrics={"tempo_ratio": 3.0}),
+            session_config)
+
+        response = client.get(f"/sessions/{session_id}/swings/swing000/metrics")
+
+        assert response.json()["metrics"] == {"tempo_ratio": 3.0}
+        assert client.get(f"/sessions/{session_id}/swings/missing/metrics").status_code == 404
+
+
+def test_summaries_stored_as_json(redis_manager, sample_session_config):
+    """Test the stored summary is the JSON the list endpoint passes through"""
+    session_id = sample_session_config.session_id
+    swing = make_swing(7, session_id)
+    redis_manager.store_swing_data(swing, sample_session_config)
+
+    client = redis_manager.redis_client
+    summary = json.loads(client.hget(f"session:{session_id}:swing_summaries", "swing007"))
+
+    assert summary["impact_g_force"] == 47.0
+    assert client.zsets[f"session:{session_id}:swing_index"]["swing007"] == swing.swing_start_time.timestamp()
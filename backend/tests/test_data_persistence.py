@@ -71,6 +71,66 @@ class MockRedisClient:
                 deleted_count += 1
         return deleted_count
     
+    def zadd(self, key, mapping):
+        """Mock Redis ZADD operation"""
+        self.data.setdefault(key, {}).update(mapping)
+        return len(mapping)
+    
+    def zrevrange(self, key, start, end):
+        """Mock Redis ZREVRANGE operation (members only)"""
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: -item[1])
+        return [member for member, _ in members][start:None if end == -1 else end + 1]
+    
+    def lindex(self, key, index):
+        """Mock Redis LINDEX operation"""
+        items = self.lists.get(key, [])
+        return items[index] if index < len(items) else None
+    
+    def zrange(self, key, start, end):
+        """Mock Redis ZRANGE operation (members only)"""
+        members = sorted(self.data.get(key, {}).items(), key=lambda item: item[1])
+        return [member for member, _ in members][start:None if end == -1 else end + 1]
+    
+    def zrem(self, key, *members):
+        """Mock Redis ZREM operation"""
+        zset = self.data.get(key, {})
+        removed = sum(zset.pop(member, None) is not None for member in members)
+        if not zset:
+            self.data.pop(key, None)
+        return removed
+    
+    def hset(self, key, field=None, value=None, mapping=None):
+        """Mock Redis HSET operation"""
+        self.data.setdefault(key, {}).update(mapping or {field: value})
+        return 1
+    
+    def hgetall(self, key):
+        """Mock Redis HGETALL operation"""
+        return dict(self.data.get(key, {}))
+    
+    def hincrby(self, key, field, amount=1):
+        """Mock Redis HINCRBY operation"""
+        fields = self.data.setdefault(key, {})
+        fields[field] = int(fields.get(field, 0)) + amount
+        return fields[field]
+    
+    def sadd(self, key, *members):
+        """Mock Redis SADD operation"""
+        self.data.setdefault(key, set()).update(members)
+        return len(members)
+    
+    def smembers(self, key):
+        """Mock Redis SMEMBERS operation"""
+        return set(self.data.get(key, set()))
+    
+    def unlink(self, *keys):
+        """Mock Redis UNLINK operation"""
+        return self.delete(*keys)
+    
+    def pipeline(self, transaction=True):
+        """Mock Redis pipeline (commands run immediately)"""
+        return MockPipeline(self)
+    
     def ping(self):
         """Mock Redis PING operation"""
         return True
@@ -80,6 +140,26 @@ class MockRedisClient:
         import fnmatch
         all_keys = list(self.data.keys()) + list(self.lists.keys())
         return fnmatch.filter(all_keys, pattern)
+    
+    def scan_iter(self, match, count=None):
+        """Mock Redis SCAN iteration"""
+        return self.keys(match)
+
+
+class MockPipeline:
+    """Mock Redis pipeline running each command on the client as it is queued"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.results = []
+    
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        return lambda *args, **kwargs: self.results.append(command(*args, **kwargs))
+    
+    def execute(self):
+        results, self.results = self.results, []
+        return results
 
 
 @pytest.fixture
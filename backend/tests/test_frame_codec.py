@@ -0,0 +1,82 @@
+"""
+Tests for backend.frame_codec module
+"""
+import json
+import pytest
+import numpy as np
+
+from backend.frame_codec import (
+    BINARY_FRAME_SIZE, FRAME_FIELDS, decode_binary_frames, decode_json_frame, decode_json_frames,
+    encode_binary_frames, encode_json_frames
+)
+
+
+def make_frames(count=5):
+    """Distinct frame values per sample"""
+    values = np.arange(count * len(FRAME_FIELDS), dtype=np.float64).reshape(count, -1) / 10
+    return np.arange(count) * 2, values
+
+
+class TestFrameCodec:
+    """Test JSON and binary serial frames"""
+
+    def test_json_matches_firmware_layout(self):
+        """Test JSON lines use the firmware field order and precision"""
+        t_ms, values = make_frames(1)
+        line = encode_json_frames(t_ms, values).decode()
+
+        assert line.endswith("\r\n")
+        assert list(json.loads(line)) == ["t"] + list(FRAME_FIELDS)
+        assert '"ax":0.000' in line and '"qw":0.9000' in line
+
+    def test_json_round_trip(self):
+        """Test JSON lines decode to the encoded values"""
+        t_ms, values = make_frames(1)
+        t, decoded = decode_json_frame(encode_json_frames(t_ms, values).decode())
+
+        assert t == 0
+        assert np.allclose(decoded, values[0])
+        assert decode_json_frame("Swing monitoring started") is None
+
+    def test_json_buffer(self):
+        """Test a read buffer decodes every complete line and keeps the cut-off one"""
+        t_ms, values = make_frames(3)
+        data = b"Swing monitoring started\r\n" + encode_json_frames(t_ms, values)
+
+        t, decoded, consumed = decode_json_frames(data[:-10])
+
+        assert list(t) == [0, 2]
+        assert np.allclose(decoded, values[:2])
+        assert data[consumed:].startswith(b'{"t":4')
+
+    def test_binary_round_trip(self):
+        """Test binary frames decode exactly"""
+        t_ms, values = make_frames()
+        data = encode_binary_frames(t_ms, values)
+
+        t, decoded, consumed = decode_binary_frames(data)
+
+        assert len(data) == 5 * BINARY_FRAME_SIZE
+        assert consumed == len(data)
+        assert np.array_equal(t, t_ms)
+        assert np.allclose(decoded, values.astype(np.float32))
+
+    def test_binary_resync(self):
+        """Test status lines and corrupted frames are skipped"""
+        t_ms, values = make_frames()
+        data = bytearray(encode_binary_frames(t_ms, values))
+        data[BINARY_FRAME_SIZE + 10] ^= 0xFF  # corrupt frame 1
+
+        t, _, _ = decode_binary_frames(b"Swing monitoring started\r\n" + bytes(data))
+
+        assert list(t) == [0, 4, 6, 8]
+
+    def test_binary_partial_frame_left_unconsumed(self):
+        """Test a frame cut off at the end waits for the next read"""
+        t_ms, values = make_frames(2)
+        data = encode_binary_frames(t_ms, values)
+
+        t, _, consumed = decode_binary_frames(data[:-5])
+
+        assert list(t) == [0]
+        assert consumed == BINARY_FRAME_SIZE
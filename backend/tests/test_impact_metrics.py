@@ -0,0 +1,212 @@
+"""
+Tests for backend.impact_metrics module
+"""
+import math
+import pytest
+import json
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from backend.models import IMUData, SwingData, SessionConfig, ProcessedMetrics
+from backend.imu_batch import IMUBatch
+from backend.kinematics import quaternion_to_matrix
+from backend.impact_metrics import (
+    analyze_impact, calibrate_face_normal, compute_impact_metrics,
+    find_impact_index, get_impact_calibration
+)
+
+
+def make_points(count=200, gyro=(0.0, 20.0, 0.0), impact_index=150,
+                quat=(1.0, 0.0, 0.0, 0.0), impact_quat=None):
+    """Build 1 kHz samples with a constant rotation and one impact spike"""
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    points = []
+    for i in range(count):
+        q = impact_quat if (impact_quat is not None and i >= impact_index - 10) else quat
+        points.append(IMUData(
+            ax=400.0 if i == impact_index else 0.0, ay=0.0, az=9.81,
+            gx=gyro[0], gy=gyro[1], gz=gyro[2],
+            mx=0.0, my=0.0, mz=0.0,
+            qw=q[0], qx=q[1], qy=q[2], qz=q[3],
+            timestamp=start + timedelta(milliseconds=i)
+        ))
+    return points
+
+
+def yaw_quat(degrees):
+    """Quaternion for a rotation about world z"""
+    half = math.radians(degrees) / 2
+    return (math.cos(half), 0.0, 0.0, math.sin(half))
+
+
+class TestImpactMetrics:
+    """Test impact metric computation"""
+
+    def test_find_impact_index(self):
+        """Test impact index is the acceleration peak"""
+        batch = IMUBatch.from_imu_points(make_points(impact_index=120))
+        assert find_impact_index(batch) == 120
+
+    def test_square_straight_swing(self, sample_session_config):
+        """Test a square face on a straight path gives zero angles"""
+        batch = IMUBatch.from_imu_points(make_points())
+        metrics = compute_impact_metrics(batch, get_impact_calibration(sample_session_config))
+
+        assert metrics["impact_index"] == 150
+        assert metrics["club_head_speed"] == pytest.approx(20.0 * 1.07)
+        assert metrics["attack_angle"] == pytest.approx(0.0, abs=1e-9)
+        assert metrics["club_path"] == pytest.approx(0.0, abs=1e-9)
+        assert metrics["face_angle"] == pytest.approx(0.0, abs=1e-9)
+        assert metrics["face_calibrated"] is True
+
+    def test_in_to_out_path(self, sample_session_config):
+        """Test a lateral velocity component shows as in-to-out path"""
+        batch = IMUBatch.from_imu_points(make_points(gyro=(5.0, 20.0, 0.0)))
+        metrics = compute_impact_metrics(batch, get_impact_calibration(sample_session_config))
+
+        assert metrics["club_path"] == pytest.approx(math.degrees(math.atan2(5.0, 20.0)))
+
+    def test_open_face(self, sample_session_config):
+        """Test a face rotated clockwise since address reads open"""
+        batch = IMUBatch.from_imu_points(make_points(gyro=(0.0, 0.0, 0.0), impact_quat=yaw_quat(-4.0)))
+        metrics = compute_impact_metrics(batch, get_impact_calibration(sample_session_config))
+
+        assert metrics["face_angle"] == pytest.approx(4.0)
+
+    def test_too_few_samples(self, sample_session_config):
+        """Test metrics need at least two samples"""
+        batch = IMUBatch.from_imu_points(make_points(count=1, impact_index=0))
+        with pytest.raises(ValueError):
+            compute_impact_metrics(batch, get_impact_calibration(sample_session_config))
+
+    def test_analyze_impact_returns_processed_metrics(self, sample_session_config):
+        """Test analyze_impact wraps metrics in ProcessedMetrics"""
+        swing = SwingData(
+            session_id=sample_session_config.session_id,
+            imu_data_points=make_points(),
+            swing_start_time=datetime(2023, 1, 1, 12, 0, 0),
+            swing_end_time=datetime(2023, 1, 1, 12, 0, 1),
+            swing_duration=0.2,
+            impact_g_force=40.0
+        )
+
+        result = analyze_impact(swing, sample_session_config)
+
+        assert isinstance(result, ProcessedMetrics)
+        assert result.swing_id == swing.swing_id
+        assert "attack_angle" in result.metrics
+
+
+class TestImpactCalibration:
+    """Test face normal calibration and caching"""
+
+    def test_calibration_is_cached_per_session(self, sample_session_config):
+        """Test repeated lookups reuse the precomputed geometry"""
+        first = get_impact_calibration(sample_session_config)
+        second = get_impact_calibration(sample_session_config)
+        assert first is second
+
+    def test_calibration_rebuilt_when_normal_changes(self, sample_session_config):
+        """Test a new calibration invalidates the cached geometry"""
+        first = get_impact_calibration(sample_session_config)
+        sample_session_config.face_normal_calibration = [0.0, 1.0, 0.0]
+        second = get_impact_calibration(sample_session_config)
+
+        assert first is not second
+        assert np.allclose(second.face_normal, [0.0, 1.0, 0.0])
+
+    def test_uncalibrated_session_uses_nominal_axis(self, sample_session_config):
+        """Test sessions without calibration fall back to the nominal face axis"""
+        sample_session_config.face_normal_calibration = None
+        calibration = get_impact_calibration(sample_session_config)
+
+        assert calibration.calibrated is False
+        assert np.allclose(calibration.face_normal, [1.0, 0.0, 0.0])
+
+    def test_calibrate_face_normal_levels_face(self):
+        """Test the calibrated normal is horizontal at address"""
+        half = math.radians(20.0) / 2
+        tilted = (math.cos(half), 0.0, math.sin(half), 0.0)  # 20° about y
+        points = make_points(count=50, gyro=(0.0, 0.0, 0.0), quat=tilted)
+
+        normal = calibrate_face_normal(points)
+        world = quaternion_to_matrix(np.array(tilted)) @ np.array(normal)
+
+        assert np.linalg.norm(normal) == pytest.approx(1.0)
+        assert world[2] == pytest.approx(0.0, abs=1e-9)
+        assert world[0] == pytest.approx(1.0)
+
+    def test_calibrate_face_normal_empty(self):
+        """Test calibration without samples fails"""
+        with pytest.raises(ValueError):
+            calibrate_face_normal([])
+
+
+class TestImpactIntegration:
+    """Test impact metrics wiring in managers and backend"""
+
+    def test_store_processed_metrics(self, redis_manager_with_mock, sample_session_config):
+        """Test processed metrics are stored in the session metrics hash"""
+        metrics = ProcessedMetrics(swing_id="swing1", session_id=sample_session_config.session_id,
+                                   metrics={"club_path": 1.5})
+
+        pipe = Mock()
+        pipe.execute.return_value = [False]
+        redis_manager_with_mock.redis_client.pipeline.return_value = pipe
+
+        assert redis_manager_with_mock.store_processed_metrics(metrics, sample_session_config) is True
+
+        # club_path has rollups: one read checks the swing's metrics are new, then one write
+        assert pipe.execute.call_count == 2
+        key, field, value = pipe.hset.call_args[0]
+        assert key == f"session:{sample_session_config.session_id}:metrics"
+        assert field == "swing1"
+        assert json.loads(value)["metrics"] == {"club_path": 1.5}
+
+    def test_get_processed_metrics(self, redis_manager_with_mock, sample_session_config):
+        """Test processed metrics round trip through JSON"""
+        redis_manager_with_mock.redis_client.hget.return_value = json.dumps({
+            "swing_id": "swing1",
+            "session_id": sample_session_config.session_id,
+            "timestamp": "2023-01-01T12:00:00",
+            "metrics": {"face_angle": -2.0}
+        })
+
+        result = redis_manager_with_mock.get_processed_metrics(sample_session_config, "swing1")
+
+        assert result.metrics == {"face_angle": -2.0}
+
+    def test_session_manager_calibration(self, session_manager_with_mock, sample_session_config):
+        """Test calibration is stored on the current session"""
+        session_manager_with_mock.current_session = sample_session_config
+
+        normal = session_manager_with_mock.calibrate_face_normal(make_points(count=20))
+
+        assert normal == pytest.approx([1.0, 0.0, 0.0])
+        assert sample_session_config.face_normal_calibration == normal
+        session_manager_with_mock.redis_manager.redis_client.set.assert_called_once()
+
+    def test_session_manager_calibration_no_session(self, session_manager_with_mock):
+        """Test calibration requires an active session"""
+        assert session_manager_with_mock.calibrate_face_normal(make_points(count=20)) is None
+
+    def test_process_swing_data_stores_metrics(self, backend_with_mocks, sample_session_config):
+        """Test processed swings store their impact metrics"""
+        backend = backend_with_mocks
+        backend.session_manager.current_session = sample_session_config
+        backend.redis_manager.store_processed_metrics = Mock(return_value=True)
+        swing = SwingData(
+            session_id=sample_session_config.session_id,
+            imu_data_points=make_points(),
+            swing_start_time=datetime(2023, 1, 1, 12, 0, 0),
+            swing_end_time=datetime(2023, 1, 1, 12, 0, 1),
+            swing_duration=0.2,
+            impact_g_force=40.0
+        )
+
+        backend._process_swing_data(swing)
+
+        processed = backend.redis_manager.store_processed_metrics.call_args[0][0]
+        assert processed.swing_id == swing.swing_id
+        assert "face_angle" in processed.metrics
@@ -0,0 +1,289 @@
+"""
+Tests for backend.shared_ring and backend.ingest_supervisor modules
+"""
+import multiprocessing
+import os
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from backend.config import settings
+from backend.imu_batch import ROW_FIELDS
+from backend.ingest_supervisor import (
+    FrameClock, IngestSupervisor, RingSwingScanner, Worker, persistence_worker, ring_swing_data
+)
+from backend.shared_ring import SharedRing
+from backend.swing_generator import generate_swings
+
+
+def make_rows(start, count):
+    """Rows whose every column holds the row's sequence number"""
+    return np.repeat(np.arange(start, start + count, dtype=np.float64)[:, None], ROW_FIELDS, axis=1)
+
+
+def swing_rows(count, sample_rate=1000, seed=0):
+    """Generated swings back to back as ring rows"""
+    swings = generate_swings(count, sample_rate=sample_rate, seed=seed)
+    duration = float(swings.t[-1]) + float(swings.t[1])
+    return np.vstack([np.column_stack((1.7e9 + i * duration + swings.t, swings.frames(i)))
+                      for i in range(count)])
+
+
+def write_rows(ring_name, count):
+    """Writer process: append ``count`` numbered rows"""
+    ring = SharedRing.attach(ring_name)
+    ring.write(make_rows(0, count))
+    ring.close()
+
+
+def crash_once_reader(ring_name, stop_event, reader, flag_path):
+    """Reader that dies after its first commit, then finishes the ring on restart"""
+    ring = SharedRing.attach(ring_name)
+    cursor = ring.cursor(reader)
+    while cursor < ring.write_seq:
+        rows, start, _ = ring.read(cursor, 10)
+        cursor = start + len(rows)
+        ring.commit(reader, cursor)
+        if not os.path.exists(flag_path):
+            open(flag_path, "w").close()
+            os._exit(1)
+    ring.close()
+    stop_event.wait()
+
+
+class StopAfter:
+    """Stop event that is set after ``count`` checks"""
+
+    def __init__(self, count):
+        self.count = count
+
+    def is_set(self):
+        self.count -= 1
+        return self.count < 0
+
+
+@pytest.fixture
+def ring():
+    """A small ring, freed after the test"""
+    ring = SharedRing.create(capacity=8)
+    yield ring
+    ring.close()
+    ring.unlink()
+
+
+class TestSharedRing:
+    """Test the shared-memory ring buffer"""
+
+    def test_write_and_read(self, ring):
+        """Test rows come back as a view in write order"""
+        ring.write(make_rows(0, 5))
+
+        rows, start, lost = ring.read(0, 100)
+
+        assert (start, lost, len(rows)) == (0, 0, 5)
+        assert np.array_equal(rows[:, 0], np.arange(5))
+        assert np.shares_memory(rows, ring._rows)
+        assert ring.is_intact(start, len(rows))
+
+    def test_wrap_and_overrun(self, ring):
+        """Test a lagging reader loses the overwritten rows and reads stop at the ring end"""
+        ring.write(make_rows(0, 5))
+        rows, start, _ = ring.read(0, 5)
+        ring.write(make_rows(5, 10))
+
+        assert not ring.is_intact(start, len(rows))
+        rows, start, lost = ring.read(5, 100)
+        assert (start, lost) == (7, 2)
+        assert list(rows[:, 0]) == [7]
+        rows, start, _ = ring.read(8, 100)
+        assert list(rows[:, 0]) == list(range(8, 15))
+        assert list(ring.copy_range(10, 15)[:, 0]) == list(range(10, 15))
+        assert ring.copy_range(2, 10) is None
+
+    def test_cursors_and_lost_counts(self, ring):
+        """Test reader state is kept in the shared header"""
+        ring.commit(1, 42)
+        ring.add_lost(1, 3)
+        other = SharedRing.attach(ring.name)
+        try:
+            assert other.cursor(1) == 42
+            assert other.lost(1) == 3
+            assert other.cursor(0) == 0
+        finally:
+            other.close()
+
+    def test_other_process_writes(self):
+        """Test rows written by another process are read without copying"""
+        ring = SharedRing.create(capacity=1000)
+        try:
+            writer = multiprocessing.get_context("spawn").Process(target=write_rows, args=(ring.name, 300))
+            writer.start()
+            writer.join(30)
+
+            rows, _, _ = ring.read(0, 1000)
+            assert writer.exitcode == 0
+            assert np.array_equal(rows, make_rows(0, 300))
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_not_a_ring(self):
+        """Test attaching to a foreign block is refused"""
+        from multiprocessing import shared_memory
+        block = shared_memory.SharedMemory(create=True, size=4096)
+        try:
+            with pytest.raises(ValueError):
+                SharedRing.attach(block.name)
+        finally:
+            block.close()
+            block.unlink()
+
+
+class TestRingSwingScanner:
+    """Test swings are cut out of the ring"""
+
+    def test_segments_each_swing(self, sample_session_config):
+        """Test every swing is found once with its pre- and post-impact samples"""
+        ring = SharedRing.create(capacity=20000)
+        try:
+            scanner = RingSwingScanner(ring, sample_session_config)
+            rows = swing_rows(3)
+            swings = []
+            for chunk in np.array_split(rows, 40):
+                ring.write(chunk)
+                while (swing := scanner.poll()) is not None or scanner.cursor < ring.write_seq:
+                    if swing is not None:
+                        swings.append(swing)
+
+            assert len(swings) == 3
+            for window, impact_index, _ in swings:
+                assert 1.29 <= window[impact_index, 0] - window[0, 0] <= 1.5
+                assert window[-1, 0] - window[impact_index, 0] == pytest.approx(0.2, abs=0.002)
+                swing = ring_swing_data(window, impact_index, sample_session_config)
+                assert swing.impact_g_force == pytest.approx(60.0, rel=0.1)
+                assert len(swing.imu_data_points) == len(window)
+            assert ring.cursor(1) == swings[0][2]
+            for _, _, impact_seq in reversed(swings):
+                scanner.ack(impact_seq)
+            assert ring.cursor(1) == ring.write_seq
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_restart_mid_swing(self, sample_session_config):
+        """Test a scanner restarted before a swing closed still emits it"""
+        ring = SharedRing.create(capacity=20000)
+        try:
+            rows = swing_rows(1)
+            ring.write(rows[:1400])
+            assert RingSwingScanner(ring, sample_session_config).poll() is None
+
+            ring.write(rows[1400:])
+            restarted = RingSwingScanner(ring, sample_session_config)
+            window, impact_index, _ = restarted.poll()
+
+            assert window[impact_index, 0] - window[0, 0] == pytest.approx(1.3, abs=0.01)
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_restart_before_ack(self, sample_session_config):
+        """Test a swing returned but not acknowledged is cut out again by a restarted scanner"""
+        ring = SharedRing.create(capacity=20000)
+        try:
+            ring.write(swing_rows(1))
+            scanner = RingSwingScanner(ring, sample_session_config)
+            while (swing := scanner.poll()) is None:
+                pass
+            impact_seq = swing[2]
+            while scanner.cursor < ring.write_seq:
+                assert scanner.poll() is None
+            assert ring.cursor(1) == impact_seq
+
+            window, impact_index, replayed_seq = RingSwingScanner(ring, sample_session_config).poll()
+            assert replayed_seq == impact_seq
+            assert window[impact_index, 0] - window[0, 0] == pytest.approx(1.3, abs=0.01)
+
+            scanner.ack(impact_seq)
+            assert ring.cursor(1) == ring.write_seq
+            restarted = RingSwingScanner(ring, sample_session_config)
+            while restarted.cursor < ring.write_seq:
+                assert restarted.poll() is None
+        finally:
+            ring.close()
+            ring.unlink()
+
+
+class TestWorkers:
+    """Test the worker loops and the supervisor"""
+
+    def test_frame_clock(self):
+        """Test firmware time keeps its spacing and re-anchors after a reset"""
+        clock = FrameClock()
+
+        first = clock.to_host(np.array([1000, 1001]), received=50.0)
+        second = clock.to_host(np.array([1002]), received=60.0)
+        reset = clock.to_host(np.array([0]), received=70.0)
+
+        assert list(first) == [49.999, 50.0]
+        assert second[0] == pytest.approx(50.001)
+        assert reset[0] == 70.0
+
+    def test_persistence_worker(self, sample_session_config):
+        """Test new rows reach Redis in one round trip per chunk and the cursor is committed"""
+        ring = SharedRing.create(capacity=5000)
+        try:
+            ring.write(swing_rows(1)[:1500])
+            with patch('backend.redis_manager.redis.Redis') as redis_class:
+                persistence_worker(ring.name, StopAfter(3), sample_session_config)
+
+            pipe = redis_class.return_value.pipeline.return_value
+            assert pipe.execute.call_count == 2
+            assert len(pipe.lpush.call_args_list[1][0]) == 1 + 500
+            assert ring.cursor(0) == 1500
+        finally:
+            ring.close()
+            ring.unlink()
+
+    def test_supervisor_restarts_crashed_worker(self, tmp_path):
+        """Test a crashed reader is restarted and resumes from its committed cursor"""
+        worker = Worker("reader", crash_once_reader, (0, str(tmp_path / "crashed")), reader=0)
+        supervisor = IngestSupervisor([worker], capacity=1000, restart_delay=0.0)
+        supervisor.start()
+        try:
+            supervisor.ring.write(make_rows(0, 100))
+            deadline = time.monotonic() + 30
+            while supervisor.ring.cursor(0) < 100 and time.monotonic() < deadline:
+                supervisor.poll()
+                time.sleep(0.05)
+
+            status = supervisor.status()
+            assert status["write_seq"] == 100
+            assert status["workers"]["reader"]["restarts"] == 1
+            assert status["workers"]["reader"]["lag_rows"] == 0
+            assert status["workers"]["reader"]["lost_rows"] == 0
+        finally:
+            supervisor.stop()
+
+        assert supervisor.ring is None
+        assert not worker.process.is_alive()
+
+    def test_backend_hands_port_to_workers(self, backend_with_session_and_arduino):
+        """Test the backend releases the serial port and supervises the ingest workers"""
+        backend = backend_with_session_and_arduino
+        backend.serial_manager.serial_connection = Mock(port="/dev/tty.test")
+        backend.serial_manager.disconnect = Mock()
+        with patch('backend.main.IngestSupervisor') as supervisor_class:
+            supervisor = supervisor_class.return_value
+            supervisor.status.return_value = {"workers": {}}
+            status = backend.start_multiprocess_monitoring("binary")
+
+        backend.serial_manager.disconnect.assert_called_once()
+        workers = supervisor_class.call_args[0][0]
+        assert [worker.name for worker in workers] == ["ingest", "persistence", "analytics"]
+        assert workers[0].args[:3] == ("/dev/tty.test", settings.serial_baudrate, "binary")
+        supervisor.start.assert_called_once()
+        supervisor.stop.assert_called_once()
+        assert status == {"workers": {}}
@@ -0,0 +1,129 @@
+"""
+Tests for backend.latency_trace module
+"""
+import json
+import pytest
+from unittest.mock import Mock
+
+from backend.latency_trace import LATENCY_TRACER, LatencyTracer, latency_breakdown, summarize_latencies
+from backend.models import ProcessedMetrics
+
+
+@pytest.fixture(autouse=True)
+def clean_tracer():
+    """Start every test with an empty global tracer"""
+    LATENCY_TRACER.reset()
+    yield
+    LATENCY_TRACER.reset()
+
+
+class TestLatencyTracer:
+    """Test trace bookkeeping"""
+
+    def test_trace_starts_from_sample_stamps(self):
+        """Test a trace inherits the impact sample's receive and parse times"""
+        tracer = LatencyTracer()
+        tracer.stamp_sample(1.0, 1.001)
+        tracer.start("swing", impact=0.995)
+        tracer.mark("swing", "segment", 1.2)
+        tracer.mark("swing", "segment", 9.9)
+
+        assert tracer.traces()["swing"] == {"impact": 0.995, "serial_receive": 1.0,
+                                            "parse": 1.001, "segment": 1.2}
+
+    def test_untraced_swings_ignored(self):
+        """Test marks for swings without a trace are dropped"""
+        tracer = LatencyTracer()
+        tracer.mark("unknown", "store")
+
+        assert tracer.traces() == {}
+
+    def test_history_bounded(self):
+        """Test only the most recent traces are kept"""
+        tracer = LatencyTracer(history=3)
+        for i in range(5):
+            tracer.start(f"swing{i}")
+
+        assert list(tracer.traces()) == ["swing2", "swing3", "swing4"]
+
+
+class TestLatencyBreakdown:
+    """Test the per-stage latency summary"""
+
+    def test_summarize_latencies(self):
+        """Test percentiles are reported in milliseconds"""
+        summary = summarize_latencies([i / 1000.0 for i in range(1, 101)])
+
+        assert summary["p50_ms"] == pytest.approx(50.5)
+        assert summary["p99_ms"] == pytest.approx(99.01)
+        assert summary["max_ms"] == pytest.approx(100.0)
+
+    def test_breakdown_from_impact(self):
+        """Test latency is measured from the impact and steps from the previous stage"""
+        traces = [
+            {"impact": 0.0, "serial_receive": 0.002, "parse": 0.0021, "segment": 0.2, "available": 0.25},
+            {"impact": 10.0, "serial_receive": 10.004, "parse": 10.0041, "segment": 10.2, "available": 10.27},
+        ]
+
+        report = latency_breakdown(traces)
+
+        assert report["swings"] == 2
+        assert list(report["stages"]) == ["serial_receive", "parse", "segment", "available"]
+        assert report["stages"]["serial_receive"]["since_impact"]["max_ms"] == pytest.approx(4.0)
+        assert report["stages"]["available"]["since_impact"]["p50_ms"] == pytest.approx(260.0)
+        assert report["stages"]["available"]["step"]["max_ms"] == pytest.approx(70.0)
+
+    def test_breakdown_without_impact(self):
+        """Test production traces are measured from the first stage they have"""
+        report = latency_breakdown([{"serial_receive": 5.0, "store": 5.01}])
+
+        assert list(report["stages"]) == ["store"]
+        assert report["stages"]["store"]["since_impact"]["p50_ms"] == pytest.approx(10.0)
+
+
+class TestStageHooks:
+    """Test the stage hooks in the serial and Redis managers"""
+
+    def test_serial_swing_starts_trace(self, serial_manager_with_mock, sample_swing_data):
+        """Test a firmware-segmented swing is traced from its serial line"""
+        serial_manager_with_mock.serial_connection.readline.return_value = (
+            sample_swing_data.model_dump_json().encode() + b"\n")
+
+        swing_data = serial_manager_with_mock.wait_for_swing_data()
+        trace = LATENCY_TRACER.traces()[swing_data.swing_id]
+
+        assert trace["serial_receive"] <= trace["parse"]
+
+    def test_redis_stages(self, redis_manager_with_mock, sample_swing_data, sample_session_config):
+        """Test store, published and available are marked once each"""
+        LATENCY_TRACER.start(sample_swing_data.swing_id)
+        metrics = ProcessedMetrics(swing_id=sample_swing_data.swing_id, session_id="test_session")
+        redis_manager_with_mock.redis_client.pipeline.return_value = Mock()
+        redis_manager_with_mock.redis_client.hget.return_value = json.dumps({
+            "swing_id": metrics.swing_id, "session_id": metrics.session_id,
+            "timestamp": metrics.timestamp.isoformat(), "metrics": {}
+        })
+
+        redis_manager_with_mock.store_swing_data(sample_swing_data, sample_session_config)
+        redis_manager_with_mock.store_processed_metrics(metrics, sample_session_config)
+        redis_manager_with_mock.get_processed_metrics(sample_session_config, metrics.swing_id)
+        first_read = LATENCY_TRACER.traces()[metrics.swing_id]["available"]
+        redis_manager_with_mock.get_processed_metrics(sample_session_config, metrics.swing_id)
+        trace = LATENCY_TRACER.traces()[metrics.swing_id]
+
+        assert trace["store"] <= trace["published"] <= trace["available"]
+        assert trace["available"] == first_read
+
+    def test_backend_marks_analytics(self, backend_with_session, sample_swing_data):
+        """Test the analytics stage is marked when the pipeline finishes"""
+        LATENCY_TRACER.start(sample_swing_data.swing_id)
+        backend_with_session.analytics_pipeline.run = Mock(return_value=Mock(metrics={
+            "club_head_speed": 40.0, "attack_angle": 0.0, "club_path": 0.0, "face_angle": 0.0,
+            "smoothness": None, "contact_quality": None
+        }))
+        backend_with_session.redis_manager.store_processed_metrics = Mock(return_value=True)
+
+        backend_with_session._process_swing_data(sample_swing_data)
+
+        assert "analytics" in LATENCY_TRACER.traces()[sample_swing_data.swing_id]
+        assert backend_with_session.get_latency_report()["swings"] == 1
@@ -0,0 +1,198 @@
+"""
+Tests for backend.live_feed module and the live WebSocket endpoint
+"""
+import json
+import time
+from unittest.mock import MagicMock, Mock
+
+import numpy as np
+import pytest
+
+from backend.imu_batch import ROW_FIELDS
+from backend.live_feed import LIVE_FEED, LiveFeed, decode_samples, encode_samples
+from backend.models import SessionConfig
+from backend.sensor_hub import SensorChannel
+from backend.tests.test_sensor_hub import firmware_bytes
+
+
+def make_rows(start, count, t0=1.7e9):
+    """Rows at 1 kHz whose channels hold the row number"""
+    index = np.arange(start, start + count, dtype=np.float64)
+    rows = np.repeat(index[:, None], ROW_FIELDS, axis=1)
+    rows[:, 0] = t0 + index / 1000.0
+    return rows
+
+
+@pytest.fixture
+def feed():
+    """Feed that pushes every publish straight away"""
+    return LiveFeed(sample_rate=1000, flush_interval=0.0, max_pending=5)
+
+
+def drain(subscription):
+    messages = []
+    while (message := subscription.get()) is not None:
+        messages.append(message)
+    return messages
+
+
+class TestLiveFeed:
+    """Test downsampling tiers, fan-out and slow subscribers"""
+
+    def test_encode_round_trip(self):
+        """Test rows survive the binary message with absolute times"""
+        rows = make_rows(0, 20)
+
+        decoded, mode = decode_samples(encode_samples(rows, "full"))
+
+        assert mode == "full"
+        assert np.allclose(decoded, rows, atol=1e-5)
+
+    def test_tiers_share_one_encoding(self, feed):
+        """Test subscribers of a tier get the same message and each tier downsamples its own way"""
+        full = [feed.subscribe("s1"), feed.subscribe("s1")]
+        decimated = feed.subscribe("s1", "decimate", rate=100)
+        minmax = feed.subscribe("s1", "minmax", rate=100)
+        rows = make_rows(0, 20)
+        rows[13, 1] = 500.0
+
+        feed.publish_samples("s1", rows)
+
+        first, second = drain(full[0]), drain(full[1])
+        assert first[0] is second[0]
+        assert len(decode_samples(first[0])[0]) == 20
+        assert list(decode_samples(drain(decimated)[0])[0][:, 2]) == [0.0, 10.0]
+        extremes, mode = decode_samples(drain(minmax)[0])
+        assert mode == "minmax"
+        assert list(extremes[:, 2]) == [0.0, 9.0, 10.0, 19.0]
+        assert extremes[3, 1] == 500.0
+        assert extremes[2, 0] == extremes[3, 0] == pytest.approx(rows[10, 0])
+
+    def test_buckets_carry_across_batches(self, feed):
+        """Test partial buckets wait for the next batch"""
+        decimated = feed.subscribe("s1", "decimate", rate=100)
+
+        feed.publish_samples("s1", make_rows(0, 7))
+        assert drain(decimated) == []
+        feed.publish_samples("s1", make_rows(7, 7))
+
+        assert list(decode_samples(drain(decimated)[0])[0][:, 2]) == [0.0]
+        feed.publish_samples("s1", make_rows(14, 6))
+        assert list(decode_samples(drain(decimated)[0])[0][:, 2]) == [10.0]
+
+    def test_samples_are_batched(self):
+        """Test single samples are pushed together once the flush interval has passed"""
+        feed = LiveFeed(sample_rate=1000, flush_interval=0.05)
+        subscription = feed.subscribe("s1")
+
+        for i in range(10):
+            feed.publish_samples("s1", tuple(make_rows(i, 1)[0]))
+        assert len(subscription) == 0
+        time.sleep(0.06)
+        feed.publish_samples("s1", tuple(make_rows(10, 1)[0]))
+
+        assert len(decode_samples(drain(subscription)[0])[0]) == 11
+
+    def test_events_follow_pending_samples(self):
+        """Test an event flushes the samples published before it"""
+        feed = LiveFeed(sample_rate=1000, flush_interval=10.0)
+        subscription = feed.subscribe("s1", "minmax", rate=500)
+
+        feed.publish_samples("s1", make_rows(0, 4))
+        feed.publish_event("s1", "impact", {"g_force": 60.0})
+
+        samples, event = drain(subscription)
+        assert len(decode_samples(samples)[0]) == 4
+        assert json.loads(event) == {"type": "impact", "g_force": 60.0}
+
+    def test_slow_subscriber_never_blocks(self, feed):
+        """Test a subscriber that does not read loses its oldest messages"""
+        slow, fast = feed.subscribe("s1"), feed.subscribe("s1", "decimate", rate=10)
+
+        received = []
+        for i in range(8):
+            feed.publish_samples("s1", make_rows(i * 100, 100))
+            received += drain(fast)
+
+        assert len(received) == 8
+        assert len(slow) == 5
+        assert slow.take_dropped() == 3
+        assert slow.lagging_since is not None
+        assert decode_samples(slow.get())[0][0, 2] == 300.0
+
+    def test_unsubscribe(self, feed):
+        """Test a session without subscribers is no longer fed"""
+        subscription = feed.subscribe("s1", "minmax", rate=50)
+        assert feed.has_subscribers("s1")
+        assert feed.status() == {"s1": {"minmax@50Hz": {"subscribers": 1, "queued": 0}}}
+
+        feed.unsubscribe(subscription)
+        feed.publish_samples("s1", make_rows(0, 100))
+
+        assert not feed.has_subscribers("s1")
+        assert feed.subscriber_count() == 0
+        assert len(subscription) == 0
+
+    def test_invalid_subscription(self, feed):
+        """Test unknown modes and rates are refused"""
+        with pytest.raises(ValueError):
+            feed.subscribe("s1", "average")
+        with pytest.raises(ValueError):
+            feed.subscribe("s1", "decimate", rate=0)
+
+    def test_sensor_hub_publishes(self):
+        """Test samples ingested by a hub sensor reach its session's subscribers"""
+        config = SessionConfig(user_id="player1", club_id="driver", club_length=1.07, club_mass=0.2)
+        channel = SensorChannel("bay1", Mock(), config, "binary", ring_capacity=10000)
+        subscription = LIVE_FEED.subscribe(config.session_id, "decimate", rate=100)
+        try:
+            channel.ingest(firmware_bytes(1, "binary")[:59 * 1000], time.time())
+            time.sleep(LIVE_FEED.flush_interval)
+            channel.ingest(firmware_bytes(1, "binary")[59 * 1000:59 * 1100], time.time())
+
+            rows = np.vstack([decode_samples(message)[0] for message in drain(subscription)])
+            assert len(rows) == 110
+        finally:
+            LIVE_FEED.unsubscribe(subscription)
+            channel.close()
+
+
+class TestLiveEndpoint:
+    """Test the WebSocket endpoint"""
+
+    @pytest.fixture
+    def client(self, feed):
+        pytest.importorskip("httpx")
+        from fastapi.testclient import TestClient
+        from backend.api import create_app
+        from backend.redis_manager import RedisManager
+
+        redis_manager = RedisManager()
+        redis_manager.redis_client = MagicMock()
+        return TestClient(create_app(redis_manager, feed))
+
+    def test_samples_and_events(self, client, feed):
+        """Test a client gets its downsampled samples as binary and events as JSON"""
+        with client.websocket_connect("/sessions/s1/live?mode=minmax&rate=100") as websocket:
+            assert websocket.receive_json() == {"type": "subscribed", "session_id": "s1",
+                                                "mode": "minmax", "rate": 100.0}
+            feed.publish_samples("s1", make_rows(0, 100))
+            feed.publish_event("s1", "swing", {"swing_id": "swing1"})
+
+            rows, mode = decode_samples(websocket.receive_bytes())
+            assert (mode, len(rows)) == ("minmax", 20)
+            assert websocket.receive_json() == {"type": "swing", "swing_id": "swing1"}
+
+        deadline = time.monotonic() + 5
+        while feed.has_subscribers("s1") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not feed.has_subscribers("s1")
+
+    def test_bad_mode_closes(self, client):
+        """Test an unknown mode is refused with a policy-violation close"""
+        from starlette.websockets import WebSocketDisconnect
+
+        with client.websocket_connect("/sessions/s1/live?mode=average") as websocket:
+            with pytest.raises(WebSocketDisconnect) as closed:
+                websocket.receive_json()
+        assert closed.value.code == 1008
@@ -0,0 +1,149 @@
+"""
+Tests for backend.lru_cache module and the RedisManager cache
+"""
+import time
+
+import pytest
+
+from backend.lru_cache import ByteLRUCache
+from backend.redis_manager import SWINGS_KEPT, RedisManager
+from backend.tests.test_api import IndexedRedisClient, make_swing
+
+
+class CountingRedisClient(IndexedRedisClient):
+    """In-memory client counting the swing documents read"""
+
+    def __init__(self):
+        super().__init__()
+        self.documents_read = 0
+
+    def lindex(self, key, index):
+        self.documents_read += 1
+        return super().lindex(key, index)
+
+    def lrange(self, key, start, end):
+        items = super().lrange(key, start, end)
+        self.documents_read += len(items)
+        return items
+
+    def keys(self, pattern):
+        return self.scan_iter(pattern)
+
+
+class TestByteLRUCache:
+    """Test byte-bounded LRU eviction, expiry and invalidation"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the budget is kept by evicting the entries read longest ago"""
+        cache = ByteLRUCache(100, "test")
+        cache.put("a", 1, 40)
+        cache.put("b", 2, 40)
+        assert cache.get("a") == 1
+        cache.put("c", 3, 40)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.bytes == 80
+        assert cache.stats()["evictions"] == 1
+
+    def test_oversized_and_replaced_entries(self):
+        """Test values larger than the budget are not cached and replacing keeps the size right"""
+        cache = ByteLRUCache(100, "test")
+        cache.put("big", 1, 101)
+        cache.put("a", 1, 30)
+        cache.put("a", 2, 50)
+
+        assert cache.get("big") is None
+        assert cache.get("a") == 2
+        assert cache.bytes == 50
+
+    def test_expiry(self):
+        """Test entries with a time to live are dropped once it passed"""
+        cache = ByteLRUCache(100, "test")
+        cache.put("a", 1, 10, ttl=0.01)
+        cache.put("b", 2, 10)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.bytes == 10
+
+    def test_invalidate_and_stats(self):
+        """Test invalidation by key and by predicate, and hit/miss counts"""
+        cache = ByteLRUCache(100, "test")
+        for key in (("swing", "s1", "a"), ("swing", "s1", "b"), ("swing", "s2", "a")):
+            cache.put(key, key, 10)
+        cache.invalidate(("swing", "s1", "a"))
+
+        assert cache.invalidate_where(lambda key: key[1] == "s1") == 1
+        assert len(cache) == 1
+        cache.get(("swing", "s2", "a"))
+        cache.get(("swing", "s1", "b"))
+        assert cache.stats() == {"entries": 1, "bytes": 10, "max_bytes": 100, "hits": 1, "misses": 1,
+                                 "evictions": 0, "hit_rate": 0.5}
+
+
+class TestRedisManagerCache:
+    """Test decoded swings and configs are served from memory until written"""
+
+    @pytest.fixture
+    def redis_manager(self):
+        manager = RedisManager()
+        manager.redis_client = CountingRedisClient()
+        return manager
+
+    def store(self, redis_manager, session_config, indices):
+        for index in indices:
+            assert redis_manager.store_swing_data(make_swing(index, session_config.session_id), session_config)
+
+    def test_swings_read_once(self, redis_manager, sample_session_config):
+        """Test repeated reads decode each swing once and only fetch new ones"""
+        client = redis_manager.redis_client
+        self.store(redis_manager, sample_session_config, range(3))
+
+        first = redis_manager.get_swing_data(sample_session_config, count=3)
+        self.store(redis_manager, sample_session_config, [3])
+        second = redis_manager.get_swing_data(sample_session_config, count=3)
+
+        assert [swing.swing_id for swing in first] == ["swing002", "swing001", "swing000"]
+        assert [swing.swing_id for swing in second] == ["swing003", "swing002", "swing001"]
+        assert second[1] is first[0]
+        assert client.documents_read == 4
+        assert redis_manager.get_swing(sample_session_config.session_id, "swing001") is first[1]
+        assert client.documents_read == 4
+
+    def test_trimmed_swing_not_served(self, redis_manager, sample_session_config):
+        """Test a cached swing is not served once its samples are trimmed"""
+        session_id = sample_session_config.session_id
+        self.store(redis_manager, sample_session_config, [0])
+        assert redis_manager.get_swing(session_id, "swing000") is not None
+
+        self.store(redis_manager, sample_session_config, range(1, SWINGS_KEPT + 1))
+
+        assert redis_manager.get_swing(session_id, "swing000") is None
+        assert redis_manager.get_swing(session_id, "swing001") is not None
+
+    def test_out_of_order_list_read_whole(self, redis_manager, sample_session_config):
+        """Test swings stored out of start-time order are still all returned"""
+        self.store(redis_manager, sample_session_config, [1, 0])
+
+        swings = redis_manager.get_swing_data(sample_session_config, count=2)
+
+        assert [swing.swing_id for swing in swings] == ["swing000", "swing001"]
+
+    def test_config_invalidated_on_write_and_clear(self, redis_manager, sample_session_config):
+        """Test a cached config is a copy, replaced when stored and dropped when cleared"""
+        session_id = sample_session_config.session_id
+        redis_manager.store_session_config(sample_session_config)
+        loaded = redis_manager.get_session_config(session_id)
+        loaded.club_length = 2.0
+        assert redis_manager.get_session_config(session_id).club_length == sample_session_config.club_length
+
+        redis_manager.store_session_config(loaded)
+        assert redis_manager.get_session_config(session_id).club_length == 2.0
+
+        self.store(redis_manager, sample_session_config, [0])
+        redis_manager.get_swing(session_id, "swing000")
+        assert redis_manager.clear_session_data(session_id)
+        assert redis_manager.get_session_config(session_id) is None
+        assert len(redis_manager.cache) == 0
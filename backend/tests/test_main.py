@@ -1,10 +1,13 @@
 """
 Tests for backend.main module
 """
+import json
+import threading
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from backend.analytics_pipeline import calibrated_input_hash
 from backend.main import GolfIMUBackend
-from backend.models import IMUData, SessionConfig
+from backend.models import IMUData, ProcessedMetrics, SessionConfig
 from datetime import datetime
 
 
@@ -143,13 +146,16 @@ class TestGolfIMUBackend:
         backend.session_manager.get_current_session = Mock(return_value=mock_session_with_impact_threshold)
         backend.session_manager.log_swing_event = Mock(return_value=Mock())
         
-        backend._detect_impact(high_g_force_imu_data)
+        with patch('builtins.print') as mock_print, patch('backend.main.logger') as mock_logger:
+            backend._detect_impact(high_g_force_imu_data)
         
-        # Should log impact event
+        # Should log impact event, without printing per sample
         backend.session_manager.log_swing_event.assert_called_once()
         call_args = backend.session_manager.log_swing_event.call_args
         assert call_args[0][0] == "impact"
         assert "g_force" in call_args[0][1]
+        mock_print.assert_not_called()
+        mock_logger.info.assert_called_once()
     
     def test_detect_impact_below_threshold(self, backend_with_mocks, mock_session_with_impact_threshold, low_g_force_imu_data):
         """Test impact detection below threshold"""
@@ -522,6 +528,22 @@ class TestGolfIMUBackend:
         calls = [call[0][0] for call in mock_print.call_args_list]
         assert any("test_swing" in str(call) for call in calls)
     
+    def test_segmented_swing_analyzed_off_read_loop(self, backend_with_mocks):
+        """Test a segmented swing is queued without waiting for its storing and analysis"""
+        backend = backend_with_mocks
+        release = threading.Event()
+        backend.session_manager.store_swing_data = Mock(return_value=True)
+        backend._process_swing_data = Mock(side_effect=lambda swing_data: release.wait(5.0))
+        swing_data = Mock(swing_id="test_swing")
+        
+        backend._handle_segmented_swing(swing_data)
+        
+        assert not backend.wait_for_swings(timeout=0.05)
+        release.set()
+        assert backend.wait_for_swings(timeout=5.0)
+        backend.session_manager.store_swing_data.assert_called_once_with(swing_data)
+        backend._process_swing_data.assert_called_once_with(swing_data)
+    
     def test_get_swing_statistics(self, backend_with_mocks):
         """Test getting swing statistics"""
         backend = backend_with_mocks
@@ -532,52 +554,63 @@ class TestGolfIMUBackend:
         assert result == {"test": "stats"}
         backend.session_manager.get_swing_statistics.assert_called_once()
     
-    def test_get_recent_swings(self, backend_with_mocks):
-        """Test getting recent swings"""
-        backend = backend_with_mocks
+    def test_get_recent_swings(self, backend_with_session):
+        """Test recent swings come from the stored summaries and previews"""
+        backend = backend_with_session
         
-        # Mock swing data
-        mock_swing1 = Mock()
-        mock_swing1.swing_id = "swing1"
-        mock_swing1.swing_duration = 1.5
-        mock_swing1.impact_g_force = 35.0
-        mock_swing1.swing_type = "full_swing"
-        mock_swing1.imu_data_points = [Mock(), Mock()]
-        mock_swing1.swing_start_time = datetime(2023, 1, 1, 12, 0, 0)
-        mock_swing1.swing_end_time = datetime(2023, 1, 1, 12, 0, 1)
-        
-        mock_swing2 = Mock()
-        mock_swing2.swing_id = "swing2"
-        mock_swing2.swing_duration = 1.2
-        mock_swing2.impact_g_force = 32.0
-        mock_swing2.swing_type = "chip"
-        mock_swing2.imu_data_points = [Mock()]
-        mock_swing2.swing_start_time = datetime(2023, 1, 1, 12, 1, 0)
-        mock_swing2.swing_end_time = datetime(2023, 1, 1, 12, 1, 1)
-        
-        backend.session_manager.get_swing_data = Mock(return_value=[mock_swing1, mock_swing2])
+        summaries = [
+            json.dumps({"swing_id": "swing2", "swing_start_time": "2023-01-01T12:01:00",
+                        "swing_end_time": "2023-01-01T12:01:01", "swing_duration": 1.2,
+                        "impact_g_force": 32.0, "swing_type": "chip", "samples": 1, "samples_hash": "h2",
+                        "preview": {"method": "lttb", "samples": 1, "channels": {}}}),
+            json.dumps({"swing_id": "swing1", "swing_start_time": "2023-01-01T12:00:00",
+                        "swing_end_time": "2023-01-01T12:00:01", "swing_duration": 1.5,
+                        "impact_g_force": 35.0, "swing_type": "full_swing", "samples": 2, "samples_hash": "h1",
+                        "preview": None}),
+        ]
+        session = backend.session_manager.get_current_session()
+        session.face_normal_calibration, session.club_length = None, 1.07
+        backend.redis_manager.get_swing_page = Mock(return_value=(summaries, None))
+        backend.redis_manager.get_processed_metrics_bulk = Mock(return_value={
+            swing_id: ProcessedMetrics(swing_id=swing_id, session_id="test_session", metrics={"tempo_ratio": 3.0},
+                                       analyzer_version=backend.analytics_pipeline.version,
+                                       input_hash=calibrated_input_hash(samples_hash, session))
+            for swing_id, samples_hash in (("swing1", "h1"), ("swing2", "h2"))
+        })
+        backend.session_manager.get_swing_data = Mock()
         
         result = backend.get_recent_swings(count=2)
         
         assert len(result) == 2
-        assert result[0]["swing_id"] == "swing1"
-        assert result[0]["duration"] == 1.5
-        assert result[0]["impact_g_force"] == 35.0
-        assert result[0]["swing_type"] == "full_swing"
-        assert result[0]["data_points"] == 2
-        assert result[1]["swing_id"] == "swing2"
-        assert result[1]["duration"] == 1.2
-        assert result[1]["impact_g_force"] == 32.0
-        assert result[1]["swing_type"] == "chip"
-        assert result[1]["data_points"] == 1
-        
-        backend.session_manager.get_swing_data.assert_called_once_with(count=2)
-    
-    def test_get_recent_swings_default_count(self, backend_with_mocks):
+        assert result[0]["swing_id"] == "swing2"
+        assert result[0]["duration"] == 1.2
+        assert result[0]["impact_g_force"] == 32.0
+        assert result[0]["swing_type"] == "chip"
+        assert result[0]["data_points"] == 1
+        assert result[0]["preview"]["method"] == "lttb"
+        assert result[1]["swing_id"] == "swing1"
+        assert result[1]["duration"] == 1.5
+        assert result[1]["swing_type"] == "full_swing"
+        assert result[1]["data_points"] == 2
+        assert result[1]["preview"] is None
+        assert result[1]["metrics"] == {"tempo_ratio": 3.0}
+        
+        backend.redis_manager.get_swing_page.assert_called_once_with("test_session", limit=2, previews=True)
+        backend.session_manager.get_swing_data.assert_not_called()
+    
+    def test_get_recent_swings_default_count(self, backend_with_session):
         """Test getting recent swings with default count"""
-        backend = backend_with_mocks
-        backend.session_manager.get_swing_data = Mock(return_value=[])
+        backend = backend_with_session
+        backend.redis_manager.get_swing_page = Mock(return_value=([], None))
         
-        backend.get_recent_swings()
+        assert backend.get_recent_swings() == []
+        
+        backend.redis_manager.get_swing_page.assert_called_once_with("test_session", limit=5, previews=True)
+    
+    def test_get_recent_swings_without_session(self, backend_with_mocks):
+        """Test there are no recent swings without a session"""
+        backend = backend_with_mocks
+        backend.redis_manager.get_swing_page = Mock()
         
-        backend.session_manager.get_swing_data.assert_called_once_with(count=5) 
\ No newline at end of file
+        assert backend.get_recent_swings() == []
+        backend.redis_manager.get_swing_page.assert_not_called() 
\ No newline at end of file
@@ -0,0 +1,185 @@
+"""
+Tests for the versioned processed-metrics cache
+"""
+import json
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from backend.analytics_pipeline import (
+    AnalyticsPipeline, Analyzer, AnalyzerRegistry, swing_input_hash
+)
+from backend.imu_batch import IMUBatch
+from backend.models import IMUData, ProcessedMetrics, SwingData
+from backend.tests.test_api import IndexedRedisClient, make_swing as make_indexed_swing
+from backend.tests.test_swing_quality import make_swing_batch
+
+
+def make_swing(swing_id="swing1", scale=1.0):
+    """Small stored swing"""
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    points = [
+        IMUData(ax=scale * i, ay=0.0, az=9.81, gx=0.0, gy=scale, gz=0.0,
+                mx=0.0, my=0.0, mz=0.0, qw=1.0, qx=0.0, qy=0.0, qz=0.0,
+                timestamp=start + timedelta(milliseconds=i))
+        for i in range(20)
+    ]
+    return SwingData(swing_id=swing_id, session_id="s1", imu_data_points=points,
+                     swing_start_time=start, swing_end_time=start + timedelta(milliseconds=20),
+                     swing_duration=0.02, impact_g_force=2.0)
+
+
+def counting_pipeline(version=1):
+    """Pipeline with one analyzer that counts its runs"""
+    registry = AnalyzerRegistry()
+    calls = []
+
+    def peak(batch):
+        calls.append(1)
+        return {"metrics": {"peak": float(batch.accel[:, 0].max())}}
+
+    registry.add(Analyzer("peak", ["batch"], [], peak, version=version))
+    pipeline = AnalyticsPipeline(registry, max_workers=1)
+    pipeline.calls = calls
+    return pipeline
+
+
+def cached_entry(swing, session_config, pipeline, peak=0.0):
+    """Stored metrics JSON as written by the cache"""
+    return json.dumps({
+        "swing_id": swing.swing_id, "session_id": "s1", "timestamp": "2023-01-01T12:00:00",
+        "metrics": {"peak": peak}, "analyzer_version": pipeline.version,
+        "input_hash": swing_input_hash(IMUBatch.from_swing(swing), session_config)
+    })
+
+
+class TestVersioning:
+    """Test analyzer versions and input hashes"""
+
+    def test_version_changes_on_bump(self):
+        """Test bumping one analyzer changes the pipeline version"""
+        assert counting_pipeline(1).version == counting_pipeline(1).version
+        assert counting_pipeline(1).version != counting_pipeline(2).version
+
+    def test_input_hash_covers_samples_and_calibration(self, sample_session_config):
+        """Test the input hash changes with the data and the calibration"""
+        batch = make_swing_batch(count=50, top=20, impact=30)
+        original = swing_input_hash(batch, sample_session_config)
+
+        assert swing_input_hash(make_swing_batch(count=50, top=20, impact=31),
+                                sample_session_config) != original
+
+        sample_session_config.club_length = 0.9
+        assert swing_input_hash(batch, sample_session_config) != original
+
+    def test_run_stamps_version_and_hash(self, sample_session_config):
+        """Test live results carry the cache key"""
+        pipeline = counting_pipeline()
+        result = pipeline.run(make_swing(), sample_session_config)
+
+        assert result.analyzer_version == pipeline.version
+        assert result.input_hash is not None
+
+
+class TestMetricsCache:
+    """Test lazy, bulk metrics reads in RedisManager"""
+
+    def test_bulk_get_single_hmget(self, redis_manager_with_mock, sample_session_config):
+        """Test many swings are read with one HMGET"""
+        client = redis_manager_with_mock.redis_client
+        pipeline = counting_pipeline()
+        client.hmget = Mock(return_value=[cached_entry(make_swing("a"), sample_session_config, pipeline), None])
+
+        result = redis_manager_with_mock.get_processed_metrics_bulk(sample_session_config, ["a", "b"])
+
+        client.hmget.assert_called_once()
+        assert list(result) == ["a"]
+        assert result["a"].analyzer_version == pipeline.version
+
+    def test_cache_hit_skips_analysis(self, redis_manager_with_mock, sample_session_config):
+        """Test current metrics are returned without recomputing or writing"""
+        client = redis_manager_with_mock.redis_client
+        pipeline = counting_pipeline()
+        swings = [make_swing("a"), make_swing("b")]
+        client.hmget = Mock(return_value=[cached_entry(s, sample_session_config, pipeline, 7.0) for s in swings])
+
+        result = redis_manager_with_mock.get_or_compute_metrics(sample_session_config, swings, pipeline)
+
+        assert [m.metrics["peak"] for m in result] == [7.0, 7.0]
+        assert pipeline.calls == []
+        client.pipeline.assert_not_called()
+
+    def test_misses_computed_and_written_once(self, redis_manager_with_mock, sample_session_config):
+        """Test missing metrics are computed lazily and written in one batch"""
+        client = redis_manager_with_mock.redis_client
+        pipe = Mock()
+        client.pipeline.return_value = pipe
+        client.hmget = Mock(return_value=[None, None, None])
+        pipeline = counting_pipeline()
+
+        swings = [make_swing(f"s{i}") for i in range(3)]
+        result = redis_manager_with_mock.get_or_compute_metrics(sample_session_config, swings, pipeline)
+
+        assert len(pipeline.calls) == 3
+        assert all(m.analyzer_version == pipeline.version for m in result)
+        pipe.hset.assert_called_once()
+        pipe.execute.assert_called_once()
+
+    def test_version_bump_invalidates(self, redis_manager_with_mock, sample_session_config):
+        """Test metrics from an older analyzer version are recomputed"""
+        client = redis_manager_with_mock.redis_client
+        client.pipeline.return_value = Mock()
+        swing = make_swing()
+        client.hmget = Mock(return_value=[cached_entry(swing, sample_session_config, counting_pipeline(1))])
+        pipeline = counting_pipeline(2)
+
+        redis_manager_with_mock.get_or_compute_metrics(sample_session_config, [swing], pipeline)
+
+        assert len(pipeline.calls) == 1
+
+    def test_changed_input_invalidates(self, redis_manager_with_mock, sample_session_config):
+        """Test metrics computed from different samples are recomputed"""
+        client = redis_manager_with_mock.redis_client
+        client.pipeline.return_value = Mock()
+        pipeline = counting_pipeline()
+        client.hmget = Mock(return_value=[cached_entry(make_swing(scale=2.0), sample_session_config, pipeline)])
+
+        redis_manager_with_mock.get_or_compute_metrics(sample_session_config, [make_swing()], pipeline)
+
+        assert len(pipeline.calls) == 1
+
+    def test_recent_swings_include_metrics(self, backend_with_mocks, sample_session_config):
+        """Test the recent swings view computes missing metrics through the cache"""
+        backend = backend_with_mocks
+        backend.session_manager.current_session = sample_session_config
+        swing = make_swing()
+        summary = dict(backend.redis_manager._swing_summary(swing, IMUBatch.from_swing(swing)), preview=None)
+        backend.redis_manager.get_swing_page = Mock(return_value=([json.dumps(summary)], None))
+        backend.redis_manager.get_processed_metrics_bulk = Mock(return_value={})
+        backend.session_manager.get_swing_data = Mock(return_value=[swing])
+        backend.redis_manager.get_or_compute_metrics = Mock(return_value=[
+            ProcessedMetrics(swing_id=swing.swing_id, session_id="s1", metrics={"club_head_speed": 40.0})
+        ])
+
+        result = backend.get_recent_swings(1)
+
+        assert result[0]["metrics"] == {"club_head_speed": 40.0}
+        backend.redis_manager.get_or_compute_metrics.assert_called_once()
+
+    def test_recent_swings_recomputed_after_recalibration(self, backend_with_mocks, sample_session_config):
+        """Test listed swings are recomputed once the calibration changes, and only then"""
+        backend = backend_with_mocks
+        backend.redis_manager.redis_client = IndexedRedisClient()
+        backend.analytics_pipeline = counting_pipeline()
+        backend.session_manager.current_session = sample_session_config
+        for index in range(2):
+            assert backend.redis_manager.store_swing_data(
+                make_indexed_swing(index, sample_session_config.session_id), sample_session_config)
+
+        assert all(swing["metrics"] is not None for swing in backend.get_recent_swings(2))
+        backend.get_recent_swings(2)
+        assert len(backend.analytics_pipeline.calls) == 2
+
+        assert backend.session_manager.update_session_config(face_normal_calibration=[0.0, 1.0, 0.0])
+        backend.get_recent_swings(2)
+        assert len(backend.analytics_pipeline.calls) == 4
@@ -190,17 +190,21 @@ class TestRedisManager:
         assert result is None
     
     def test_clear_session_data_success(self, redis_manager_with_mock, sample_session_config):
-        """Test successful session data clearing"""
-        # Mock get_session_config to return a valid config
+        """Test session data is cleared with pipelined UNLINK, never KEYS or DEL"""
         redis_manager_with_mock.get_session_config = Mock(return_value=sample_session_config)
-        # Mock keys to return some keys to delete
-        redis_manager_with_mock.redis_client.keys.return_value = ["session:test:swings", "session:test:events"]
+        client = redis_manager_with_mock.redis_client
+        client.smembers.return_value = {"session:test:swings", "session:test:events"}
+        client.pipeline.return_value.execute.return_value = [3]
         
         result = redis_manager_with_mock.clear_session_data(sample_session_config.session_id)
         
         assert result is True
-        # Should call delete 3 times: for IMU data/events, session config, and IMU counter
-        assert redis_manager_with_mock.redis_client.delete.call_count == 3
+        client.keys.assert_not_called()
+        client.delete.assert_not_called()
+        client.scan_iter.assert_not_called()
+        unlinked = {key for call in client.pipeline.return_value.unlink.call_args_list for key in call.args}
+        assert {"session:test:swings", f"session_config:{sample_session_config.session_id}",
+                f"session:{sample_session_config.session_id}:keys"} <= unlinked
     
     def test_clear_session_data_session_not_found(self, redis_manager_with_mock):
         """Test session data clearing when session not found"""
@@ -209,12 +213,12 @@ class TestRedisManager:
         result = redis_manager_with_mock.clear_session_data("nonexistent-session")
         
         assert result is False
-        redis_manager_with_mock.redis_client.delete.assert_not_called()
+        redis_manager_with_mock.redis_client.pipeline.assert_not_called()
     
     def test_clear_session_data_failure(self, redis_manager_with_mock, sample_session_config):
         """Test session data clearing failure"""
         redis_manager_with_mock.get_session_config = Mock(return_value=sample_session_config)
-        redis_manager_with_mock.redis_client.delete.side_effect = Exception("Redis error")
+        redis_manager_with_mock.redis_client.pipeline.return_value.execute.side_effect = Exception("Redis error")
         
         result = redis_manager_with_mock.clear_session_data(sample_session_config.session_id)
         
@@ -248,11 +252,14 @@ class TestRedisManager:
         result = redis_manager_with_mock.store_swing_data(swing_data, sample_session_config)
         
         assert result is True
-        redis_manager_with_mock.redis_client.lpush.assert_called_once()
-        
-        # Check that swing data was JSON serialized
-        call_args = redis_manager_with_mock.redis_client.lpush.call_args
-        swing_json = call_args[0][1]
+        redis_manager_with_mock.redis_client.evalsha.assert_called_once()
+        
+        # Check that the ingest script got the keys and the JSON serialized swing
+        call_args = redis_manager_with_mock.redis_client.evalsha.call_args
+        assert call_args[0][1] == 10
+        assert call_args[0][2] == f"session:{sample_session_config.session_id}:swings"
+        assert call_args[0][7] == f"user:{sample_session_config.user_id}:swing_index"
+        swing_json = call_args[0][14]
         swing_dict = json.loads(swing_json)
         assert swing_dict["swing_id"] == swing_data.swing_id
         assert swing_dict["session_id"] == swing_data.session_id
@@ -263,7 +270,7 @@ class TestRedisManager:
     
     def test_store_swing_data_failure(self, redis_manager_with_mock, sample_session_config):
         """Test swing data storage failure"""
-        redis_manager_with_mock.redis_client.lpush.side_effect = Exception("Redis error")
+        redis_manager_with_mock.redis_client.evalsha.side_effect = Exception("Redis error")
         
         sample_imu_data = IMUData(ax=1.0, ay=2.0, az=3.0, gx=4.0, gy=5.0, gz=6.0, mx=7.0, my=8.0, mz=9.0, qw=1.0, qx=0.0, qy=0.0, qz=0.0)
         swing_data = SwingData(
@@ -0,0 +1,169 @@
+"""
+Tests for backend.redis_scripts module
+
+Scripts run against a throwaway local redis-server, or fakeredis (which
+runs Lua with lupa) where none is installed; those tests are skipped
+where neither is.
+"""
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+import redis
+
+try:
+    import fakeredis
+    import lupa  # noqa: F401 (fakeredis runs scripts with it)
+except ImportError:
+    fakeredis = None
+
+from backend.redis_manager import RedisManager
+from backend.redis_scripts import INGEST_SWING, SCRIPT_LOADS, script_source
+from backend.redis_spool import ResilientRedis
+from backend.tests.test_api import START, IndexedRedisClient, make_swing
+
+requires_scripting = pytest.mark.skipif(shutil.which("redis-server") is None and fakeredis is None,
+                                        reason="neither redis-server nor fakeredis[lua] available")
+
+
+def ingest_keys(session_id="s1"):
+    return ([f"session:{session_id}:{name}"
+             for name in ("swings", "swing_index", "swing_summaries", "swing_previews", "swing_stats")]
+            + ["user:u:swing_index", "club:driver:swing_index", f"session:{session_id}:keys",
+               "metric:impact_g_force:swing_index"])
+
+
+def ingest_args(index, kept=100, preview=""):
+    return [f"swing{index}", repr(START.timestamp() + index), f'{{"swing_id": "swing{index}"}}',
+            f'{{"n": {index}}}', preview, kept, f"s1:swing{index}", "impact_g_force", repr(40.0 - index)]
+
+
+@pytest.fixture
+def redis_server():
+    """Client of a redis-server started for the test on a free port (a fakeredis server without one)"""
+    if shutil.which("redis-server") is None:
+        yield fakeredis.FakeRedis(server=fakeredis.FakeServer(), decode_responses=True)
+        return
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    client = redis.Redis(port=port, decode_responses=True)
+    deadline = time.monotonic() + 5.0
+    while True:
+        try:
+            client.ping()
+            break
+        except redis.ConnectionError:
+            if time.monotonic() > deadline:
+                process.kill()
+                pytest.skip("redis-server did not start")
+            time.sleep(0.05)
+    yield client
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture
+def redis_manager(redis_server, tmp_path):
+    manager = RedisManager()
+    manager.redis_client = ResilientRedis(redis_server, spool_path=str(tmp_path / "test.spool"))
+    yield manager
+    manager.redis_client.close()
+
+
+class TestIngestSwingFallback:
+    """Test the pipelined ingest used by clients without scripting"""
+
+    def test_counts_and_ranges(self):
+        """Test swings are indexed everywhere and the min/max ranges follow them"""
+        client = IndexedRedisClient()
+        for index in range(3):
+            assert INGEST_SWING(client, ingest_keys(), ingest_args(index, kept=2)) == index + 1
+
+        assert client.lrange("session:s1:swings", 0, -1) == ['{"swing_id": "swing2"}', '{"swing_id": "swing1"}']
+        assert client.zrange("club:driver:swing_index", 0, -1) == ["s1:swing0", "s1:swing1", "s1:swing2"]
+        assert client.hgetall("session:s1:swing_stats") == {
+            "swings": 3, "impact_g_force:min": "38.0", "impact_g_force:max": "40.0"}
+        assert "session:s1:swing_stats" in client.smembers("session:s1:keys")
+        assert script_source(INGEST_SWING.sha) == INGEST_SWING.source
+
+
+@requires_scripting
+class TestIngestSwingScript:
+    """Test the Lua ingest against Redis"""
+
+    def test_matches_fallback(self, redis_server):
+        """Test the script leaves Redis as the pipelined ingest leaves the in-memory client"""
+        fallback = IndexedRedisClient()
+        for index in range(3):
+            args = ingest_args(index, kept=2, preview="" if index else "[1, 2]")
+            assert INGEST_SWING(redis_server, ingest_keys(), args) == INGEST_SWING(fallback, ingest_keys(), args)
+
+        for key in ingest_keys():
+            kind = redis_server.type(key)
+            if kind == "list":
+                assert redis_server.lrange(key, 0, -1) == fallback.lrange(key, 0, -1)
+            elif kind == "zset":
+                assert redis_server.zrange(key, 0, -1) == fallback.zrange(key, 0, -1)
+            elif kind == "hash":
+                assert redis_server.hgetall(key) == {field: str(value) for field, value in fallback.hgetall(key).items()}
+            else:
+                assert redis_server.smembers(key) == fallback.smembers(key)
+
+    def test_failure_keeps_earlier_writes(self, redis_server):
+        """Test a script failing partway is not rolled back (it is isolated, not transactional)"""
+        redis_server.set("session:s1:swing_summaries", "not a hash")
+
+        with pytest.raises(redis.ResponseError):
+            INGEST_SWING(redis_server, ingest_keys(), ingest_args(0))
+
+        assert redis_server.llen("session:s1:swings") == 1
+        assert redis_server.zscore("session:s1:swing_index", "swing0") is not None
+        assert not redis_server.exists("user:u:swing_index")
+
+    def test_non_finite_swing_refused(self, redis_manager, redis_server, sample_session_config):
+        """Test a swing with a NaN range field writes nothing, so storing it fixed later keeps one copy"""
+        session_config = sample_session_config.model_copy(update={"session_start_time": START})
+        swing = make_swing(0, session_config.session_id)
+        swing.impact_g_force = float("nan")
+
+        assert not redis_manager.store_swing_data(swing, session_config)
+        assert redis_server.keys("*") == []
+
+        swing.impact_g_force = 40.0
+        assert redis_manager.store_swing_data(swing, session_config)
+        assert redis_server.llen(f"session:{session_config.session_id}:swings") == 1
+
+    def test_reloaded_after_flush(self, redis_server):
+        """Test a script Redis forgot is loaded again and run once"""
+        loads = SCRIPT_LOADS.labels("ingest_swing").value
+        INGEST_SWING(redis_server, ingest_keys(), ingest_args(0))
+        INGEST_SWING(redis_server, ingest_keys(), ingest_args(1))
+        redis_server.script_flush()
+        INGEST_SWING(redis_server, ingest_keys(), ingest_args(2))
+
+        assert SCRIPT_LOADS.labels("ingest_swing").value == loads + 2
+        assert redis_server.llen("session:s1:swings") == 3
+
+    def test_store_swing_data(self, redis_manager, redis_server, sample_session_config):
+        """Test stored swings are readable, aggregated and removed with their session"""
+        session_config = sample_session_config.model_copy(update={"session_start_time": START})
+        redis_manager.store_session_config(session_config)
+        session_id = session_config.session_id
+        for index in range(3):
+            assert redis_manager.store_swing_data(make_swing(index, session_id), session_config)
+
+        redis_manager.cache.clear()
+        assert redis_manager.get_swing(session_id, "swing001").impact_g_force == 41.0
+        aggregates = redis_manager.get_session_aggregates(session_id)
+        assert aggregates["swing_count"] == 3
+        assert aggregates["ranges"]["impact_g_force"] == {"min": 40.0, "max": 42.0}
+        assert redis_server.zcard(f"user:{session_config.user_id}:swing_index") == 3
+
+        redis_manager.purge_session(session_id)
+
+        assert redis_server.keys("*") == []
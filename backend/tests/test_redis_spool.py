@@ -0,0 +1,201 @@
+"""
+Tests for backend.redis_spool module
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+import redis
+
+from backend.redis_manager import RedisManager
+from backend.redis_scripts import INGEST_SWING, QUERY_SWINGS
+from backend.redis_spool import SPOOL_DROPPED, ResilientRedis
+from backend.tests.test_api import IndexedRedisClient, make_swing
+
+
+class FlakyRedisClient(IndexedRedisClient):
+    """In-memory client that can be taken down, with pipelines run on execute"""
+
+    def __init__(self):
+        super().__init__()
+        self.down = False
+        self.calls = 0
+
+    def __getattribute__(self, name):
+        attribute = super().__getattribute__(name)
+        if not callable(attribute) or name.startswith("_") or name == "pipeline":
+            return attribute
+
+        def command(*args, **kwargs):
+            if self.down:
+                raise redis.ConnectionError("Connection refused")
+            self.calls += 1
+            return attribute(*args, **kwargs)
+        return command
+
+    def ping(self):
+        return True
+
+    def pipeline(self, transaction=True):
+        return FlakyPipeline(self)
+
+
+class FlakyPipeline:
+    """Pipeline buffering commands until execute, like redis-py"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self, raise_on_error=True):
+        if self.client.down:
+            raise redis.ConnectionError("Connection refused")
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def flaky_client():
+    return FlakyRedisClient()
+
+
+@pytest.fixture
+def resilient(flaky_client, tmp_path):
+    # A long backoff keeps the recovery thread from replaying before the test does
+    client = ResilientRedis(flaky_client, spool_path=str(tmp_path / "test.spool"), backoff_min=60.0)
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def redis_manager(resilient):
+    manager = RedisManager()
+    manager.redis_client = resilient
+    return manager
+
+
+def imu_entries(redis_manager, start, count=10):
+    rows = np.zeros((count, 14))
+    rows[:, 0] = 1.7e9 + np.arange(start, start + count) / 1000.0
+    return redis_manager._serialize_imu_rows(rows)
+
+
+class TestResilientRedis:
+    """Test writes are spooled during an outage and replayed in order"""
+
+    def test_outage_spooled_and_replayed(self, redis_manager, resilient, flaky_client, sample_session_config):
+        """Test writes made while Redis is down reach it, in order, once it is back"""
+        redis_manager.store_session_config(sample_session_config)
+        assert redis_manager.store_imu_entries(imu_entries(redis_manager, 0), sample_session_config)
+        flaky_client.down = True
+
+        assert redis_manager.store_imu_entries(imu_entries(redis_manager, 10), sample_session_config)
+        assert redis_manager.store_swing_data(make_swing(0, sample_session_config.session_id), sample_session_config)
+        calls = flaky_client.calls
+        redis_manager.cache.clear()
+        assert redis_manager.get_session_config(sample_session_config.session_id) is None
+        assert redis_manager.get_swing_page(sample_session_config.session_id) == ([], None)
+        # IMU pipeline and swing ingest pipeline (the min/max read is skipped)
+        assert resilient.status()["depth"] == 2
+        assert not resilient.status()["available"]
+
+        flaky_client.down = False
+        assert flaky_client.calls == calls
+        assert resilient._replay()
+
+        buffer = redis_manager.get_imu_buffer(sample_session_config)
+        assert len(buffer) == 20
+        assert buffer[0].timestamp > buffer[-1].timestamp
+        summaries, _ = redis_manager.get_swing_page(sample_session_config.session_id)
+        assert [json.loads(summary)["swing_id"] for summary in summaries] == ["swing000"]
+        assert resilient.status()["depth"] == 0 and not resilient.spooling
+        assert resilient.last_replay["batches"] == 2
+
+    def test_writes_queue_behind_spool(self, redis_manager, resilient, flaky_client, sample_session_config):
+        """Test writes made before the spool is replayed are spooled behind it"""
+        flaky_client.down = True
+        redis_manager.store_imu_entries(imu_entries(redis_manager, 0), sample_session_config)
+        flaky_client.down = False
+        resilient.available = True
+
+        redis_manager.store_imu_entries(imu_entries(redis_manager, 10), sample_session_config)
+        assert not flaky_client.lists
+
+        resilient._replay()
+        timestamps = [point.timestamp for point in redis_manager.get_imu_buffer(sample_session_config)]
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert len(timestamps) == 20
+
+    def test_scripts_spooled_with_source(self, resilient, flaky_client):
+        """Test a script run by SHA during an outage is spooled as EVAL with its source"""
+        flaky_client.evalsha = lambda *args: None
+        flaky_client.down = True
+
+        resilient.evalsha(INGEST_SWING.sha, 1, "key", "arg")
+
+        (batch,), _ = resilient.spool.read(1)
+        assert batch == [["eval", [INGEST_SWING.source, 1, "key", "arg"], {}]]
+        with pytest.raises(redis.ConnectionError):
+            resilient.evalsha(QUERY_SWINGS.sha, 1, "key")
+        assert resilient.spool.pending == 1
+
+    def test_spool_bounded(self, flaky_client, tmp_path):
+        """Test batches past the spool bound are dropped and counted"""
+        resilient = ResilientRedis(flaky_client, spool_path=str(tmp_path / "small.spool"), max_bytes=100,
+                                   backoff_min=60.0)
+        flaky_client.down = True
+        dropped = SPOOL_DROPPED.value
+
+        resilient.set("a", "x" * 10)
+        resilient.set("b", "x" * 100)
+
+        assert resilient.spool.pending == 1
+        assert SPOOL_DROPPED.value == dropped + 1
+        resilient.close()
+
+    def test_background_recovery(self, flaky_client, tmp_path):
+        """Test the recovery thread replays once Redis answers again"""
+        resilient = ResilientRedis(flaky_client, spool_path=str(tmp_path / "bg.spool"), backoff_min=0.01)
+        flaky_client.down = True
+        resilient.lpush("k", "1")
+        resilient.lpush("k", "2")
+        flaky_client.down = False
+
+        assert resilient.wait_replayed(timeout=5.0)
+
+        assert flaky_client.lrange("k", 0, -1) == ["2", "1"]
+        assert not (tmp_path / "bg.spool").exists()
+        resilient.close()
+
+    def test_clients_have_their_own_spools(self, flaky_client, spool_dir):
+        """Test clients of one process spool to separate files, and one replay leaves the other's spool alone"""
+        first = ResilientRedis(flaky_client, backoff_min=60.0)
+        second = ResilientRedis(flaky_client, backoff_min=60.0)
+        assert first.spool.path != second.spool.path
+        assert os.path.dirname(first.spool.path) == str(spool_dir)
+
+        flaky_client.down = True
+        first.set("a", "1")
+        second.set("b", "2")
+        flaky_client.down = False
+        assert first._replay()
+
+        assert not os.path.exists(first.spool.path)
+        assert second.spool.pending == 1 and os.path.exists(second.spool.path)
+        first.close()
+        second.close()
+
+    def test_adopts_orphaned_spool(self, flaky_client, tmp_path):
+        """Test a spool left by a dead process is replayed by the next one"""
+        (tmp_path / "999999999.spool").write_text(json.dumps([["set", ["orphan", "1"], {}]]) + "\n")
+        resilient = ResilientRedis(flaky_client, spool_path=str(tmp_path / "own.spool"), backoff_min=0.01)
+
+        assert resilient.adopt_orphans() == 1
+        assert resilient.wait_replayed(timeout=5.0)
+
+        assert flaky_client.get("orphan") == "1"
+        assert not (tmp_path / "999999999.spool").exists()
+        resilient.close()
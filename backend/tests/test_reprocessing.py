@@ -0,0 +1,191 @@
+"""
+Tests for backend.reprocessing module
+"""
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.imu_batch import IMUBatch
+from backend.models import IMUData, ProcessedMetrics
+from backend.reprocessing import SwingReprocessor, process_chunk
+from backend.tests.test_swing_quality import make_swing_batch
+
+
+def make_swing_json(swing_id, batch):
+    """Stored swing document in the store_swing_data layout"""
+    start = datetime(2023, 1, 1, 12, 0, 0)
+    points = [{
+        "ax": a[0], "ay": a[1], "az": a[2], "gx": g[0], "gy": g[1], "gz": g[2],
+        "mx": 0.0, "my": 0.0, "mz": 0.0, "qw": 1.0, "qx": 0.0, "qy": 0.0, "qz": 0.0,
+        "timestamp": (start + timedelta(milliseconds=i)).isoformat()
+    } for i, (a, g) in enumerate(zip(batch.accel, batch.gyro))]
+    return json.dumps({"swing_id": swing_id, "session_id": "s1", "imu_data_points": points})
+
+
+@pytest.fixture
+def stored_redis_manager(sample_session_config):
+    """Redis manager stub holding five stored swings"""
+    manager = Mock()
+    manager.list_session_ids.return_value = [sample_session_config.session_id]
+    manager.get_session_config.return_value = sample_session_config
+    manager.get_raw_swings.return_value = [
+        make_swing_json(f"swing{i}", make_swing_batch()) for i in range(5)
+    ]
+    manager.store_processed_metrics_batch.return_value = True
+    manager.get_processed_metrics_bulk.return_value = {}
+    return manager
+
+
+class TestBinaryBatches:
+    """Test compact batch encodings"""
+
+    def test_bytes_round_trip(self):
+        """Test the binary form decodes to identical channels"""
+        batch = make_swing_batch(count=50, top=20, impact=30)
+        decoded = IMUBatch.from_bytes(batch.to_bytes())
+
+        assert len(batch.to_bytes()) == 50 * 14 * 8
+        assert np.array_equal(decoded.to_rows(), batch.to_rows())
+
+    def test_point_dicts_match_models(self):
+        """Test the unvalidated decode path matches the IMUData path"""
+        swing = json.loads(make_swing_json("a", make_swing_batch(count=20, top=5, impact=10)))
+        points = [IMUData(**{**p, "timestamp": datetime.fromisoformat(p["timestamp"])})
+                  for p in swing["imu_data_points"]]
+
+        assert np.array_equal(IMUBatch.from_point_dicts(swing["imu_data_points"]).to_rows(),
+                              IMUBatch.from_imu_points(points).to_rows())
+
+
+class TestSwingReprocessor:
+    """Test chunked, resumable reprocessing"""
+
+    def test_process_chunk_matches_pipeline(self, sample_session_config):
+        """Test workers produce the same metrics as the live pipeline"""
+        batch = make_swing_batch()
+        expected = AnalyticsPipeline(max_workers=1).run_batch(batch, sample_session_config)
+
+        [(swing_id, metrics, error)] = process_chunk(sample_session_config, [("a", batch.to_bytes())])
+
+        assert (swing_id, error) == ("a", None)
+        assert metrics == expected
+
+    def test_process_chunk_reports_errors(self, sample_session_config):
+        """Test a bad swing does not fail the whole chunk"""
+        good = make_swing_batch().to_bytes()
+        results = process_chunk(sample_session_config, [("bad", b""), ("good", good)])
+
+        assert results[0][1] is None and results[0][2]
+        assert results[1][2] is None
+
+    def test_run_chunks_and_writes(self, stored_redis_manager, tmp_path):
+        """Test swings are written back one pipelined batch per chunk"""
+        reprocessor = SwingReprocessor(stored_redis_manager, workers=1, chunk_size=2,
+                                       checkpoint_path=str(tmp_path / "checkpoint.json"))
+
+        report = reprocessor.run()
+
+        assert report["swings"] == 5
+        assert report["failed"] == 0
+        assert report["swings_per_second"] > 0
+        assert stored_redis_manager.store_processed_metrics_batch.call_count == 3
+        stored_redis_manager.rebuild_running_statistics.assert_called_once()
+        stored_redis_manager.rebuild_rollups.assert_called_once()
+
+    def test_resume_skips_finished_swings(self, stored_redis_manager, tmp_path):
+        """Test a second run only picks up swings missing from the checkpoint"""
+        checkpoint = tmp_path / "checkpoint.json"
+        SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=str(checkpoint)).run()
+
+        stored_redis_manager.get_raw_swings.return_value.append(
+            make_swing_json("swing5", make_swing_batch()))
+        stored_redis_manager.store_processed_metrics_batch.reset_mock()
+        report = SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=str(checkpoint)).run()
+
+        assert report["swings"] == 1
+        written = stored_redis_manager.store_processed_metrics_batch.call_args[0][1]
+        assert [m.swing_id for m in written] == ["swing5"]
+
+    def test_current_metrics_skipped(self, stored_redis_manager, tmp_path):
+        """Test swings already analyzed by the current version are not redone"""
+        SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=None).run()
+        written = [m for call in stored_redis_manager.store_processed_metrics_batch.call_args_list
+                   for m in call[0][1]]
+        stored_redis_manager.get_processed_metrics_bulk.return_value = {m.swing_id: m for m in written}
+
+        report = SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=None).run()
+
+        assert report["swings"] == 0
+        assert report["sessions"] == 0
+
+    def test_restart_ignores_checkpoint(self, stored_redis_manager, tmp_path):
+        """Test restarting reprocesses everything"""
+        checkpoint = tmp_path / "checkpoint.json"
+        SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=str(checkpoint)).run()
+
+        report = SwingReprocessor(stored_redis_manager, workers=1,
+                                  checkpoint_path=str(checkpoint)).run(resume=False)
+
+        assert report["swings"] == 5
+
+    def test_process_pool_matches_inline(self, stored_redis_manager, sample_session_config):
+        """Test the process pool writes the same metrics as inline runs"""
+        SwingReprocessor(stored_redis_manager, workers=1, checkpoint_path=None).run()
+        inline = {m.swing_id: m.metrics
+                  for call in stored_redis_manager.store_processed_metrics_batch.call_args_list
+                  for m in call[0][1]}
+
+        stored_redis_manager.store_processed_metrics_batch.reset_mock()
+        report = SwingReprocessor(stored_redis_manager, workers=2, chunk_size=2,
+                                  checkpoint_path=None).run()
+        pooled = {m.swing_id: m.metrics
+                  for call in stored_redis_manager.store_processed_metrics_batch.call_args_list
+                  for m in call[0][1]}
+
+        assert report["swings"] == 5
+        assert pooled == inline
+
+
+class TestReprocessingRedis:
+    """Test the Redis side of reprocessing"""
+
+    def test_store_processed_metrics_batch(self, redis_manager_with_mock, sample_session_config):
+        """Test a chunk of metrics is one pipelined HSET"""
+        pipe = Mock()
+        redis_manager_with_mock.redis_client.pipeline.return_value = pipe
+        metrics = [ProcessedMetrics(swing_id=f"s{i}", session_id="x", metrics={"smoothness": i})
+                   for i in range(3)]
+
+        assert redis_manager_with_mock.store_processed_metrics_batch(sample_session_config, metrics)
+
+        pipe.hset.assert_called_once()
+        assert set(pipe.hset.call_args[1]["mapping"]) == {"s0", "s1", "s2"}
+        pipe.execute.assert_called_once()
+
+    def test_rebuild_running_statistics(self, redis_manager_with_mock, sample_session_config):
+        """Test running sums are recomputed from the metrics hash"""
+        pipe = Mock()
+        client = redis_manager_with_mock.redis_client
+        client.pipeline.return_value = pipe
+        client.hvals = Mock(return_value=[
+            json.dumps({"metrics": {"smoothness": 1.0, "contact_quality": None}}),
+            json.dumps({"metrics": {"smoothness": 3.0}})
+        ])
+
+        assert redis_manager_with_mock.rebuild_running_statistics(
+            sample_session_config, ["smoothness", "contact_quality"])
+
+        pipe.delete.assert_called_once()
+        assert pipe.hset.call_args[1]["mapping"] == {
+            "smoothness:count": 2, "smoothness:sum": 4.0, "smoothness:sumsq": 10.0
+        }
+
+    def test_list_session_ids(self, redis_manager_with_mock):
+        """Test sessions are enumerated with SCAN rather than KEYS"""
+        client = redis_manager_with_mock.redis_client
+        client.scan_iter = Mock(return_value=iter(["session_config:b", "session_config:a"]))
+
+        assert redis_manager_with_mock.list_session_ids() == ["a", "b"]
@@ -0,0 +1,208 @@
+"""
+Tests for backend.retention and backend.swing_segments modules
+"""
+import os
+import time
+from datetime import timedelta
+
+import pytest
+
+import global_config
+from backend.models import ProcessedMetrics
+from backend.redis_manager import COLD_HASH_NAMES, RedisManager
+from backend.retention import RetentionManager
+from backend.swing_segments import SwingSegmentStore
+from backend.tests.test_api import START, IndexedRedisClient, make_swing
+
+DAY = 24 * 3600.0
+
+
+@pytest.fixture
+def redis_manager(tmp_path):
+    manager = RedisManager()
+    manager.redis_client = IndexedRedisClient()
+    manager.cold_store = SwingSegmentStore(str(tmp_path))
+    return manager
+
+
+def store_session(redis_manager, session_config, session_id, indices, user_id=None):
+    """Store a session's config and swings, returning its config"""
+    session_config = session_config.model_copy(update={
+        "session_id": session_id, "user_id": user_id or session_config.user_id, "session_start_time": START})
+    redis_manager.store_session_config(session_config)
+    for index in indices:
+        assert redis_manager.store_swing_data(make_swing(index, session_id), session_config)
+    return session_config
+
+
+class TestSwingSegmentStore:
+    """Test segment files keep documents byte for byte and survive restarts"""
+
+    def test_round_trip(self, tmp_path):
+        """Test documents are read back from a new store, newest segment winning"""
+        store = SwingSegmentStore(str(tmp_path))
+        store.write("s1", [("a", 1.0, '{"swing_id": "a", "v": 1}'), ("b", 2.0, '{"swing_id": "b"}')])
+        store.write("s1", [("a", 1.0, '{"swing_id": "a", "v": 2}')])
+
+        reopened = SwingSegmentStore(str(tmp_path))
+
+        assert reopened.swing_ids("s1") == ["b", "a"]
+        assert reopened.read("s1", ["a", "b", "missing"]) == {"a": '{"swing_id": "a", "v": 2}',
+                                                              "b": '{"swing_id": "b"}'}
+        assert reopened.contains("s1", "b") and not reopened.contains("s2", "b")
+        assert sorted(os.listdir(tmp_path / "s1")) == ["00000001.seg", "00000002.seg"]
+        assert reopened.delete_session("s1") == 2
+        assert reopened.swing_ids("s1") == []
+
+
+    def test_default_root_under_project(self, tmp_path, monkeypatch):
+        """Test the default segment directory does not follow the working directory"""
+        monkeypatch.chdir(tmp_path)
+
+        root = SwingSegmentStore().root
+
+        assert os.path.isabs(root)
+        assert root == os.path.join(os.path.dirname(global_config.__file__), global_config.RETENTION_SEGMENT_DIR)
+
+    def test_hashes_merged(self, tmp_path):
+        """Test demoted hashes merge over earlier ones and are deleted once promoted"""
+        store = SwingSegmentStore(str(tmp_path))
+        store.write_hashes("s1", {"metrics": {"a": "1", "b": "1"}})
+        store.write_hashes("s1", {"metrics": {"b": "2"}, "swing_previews": {"a": "[]"}})
+
+        assert SwingSegmentStore(str(tmp_path)).read_hashes("s1") == {
+            "metrics": {"a": "1", "b": "2"}, "swing_previews": {"a": "[]"}}
+        assert store.delete_hashes("s1") and not store.has_hashes("s1")
+        assert store.read_hashes("s1") == {}
+
+
+class TestTiering:
+    """Test demoted swings stay readable and are promoted when read"""
+
+    def test_demote_and_promote(self, redis_manager, sample_session_config):
+        """Test the oldest swings move to disk and are served from there"""
+        client = redis_manager.redis_client
+        session_config = store_session(redis_manager, sample_session_config, "s1", range(5))
+        originals = {swing_id: redis_manager.get_raw_swing("s1", swing_id) for swing_id in ("swing000", "swing004")}
+
+        assert redis_manager.demote_swings("s1", keep=2) == 3
+
+        assert client.llen("session:s1:swings") == 2
+        assert redis_manager.cold_store.swing_ids("s1") == ["swing002", "swing001", "swing000"]
+        swing = redis_manager.get_swing("s1", "swing000")
+        assert redis_manager._serialize_swing_data(swing) == originals["swing000"]
+        assert "swing000" in client.hashes["session:s1:promoted"]
+        assert client.ttls["session:s1:promoted"] > 0
+
+        redis_manager.cache.clear()
+        swings = redis_manager.get_swing_data(session_config, count=5)
+        assert [swing.swing_id for swing in swings] == [f"swing{i:03d}" for i in range(4, -1, -1)]
+        assert len(redis_manager.get_raw_swings("s1")) == 5
+        assert redis_manager.get_raw_swing("s1", "swing004") == originals["swing004"]
+
+    def test_purge_removes_segments(self, redis_manager, sample_session_config):
+        """Test purging a session deletes its cold swings too"""
+        store_session(redis_manager, sample_session_config, "s1", range(2))
+        redis_manager.demote_swings("s1")
+
+        redis_manager.purge_session("s1")
+
+        assert redis_manager.cold_store.swing_ids("s1") == []
+        assert redis_manager.get_swing("s1", "swing000") is None
+
+
+class TestRetentionManager:
+    """Test the age, count, size and per-user policies"""
+
+    def test_age_and_count(self, redis_manager, sample_session_config):
+        """Test idle sessions go cold whole and active ones keep their newest swings"""
+        client = redis_manager.redis_client
+        store_session(redis_manager, sample_session_config, "idle", range(3))
+        store_session(redis_manager, sample_session_config, "active", range(3))
+        client.lists["session:idle:user:u:club:c:imu_buffer"] = ["{}"]
+        client.sadd("session:idle:keys", "session:idle:user:u:club:c:imu_buffer")
+        retention = RetentionManager(redis_manager, active_sessions=lambda: ["active"], hot_swings=1)
+
+        report = retention.run_once(now=START.timestamp() + 2 * DAY)
+
+        assert report["demoted_swings"] == 5
+        assert client.llen("session:idle:swings") == 0
+        assert client.llen("session:active:swings") == 1
+        assert client.ttls["session:idle:user:u:club:c:imu_buffer"] > 0
+        assert "session:active:events" not in client.ttls
+        assert redis_manager.get_swing("idle", "swing000") is not None
+
+    def test_user_policy(self, redis_manager, sample_session_config):
+        """Test a user's policy overrides the default age"""
+        store_session(redis_manager, sample_session_config, "coach", range(2), user_id="coach")
+        store_session(redis_manager, sample_session_config, "player", range(2), user_id="player")
+        retention = RetentionManager(redis_manager, user_policies={"coach": {"hot_age_s": 7 * DAY}})
+
+        retention.run_once(now=START.timestamp() + 2 * DAY)
+
+        assert redis_manager.redis_client.llen("session:coach:swings") == 2
+        assert redis_manager.redis_client.llen("session:player:swings") == 0
+
+    def test_size_budget(self, redis_manager, sample_session_config):
+        """Test the least recently active sessions go cold until the budget is met"""
+        for session_id, indices in (("old", [0]), ("mid", [5]), ("new", [9])):
+            store_session(redis_manager, sample_session_config, session_id, indices)
+        indexes = redis_manager.query_index_bytes([sample_session_config.user_id], [sample_session_config.club_id])
+        size = redis_manager.hot_session_bytes("new")
+        retention = RetentionManager(redis_manager, max_hot_bytes=indexes + int(size * 1.5))
+
+        report = retention.run_once(now=(START + timedelta(seconds=10)).timestamp())
+
+        assert report["demoted_sessions"] == ["old", "mid"]
+        assert redis_manager.redis_client.llen("session:new:swings") == 1
+        assert report["hot_bytes"] == indexes + size + sum(redis_manager.hot_session_bytes(session_id)
+                                                           for session_id in ("old", "mid"))
+
+    def test_filled_past_budget(self, redis_manager, sample_session_config):
+        """Test summaries, previews and metrics go cold with their sessions and are read back on demand"""
+        client = redis_manager.redis_client
+        for number in range(20):
+            session_config = store_session(redis_manager, sample_session_config, f"s{number:02d}",
+                                           range(number * 3, number * 3 + 3))
+            for index in range(number * 3, number * 3 + 3):
+                redis_manager.store_processed_metrics(ProcessedMetrics(
+                    swing_id=f"swing{index:03d}", session_id=session_config.session_id,
+                    metrics={"club_head_speed": 40.0 + index}), session_config)
+        user_id, club_id = sample_session_config.user_id, sample_session_config.club_id
+        pages = {session_id: redis_manager.get_swing_page(session_id, previews=True)[0]
+                 for session_id in ("s00", "s19")}
+        sizes = [redis_manager.hot_session_bytes(f"s{number:02d}") for number in range(20)]
+        budget = redis_manager.query_index_bytes([user_id], [club_id]) + sum(sizes) // 4
+        retention = RetentionManager(redis_manager, active_sessions=lambda: ["s19"], max_hot_bytes=budget)
+
+        report = retention.run_once(now=(START + timedelta(seconds=60)).timestamp())
+
+        assert report["hot_bytes"] <= budget
+        assert report["demoted_fields"] > 0
+        assert "session:s00:swing_previews" not in client.hashes
+        assert "session:s00:metrics" not in client.hashes
+        assert "session:s19:swing_previews" in client.hashes
+        assert redis_manager.get_swing_page("s00", previews=True)[0] == pages["s00"]
+        assert redis_manager.get_swing_page("s19", previews=True)[0] == pages["s19"]
+        assert redis_manager.get_processed_metrics(session_config.model_copy(update={"session_id": "s01"}),
+                                                   "swing003").metrics == {"club_head_speed": 43.0}
+        assert not redis_manager.cold_store.has_hashes("s01")
+
+        # Read back until a pass finds them idle
+        retention.run_once(now=START.timestamp() + 2 * DAY)
+        assert redis_manager.cold_store.has_hashes("s00") and redis_manager.cold_store.has_hashes("s01")
+        assert not any(f"session:s01:{name}" in client.hashes for name in COLD_HASH_NAMES)
+
+    def test_background_task(self, redis_manager, sample_session_config):
+        """Test the background thread runs passes until stopped"""
+        store_session(redis_manager, sample_session_config, "idle", range(2))
+        retention = RetentionManager(redis_manager, interval=0.01)
+
+        retention.start()
+        deadline = time.monotonic() + 5.0
+        while redis_manager.redis_client.llen("session:idle:swings") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        retention.stop()
+
+        assert redis_manager.redis_client.llen("session:idle:swings") == 0
+        assert not retention.status()["running"]
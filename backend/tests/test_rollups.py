@@ -0,0 +1,179 @@
+"""
+Tests for backend.rollups module
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.api import create_app
+from backend.models import ProcessedMetrics
+from backend.redis_manager import RedisManager
+from backend.rollups import (
+    ROLLUP_STALE_KEY, bucket_fields, bucket_start, bucket_statistics, rollup_increments, rollup_values
+)
+from backend.tests.test_api import START, IndexedRedisClient, make_swing
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+# START is a Sunday: day 0 closes the week of 2022-12-26, days 1 and 2 open the week of 2023-01-02
+SWING_DAYS = [0, 0, 1, 2, 2, 2]
+
+
+@pytest.fixture
+def redis_manager():
+    manager = RedisManager()
+    manager.redis_client = IndexedRedisClient()
+    return manager
+
+
+@pytest.fixture
+def stored(redis_manager, sample_session_config):
+    """Driver swings of user p1 on SWING_DAYS with club-head speed 40 + index, and one iron swing"""
+    for club_id, indices in (("driver", range(len(SWING_DAYS))), ("iron7", [len(SWING_DAYS)])):
+        session_config = sample_session_config.model_copy(update={
+            "session_id": club_id, "user_id": "p1", "club_id": club_id, "session_start_time": START})
+        redis_manager.store_session_config(session_config)
+        for index in indices:
+            day = SWING_DAYS[index] if index < len(SWING_DAYS) else 0
+            swing = make_swing(index, club_id).model_copy(update={
+                "swing_start_time": START + timedelta(days=day, minutes=index)})
+            assert redis_manager.store_swing_data(swing, session_config)
+            assert redis_manager.store_processed_metrics(ProcessedMetrics(
+                swing_id=swing.swing_id, session_id=club_id,
+                metrics={"club_head_speed": 40.0 + index, "smoothness": 1.0}),
+                session_config, swing_start_time=swing.swing_start_time)
+
+
+class TestBuckets:
+    """Test bucket boundaries, histogram bins and statistics"""
+
+    def test_bucket_start(self):
+        """Test days start at midnight and weeks on Monday"""
+        when = datetime(2023, 1, 4, 15, 30)
+        assert bucket_start(when, "day") == datetime(2023, 1, 4)
+        assert bucket_start(when, "week") == datetime(2023, 1, 2)
+        assert bucket_start(datetime(2023, 1, 2), "week") == datetime(2023, 1, 2)
+
+    def test_out_of_range_values_in_edge_bins(self):
+        """Test values outside the histogram range are counted in its first and last bins"""
+        assert "contact_quality:b0" in rollup_increments({"contact_quality": -0.5})
+        assert "contact_quality:b49" in rollup_increments({"contact_quality": 1.0})
+
+    def test_non_finite_values_skipped(self):
+        """Test NaN and infinite metrics are left out of the rollups"""
+        assert rollup_values({"club_head_speed": float("nan"), "tempo": float("inf"), "face_angle": 1.0}) == {
+            "face_angle": 1.0}
+
+    def test_statistics(self):
+        """Test mean, std and percentiles are recovered from summed increments"""
+        totals = {}
+        for value in range(1, 101):
+            for field, amount in rollup_increments({"club_head_speed": float(value) / 2}).items():
+                totals[field] = totals.get(field, 0) + amount
+
+        statistics = bucket_statistics("club_head_speed", [totals.get(field) for field in
+                                                           bucket_fields("club_head_speed")])
+
+        assert statistics["count"] == 100
+        assert statistics["mean"] == pytest.approx(25.25)
+        assert statistics["std"] == pytest.approx(14.43, abs=0.01)
+        assert statistics["p50"] == pytest.approx(25.0, abs=0.5)
+        assert statistics["p90"] == pytest.approx(45.0, abs=0.5)
+        assert bucket_statistics("tempo", [None] * len(bucket_fields("tempo"))) == {"count": 0}
+
+
+class TestRollupTrends:
+    """Test rollups kept as metrics are stored, and rebuilt from them"""
+
+    def test_day_and_week_trends(self, redis_manager, stored):
+        """Test each day and week bucket holds its swings of the club"""
+        days = redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", "day")
+        assert [(day["bucket"], day["count"], day["mean"]) for day in days] == [
+            ("2023-01-01", 2, 40.5), ("2023-01-02", 1, 42.0), ("2023-01-03", 3, 44.0)]
+
+        weeks = redis_manager.get_rollup_trend("p1", "driver", "club_head_speed")
+        assert [(week["bucket"], week["count"]) for week in weeks] == [("2022-12-26", 2), ("2023-01-02", 4)]
+        assert weeks[1]["std"] == pytest.approx(1.25 ** 0.5)
+        assert weeks[1]["p10"] <= weeks[1]["p50"] <= weeks[1]["p90"]
+
+        since = redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", "day",
+                                               since=START + timedelta(days=1, hours=6))
+        assert [day["bucket"] for day in since] == ["2023-01-02", "2023-01-03"]
+        assert redis_manager.get_rollup_trend("p1", "iron7", "club_head_speed", "week")[0]["count"] == 1
+        assert redis_manager.get_rollup_trend("p1", "driver", "tempo") == []
+
+    def test_invalid_trends(self, redis_manager):
+        """Test metrics without rollups and unknown periods are refused"""
+        with pytest.raises(ValueError):
+            redis_manager.get_rollup_trend("p1", "driver", "smoothness")
+        with pytest.raises(ValueError):
+            redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", "month")
+
+    def test_rebuild_matches_incremental(self, redis_manager, stored):
+        """Test rebuilding from stored metrics gives the incremental rollups back, without stale buckets"""
+        client = redis_manager.redis_client
+        incremental = {period: redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", period)
+                       for period in ("day", "week")}
+        client.hset("rollup:p1:driver:day:2022-12-01", "club_head_speed:count", 5)
+        client.zadd("rollup:p1:driver:day", {"2022-12-01": datetime(2022, 12, 1).timestamp()})
+
+        assert redis_manager.rebuild_rollups("p1", "driver") == len(SWING_DAYS)
+
+        for period, trend in incremental.items():
+            rebuilt = redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", period)
+            assert [bucket["bucket"] for bucket in rebuilt] == [bucket["bucket"] for bucket in trend]
+            for before, after in zip(trend, rebuilt):
+                assert after == pytest.approx(before)
+        assert "rollup:p1:driver:day:2022-12-01" not in client.hashes
+
+
+    def test_non_finite_metrics_stored(self, redis_manager, stored):
+        """Test a swing with NaN metrics is stored and counted for its finite metrics only"""
+        session_config = redis_manager.get_session_config("driver")
+        metrics = ProcessedMetrics(swing_id="swing099", session_id="driver",
+                                   metrics={"club_head_speed": float("nan"), "tempo": 3.0})
+
+        assert redis_manager.store_processed_metrics(metrics, session_config, swing_start_time=START)
+
+        assert redis_manager.get_processed_metrics(session_config, "swing099") is not None
+        assert redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", "day")[0]["count"] == 2
+        assert redis_manager.get_rollup_trend("p1", "driver", "tempo", "day")[0]["count"] == 1
+
+    def test_stored_again_not_double_counted(self, redis_manager, stored):
+        """Test metrics stored again mark the rollups stale, and the next trend is rebuilt"""
+        session_config = redis_manager.get_session_config("driver")
+        metrics = ProcessedMetrics(swing_id="swing000", session_id="driver", metrics={"club_head_speed": 50.0})
+
+        assert redis_manager.store_processed_metrics(metrics, session_config, swing_start_time=START)
+        assert redis_manager.redis_client.smembers(ROLLUP_STALE_KEY)
+
+        days = redis_manager.get_rollup_trend("p1", "driver", "club_head_speed", "day")
+        assert (days[0]["count"], days[0]["mean"]) == (2, 45.5)
+        assert not redis_manager.redis_client.smembers(ROLLUP_STALE_KEY)
+
+    def test_batch_writes(self, redis_manager, stored):
+        """Test new swings written in a batch are counted, and reprocessed ones mark the rollups stale"""
+        session_config = redis_manager.get_session_config("iron7")
+        new = ProcessedMetrics(swing_id="swing050", session_id="iron7", metrics={"club_head_speed": 30.0})
+
+        assert redis_manager.store_processed_metrics_batch(session_config, [new], {"swing050": START})
+        assert redis_manager.get_rollup_trend("p1", "iron7", "club_head_speed", "day")[0]["count"] == 2
+        assert not redis_manager.redis_client.smembers(ROLLUP_STALE_KEY)
+
+        assert redis_manager.store_processed_metrics_batch(session_config, [new])
+        assert redis_manager.redis_client.smembers(ROLLUP_STALE_KEY)
+
+
+class TestTrendApi:
+    """Test the trend endpoint"""
+
+    def test_trend_endpoint(self, redis_manager, stored):
+        """Test buckets are returned and bad metrics or periods get a 400"""
+        client = TestClient(create_app(redis_manager))
+
+        body = client.get("/users/p1/clubs/driver/trends/club_head_speed", params={"period": "day"}).json()
+        assert [day["count"] for day in body["buckets"]] == [2, 1, 3]
+
+        assert client.get("/users/p1/clubs/driver/trends/speed").status_code == 400
+        assert client.get("/users/p1/clubs/driver/trends/tempo", params={"period": "year"}).status_code == 400
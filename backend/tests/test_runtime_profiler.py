@@ -0,0 +1,174 @@
+"""
+Tests for backend.runtime_profiler module
+"""
+import pstats
+import threading
+import time
+from unittest.mock import patch
+
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.runtime_profiler import PROFILER, RuntimeProfiler
+from backend.tests.test_swing_quality import make_swing_batch
+from global_config import PROFILE_STOP_TIMEOUT_S
+
+
+def busy_work():
+    """Something for the profilers to find"""
+    return sum(i * i for i in range(2000))
+
+
+def run_worker(profiler, stop, checkpoint=True):
+    """Start an 'ingest' thread that calls busy_work until stopped"""
+    def loop():
+        while not stop.is_set():
+            if checkpoint:
+                profiler.checkpoint()
+            busy_work()
+        profiler.checkpoint()
+
+    thread = threading.Thread(target=loop, name="ingest", daemon=True)
+    thread.start()
+    return thread
+
+
+class TestRuntimeProfiler:
+    """Test toggling the profilers at runtime"""
+
+    def test_sampling(self, tmp_path):
+        """Test stack samples of running threads are written as collapsed stacks and a summary"""
+        profiler = RuntimeProfiler(str(tmp_path), sample_interval_ms=1.0)
+        stop = threading.Event()
+        worker = run_worker(profiler, stop, checkpoint=False)
+
+        assert profiler.start("sampling")
+        time.sleep(0.2)
+        paths = profiler.stop()
+        stop.set()
+        worker.join()
+
+        stacks = open(paths["stacks"]).read()
+        summary = open(paths["summary"]).read()
+        assert "ingest;" in stacks
+        assert "test_runtime_profiler.py:busy_work" in stacks
+        assert "ingest" in summary and "Top functions" in summary
+        assert not profiler.active
+
+    def test_cprofile_threads_attach_at_checkpoints(self, tmp_path):
+        """Test cProfile attaches to a running thread and detaches on stop"""
+        profiler = RuntimeProfiler(str(tmp_path))
+        stop = threading.Event()
+        worker = run_worker(profiler, stop)
+
+        assert profiler.start("cprofile")
+        time.sleep(0.1)
+        paths = profiler.stop()
+        stop.set()
+        worker.join()
+
+        assert "ingest" in open(paths["summary"]).read()
+        functions = {name for _, _, name in pstats.Stats(paths["stats"]).stats}
+        assert "busy_work" in functions
+        assert profiler._attached == 0
+
+    def test_stale_profile_dropped_on_restart(self, tmp_path):
+        """Test a thread that missed one run's stop is profiled again, and reported, in the next run"""
+        profiler = RuntimeProfiler(str(tmp_path))
+        tick, done = threading.Semaphore(0), threading.Event()
+
+        def loop():
+            while tick.acquire() and not done.is_set():
+                profiler.checkpoint()
+                busy_work()
+
+        def attached():
+            deadline = time.monotonic() + 5.0
+            while profiler._attached != 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return profiler._attached == 1
+
+        worker = threading.Thread(target=loop, name="ingest", daemon=True)
+        worker.start()
+        with patch("backend.runtime_profiler.PROFILE_STOP_TIMEOUT_S", 0.05):
+            assert profiler.start("cprofile")
+            tick.release()
+            assert attached()
+            assert "did not reach a checkpoint" in open(profiler.stop()["summary"]).read()
+
+            assert profiler.start("cprofile")
+            tick.release()
+            assert attached()
+            paths = []
+            stopper = threading.Thread(target=lambda: paths.append(profiler.stop()))
+            stopper.start()
+            while profiler.active:
+                time.sleep(0.001)
+            tick.release()
+            stopper.join()
+        done.set()
+        tick.release()
+        worker.join()
+
+        summary = open(paths[0]["summary"]).read()
+        assert "threads: ingest" in summary and "did not reach" not in summary
+        assert "busy_work" in {name for _, _, name in pstats.Stats(paths[0]["stats"]).stats}
+        assert profiler._enabled == 0
+
+    def test_idle_pool_threads_detached(self, tmp_path, sample_session_config):
+        """Test analytics pool threads that went idle are detached at stop, run after run"""
+        pipeline = AnalyticsPipeline(max_workers=2)
+        try:
+            with patch.object(PROFILER, "output_dir", str(tmp_path)):
+                for _ in range(2):
+                    assert PROFILER.start("cprofile")
+                    pipeline.run_batch(make_swing_batch(), sample_session_config)
+                    started = time.perf_counter()
+                    summary = open(PROFILER.stop()["summary"]).read()
+
+                    assert time.perf_counter() - started < PROFILE_STOP_TIMEOUT_S
+                    assert "analytics" in summary and "did not reach" not in summary
+                    assert PROFILER._attached == 0
+        finally:
+            pipeline.shutdown()
+
+    def test_checkpoint_is_noop_when_off(self):
+        """Test an idle profiler does not attach anything"""
+        profiler = RuntimeProfiler()
+
+        profiler.checkpoint()
+
+        assert not hasattr(profiler._local, "profile")
+
+    def test_start_stop_errors(self, tmp_path):
+        """Test unknown modes, double starts and stray stops are refused"""
+        profiler = RuntimeProfiler(str(tmp_path))
+
+        assert not profiler.start("perf")
+        assert profiler.stop() is None
+        assert profiler.start("cprofile")
+        assert not profiler.start("sampling")
+        assert profiler.stop()["summary"].endswith(".txt")
+
+    def test_memory_snapshots(self, tmp_path):
+        """Test snapshots list allocation sites and the growth since the previous one"""
+        profiler = RuntimeProfiler(str(tmp_path))
+        try:
+            first = profiler.memory_snapshot()
+            retained = [bytearray(1024) for _ in range(1000)]
+            second = profiler.memory_snapshot()
+        finally:
+            profiler.stop_memory_tracing()
+
+        assert "tracemalloc started now" in open(first).read()
+        report = open(second).read()
+        assert "Growth since previous snapshot" in report
+        assert "test_runtime_profiler.py" in report
+        assert first != second and len(retained) == 1000
+
+    def test_backend_commands(self, backend_with_mocks, tmp_path):
+        """Test the backend toggles the global profiler"""
+        with patch.object(PROFILER, "output_dir", str(tmp_path)):
+            assert backend_with_mocks.start_profiling("sampling")
+            paths = backend_with_mocks.stop_profiling()
+
+        assert set(paths) == {"stacks", "summary"}
+        assert not PROFILER.active
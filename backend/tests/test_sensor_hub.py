@@ -0,0 +1,221 @@
+"""
+Tests for backend.sensor_hub module
+"""
+import os
+import threading
+import time
+import tty
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.models import SessionConfig
+from backend.redis_manager import RedisManager
+from backend.sensor_hub import FairQueue, SensorChannel, SensorHub
+from backend.swing_generator import generate_swings
+
+
+def firmware_bytes(count, frame_format, seed=0):
+    """Generated swings back to back, as the firmware would stream them"""
+    swings = generate_swings(count, sample_rate=1000, seed=seed)
+    duration_ms = int(round(swings.t[-1] * 1000.0)) + 1
+    return b"".join(swings.to_firmware_bytes(i, frame_format, start_ms=i * duration_ms) for i in range(count))
+
+
+class FakeSensor:
+    """Pseudo-terminal the test writes firmware bytes into"""
+
+    def __init__(self):
+        self.master, slave = os.openpty()
+        tty.setraw(slave)
+        self.port = os.ttyname(slave)
+        self._slave = slave
+        self._thread = None
+
+    def feed(self, data, chunk=2048):
+        """Write ``data`` from a thread (writes block while the port is not read)"""
+        def write():
+            try:
+                for i in range(0, len(data), chunk):
+                    os.write(self.master, data[i:i + chunk])
+            except OSError:
+                pass
+
+        self._thread = threading.Thread(target=write, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        for fd in (self.master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+@pytest.fixture
+def hub():
+    """Hub on a mock Redis client, stopped after the test"""
+    redis_manager = RedisManager()
+    redis_manager.redis_client = MagicMock()
+    pipeline = AnalyticsPipeline(max_workers=1)
+    hub = SensorHub(redis_manager, pipeline, flush_interval=0.01)
+    yield hub
+    hub.stop()
+    pipeline.shutdown()
+
+
+@pytest.fixture
+def sensors():
+    """Factory for fake sensors, closed after the test"""
+    created = []
+
+    def make():
+        created.append(FakeSensor())
+        return created[-1]
+
+    yield make
+    for sensor in created:
+        sensor.close()
+
+
+def wait_for(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def session(user_id):
+    return SessionConfig(user_id=user_id, club_id="driver", club_length=1.07, club_mass=0.2)
+
+
+class TestFairQueue:
+    """Test round-robin service across keys"""
+
+    def test_round_robin(self):
+        """Test keys take turns, each in FIFO order"""
+        queue = FairQueue()
+        for key, item in [("a", 1), ("a", 2), ("a", 3), ("b", 1), ("c", 1), ("c", 2)]:
+            queue.put(key, item)
+
+        order = [queue.get(0) for _ in range(6)]
+
+        assert order == [("a", 1), ("b", 1), ("c", 1), ("a", 2), ("c", 2), ("a", 3)]
+        assert queue.get(0) is None
+        assert len(queue) == 0
+
+    def test_close_wakes_waiters(self):
+        """Test a waiting get returns None once the queue is closed"""
+        queue = FairQueue()
+        threading.Timer(0.05, queue.close).start()
+
+        assert queue.get(timeout=5.0) is None
+
+
+class TestSensorChannel:
+    """Test per-sensor decoding, swing cutting and flushing"""
+
+    def test_swings_and_flush_batching(self):
+        """Test swings are cut per sensor and one pipeline carries every sensor's newest samples"""
+        redis_manager = RedisManager()
+        redis_manager.redis_client = MagicMock()
+        hub = SensorHub(redis_manager, Mock())
+        channels = [SensorChannel(name, Mock(), session(name), frame_format, ring_capacity=10000)
+                    for name, frame_format in (("bay1", "binary"), ("bay2", "json"))]
+        try:
+            swings = [channel.ingest(firmware_bytes(2, channel_format), time.time())
+                      for channel, channel_format in zip(channels, ("binary", "json"))]
+            hub.sensors = {channel.name: channel for channel in channels}
+
+            assert hub.flush()
+            assert hub.flush()
+
+            assert [len(found) for found in swings] == [2, 2]
+            pipe = redis_manager.redis_client.pipeline.return_value
+            assert pipe.execute.call_count == 1
+            keys = [call[0][0] for call in pipe.lpush.call_args_list]
+            assert len(keys) == 2 and keys[0] != keys[1]
+            assert all(len(call[0]) == 1 + 1000 for call in pipe.lpush.call_args_list)
+            assert all(channel.flushed == channel.ring.write_seq for channel in channels)
+        finally:
+            for channel in channels:
+                channel.close()
+
+    def test_failed_flush_is_retried(self):
+        """Test samples stay unflushed while Redis is down"""
+        redis_manager = RedisManager()
+        redis_manager.redis_client = MagicMock()
+        redis_manager.redis_client.pipeline.return_value.execute.side_effect = [Exception("down"), []]
+        hub = SensorHub(redis_manager, Mock())
+        channel = SensorChannel("bay1", Mock(), session("bay1"), "binary", ring_capacity=10000)
+        try:
+            channel.ingest(firmware_bytes(1, "binary")[:59 * 100], time.time())
+            hub.sensors = {"bay1": channel}
+
+            assert not hub.flush()
+            assert channel.flushed == 0
+            assert hub.flush()
+            assert channel.flushed == 100
+        finally:
+            channel.close()
+
+
+class TestSensorHub:
+    """Test concurrent ingest from several sensors"""
+
+    def test_sensors_bound_to_their_sessions(self, hub, sensors):
+        """Test every sensor's swings are analyzed under its own session"""
+        fakes = [sensors() for _ in range(3)]
+        sessions = [session(f"player{i}") for i in range(3)]
+        for i, (fake, config) in enumerate(zip(fakes, sessions)):
+            frame_format = "binary" if i % 2 else "json"
+            assert hub.add_sensor(f"bay{i}", fake.port, config, frame_format)
+            fake.feed(firmware_bytes(2, frame_format, seed=i))
+        assert not hub.add_sensor("bay0", fakes[0].port, sessions[0])
+
+        hub.start()
+        done = wait_for(lambda: all(s["swings_analyzed"] == 2 for s in hub.status()["sensors"].values()))
+
+        status = hub.status()
+        assert done, status
+        assert [s["session_id"] for s in status["sensors"].values()] == [c.session_id for c in sessions]
+        pipe = hub.redis_manager.redis_client.pipeline.return_value
+        metrics_keys = {call[0][0] for call in pipe.hset.call_args_list if call[0][0].endswith(":metrics")}
+        assert metrics_keys == {f"session:{c.session_id}:metrics" for c in sessions}
+
+    def test_backpressure_pauses_one_sensor(self, hub, sensors):
+        """Test a sensor with a full swing queue stops being read while the others continue"""
+        hub.analytics_workers = 0
+        hub.max_pending_swings = 1
+        slow, fast = sensors(), sensors()
+        hub.add_sensor("slow", slow.port, session("slow"), "binary")
+        hub.add_sensor("fast", fast.port, session("fast"), "binary")
+        slow_data = firmware_bytes(4, "binary")
+        slow.feed(slow_data)
+        hub.start()
+
+        assert wait_for(lambda: hub.status()["sensors"]["slow"]["paused"])
+        fast_data = firmware_bytes(1, "binary", seed=1)[:59 * 500]
+        fast.feed(fast_data)
+        assert wait_for(lambda: hub.status()["sensors"]["fast"]["bytes"] == len(fast_data))
+
+        status = hub.status()["sensors"]
+        assert status["slow"]["pending_swings"] == 1
+        assert status["slow"]["bytes"] < len(slow_data)
+        assert not status["fast"]["paused"]
+
+    def test_backend_commands(self, backend_with_mocks, sensors):
+        """Test the backend creates a session per sensor and runs the hub until stopped"""
+        backend = backend_with_mocks
+        backend.redis_manager.redis_client = MagicMock()
+        fake = sensors()
+
+        assert backend.start_hub_monitoring() is None
+        config = backend.add_sensor(fake.port, "player1", "driver", 1.07, 0.2, "binary")
+        assert backend.add_sensor(fake.port, "player2", "driver", 1.07, 0.2) is None
+        threading.Timer(0.2, backend.stop).start()
+        status = backend.start_hub_monitoring()
+
+        assert status["sensors"][fake.port]["session_id"] == config.session_id
+        assert not backend.sensor_hub.sensors
@@ -0,0 +1,125 @@
+"""
+Tests for backend.session_cleanup module and RedisManager.purge_session
+"""
+import pytest
+
+from backend.redis_manager import RedisManager
+from backend.session_cleanup import SessionPurger, session_registry_key, unlink_keys
+from backend.tests.test_api import IndexedRedisClient, make_swing
+
+
+class CleanupRedisClient(IndexedRedisClient):
+    """In-memory client recording commands and refusing KEYS"""
+
+    def __init__(self):
+        super().__init__()
+        self.commands = []
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS blocks Redis")
+
+    def scan_iter(self, match, count=None):
+        self.commands.append(("scan", match))
+        return super().scan_iter(match, count)
+
+    def unlink(self, *keys):
+        self.commands.append(("unlink", len(keys)))
+        return super().unlink(*keys)
+
+    def all_keys(self):
+        return {key for store in (self.values, self.lists, self.hashes, self.zsets, self.sets) for key in store}
+
+
+@pytest.fixture
+def redis_manager():
+    manager = RedisManager()
+    manager.redis_client = CleanupRedisClient()
+    return manager
+
+
+def fill_session(redis_manager, session_config, swings=2):
+    """Store a config, samples, swings and metrics for a session"""
+    redis_manager.store_session_config(session_config)
+    redis_manager.store_imu_data(make_swing(0, session_config.session_id).imu_data_points[0], session_config)
+    for index in range(swings):
+        redis_manager.store_swing_data(make_swing(index, session_config.session_id), session_config)
+
+
+class TestPurgeSession:
+    """Test sessions are deleted from their key registry with UNLINK"""
+
+    def test_registry_avoids_scan(self, redis_manager, sample_session_config):
+        """Test every key of a session is registered and unlinked without scanning"""
+        client = redis_manager.redis_client
+        other = sample_session_config.model_copy(update={"session_id": "other"})
+        fill_session(redis_manager, sample_session_config)
+        fill_session(redis_manager, other)
+
+        assert redis_manager.purge_session(sample_session_config.session_id) > 0
+
+        assert not [command for command in client.commands if command[0] == "scan"]
+        assert all(sample_session_config.session_id not in key for key in client.all_keys())
+        assert redis_manager.get_session_config("other") is not None
+        assert len(redis_manager.get_swing_data(other, count=2)) == 2
+
+    def test_legacy_session_scanned(self, redis_manager, sample_session_config):
+        """Test sessions written without a registry are found with SCAN"""
+        client = redis_manager.redis_client
+        session_id = sample_session_config.session_id
+        fill_session(redis_manager, sample_session_config)
+        client.sets.pop(session_registry_key(session_id))
+        client.lists[f"session:{session_id}:user:old:club:old:imu_buffer"] = ["{}"]
+
+        redis_manager.purge_session(session_id)
+
+        assert ("scan", f"session:{session_id}:*") in client.commands
+        assert not client.all_keys()
+
+    def test_clear_session_data(self, redis_manager, sample_session_config):
+        """Test clearing a session purges it and drops its cached values"""
+        session_id = sample_session_config.session_id
+        fill_session(redis_manager, sample_session_config)
+        redis_manager.get_swing(session_id, "swing000")
+
+        assert redis_manager.clear_session_data(session_id)
+
+        assert not redis_manager.redis_client.all_keys()
+        assert len(redis_manager.cache) == 0
+        assert not redis_manager.clear_session_data(session_id)
+
+        # Keys written again after a purge are registered again
+        fill_session(redis_manager, sample_session_config, swings=1)
+        assert redis_manager.redis_client.smembers(session_registry_key(session_id))
+
+    def test_unlink_chunks(self):
+        """Test keys are unlinked in chunks, several chunks per round trip"""
+        client = CleanupRedisClient()
+        for i in range(25):
+            client.set(f"key{i}", i)
+
+        assert unlink_keys(client, (f"key{i}" for i in range(30)), chunk=4, chunks_per_pipeline=3) == 25
+
+        assert [size for _, size in client.commands] == [4, 4, 4, 4, 4, 4, 4, 2]
+        assert not client.values
+
+
+class TestSessionPurger:
+    """Test bulk purges run in the background"""
+
+    def test_purges_queued_sessions(self, redis_manager, sample_session_config):
+        """Test several queued sessions are purged and failures counted"""
+        session_ids = [f"session{i}" for i in range(3)]
+        for session_id in session_ids:
+            fill_session(redis_manager, sample_session_config.model_copy(update={"session_id": session_id}))
+        purger = SessionPurger(redis_manager, pause=0.0)
+
+        assert purger.purge(session_ids) == 3
+        assert purger.wait(timeout=5.0)
+
+        assert not redis_manager.redis_client.all_keys()
+        redis_manager.redis_client.sets = None
+        purger.purge(["broken"])
+        purger.stop()
+        status = purger.status()
+        assert (status["pending"], status["purged"], status["failed"]) == (0, 3, 1)
+        assert status["keys_unlinked"] > 3
@@ -0,0 +1,172 @@
+"""
+Tests for backend.session_replay module
+"""
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from backend.frame_codec import encode_binary_frames, encode_json_frames
+from backend.session_replay import SessionReplay, load_session_recording
+from backend.swing_generator import generate_swings
+
+
+@pytest.fixture
+def recording():
+    """Generated swing at 200 Hz as (times, values)"""
+    swings = generate_swings(1, sample_rate=200, seed=0)
+    return swings.t, swings.frames(0)
+
+
+class TestLoadSessionRecording:
+    """Test recordings load with their timing"""
+
+    def test_session_jsonl(self, tmp_path, recording):
+        """Test imu_{session}.jsonl files are timed by their timestamps"""
+        times, values = recording
+        start = datetime(2023, 1, 1, 12, 0, 0)
+        path = tmp_path / "imu_s1.jsonl"
+        path.write_text("".join(
+            json.dumps({**dict(zip(("ax", "ay", "az", "gx", "gy", "gz", "mx", "my", "mz",
+                                    "qw", "qx", "qy", "qz"), row)),
+                        "timestamp": (start + timedelta(seconds=t)).isoformat()}) + "\n"
+            for t, row in zip(times.tolist(), values.tolist())
+        ))
+
+        loaded_times, loaded_values = load_session_recording(str(path))
+        assert np.allclose(loaded_times, times, atol=1e-5)
+        assert np.allclose(loaded_values, values)
+
+    def test_captures(self, tmp_path, recording):
+        """Test C reader captures are timed by the firmware clock"""
+        times, values = recording
+        t_ms = 5000 + np.round(times * 1000).astype(np.int64)
+        (tmp_path / "capture.txt").write_bytes(b"GolfIMU\r\n" + encode_json_frames(t_ms, values))
+        (tmp_path / "capture.bin").write_bytes(encode_binary_frames(t_ms, values))
+
+        for name in ("capture.txt", "capture.bin"):
+            loaded_times, loaded_values = load_session_recording(str(tmp_path / name))
+            assert np.allclose(loaded_times, times)
+            assert np.allclose(loaded_values, values, atol=1e-3)
+
+    def test_untimed_and_empty(self, tmp_path):
+        """Test untimed lines get the IMU rate and empty files are rejected"""
+        line = json.dumps({name: 0.0 for name in ("ax", "ay", "az", "gx", "gy", "gz",
+                                                   "mx", "my", "mz", "qw", "qx", "qy", "qz")})
+        (tmp_path / "untimed.txt").write_text(f"{line}\n{line}\n")
+        (tmp_path / "empty.txt").write_text("GolfIMU\n")
+
+        times, _ = load_session_recording(str(tmp_path / "untimed.txt"))
+        assert times[1] > 0
+        with pytest.raises(ValueError):
+            load_session_recording(str(tmp_path / "empty.txt"))
+
+
+class TestSessionReplay:
+    """Test replay pacing and reporting"""
+
+    def test_stream_preserves_timing(self, recording):
+        """Test samples keep the recorded spacing in their timestamps"""
+        times, values = recording
+        replay = SessionReplay(times=times, values=values, speed=0)
+
+        samples = list(replay.imu_data_stream())
+        offsets = [(s.timestamp - samples[0].timestamp).total_seconds() for s in samples]
+
+        assert len(samples) == len(times)
+        assert np.allclose(offsets, times, atol=1e-5)
+        assert samples[10].ax == values[10, 0]
+
+    def test_max_speed_never_sleeps(self, recording):
+        """Test max speed replays without pacing"""
+        times, values = recording
+        replay = SessionReplay(times=times, values=values, speed=0)
+
+        with patch('backend.session_replay.time.sleep') as sleep:
+            for _ in replay.imu_data_stream():
+                pass
+
+        sleep.assert_not_called()
+        assert replay.report()["target_rate"] is None
+        assert replay.report()["speed"] == "max"
+
+    def test_accelerated_pacing(self):
+        """Test N× speed finishes in 1/N of the recorded time"""
+        times = np.arange(41) / 200.0
+        replay = SessionReplay(times=times, values=np.zeros((41, 13)), speed=2.0)
+
+        for _ in replay.imu_data_stream():
+            pass
+        report = replay.report()
+
+        assert report["elapsed"] == pytest.approx(0.1, abs=0.05)
+        assert report["target_rate"] == pytest.approx(400.0)
+        assert report["achieved_rate"] == pytest.approx(400.0, rel=0.3)
+
+    def test_stage_report(self, recording):
+        """Test consumer stages are timed per sample"""
+        times, values = recording
+        replay = SessionReplay(times=times, values=values, speed=0)
+
+        for _ in replay.imu_data_stream():
+            with replay.stage("store"):
+                pass
+        report = replay.report()
+
+        assert report["samples"] == len(times)
+        assert set(report["stages"]) == {"store"}
+        assert set(report["stages"]["store"]) == {"time", "lag"}
+        assert report["stages"]["store"]["lag"]["max_ms"] >= report["stages"]["store"]["time"]["p50_ms"]
+
+    def test_stop(self, recording):
+        """Test stop ends the stream early"""
+        times, values = recording
+        replay = SessionReplay(times=times, values=values, speed=0)
+
+        for count, _ in enumerate(replay.imu_data_stream(), 1):
+            if count == 5:
+                replay.stop()
+
+        assert replay.report()["samples"] == 5
+
+    def test_invalid_arguments(self):
+        """Test missing recordings and negative speeds are rejected"""
+        with pytest.raises(ValueError):
+            SessionReplay()
+        with pytest.raises(ValueError):
+            SessionReplay(times=np.zeros(2), values=np.zeros((2, 13)), speed=-1)
+
+
+class TestBackendReplay:
+    """Test replay through GolfIMUBackend"""
+
+    def test_replay_feeds_live_path(self, backend_with_mocks, sample_session_config, tmp_path, recording):
+        """Test every replayed sample is impact-checked and stored"""
+        times, values = recording
+        path = tmp_path / "capture.bin"
+        path.write_bytes(encode_binary_frames(np.round(times * 1000), values))
+        backend = backend_with_mocks
+        backend.session_manager.current_session = sample_session_config
+        backend.redis_manager.store_imu_data = Mock(return_value=True)
+        backend.session_manager.log_swing_event = Mock()
+        backend.session_manager.store_swing_data = Mock(return_value=True)
+        backend._process_swing_data = Mock()
+
+        report = backend.replay_session(str(path), speed=0)
+
+        assert report["samples"] == len(times)
+        assert backend.redis_manager.store_imu_data.call_count == len(times)
+        assert set(report["stages"]) == {"impact", "store", "segment", "swing"}
+        backend.session_manager.log_swing_event.assert_called()
+        swing_data = backend._process_swing_data.call_args[0][0]
+        assert swing_data.impact_g_force == pytest.approx(61.3, abs=0.5)
+
+    def test_replay_requires_session(self, backend_with_mocks, tmp_path):
+        """Test replay needs an active session and a readable recording"""
+        backend = backend_with_mocks
+        backend.session_manager.current_session = None
+        assert backend.replay_session(str(tmp_path / "missing.bin")) == {}
+
+        backend.session_manager.get_current_session = Mock(return_value=Mock())
+        assert backend.replay_session(str(tmp_path / "missing.bin")) == {}
@@ -0,0 +1,115 @@
+"""
+Tests for backend.structured_log module
+"""
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from backend.structured_log import (
+    RATE_LIMITER, DroppingQueueHandler, RateLimitedLogger, RateLimiter, configure_logging, flush_suppressed,
+    get_logger, shutdown_logging
+)
+from backend.telemetry import TELEMETRY
+
+
+def make_record(message="Error parsing IMU data"):
+    """A log record"""
+    return logging.LogRecord("golfimu.test", logging.WARNING, "serial_manager.py", 10, message, None, None)
+
+
+def read_log(path):
+    """JSON entries of a log file"""
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestRateLimiter:
+    """Test per-call-site rate limiting"""
+
+    def test_burst_then_summary(self, caplog):
+        """Test records beyond the burst are dropped and counted on the next window's first record"""
+        log = RateLimitedLogger(logging.getLogger("golfimu.test"), RateLimiter(window=1.0, burst=3))
+
+        with caplog.at_level(logging.WARNING):
+            with patch('backend.structured_log.time.monotonic', return_value=100.0):
+                for i in range(10):
+                    log.warning("Error parsing IMU data: %s", i)
+            with patch('backend.structured_log.time.monotonic', return_value=101.5):
+                log.warning("Error parsing IMU data: %s", 10)
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Error parsing IMU data: 0", "Error parsing IMU data: 1", "Error parsing IMU data: 2",
+            "Error parsing IMU data: 10 (7 similar messages suppressed)"]
+        assert caplog.records[-1].suppressed == 7
+        # The record points at the caller, not the adapter
+        assert caplog.records[0].pathname == __file__
+
+    def test_call_sites_are_independent(self):
+        """Test a noisy call site does not silence another one"""
+        limiter = RateLimiter(window=1.0, burst=1)
+
+        with patch('backend.structured_log.time.monotonic', return_value=0.0):
+            assert limiter.check(("golfimu.serial", "Error parsing IMU data: %s")) == 0
+            assert limiter.check(("golfimu.serial", "Error parsing IMU data: %s")) == -1
+            assert limiter.check(("golfimu.serial", "Error reading IMU data: %s")) == 0
+
+    def test_flush_reports_once(self, caplog):
+        """Test outstanding drops are summarized once"""
+        limiter = RateLimiter(window=60.0, burst=1)
+        log = RateLimitedLogger(logging.getLogger("golfimu.test"), limiter)
+
+        with caplog.at_level(logging.WARNING):
+            for i in range(4):
+                log.warning("Error parsing IMU data: %s", i)
+            flush_suppressed(limiter)
+            flush_suppressed(limiter)
+
+        assert [record.getMessage() for record in caplog.records] == [
+            "Error parsing IMU data: 0", "Error parsing IMU data: 3 (3 similar messages suppressed)"]
+
+
+class TestConfigureLogging:
+    """Test the queued JSON log writer"""
+
+    def test_json_lines_with_extra(self, tmp_path):
+        """Test records reach the file as JSON with their extra fields"""
+        log_file = tmp_path / "golfimu.log"
+        configure_logging(level="DEBUG", log_file=str(log_file), console=False)
+        try:
+            get_logger("session").debug("Stored swing data: %s", "swing_1", extra={"swing_id": "swing_1"})
+        finally:
+            shutdown_logging()
+
+        entries = read_log(log_file)
+        assert entries[-1]["logger"] == "golfimu.session"
+        assert entries[-1]["message"] == "Stored swing data: swing_1"
+        assert entries[-1]["swing_id"] == "swing_1"
+
+    def test_corrupt_serial_burst(self, tmp_path, serial_manager_with_mock):
+        """Test a burst of corrupt frames logs the burst plus one summary"""
+        log_file = tmp_path / "golfimu.log"
+        configure_logging(log_file=str(log_file), console=False)
+        RATE_LIMITER.reset()
+        serial_manager_with_mock.serial_connection.readline.return_value = b'{"ax": 1.0}\n'
+        try:
+            for _ in range(200):
+                assert serial_manager_with_mock.read_imu_data() is None
+        finally:
+            shutdown_logging()
+
+        messages = [entry["message"] for entry in read_log(log_file)]
+        assert len(messages) == 6
+        assert messages[-1].endswith("(195 similar messages suppressed)")
+        assert read_log(log_file)[0]["line"] == '{"ax": 1.0}'
+
+    def test_full_queue_drops(self):
+        """Test a full queue drops records instead of blocking the caller"""
+        handler = DroppingQueueHandler(queue.Queue(1))
+        dropped = TELEMETRY.snapshot()["golfimu_log_dropped_total"]
+
+        handler.emit(make_record())
+        handler.emit(make_record())
+
+        assert handler.queue.qsize() == 1
+        assert TELEMETRY.snapshot()["golfimu_log_dropped_total"] == dropped + 1
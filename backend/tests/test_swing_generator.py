@@ -0,0 +1,147 @@
+"""
+Tests for backend.swing_generator module
+"""
+import pytest
+import numpy as np
+from datetime import datetime
+
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.frame_codec import decode_binary_frames, decode_json_frame
+from backend.imu_batch import IMUBatch
+from backend.kinematics import quaternion_multiply, quaternion_to_matrix
+from backend.swing_generator import generate_swings, sample_swing_parameters
+
+from global_config import SYNTH_EARTH_FIELD_UT
+
+
+def clean_swings(count=1, **params):
+    """Noise-free swings for exact consistency checks"""
+    return generate_swings(count, accel_noise=0.0, gyro_noise=0.0, mag_noise=0.0, seed=0, **params)
+
+
+@pytest.fixture(scope="module")
+def pipeline():
+    """Default analytics pipeline"""
+    pipeline = AnalyticsPipeline()
+    yield pipeline
+    pipeline.shutdown()
+
+
+class TestChannelConsistency:
+    """Test every channel is derived from the same motion"""
+
+    def test_quaternion_multiply(self):
+        """Test the Hamilton product composes rotations"""
+        a = np.array([np.cos(0.3), np.sin(0.3), 0.0, 0.0])
+        b = np.array([np.cos(0.2), 0.0, 0.0, np.sin(0.2)])
+
+        assert np.allclose(quaternion_to_matrix(quaternion_multiply(a, b)),
+                           quaternion_to_matrix(a) @ quaternion_to_matrix(b))
+
+    def test_mag_follows_orientation(self):
+        """Test the magnetometer is the world field seen through the quaternion"""
+        swings = clean_swings()
+        rotations = quaternion_to_matrix(swings.quat[0])
+
+        expected = np.einsum("nji,j->ni", rotations, np.array(SYNTH_EARTH_FIELD_UT))
+        assert np.allclose(swings.mag[0], expected)
+
+    def test_gyro_matches_quaternion_rate(self):
+        """Test the gyro is the body rate of the quaternion trajectory"""
+        swings = clean_swings()
+        rotations = quaternion_to_matrix(swings.quat[0])
+        dt = swings.t[1] - swings.t[0]
+
+        rate = np.einsum("nji,njk->nik", rotations[1:-1], (rotations[2:] - rotations[:-2]) / (2 * dt))
+        body_rate = np.stack([rate[:, 2, 1], rate[:, 0, 2], rate[:, 1, 0]], axis=1)
+        error = np.linalg.norm(body_rate - swings.gyro[0, 1:-1], axis=1)
+
+        assert np.percentile(error, 99) < 0.01 * np.abs(swings.gyro).max()
+
+    def test_address_reads_gravity(self):
+        """Test the accelerometer reads 1 g up while the club is still"""
+        swings = clean_swings()
+        rotations = quaternion_to_matrix(swings.quat[0, :10])
+
+        assert np.allclose(np.einsum("nij,nj->ni", rotations, swings.accel[0, :10]), [0.0, 0.0, 9.81])
+
+
+class TestRecoveredMetrics:
+    """Test the analytics recover the generation parameters"""
+
+    def test_speed_plane_and_phases(self, pipeline, sample_session_config):
+        """Test speed, plane tilt, top and impact come back out"""
+        swings = generate_swings(1, club_head_speed=35.0, swing_plane_deg=55.0, seed=1)
+        metrics = pipeline.run_batch(swings.batch(0), sample_session_config)
+
+        assert metrics["impact_index"] == swings.impact_index
+        assert metrics["top_index"] == pytest.approx(swings.top_index[0], abs=2)
+        assert metrics["club_head_speed"] == pytest.approx(35.0, rel=0.03)
+        assert metrics["peak_club_head_speed"] == pytest.approx(35.0, rel=0.01)
+        assert metrics["swing_plane_tilt"] == pytest.approx(55.0, abs=0.5)
+        assert metrics["dominant_frequency"] == pytest.approx(150.0, abs=8.0)
+
+    def test_attack_angle(self, pipeline, sample_session_config):
+        """Test attack angle tracks the requested value"""
+        up = generate_swings(1, attack_angle_deg=4.0, seed=2).batch(0)
+        down = generate_swings(1, attack_angle_deg=-4.0, seed=2).batch(0)
+
+        difference = (pipeline.run_batch(up, sample_session_config)["attack_angle"]
+                      - pipeline.run_batch(down, sample_session_config)["attack_angle"])
+        assert difference == pytest.approx(8.0, abs=0.5)
+
+
+class TestGeneration:
+    """Test batch generation and output formats"""
+
+    def test_batch_shapes(self):
+        """Test per-swing parameters share one time grid"""
+        params = sample_swing_parameters(8, seed=3)
+        swings = generate_swings(8, sample_rate=500, seed=3, **params)
+
+        assert len(swings) == 8
+        assert swings.accel.shape == swings.gyro.shape == swings.mag.shape == (8, len(swings.t), 3)
+        assert swings.quat.shape == (8, len(swings.t), 4)
+        assert np.allclose(np.linalg.norm(swings.quat, axis=2), 1.0)
+        assert np.all(np.argmax(np.linalg.norm(swings.accel, axis=2), axis=1) == swings.impact_index)
+        assert np.allclose(swings.parameters["club_head_speed"], params["club_head_speed"])
+
+    def test_seed_reproducible(self):
+        """Test the same seed gives the same noise"""
+        assert np.array_equal(generate_swings(2, seed=7).accel, generate_swings(2, seed=7).accel)
+        assert not np.array_equal(generate_swings(2, seed=7).accel, generate_swings(2, seed=8).accel)
+
+    def test_invalid_parameters(self):
+        """Test impossible swings are rejected"""
+        with pytest.raises(ValueError):
+            generate_swings(0)
+        with pytest.raises(ValueError):
+            generate_swings(1, club_head_speed=1.0)
+        with pytest.raises(ValueError):
+            generate_swings(1, attack_angle_deg=70.0, swing_plane_deg=45.0)
+
+    def test_swing_data(self):
+        """Test SwingData round-trips to the same batch"""
+        swings = generate_swings(1, sample_rate=200, seed=4)
+        swing = swings.to_swing_data(0, "session1", start_time=datetime(2023, 1, 1, 12, 0, 0))
+        batch = IMUBatch.from_swing(swing)
+
+        assert swing.session_id == "session1"
+        assert swing.impact_g_force > 50.0
+        assert np.allclose(batch.t - batch.t[0], swings.t, atol=1e-5)
+        assert np.allclose(batch.accel, swings.accel[0])
+
+    def test_firmware_bytes(self):
+        """Test firmware streams decode to the generated frames"""
+        swings = generate_swings(1, sample_rate=200, seed=5)
+
+        t_ms, values, _ = decode_binary_frames(swings.to_firmware_bytes(0, "binary", start_ms=1000))
+        assert t_ms[0] == 1000
+        assert np.allclose(values, swings.frames(0), atol=1e-3)
+
+        lines = swings.to_firmware_bytes(0).decode().splitlines()
+        assert len(lines) == len(swings.t)
+        assert decode_json_frame(lines[0])[0] == 0
+
+        with pytest.raises(ValueError):
+            swings.to_firmware_bytes(0, "csv")
@@ -0,0 +1,118 @@
+"""
+Tests for backend.swing_preview module and stored previews
+"""
+import json
+
+import numpy as np
+import pytest
+
+from backend.imu_batch import IMUBatch, ROW_FIELDS
+from backend.swing_preview import build_preview, lttb_indices, minmax_indices
+from backend.tests.test_api import IndexedRedisClient, make_swing
+
+
+def spiky_rows(samples=1000):
+    """Rows at 1 kHz: a slow sine on every channel and one spike on ax (at 63.7%)"""
+    rows = np.zeros((samples, ROW_FIELDS))
+    rows[:, 0] = 1.7e9 + np.arange(samples) / 1000.0
+    rows[:, 1:] = np.sin(np.arange(samples) / 100.0)[:, None]
+    rows[samples * 637 // 1000, 1] = 80.0
+    return rows
+
+
+class TestPreview:
+    """Test LTTB and min-max downsampling"""
+
+    def test_lttb_keeps_shape_and_peaks(self):
+        """Test LTTB keeps the ends and the spike, with increasing picks"""
+        rows = spiky_rows()
+
+        picked = lttb_indices(rows[:, 0], rows[:, 1:3], 100)
+
+        assert picked.shape == (100, 2)
+        assert picked[0].tolist() == [0, 0] and picked[-1].tolist() == [999, 999]
+        assert np.all(np.diff(picked, axis=0) > 0)
+        assert 637 in picked[:, 0]
+        assert 637 not in picked[:, 1]
+
+    def test_minmax_keeps_extremes_in_time_order(self):
+        """Test every bucket keeps its minimum and maximum, earliest first"""
+        values = spiky_rows()[:, 1:2]
+
+        picked = minmax_indices(values, 20)[:, 0]
+
+        assert len(picked) == 20
+        assert np.all(np.diff(picked) > 0)
+        assert values[picked].max() == 80.0
+        assert values[picked].min() == values.min()
+
+    def test_short_swing_kept_whole(self):
+        """Test a swing with fewer samples than points is not downsampled"""
+        batch = IMUBatch.from_rows(spiky_rows(50))
+
+        preview = build_preview(batch, points=200)
+
+        assert preview["samples"] == 50
+        assert len(preview["channels"]["ax"]["t"]) == 50
+        assert preview["channels"]["ax"]["t"][1] == 1.0
+
+    def test_preview_format(self):
+        """Test channels have their own times in ms and the method is checked"""
+        batch = IMUBatch.from_rows(spiky_rows())
+
+        preview = build_preview(batch, points=50, method="minmax", channels=("ax", "gz"))
+
+        assert list(preview["channels"]) == ["ax", "gz"]
+        assert max(preview["channels"]["ax"]["v"]) == 80.0
+        assert preview["channels"]["ax"]["t"] != preview["channels"]["gz"]["t"]
+        assert preview["channels"]["gz"]["t"][-1] <= 999.0
+        with pytest.raises(ValueError):
+            build_preview(batch, method="average")
+
+
+class TestStoredPreviews:
+    """Test previews are stored with swings and served without the samples"""
+
+    @pytest.fixture
+    def redis_manager(self, redis_manager_with_mock):
+        redis_manager_with_mock.redis_client = IndexedRedisClient()
+        return redis_manager_with_mock
+
+    def test_stored_with_swing(self, redis_manager, sample_session_config):
+        """Test storing a swing stores its preview next to its summary"""
+        session_id = sample_session_config.session_id
+        redis_manager.store_swing_data(make_swing(3, session_id, samples=300), sample_session_config)
+
+        preview = json.loads(redis_manager.get_swing_preview(session_id, "swing003"))
+
+        assert preview["samples"] == 300
+        assert len(preview["channels"]["ay"]["v"]) == 200
+        assert preview["channels"]["ay"]["v"][-1] == 299.0
+        assert redis_manager.get_swing_preview(session_id, "missing") is None
+
+    def test_page_with_previews(self, redis_manager, sample_session_config):
+        """Test a page carries previews without the swing samples being read"""
+        session_id = sample_session_config.session_id
+        for index in range(3):
+            redis_manager.store_swing_data(make_swing(index, session_id), sample_session_config)
+        redis_manager.redis_client.lists.clear()
+        redis_manager.redis_client.hashes[f"session:{session_id}:swing_previews"].pop("swing000")
+
+        summaries, _ = redis_manager.get_swing_page(session_id, limit=3, previews=True)
+        swings = [json.loads(summary) for summary in summaries]
+
+        assert [swing["swing_id"] for swing in swings] == ["swing002", "swing001", "swing000"]
+        assert swings[0]["preview"]["channels"]["ax"]["v"][0] == 2.0
+        assert swings[2]["preview"] is None
+        plain, _ = redis_manager.get_swing_page(session_id, limit=3)
+        assert "preview" not in json.loads(plain[0])
+
+    def test_rebuilt_index_has_previews(self, redis_manager, sample_session_config):
+        """Test sessions indexed after the fact get previews too"""
+        session_id = sample_session_config.session_id
+        redis_manager.store_swing_data(make_swing(0, session_id), sample_session_config)
+        redis_manager.redis_client.zsets.clear()
+        redis_manager.redis_client.hashes.clear()
+
+        assert redis_manager.rebuild_swing_index(session_id) == 1
+        assert json.loads(redis_manager.get_swing_preview(session_id, "swing000"))["samples"] == 50
@@ -0,0 +1,160 @@
+"""
+Tests for backend.swing_quality module
+"""
+import math
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from backend.models import IMUData, SwingData
+from backend.imu_batch import IMUBatch
+from backend.swing_quality import (
+    analyze_quality, compute_contact_quality, compute_smoothness,
+    detect_swing_phases, get_fft_plan, normalized_jerk
+)
+
+
+def make_swing_batch(count=600, top=250, impact=400, ring_hz=150.0, noise=0.0):
+    """1 kHz swing: backswing, downswing, impact spike, damped ringing"""
+    rng = np.random.default_rng(0)
+    t = np.arange(count) / 1000.0
+
+    gyro = np.zeros((count, 3))
+    gyro[:top, 1] = -5.0 * np.sin(np.pi * np.arange(top) / top)
+    gyro[top:impact, 1] = 30.0 * np.sin(0.5 * np.pi * np.arange(impact - top) / (impact - top))
+
+    accel = np.zeros((count, 3))
+    accel[:, 2] = 9.81
+    accel[:impact, 0] = 50.0 * np.sin(np.pi * np.arange(impact) / impact)
+    accel[impact, 0] = 500.0
+    ring = np.arange(count - impact - 1) / 1000.0
+    accel[impact + 1:, 0] = 80.0 * np.exp(-40.0 * ring) * np.sin(2 * np.pi * ring_hz * ring)
+    accel += noise * rng.standard_normal(accel.shape)
+
+    quat = np.tile([1.0, 0.0, 0.0, 0.0], (count, 1))
+    return IMUBatch(t=t, accel=accel, gyro=gyro, mag=np.zeros((count, 3)), quat=quat)
+
+
+class TestSmoothness:
+    """Test jerk-based smoothness scoring"""
+
+    def test_detect_top_of_backswing(self):
+        """Test the top is where rotation reverses"""
+        batch = make_swing_batch()
+        top, impact = detect_swing_phases(batch, 400)
+
+        assert top == 250
+        assert impact == 400
+
+    def test_normalized_jerk_scale_invariant(self):
+        """Test jerk is invariant to the acceleration amplitude"""
+        t = np.linspace(0.0, 1.0, 200)
+        accel = np.zeros((200, 3))
+        accel[:, 0] = np.sin(np.pi * t)
+
+        assert normalized_jerk(t, accel) == pytest.approx(normalized_jerk(t, 10 * accel))
+
+    def test_normalized_jerk_degenerate(self):
+        """Test short or motionless phases have no jerk score"""
+        assert normalized_jerk(np.array([0.0, 0.1]), np.zeros((2, 3))) is None
+        assert normalized_jerk(np.linspace(0, 1, 10), np.ones((10, 3))) is None
+
+    def test_noisy_swing_is_less_smooth(self):
+        """Test sensor jitter lowers the smoothness score"""
+        smooth = compute_smoothness(make_swing_batch(), 400)
+        noisy = compute_smoothness(make_swing_batch(noise=5.0), 400)
+
+        assert noisy["jerk_downswing"] > smooth["jerk_downswing"]
+        assert noisy["smoothness"] < smooth["smoothness"]
+
+
+class TestContactQuality:
+    """Test FFT contact analysis"""
+
+    def test_dominant_frequency_and_damping(self):
+        """Test the ringing frequency and its damping are recovered"""
+        result = compute_contact_quality(make_swing_batch(), 400)
+
+        resolution = 1000.0 / 128
+        assert result["dominant_frequency"] == pytest.approx(150.0, abs=resolution)
+        assert result["damping_ratio"] > 0
+        assert result["band_mid"] > result["band_low"]
+        assert result["band_low"] + result["band_mid"] + result["band_high"] == pytest.approx(1.0)
+        assert result["contact_quality"] == result["band_low"]
+
+    def test_short_vibration_window(self):
+        """Test swings that end right after impact have no contact scores"""
+        result = compute_contact_quality(make_swing_batch(count=410), 400)
+
+        assert result["dominant_frequency"] is None
+        assert result["contact_quality"] is None
+
+    def test_fft_plans_are_cached(self):
+        """Test windows and bins are reused per sample rate/length"""
+        assert get_fft_plan(1000, 128) is get_fft_plan(1000, 128)
+        assert get_fft_plan(1000, 64) is not get_fft_plan(1000, 128)
+
+        plan = get_fft_plan(1000, 128)
+        assert len(plan.freqs) == 65
+        assert plan.freqs[-1] == pytest.approx(500.0)
+
+
+class TestQualityIntegration:
+    """Test quality scores in managers"""
+
+    def test_analyze_quality(self):
+        """Test analyze_quality wraps all scores"""
+        batch = make_swing_batch()
+        start = datetime(2023, 1, 1, 12, 0, 0)
+        points = [
+            IMUData(ax=a[0], ay=a[1], az=a[2], gx=g[0], gy=g[1], gz=g[2],
+                    mx=0.0, my=0.0, mz=0.0, qw=1.0, qx=0.0, qy=0.0, qz=0.0,
+                    timestamp=start + timedelta(milliseconds=i))
+            for i, (a, g) in enumerate(zip(batch.accel, batch.gyro))
+        ]
+        swing = SwingData(session_id="s1", imu_data_points=points, swing_start_time=start,
+                          swing_end_time=start + timedelta(seconds=0.6), swing_duration=0.6,
+                          impact_g_force=50.0)
+
+        result = analyze_quality(swing)
+
+        assert result.metrics["top_index"] == 250
+        assert result.metrics["smoothness"] is not None
+        assert result.metrics["dominant_frequency"] == pytest.approx(150.0, abs=8.0)
+
+    def test_update_running_statistics(self, redis_manager_with_mock, sample_session_config):
+        """Test scores are folded in with one pipelined round trip"""
+        pipe = Mock()
+        redis_manager_with_mock.redis_client.pipeline.return_value = pipe
+
+        result = redis_manager_with_mock.update_running_statistics(sample_session_config, {"smoothness": 2.0})
+
+        assert result is True
+        pipe.hincrby.assert_called_once()
+        assert pipe.hincrbyfloat.call_count == 2
+        pipe.execute.assert_called_once()
+
+    def test_get_running_statistics(self, redis_manager_with_mock, sample_session_config):
+        """Test mean and std are derived from the running sums"""
+        redis_manager_with_mock.redis_client.hgetall.return_value = {
+            "smoothness:count": "2", "smoothness:sum": "6.0", "smoothness:sumsq": "20.0"
+        }
+
+        result = redis_manager_with_mock.get_running_statistics(sample_session_config)
+
+        assert result["smoothness"]["count"] == 2
+        assert result["smoothness"]["mean"] == pytest.approx(3.0)
+        assert result["smoothness"]["std"] == pytest.approx(1.0)
+
+    def test_swing_statistics_include_quality(self, session_manager_with_mock, sample_session_config):
+        """Test session statistics report the running quality scores"""
+        session_manager_with_mock.current_session = sample_session_config
+        swing = Mock(swing_duration=1.0, impact_g_force=30.0, swing_type="full_swing")
+        session_manager_with_mock.get_swing_data = Mock(return_value=[swing])
+        session_manager_with_mock.redis_manager.get_running_statistics = Mock(
+            return_value={"smoothness": {"count": 1, "mean": 2.0, "std": 0.0}})
+
+        result = session_manager_with_mock.get_swing_statistics()
+
+        assert result["quality"]["smoothness"]["mean"] == 2.0
@@ -0,0 +1,182 @@
+"""
+Tests for backend.swing_query module
+"""
+import json
+from datetime import timedelta
+
+import pytest
+
+from backend.api import create_app
+from backend.models import ProcessedMetrics
+from backend.redis_manager import RedisManager, page_cursor
+from backend.redis_scripts import QUERY_SWINGS
+from backend.swing_query import SwingQueryEngine
+from backend.tests.test_api import START, IndexedRedisClient, make_swing
+from backend.tests.test_redis_scripts import redis_server, requires_scripting  # noqa: F401
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture
+def redis_manager():
+    manager = RedisManager()
+    manager.redis_client = IndexedRedisClient()
+    return manager
+
+
+def store_session(redis_manager, session_config, session_id, user_id, club_id, indices):
+    """Store a session's swings with club-head speed 40 + index"""
+    session_config = session_config.model_copy(update={
+        "session_id": session_id, "user_id": user_id, "club_id": club_id, "session_start_time": START})
+    redis_manager.store_session_config(session_config)
+    for index in indices:
+        assert redis_manager.store_swing_data(make_swing(index, session_id), session_config)
+        redis_manager.store_processed_metrics(ProcessedMetrics(
+            swing_id=f"swing{index:03d}", session_id=session_id, metrics={"club_head_speed": 40.0 + index}),
+            session_config)
+    return session_config
+
+
+@pytest.fixture
+def sessions(redis_manager, sample_session_config):
+    store_session(redis_manager, sample_session_config, "a", "p1", "driver", range(0, 3))
+    store_session(redis_manager, sample_session_config, "b", "p1", "iron7", range(3, 5))
+    store_session(redis_manager, sample_session_config, "c", "p1", "driver", range(5, 8))
+    store_session(redis_manager, sample_session_config, "d", "p2", "driver", range(8, 10))
+
+
+def ids(documents):
+    return [(json.loads(d)["session_id"], json.loads(d)["swing_id"]) for d in documents]
+
+
+class TestSwingQueryEngine:
+    """Test queries intersect the user, club, time and metric indexes"""
+
+    def test_user_club_and_ranges(self, redis_manager, sessions):
+        """Test only the user's swings with the club, in the time and metric ranges, are returned"""
+        engine = SwingQueryEngine(redis_manager)
+
+        swings, cursor = engine.query(user_id="p1", club_id="driver")
+        assert ids(swings) == [("c", "swing007"), ("c", "swing006"), ("c", "swing005"),
+                               ("a", "swing002"), ("a", "swing001"), ("a", "swing000")]
+        assert cursor is None
+
+        swings, _ = engine.query(user_id="p1", club_id="driver", since=START + timedelta(seconds=1),
+                                 until=START + timedelta(seconds=6), metric_ranges={"club_head_speed": (41.5, None)})
+        assert ids(swings) == [("c", "swing006"), ("c", "swing005"), ("a", "swing002")]
+
+        swings, _ = engine.query(club_id="driver", metric_ranges={"impact_g_force": (None, 41.0)})
+        assert ids(swings) == [("a", "swing001"), ("a", "swing000")]
+
+    def test_pagination(self, redis_manager, sessions):
+        """Test pages continue from the cursor, and a small scan budget returns early with a cursor"""
+        engine = SwingQueryEngine(redis_manager)
+        pages, cursor = [], None
+        while True:
+            swings, cursor = engine.query(user_id="p1", limit=2, cursor=cursor)
+            pages.append(ids(swings))
+            if cursor is None:
+                break
+        assert [swing for page in pages for swing in page] == [
+            ("c", f"swing{i:03d}") for i in (7, 6, 5)] + [("b", "swing004"), ("b", "swing003")] + [
+            ("a", f"swing{i:03d}") for i in (2, 1, 0)]
+
+        swings, cursor = SwingQueryEngine(redis_manager, scan_budget=2).query(user_id="p1", club_id="iron7")
+        assert swings == [] and cursor == page_cursor((START + timedelta(seconds=6)).timestamp(), "c:swing006")
+
+    def test_tied_start_times_paged(self, redis_manager, sample_session_config):
+        """Test swings sharing a start time are neither skipped nor repeated, by page size or scan budget"""
+        session_config = sample_session_config.model_copy(update={
+            "session_id": "t", "user_id": "p1", "club_id": "driver", "session_start_time": START})
+        redis_manager.store_session_config(session_config)
+        for index in range(7):
+            swing = make_swing(index, "t")
+            swing.swing_start_time = START + timedelta(seconds=index // 3)
+            assert redis_manager.store_swing_data(swing, session_config)
+        expected = [("t", f"swing{i:03d}") for i in (6, 5, 4, 3, 2, 1, 0)]
+
+        for limit, budget in ((2, 100), (100, 2), (3, 1)):
+            engine = SwingQueryEngine(redis_manager, scan_budget=budget)
+            seen, cursor = [], None
+            while True:
+                swings, cursor = engine.query(user_id="p1", limit=limit, cursor=cursor)
+                seen += ids(swings)
+                if cursor is None:
+                    break
+            assert seen == expected
+
+    def test_details(self, redis_manager, sessions):
+        """Test summaries and previews are returned with the session id"""
+        swings, _ = SwingQueryEngine(redis_manager).query(user_id="p2", limit=1, detail="preview")
+
+        document = json.loads(swings[0])
+        assert document["session_id"] == "d"
+        assert document["swing_id"] == "swing009"
+        assert document["impact_g_force"] == 49.0
+        assert document["preview"]["samples"] == 50
+
+    def test_invalid_queries(self, redis_manager):
+        """Test queries without a user or club, or on unindexed metrics, are refused"""
+        engine = SwingQueryEngine(redis_manager)
+
+        with pytest.raises(ValueError):
+            engine.query()
+        with pytest.raises(ValueError):
+            engine.query(user_id="p1", metric_ranges={"unknown": (0, 1)})
+        with pytest.raises(ValueError):
+            engine.query(user_id="p1", cursor="1672574400.0")
+
+    def test_purge_and_rebuild(self, redis_manager, sessions):
+        """Test purged sessions leave the indexes and older sessions can be indexed again"""
+        client = redis_manager.redis_client
+        engine = SwingQueryEngine(redis_manager)
+
+        redis_manager.purge_session("a")
+        assert ("a", "swing000") not in ids(engine.query(user_id="p1")[0])
+        assert "a:swing000" not in client.zsets["metric:club_head_speed:swing_index"]
+
+        for key in [key for key in client.zsets if not key.startswith("session:")]:
+            del client.zsets[key]
+        assert redis_manager.rebuild_query_indexes("c") == 3
+        swings, _ = engine.query(user_id="p1", metric_ranges={"club_head_speed": (46.0, None)})
+        assert ids(swings) == [("c", "swing007"), ("c", "swing006")]
+
+
+class TestQueryApi:
+    """Test the /swings endpoint"""
+
+    def test_query_endpoint(self, redis_manager, sessions):
+        """Test metric ranges are parsed and bad queries get a 400"""
+        client = TestClient(create_app(redis_manager))
+
+        body = client.get("/swings", params={"user_id": "p1", "club_id": "driver", "limit": 2,
+                                             "metric": ["club_head_speed:41:46"]}).json()
+        assert [swing["swing_id"] for swing in body["swings"]] == ["swing006", "swing005"]
+        assert body["next_cursor"] is not None
+
+        assert client.get("/swings", params={"metric": "club_head_speed:41:"}).status_code == 400
+        assert client.get("/swings", params={"user_id": "p1", "metric": "speed"}).status_code == 400
+
+
+@requires_scripting
+class TestQueryScript:
+    """Test the Lua query against Redis"""
+
+    def test_matches_fallback(self, redis_server):  # noqa: F811
+        """Test the script returns what the pipelined query returns"""
+        fallback = IndexedRedisClient()
+        for client in (redis_server, fallback):
+            client.zadd("user:p1:swing_index", {f"s:{i}": 100.0 + i for i in range(10)})
+            client.zadd("metric:tempo:swing_index", {f"s:{i}": 2.0 + i / 10 for i in range(0, 10, 2)})
+            client.zadd("user:p1:swing_index", {f"t:{i}": 105.0 for i in range(4)})
+            client.zadd("metric:tempo:swing_index", {"t:0": 2.5, "t:1": 2.5})
+        keys = ["user:p1:swing_index", "metric:tempo:swing_index"]
+
+        for args in (["+inf", "-inf", 3, 100, "", "2.2", ""], ["(108.0", "101", 10, 100, "", "", "2.6"],
+                     ["+inf", "-inf", 10, 3, "", "", ""], ["105.0", "-inf", 10, 3, "t:2", "", ""],
+                     ["+inf", "-inf", 2, 100, "", "", ""]):
+            scripted, pipelined = [QUERY_SWINGS(client, keys, args) for client in (redis_server, fallback)]
+            assert scripted[0] == pipelined[0]
+            assert scripted[2] == pipelined[2]
+            assert (float(scripted[1]) if scripted[1] else None) == (float(pipelined[1]) if pipelined[1] else None)
@@ -0,0 +1,64 @@
+"""
+Tests for backend.swing_segmenter module
+"""
+import pytest
+from datetime import datetime, timedelta
+
+from backend.frame_codec import FRAME_FIELDS
+from backend.latency_trace import LatencyTracer
+from backend.models import IMUData
+from backend.swing_generator import generate_swings
+from backend.swing_segmenter import SwingSegmenter
+
+
+def stream(swings, start=None):
+    """Generated swings as one IMUData stream, back to back"""
+    start = start or datetime(2023, 1, 1, 12, 0, 0)
+    duration = float(swings.t[-1]) + float(swings.t[1])
+    for i in range(len(swings)):
+        for t, row in zip(swings.t.tolist(), swings.frames(i).tolist()):
+            yield IMUData(**dict(zip(FRAME_FIELDS, row)),
+                          timestamp=start + timedelta(seconds=i * duration + t))
+
+
+class TestSwingSegmenter:
+    """Test swings are cut out around impacts"""
+
+    def test_segments_each_swing(self, sample_session_config):
+        """Test every generated swing comes out with the impact inside its window"""
+        swings = generate_swings(3, sample_rate=500, seed=0)
+        tracer = LatencyTracer()
+        segmenter = SwingSegmenter(sample_session_config, sample_rate=500, tracer=tracer)
+
+        segmented = [swing for swing in map(segmenter.add, stream(swings)) if swing]
+
+        assert len(segmented) == 3
+        for swing in segmented:
+            assert swing.session_id == sample_session_config.session_id
+            assert swings.t[swings.impact_index] - 0.01 <= swing.swing_duration <= 1.5
+            assert swing.impact_g_force == pytest.approx(60.0, rel=0.1)
+            assert (swing.imu_data_points[-1].timestamp - swing.swing_end_time) >= timedelta(milliseconds=200)
+            assert "segment" in tracer.traces()[swing.swing_id]
+
+    def test_quiet_stream_never_segments(self, sample_session_config, sample_imu_data):
+        """Test samples below the impact threshold only fill the pre-impact buffer"""
+        segmenter = SwingSegmenter(sample_session_config, sample_rate=100, pre_impact_ms=100,
+                                   tracer=LatencyTracer())
+
+        for _ in range(50):
+            assert segmenter.add(sample_imu_data) is None
+
+        assert not segmenter.in_swing
+        assert len(segmenter._history) == 11
+
+    def test_short_lead_in(self, sample_session_config, high_g_force_imu_data, sample_imu_data):
+        """Test an impact right after the stream starts keeps what was seen"""
+        segmenter = SwingSegmenter(sample_session_config, post_impact_ms=0, tracer=LatencyTracer())
+
+        segmenter.add(sample_imu_data)
+        assert segmenter.add(high_g_force_imu_data) is None
+        assert segmenter.in_swing
+        swing = segmenter.add(high_g_force_imu_data)
+
+        assert len(swing.imu_data_points) == 3
+        assert not segmenter.in_swing
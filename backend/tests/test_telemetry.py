@@ -0,0 +1,142 @@
+"""
+Tests for backend.telemetry module
+"""
+import pytest
+import urllib.request
+
+from backend.models import SessionConfig
+from backend.swing_generator import generate_swings
+from backend.telemetry import TELEMETRY, TelemetryRegistry, start_http_server
+
+
+def value(name):
+    """Current value of a global telemetry series (0 if never updated)"""
+    return TELEMETRY.snapshot().get(name, 0.0)
+
+
+class TestTelemetryRegistry:
+    """Test counters, gauges and histograms"""
+
+    def test_counter_and_gauge(self):
+        """Test unlabeled metrics are updated directly"""
+        registry = TelemetryRegistry()
+        frames = registry.counter("frames_total", "Frames")
+        depth = registry.gauge("depth", "Depth")
+        waiting = registry.gauge("waiting", "Waiting")
+
+        frames.inc()
+        frames.inc(2)
+        depth.set(5)
+        depth.dec()
+        waiting.set_function(lambda: 7)
+
+        assert registry.snapshot() == {"frames_total": 3.0, "depth": 4.0, "waiting": 7.0}
+
+    def test_histogram_buckets(self):
+        """Test observations land in the first bucket whose bound they do not exceed"""
+        registry = TelemetryRegistry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.001, 0.01))
+
+        for observation in (0.0005, 0.001, 0.005, 0.5):
+            latency.observe(observation)
+
+        assert latency.cumulative() == [(0.001, 2), (0.01, 3), (float("inf"), 4)]
+        assert registry.snapshot()["latency_seconds"]["count"] == 4
+
+    def test_labels(self):
+        """Test labeled metrics keep one series per label value"""
+        registry = TelemetryRegistry()
+        trips = registry.counter("trips_total", "Trips", labels=("operation",))
+
+        trips.labels("store").inc(2)
+        trips.labels("get").inc()
+        trips.labels("store").inc()
+
+        assert registry.snapshot() == {'trips_total{operation="store"}': 3.0,
+                                       'trips_total{operation="get"}': 1.0}
+        with pytest.raises(ValueError):
+            trips.labels("store", "extra")
+
+    def test_reregistration(self):
+        """Test registering a name again returns the same metric unless it conflicts"""
+        registry = TelemetryRegistry()
+        counter = registry.counter("swings_total", "Swings")
+
+        assert registry.counter("swings_total", "Swings") is counter
+        with pytest.raises(ValueError):
+            registry.gauge("swings_total", "Swings")
+
+    def test_prometheus_text(self):
+        """Test the text exposition format"""
+        registry = TelemetryRegistry()
+        registry.counter("swings_total", "Swings", labels=("source",)).labels("stream").inc()
+        registry.histogram("run_seconds", "Run time", buckets=(0.1,)).observe(0.05)
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE swings_total counter\n" in text
+        assert 'swings_total{source="stream"} 1.0\n' in text
+        assert '# TYPE run_seconds histogram\n' in text
+        assert 'run_seconds_bucket{le="0.1"} 1\n' in text
+        assert 'run_seconds_bucket{le="+Inf"} 1\n' in text
+        assert "run_seconds_count 1\n" in text
+
+    def test_http_endpoint(self):
+        """Test /metrics serves the registry over HTTP"""
+        registry = TelemetryRegistry()
+        registry.counter("frames_total", "Frames").inc(5)
+        server = start_http_server(registry, "127.0.0.1", 0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode()
+                content_type = response.headers["Content-Type"]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert "frames_total 5.0" in body
+        assert content_type.startswith("text/plain; version=0.0.4")
+
+
+class TestInstrumentation:
+    """Test the backend updates the global telemetry"""
+
+    def test_serial_frames_and_bytes(self, serial_manager_with_mock):
+        """Test parsed frames, bytes read and parse errors are counted"""
+        frames, received = value("golfimu_serial_frames_total"), value("golfimu_serial_bytes_total")
+        errors = value("golfimu_serial_parse_errors_total")
+        line = serial_manager_with_mock.serial_connection.readline.return_value
+
+        serial_manager_with_mock.read_imu_data()
+        serial_manager_with_mock.serial_connection.readline.return_value = b'{"ax": 1.0}\n'
+        serial_manager_with_mock.read_imu_data()
+
+        assert value("golfimu_serial_frames_total") == frames + 1
+        assert value("golfimu_serial_bytes_total") == received + len(line) + len(b'{"ax": 1.0}\n')
+        assert value("golfimu_serial_parse_errors_total") == errors + 1
+
+    def test_redis_round_trips(self, redis_manager_with_mock, sample_imu_data, sample_session_config):
+        """Test Redis operations record their round trips, duration and failures"""
+        trips = value('golfimu_redis_round_trips_total{operation="store_imu_data"}')
+        errors = value('golfimu_redis_errors_total{operation="store_imu_data"}')
+
+        redis_manager_with_mock.store_imu_data(sample_imu_data, sample_session_config)
+        redis_manager_with_mock.redis_client.lpush.side_effect = Exception("down")
+        redis_manager_with_mock.store_imu_data(sample_imu_data, sample_session_config)
+
+        assert value('golfimu_redis_round_trips_total{operation="store_imu_data"}') == trips + 2
+        assert value('golfimu_redis_errors_total{operation="store_imu_data"}') == errors + 1
+        assert value('golfimu_redis_seconds{operation="store_imu_data"}')["count"] >= 1
+
+    def test_status_includes_telemetry(self, backend_with_mocks):
+        """Test get_status exposes queue depths and analyzer runtimes"""
+        session = SessionConfig(user_id="u", club_id="driver", club_length=1.07, club_mass=0.205)
+        backend_with_mocks.analytics_pipeline.run(generate_swings(1, seed=0).to_swing_data(0, "s"), session)
+
+        telemetry = backend_with_mocks.get_status()["telemetry"]
+
+        assert telemetry['golfimu_queue_depth{queue="analytics"}'] == 0
+        assert telemetry["golfimu_serial_input_waiting_bytes"] == 0
+        assert telemetry['golfimu_analyzer_seconds{analyzer="kinematics"}']["count"] >= 1
+        assert telemetry["golfimu_analytics_seconds"]["count"] >= 1
@@ -13,6 +13,7 @@ IMU_SAMPLE_RATE_HZ = 1000
 # IMU Sensor Ranges
 IMU_ACCEL_RANGE_G = 16.0      # Accelerometer range in g-force (±16g for golf swings)
 IMU_GYRO_RANGE_DPS = 2000.0   # Gyroscope range in degrees per second
+GRAVITY_MS2 = 9.81            # Standard gravity for g-force conversions (m/s²)
 
 # IMU Sensor Report Rates (Hz)
 IMU_ACCEL_REPORT_RATE = 1000  # Accelerometer report rate
@@ -29,6 +30,14 @@ SERIAL_BAUDRATE = 115200
 SERIAL_TIMEOUT = 1.0
 SERIAL_PORT_PATTERN = "/dev/tty.usbserial-*"  # Default for Mac
 
+# Firmware Emulator (virtual serial device for hardware-free testing)
+EMULATOR_BAUDRATE = 0               # Link throttle in baud (0 = native USB, unthrottled)
+EMULATOR_FRAME_FORMAT = "json"      # "json" (firmware lines) or "binary" (59-byte frames)
+EMULATOR_TX_BUFFER_BYTES = 16384    # Pending output before the emulated loop blocks
+
+# Session Replay
+REPLAY_SPEED = 1.0                  # Playback speed multiplier (0 = as fast as possible)
+
 # =============================================================================
 # DATA PROCESSING
 # =============================================================================
@@ -47,6 +56,59 @@ DEFAULT_IMPACT_THRESHOLD_G = 30.0  # Default g-force threshold for impact detect
 MIN_IMPACT_THRESHOLD_G = 5.0       # Minimum allowed threshold
 MAX_IMPACT_THRESHOLD_G = 100.0     # Maximum allowed threshold
 
+# Swing Segmentation (streamed samples around a detected impact)
+SEGMENT_PRE_IMPACT_MS = 1500.0     # Samples kept before the impact (address to impact)
+SEGMENT_POST_IMPACT_MS = 200.0     # Samples collected after the impact before the swing closes
+SEGMENT_MAX_PENDING_SWINGS = 4     # Segmented swings waiting for analytics before the stream read pauses
+
+# Latency Tracing
+LATENCY_TRACE_HISTORY = 1000       # Swings whose impact-to-metrics stage times are kept
+
+# =============================================================================
+# ANALYTICS
+# =============================================================================
+
+# Club/Sensor Geometry (sensor frame, mounted on the shaft below the grip)
+CLUB_SHAFT_AXIS = (0.0, 0.0, 1.0)   # Unit vector from grip towards club head
+CLUB_FACE_AXIS = (1.0, 0.0, 0.0)    # Nominal face normal before calibration
+
+# Impact Metrics
+IMPACT_WINDOW_MS = 5.0              # Pre-impact window averaged for attack angle / path / face
+ADDRESS_WINDOW_MS = 50.0            # Leading window used as the address reference of a swing
+CALIBRATION_SAMPLE_COUNT = 200      # Address-position samples captured for face calibration
+
+# Analytics Pipeline
+ANALYTICS_WORKER_THREADS = 4        # Threads running independent analyzer branches
+
+# Batch Reprocessing
+REPROCESS_WORKERS = 4               # Worker processes re-analyzing stored swings
+REPROCESS_CHUNK_SIZE = 32           # Swings per work unit / pipelined write
+REPROCESS_CHECKPOINT_FILE = "data/reprocess_checkpoint.json"  # Finished swings, for resume, under the project root
+
+# Swing Quality
+FFT_WINDOW_SAMPLES = 128            # Post-impact vibration window for contact analysis
+FFT_MIN_WINDOW_SAMPLES = 16         # Shortest usable vibration window
+FFT_BANDS_HZ = {                    # Vibration bands for energy ratios
+    "low": (0.0, 100.0),
+    "mid": (100.0, 250.0),
+    "high": (250.0, float("inf"))
+}
+
+# Synthetic Swing Generator (defaults for benchmarks and tests)
+SYNTH_CLUB_HEAD_SPEED = 40.0        # Club-head speed at impact (m/s)
+SYNTH_TEMPO = 3.0                   # Backswing / downswing duration ratio
+SYNTH_DOWNSWING_TIME = 0.3          # Top of backswing to impact (s)
+SYNTH_BACKSWING_ANGLE_DEG = 250.0   # Club rotation in the swing plane from address to the top
+SYNTH_SWING_PLANE_DEG = 60.0        # Swing plane tilt from horizontal
+SYNTH_ADDRESS_TIME = 0.1            # Motionless address before the takeaway (s)
+SYNTH_FOLLOW_THROUGH_TIME = 0.25    # Impact to the end of the follow-through (s)
+SYNTH_SENSOR_OFFSET_M = 0.05        # Sensor distance below the grip pivot
+SYNTH_IMPACT_G = 60.0               # Peak impact deceleration (g)
+SYNTH_VIBRATION_HZ = 150.0          # Post-impact shaft ringing frequency
+SYNTH_VIBRATION_G = 8.0             # Initial ringing amplitude (g)
+SYNTH_VIBRATION_DAMPING = 0.02      # Ringing damping ratio
+SYNTH_EARTH_FIELD_UT = (20.0, 0.0, -40.0)  # World-frame magnetic field (μT)
+
 # =============================================================================
 # REDIS CONFIGURATION
 # =============================================================================
@@ -67,6 +129,51 @@ REDIS_SAVE_INTERVALS = [
     (900, 100)  # Save every 900 seconds if at least 100 keys changed
 ]
 
+# Resilient writes (see backend/redis_spool.py)
+REDIS_CONNECT_TIMEOUT_S = 0.5         # Connect timeout, so a down Redis fails fast instead of stalling writers
+RESILIENT_SPOOL_DIR = "data/spool"    # Spool files of writes made while Redis was unavailable (one per client), under the project root
+RESILIENT_SPOOL_MAX_BYTES = 256 * 1024 * 1024  # Spool bound; later batches are dropped and counted
+RESILIENT_BACKOFF_MIN_S = 0.1         # First wait before pinging Redis again after an outage
+RESILIENT_BACKOFF_MAX_S = 10.0        # Longest wait between pings (the wait doubles after each failure)
+RESILIENT_REPLAY_CHUNK = 500          # Spooled write batches replayed per pipeline
+
+# In-process cache of decoded Redis values (see backend/lru_cache.py)
+REDIS_CACHE_MAX_BYTES = 128 * 1024 * 1024  # Estimated bytes of decoded swings and configs held
+REDIS_CACHE_CONFIG_TTL_S = 30.0       # Cached session configs are re-read after this (other processes may write)
+
+# Session cleanup (SCAN/UNLINK, see backend/session_cleanup.py)
+CLEANUP_SCAN_COUNT = 1000             # COUNT hint of each SCAN step when a session has no key registry
+CLEANUP_UNLINK_CHUNK = 100            # Keys per UNLINK command
+CLEANUP_PIPELINE_CHUNKS = 10          # UNLINK commands per round trip
+CLEANUP_PAUSE_S = 0.01                # Rest between sessions of a background purge
+
+# Retention and hot/cold tiering (see backend/retention.py)
+RETENTION_INTERVAL_S = 60.0           # Period of the background retention pass (0 = not started)
+RETENTION_HOT_AGE_S = 24 * 3600.0     # Sessions idle longer than this have all their swings demoted to disk
+RETENTION_HOT_SWINGS = 50             # Newest swings of a session kept in Redis (below the 100 the swings list keeps)
+RETENTION_MAX_HOT_BYTES = 48 * 1024 * 1024  # Redis memory of sessions and query indexes; least recently active sessions go cold first
+RETENTION_USER_POLICIES = {}          # user_id -> {"hot_age_s": ..., "hot_swings": ...} overriding the defaults
+RETENTION_PROMOTED_TTL_S = 3600       # Promoted copies of cold swings stay in Redis this long
+RETENTION_BUFFER_TTL_S = 24 * 3600    # IMU buffer and events of cold sessions expire after this
+RETENTION_SEGMENT_DIR = "data/segments"  # Segment files of demoted swings, one directory per session, under the project root
+RETENTION_SEGMENT_COMPRESSION = 6     # zlib level of demoted swing documents
+
+# Cross-session swing queries (see backend/swing_query.py)
+QUERY_INDEXED_METRICS = ("club_head_speed", "tempo", "attack_angle", "club_path", "face_angle",
+                         "contact_quality")  # Processed metrics with a metric:{name}:swing_index sorted set
+QUERY_SCAN_BUDGET = 5000              # Most index members one query call examines before returning a cursor
+
+# Per-user, per-club trend rollups (see backend/rollups.py)
+ROLLUP_METRICS = {                    # Metric -> (low, high, bins) of the histogram behind bucket percentiles
+    "club_head_speed": (0.0, 80.0, 160),
+    "tempo": (0.0, 8.0, 80),
+    "attack_angle": (-20.0, 20.0, 80),
+    "club_path": (-20.0, 20.0, 80),
+    "face_angle": (-20.0, 20.0, 80),
+    "contact_quality": (0.0, 1.0, 50)
+}
+ROLLUP_PERCENTILES = (10, 50, 90)     # Percentiles reported per trend bucket
+
 # =============================================================================
 # SESSION MANAGEMENT
 # =============================================================================
@@ -104,6 +211,52 @@ MONITORING_SLEEP_MS = 1               # Sleep time for monitoring loops
 ARDUINO_CONNECT_MAX_RETRIES = 3       # Maximum Arduino connection retries
 ARDUINO_CONNECT_RETRY_DELAY_MS = 2000 # Initial retry delay (doubles each retry)
 
+# Telemetry (Prometheus text exposition)
+TELEMETRY_HTTP_HOST = "127.0.0.1"     # Interface the /metrics endpoint listens on
+TELEMETRY_HTTP_PORT = 9108            # Port of the /metrics endpoint (0 disables it)
+TELEMETRY_LATENCY_BUCKETS_S = (       # Histogram bucket upper bounds for durations (s)
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+# Multi-process ingest (ingest, persistence and analytics processes sharing a ring buffer)
+SHARED_RING_SECONDS = 60              # Ring capacity in seconds of samples at IMU_SAMPLE_RATE_HZ
+SHARED_RING_CAPACITY = SHARED_RING_SECONDS * IMU_SAMPLE_RATE_HZ
+SHARED_RING_READ_CHUNK = 1000         # Most rows a reader takes per read
+SHARED_RING_POLL_INTERVAL_S = 0.001   # Reader sleep while the ring has nothing new
+SUPERVISOR_POLL_INTERVAL_S = 0.1      # How often the supervisor checks its workers
+SUPERVISOR_RESTART_DELAY_S = 0.5      # Wait before restarting a crashed worker
+SUPERVISOR_MAX_RESTARTS = 10          # Restarts per worker before giving up on it
+
+# Multi-sensor hub (several sensors, each with its own session, in one backend)
+HUB_READ_QUANTUM_BYTES = 4096         # Most bytes read from one sensor per scheduling turn
+HUB_SELECT_TIMEOUT_S = 0.01           # Ingest wait for any sensor to have data
+HUB_TURN_INTERVAL_S = 0.005           # Least time between ingest turns, so each read carries several frames
+HUB_SENSOR_RING_SECONDS = 10          # Per-sensor ring of recent samples (swing look-back)
+HUB_FLUSH_INTERVAL_S = 0.05           # Batch writer period (one Redis pipeline for all sensors)
+HUB_ANALYTICS_WORKERS = 2             # Threads analyzing swings of every sensor
+HUB_MAX_PENDING_SWINGS = 4            # Swings queued per sensor before its reads pause
+
+# HTTP API (sessions, swings and metrics)
+API_HOST = "127.0.0.1"                # Interface the API server listens on
+API_PORT = 8000                       # Port of the API server
+API_PAGE_SIZE = 20                    # Swings per page when the client does not ask
+API_MAX_PAGE_SIZE = 100               # Most swings one page may hold
+SWING_PREVIEW_POINTS = 200            # Most points per channel in a stored swing preview
+SWING_PREVIEW_METHOD = "lttb"         # Preview downsampling: "lttb" (shape) or "minmax" (peaks)
+SWING_PREVIEW_CHANNELS = ("ax", "ay", "az", "gx", "gy", "gz")  # Channels in swing previews
+LIVE_FEED_DEFAULT_RATE_HZ = 50        # Live feed rate of downsampled subscriptions that do not ask
+LIVE_FEED_FLUSH_INTERVAL_S = 0.02     # Samples are pushed to live subscribers in batches this long
+LIVE_FEED_MAX_PENDING = 100           # Messages queued per live subscriber; older ones are dropped
+LIVE_FEED_SLOW_CLIENT_S = 5.0         # A subscriber dropping messages for this long is disconnected
+
+# Runtime profiling (profile start/stop and memsnap commands)
+PROFILE_OUTPUT_DIR = "data/profiles"  # Timestamped profile and memory snapshot reports, under the project root
+PROFILE_SAMPLE_INTERVAL_MS = 2.0      # Stack sampling period of the sampling profiler
+PROFILE_STOP_TIMEOUT_S = 2.0          # Wait for profiled threads to detach from cProfile
+PROFILE_TOP_N = 30                    # Functions / allocation sites listed per report
+PROFILE_TRACEMALLOC_FRAMES = 1        # Frames kept per allocation (1 = by line)
+
 # =============================================================================
 # LOGGING CONFIGURATION
 # =============================================================================
@@ -112,6 +265,10 @@ ARDUINO_CONNECT_RETRY_DELAY_MS = 2000 # Initial retry delay (doubles each retry)
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_FILE = "golfimu_system.log"
+LOG_CONSOLE_FORMAT = "%(message)s"   # Console keeps the plain REPL output; the file gets JSON lines
+LOG_QUEUE_SIZE = 10000                # Records buffered for the writer thread before dropping
+LOG_RATE_LIMIT_WINDOW_S = 1.0         # Rate limit window per call site
+LOG_RATE_LIMIT_BURST = 5              # Records let through per call site per window
 
 # =============================================================================
 # TESTING CONFIGURATION
@@ -120,4 +277,23 @@ LOG_FILE = "golfimu_system.log"
 # Test Settings
 TEST_REDIS_DB = 1                     # Redis DB for testing (separate from production)
 TEST_SERIAL_PORT = "/dev/tty.test"    # Mock serial port for testing
-TEST_IMU_SAMPLE_RATE = 1000           # Sample rate for tests 
\ No newline at end of file
+TEST_IMU_SAMPLE_RATE = 1000           # Sample rate for tests 
+
+# =============================================================================
+# BENCHMARKS
+# =============================================================================
+
+BENCHMARK_REPEAT = 200                # Timed samples per micro-benchmark
+BENCHMARK_TARGET_SAMPLE_MS = 2.0      # Calls per sample are scaled to take about this long
+BENCHMARK_INGEST_SECONDS = 60.0       # Duration of the sustained 1 kHz ingest benchmark
+BENCHMARK_REGRESSION_THRESHOLD = 0.25 # Relative slowdown flagged by compare mode
+BENCHMARK_REDIS_DB = TEST_REDIS_DB    # Redis DB the benchmarks write to (their keys are removed afterwards)
+LATENCY_HARNESS_SWINGS = 50           # Swings injected by the impact-to-metrics latency harness
+LATENCY_HARNESS_GAP_S = 0.5           # Rest between injected swings
+LATENCY_HARNESS_TIMEOUT_S = 5.0       # Wait for a swing's metrics before giving up on it
+LOAD_TEST_SENSORS = 16                # Emulated sensors streaming into one backend
+LOAD_TEST_SECONDS = 30.0              # Measured duration of the multi-sensor load test
+LOAD_TEST_EMULATORS_PER_PROCESS = 16  # Emulated sensors per emulator process
+API_LOAD_TEST_USERS = 8               # Concurrent simulated API clients
+API_LOAD_TEST_SECONDS = 20.0          # Measured duration of the API load test
+API_LOAD_TEST_SWINGS = 50             # Swings stored in the load-test session
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+HTTP API load test for GolfIMU
+Serves the API with uvicorn against Redis, stores a session of generated
+swings with their metrics, and lets simulated clients hit it concurrently.
+Like a locust run, every client picks weighted tasks (swing pages, binary
+and JSON samples, metrics, session summary) back to back over a keep-alive
+connection. Reports requests per second and latency percentiles per task.
+"""
+
+import argparse
+import http.client
+import json
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import redis
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from benchmark import PERCENTILES, benchmark_redis_client, remove_session_keys
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.api import create_app
+from backend.imu_batch import IMUBatch
+from backend.models import ProcessedMetrics, SessionConfig
+from backend.redis_manager import RedisManager
+from backend.swing_generator import generate_swings
+
+# Task name -> relative weight
+TASK_WEIGHTS = {
+    "list_swings": 4,
+    "get_swing_npy": 3,
+    "get_swing_json": 1,
+    "get_metrics": 2,
+    "session_summary": 2,
+}
+SERVER_START_TIMEOUT_S = 10.0
+
+
+def free_port(host: str = API_HOST) -> int:
+    """A port nothing listens on right now"""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def seed_session(redis_manager: RedisManager, swings: int) -> Tuple[SessionConfig, List[str]]:
+    """Store a session of generated swings with their processed metrics"""
+    session = SessionConfig(user_id="api_load_test", club_id="driver",
+                            club_length=DEFAULT_CLUB_LENGTH_M, club_mass=DEFAULT_CLUB_MASS_KG)
+    redis_manager.store_session_config(session)
+
+    generated = generate_swings(swings, IMU_SAMPLE_RATE_HZ, seed=0)
+    pipeline = AnalyticsPipeline()
+    swing_ids = []
+    try:
+        for i in range(swings):
+            swing = generated.to_swing_data(i, session.session_id)
+            redis_manager.store_swing_data(swing, session)
+            redis_manager.store_processed_metrics(ProcessedMetrics(
+                swing_id=swing.swing_id, session_id=session.session_id,
+                metrics=pipeline.run_batch(IMUBatch.from_swing(swing), session)), session,
+                swing_start_time=swing.swing_start_time)
+            swing_ids.append(swing.swing_id)
+    finally:
+        pipeline.shutdown()
+    return session, swing_ids
+
+
+class SimulatedClient(threading.Thread):
+    """One API client running weighted tasks back to back until stopped"""
+
+    def __init__(self, port: int, session_id: str, swing_ids: List[str], seed: int,
+                 stop_event: threading.Event):
+        super().__init__(name=f"api-client-{seed}", daemon=True)
+        self.connection = http.client.HTTPConnection(API_HOST, port, timeout=10)
+        self.session_id = session_id
+        self.swing_ids = swing_ids
+        self.random = random.Random(seed)
+        self.stop_event = stop_event
+        self.cursor: Optional[str] = None
+        self.measuring = False
+        self.timings: Dict[str, List[float]] = {name: [] for name in TASK_WEIGHTS}
+        self.failures = 0
+        self.bytes_received = 0
+        self.tasks: Dict[str, Callable[[], str]] = {
+            "list_swings": self.list_swings,
+            "get_swing_npy": lambda: f"/sessions/{self.session_id}/swings/{self.random_swing()}",
+            "get_swing_json": lambda: f"/sessions/{self.session_id}/swings/{self.random_swing()}?format=json",
+            "get_metrics": lambda: f"/sessions/{self.session_id}/swings/{self.random_swing()}/metrics",
+            "session_summary": lambda: f"/sessions/{self.session_id}/summary",
+        }
+
+    def random_swing(self) -> str:
+        return self.random.choice(self.swing_ids)
+
+    def list_swings(self) -> str:
+        """Next page of the swing list, starting over after the last one"""
+        path = f"/sessions/{self.session_id}/swings?limit={API_PAGE_SIZE}"
+        return path if self.cursor is None else f"{path}&cursor={urllib.parse.quote(self.cursor)}"
+
+    def request(self, name: str):
+        """Run one task and record its latency"""
+        start = time.perf_counter()
+        try:
+            self.connection.request("GET", self.tasks[name]())
+            response = self.connection.getresponse()
+            body = response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            body, ok = b"", False
+        elapsed = time.perf_counter() - start
+
+        if ok and name == "list_swings":
+            self.cursor = json.loads(body)["next_cursor"]
+        if not self.measuring:
+            return
+        if ok:
+            self.timings[name].append(elapsed)
+            self.bytes_received += len(body)
+        else:
+            self.failures += 1
+
+    def run(self):
+        names, weights = list(TASK_WEIGHTS), list(TASK_WEIGHTS.values())
+        while not self.stop_event.is_set():
+            self.request(self.random.choices(names, weights)[0])
+        self.connection.close()
+
+
+def run_load_test(users: int = API_LOAD_TEST_USERS, seconds: float = API_LOAD_TEST_SECONDS,
+                  swings: int = API_LOAD_TEST_SWINGS,
+                  redis_client: Optional[redis.Redis] = None) -> Dict[str, Any]:
+    """Load the API with ``users`` simulated clients for ``seconds``.
+
+    Args:
+        users: Concurrent simulated clients
+        seconds: Measured duration (after a one-second warm-up)
+        swings: Swings stored in the load-test session
+        redis_client: Client for the benchmark Redis DB
+
+    Returns:
+        Requests per second and latency percentiles (ms) per task and in
+        total, or ``{"skipped": reason}`` without Redis
+    """
+    if redis_client is None:
+        return {"skipped": "redis-server not reachable"}
+
+    import uvicorn
+
+    redis_manager = RedisManager()
+    redis_manager.redis_client = redis_client
+    session, swing_ids = seed_session(redis_manager, swings)
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(create_app(redis_manager), host=API_HOST, port=port,
+                                           log_level="warning"))
+    server_thread = threading.Thread(target=server.run, name="api-server", daemon=True)
+    stop_event = threading.Event()
+    clients = [SimulatedClient(port, session.session_id, swing_ids, seed, stop_event) for seed in range(users)]
+    try:
+        server_thread.start()
+        deadline = time.monotonic() + SERVER_START_TIMEOUT_S
+        while not server.started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if not server.started:
+            return {"skipped": "API server did not start"}
+
+        for client in clients:
+            client.start()
+        time.sleep(1.0)
+        for client in clients:
+            client.measuring = True
+        start = time.perf_counter()
+        time.sleep(seconds)
+        for client in clients:
+            client.measuring = False
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_event.set()
+        for client in clients:
+            if client.is_alive():
+                client.join(timeout=10)
+        server.should_exit = True
+        server_thread.join(timeout=10)
+        remove_session_keys(redis_client, session.session_id, session.user_id)
+
+    def stats(timings: List[float]) -> Dict[str, float]:
+        if not timings:
+            return {"requests": 0, "rps": 0.0}
+        values = np.asarray(timings) * 1e3
+        result = {"requests": len(values), "rps": len(values) / elapsed}
+        result.update({f"p{p}_ms": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))})
+        return result
+
+    per_task = {name: stats([t for client in clients for t in client.timings[name]]) for name in TASK_WEIGHTS}
+    total = stats([t for client in clients for timings in client.timings.values() for t in timings])
+    return {
+        "users": users,
+        "swings": swings,
+        "elapsed": elapsed,
+        "total": total,
+        "failures": sum(client.failures for client in clients),
+        "mb_per_s": sum(client.bytes_received for client in clients) / elapsed / 1e6,
+        "per_task": per_task,
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Load-test the GolfIMU HTTP API")
+    parser.add_argument("--users", type=int, default=API_LOAD_TEST_USERS, help="Concurrent simulated clients")
+    parser.add_argument("--seconds", type=float, default=API_LOAD_TEST_SECONDS, help="Measured duration (s)")
+    parser.add_argument("--swings", type=int, default=API_LOAD_TEST_SWINGS, help="Swings in the session")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    print("🏌️  GolfIMU API Load Test")
+    print("=" * 50)
+
+    report = run_load_test(args.users, args.seconds, args.swings, benchmark_redis_client())
+    if "skipped" in report:
+        print(f"Skipped: {report['skipped']}")
+        return
+
+    total = report["total"]
+    print(f"\n{report['users']} clients for {report['elapsed']:.1f}s: {total['rps']:.0f} requests/s, "
+          f"{report['mb_per_s']:.1f} MB/s, {report['failures']} failures")
+    print(f"{'task':<18}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, task in report["per_task"].items():
+        if task["requests"]:
+            print(f"{name:<18}{task['rps']:8.0f}{task['p50_ms']:9.1f}{task['p95_ms']:9.1f}{task['p99_ms']:9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Hardware-free benchmark suite for GolfIMU
+Micro-benchmarks for every stage of the data path (frame decode, IMUData
+construction, Redis stores, swing encode/decode, each analyzer) and a
+sustained 1 kHz ingest macro-benchmark, emitted as JSON with percentiles.
+A saved result can be used as the baseline for regression checks.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import redis
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from backend.analytics_pipeline import DEFAULT_REGISTRY, AnalyticsPipeline
+from backend.frame_codec import FRAME_FIELDS, decode_binary_frames, decode_json_frame
+from backend.imu_batch import IMUBatch
+from backend.main import GolfIMUBackend
+from backend.models import IMUData, SessionConfig
+from backend.redis_manager import RedisManager
+from backend.serial_manager import SerialManager
+from backend.swing_generator import generate_swings
+
+PERCENTILES = (50, 95, 99)
+
+# Compared metrics and whether a higher value is better
+COMPARED_METRICS = (("p50_us", False), ("achieved_rate", True))
+
+
+def summarize(per_item_seconds: List[float]) -> Dict[str, float]:
+    """Percentile summary of per-item timings.
+
+    Args:
+        per_item_seconds: One timing per sample, in seconds per item
+
+    Returns:
+        Dictionary of microsecond statistics and throughput
+    """
+    values = np.asarray(per_item_seconds, dtype=np.float64) * 1e6
+    summary = {f"p{p}_us": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+    summary.update({
+        "mean_us": float(values.mean()),
+        "min_us": float(values.min()),
+        "max_us": float(values.max()),
+        "ops_per_sec": float(1e6 / values.mean()) if values.mean() > 0 else 0.0,
+        "samples": len(values)
+    })
+    return summary
+
+
+def time_callable(func: Callable[[], Any], items: int = 1, repeat: int = BENCHMARK_REPEAT,
+                  target_ms: float = BENCHMARK_TARGET_SAMPLE_MS) -> Dict[str, float]:
+    """Time a callable.
+
+    The number of calls per sample is scaled so one sample takes about
+    ``target_ms``, which keeps timer resolution out of fast benchmarks.
+
+    Args:
+        func: Work to time
+        items: Items processed per call (results are per item)
+        repeat: Number of timed samples
+        target_ms: Approximate duration of one sample
+
+    Returns:
+        Summary from ``summarize``
+    """
+    start = time.perf_counter()
+    func()
+    single = max(time.perf_counter() - start, 1e-9)
+    number = max(1, int(target_ms / 1000.0 / single))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / (number * items))
+    return summarize(samples)
+
+
+class _LineSource:
+    """Serial connection stand-in that returns the same line forever"""
+
+    def __init__(self, line: bytes):
+        self.line = line
+        self.is_open = True
+
+    def readline(self) -> bytes:
+        return self.line
+
+
+def benchmark_redis_client() -> Optional[redis.Redis]:
+    """Client for the benchmark Redis DB, or None if no server is reachable"""
+    client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=BENCHMARK_REDIS_DB,
+                         password=REDIS_PASSWORD, decode_responses=True)
+    try:
+        client.ping()
+        return client
+    except redis.RedisError:
+        return None
+
+
+def remove_session_keys(client: redis.Redis, session_id: str, user_id: Optional[str] = None):
+    """Delete every key a benchmark session wrote, its swings in the user and club indexes and its user's rollups"""
+    for index_key in client.scan_iter("*:swing_index"):
+        members = [member for member, _ in client.zscan_iter(index_key, match=f"{session_id}:*")]
+        if members:
+            client.zrem(index_key, *members)
+    keys = list(client.scan_iter(f"*{session_id}*"))
+    if user_id is not None:
+        keys += client.scan_iter(f"rollup:{user_id}:*")
+    if keys:
+        client.delete(*keys)
+
+
+def micro_benchmarks(repeat: int = BENCHMARK_REPEAT,
+                     redis_client: Optional[redis.Redis] = None) -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Build the micro-benchmarks.
+
+    Args:
+        repeat: Timed samples per benchmark
+        redis_client: Client for the Redis benchmarks (skipped if None)
+
+    Returns:
+        Mapping of benchmark name to a function returning its result
+    """
+    swings = generate_swings(1, seed=0)
+    frames = swings.frames(0)
+    session = SessionConfig(user_id="benchmark", club_id="driver", club_length=DEFAULT_CLUB_LENGTH_M,
+                            club_mass=DEFAULT_CLUB_MASS_KG)
+    swing = swings.to_swing_data(0, session.session_id)
+    batch = IMUBatch.from_swing(swing)
+    batch_bytes = batch.to_bytes()
+    binary = swings.to_firmware_bytes(0, "binary")
+    json_line = swings.to_firmware_bytes(0, "json").split(b"\r\n", 1)[0].decode()
+    fields = dict(zip(FRAME_FIELDS, frames[0].tolist()))
+    now = datetime.now()
+
+    serial_manager = SerialManager()
+    serial_manager.serial_connection = _LineSource(json_line.encode() + b"\r\n")
+    serial_manager.is_connected = True
+
+    redis_manager = RedisManager()
+    point_dicts = json.loads(redis_manager._serialize_swing_data(swing))["imu_data_points"]
+
+    benchmarks: Dict[str, Callable[[], Dict[str, Any]]] = {
+        "decode.json_frame": lambda: time_callable(lambda: decode_json_frame(json_line), repeat=repeat),
+        "decode.serial_read_imu_data": lambda: time_callable(serial_manager.read_imu_data, repeat=repeat),
+        "decode.binary_frames": lambda: time_callable(lambda: decode_binary_frames(binary),
+                                                      items=len(frames), repeat=repeat),
+        "model.imu_data": lambda: time_callable(lambda: IMUData(**fields, timestamp=now), repeat=repeat),
+        "swing.encode_json": lambda: time_callable(lambda: redis_manager._serialize_swing_data(swing),
+                                                   repeat=repeat),
+        "swing.decode_points": lambda: time_callable(lambda: IMUBatch.from_point_dicts(point_dicts),
+                                                     repeat=repeat),
+        "swing.to_bytes": lambda: time_callable(batch.to_bytes, repeat=repeat),
+        "swing.from_bytes": lambda: time_callable(lambda: IMUBatch.from_bytes(batch_bytes), repeat=repeat),
+    }
+
+    # Each analyzer on the outputs of its dependencies
+    memo: Dict[str, Any] = {"batch": batch, "session": session}
+    for name in DEFAULT_REGISTRY.resolve():
+        analyzer = DEFAULT_REGISTRY.get(name)
+        kwargs = {value: memo[value] for value in analyzer.inputs}
+        result = analyzer.func(**kwargs)
+        memo.update({output: result[output] for output in analyzer.outputs})
+        benchmarks[f"analyze.{name}"] = (
+            lambda func=analyzer.func, kwargs=kwargs: time_callable(lambda: func(**kwargs), repeat=repeat)
+        )
+
+    pipeline = AnalyticsPipeline(max_workers=1)
+    benchmarks["analyze.pipeline"] = lambda: time_callable(lambda: pipeline.run_batch(batch, session),
+                                                           repeat=repeat)
+
+    def redis_benchmark(func: Callable[[], Any]) -> Callable[[], Dict[str, Any]]:
+        def run() -> Dict[str, Any]:
+            if redis_client is None:
+                return {"skipped": "redis-server not reachable"}
+            redis_manager.redis_client = redis_client
+            try:
+                return time_callable(func, repeat=repeat)
+            finally:
+                remove_session_keys(redis_client, session.session_id, session.user_id)
+        return run
+
+    sample = IMUData(**fields, timestamp=now)
+    benchmarks["redis.store_imu_data"] = redis_benchmark(lambda: redis_manager.store_imu_data(sample, session))
+    benchmarks["redis.store_swing_data"] = redis_benchmark(lambda: redis_manager.store_swing_data(swing, session))
+    return benchmarks
+
+
+def ingest_benchmark(seconds: float = BENCHMARK_INGEST_SECONDS,
+                     redis_client: Optional[redis.Redis] = None) -> Dict[str, Any]:
+    """Sustained 1 kHz ingest through the live sample path.
+
+    Generated swings are written as a binary capture and replayed in real
+    time through ``GolfIMUBackend.replay_session`` against Redis.
+
+    Args:
+        seconds: Recording length to replay
+        redis_client: Client for the benchmark Redis DB (skipped if None)
+
+    Returns:
+        Rate and end-to-end lag statistics
+    """
+    if redis_client is None:
+        return {"skipped": "redis-server not reachable"}
+
+    swings = generate_swings(max(1, int(np.ceil(seconds / 1.5))), sample_rate=IMU_SAMPLE_RATE_HZ, seed=0)
+    duration_ms = int(round(swings.t[-1] * 1000.0)) + 1
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as capture:
+        for i in range(len(swings)):
+            capture.write(swings.to_firmware_bytes(i, "binary", start_ms=i * duration_ms))
+        path = capture.name
+
+    backend = GolfIMUBackend()
+    backend.redis_manager.redis_client = redis_client
+    backend.start_session("benchmark", "driver", DEFAULT_CLUB_LENGTH_M, DEFAULT_CLUB_MASS_KG)
+    session_id = backend.session_manager.get_current_session().session_id
+
+    try:
+        report = backend.replay_session(path, speed=1.0)
+    finally:
+        os.remove(path)
+        remove_session_keys(redis_client, session_id, "benchmark")
+        backend.analytics_pipeline.shutdown()
+
+    # End-to-end lag is the lag of the last stage
+    lag = list(report["stages"].values())[-1]["lag"]
+    result = {f"{key[:-3]}_us": value * 1000.0 for key, value in lag.items()}
+    result.update({
+        "samples": report["samples"],
+        "target_rate": report["target_rate"],
+        "achieved_rate": report["achieved_rate"],
+        "elapsed": report["elapsed"],
+        "stages": report["stages"]
+    })
+    return result
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = BENCHMARK_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """Compare two result files benchmark by benchmark.
+
+    Args:
+        current: Result of this run
+        baseline: Saved result to compare against
+        threshold: Relative change that counts as a regression
+
+    Returns:
+        One entry per compared metric with the relative change and a
+        ``regression`` flag
+    """
+    rows = []
+    for name, result in current.get("benchmarks", {}).items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if not base or "skipped" in result or "skipped" in base:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            if not base.get(metric) or result.get(metric) is None:
+                continue
+            change = result[metric] / base[metric] - 1.0
+            worse = -change if higher_is_better else change
+            rows.append({
+                "benchmark": name, "metric": metric, "baseline": base[metric],
+                "current": result[metric], "change": change, "regression": worse > threshold
+            })
+    return rows
+
+
+def git_revision() -> Optional[str]:
+    """Current commit of the project, if it is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(project_root),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names: Optional[List[str]] = None, repeat: int = BENCHMARK_REPEAT,
+              ingest_seconds: float = BENCHMARK_INGEST_SECONDS,
+              redis_client: Optional[redis.Redis] = None) -> Dict[str, Any]:
+    """Run the selected benchmarks.
+
+    Args:
+        names: Substrings selecting benchmarks (all if None)
+        repeat: Timed samples per micro-benchmark
+        ingest_seconds: Length of the ingest macro-benchmark (0 skips it)
+        redis_client: Client for the Redis benchmarks
+
+    Returns:
+        JSON-serializable result with metadata and per-benchmark statistics
+    """
+    def selected(name: str) -> bool:
+        return not names or any(pattern in name for pattern in names)
+
+    results: Dict[str, Any] = {}
+    for name, run in micro_benchmarks(repeat, redis_client).items():
+        if selected(name):
+            results[name] = run()
+            print(f"  {name:32s} {format_result(results[name])}")
+
+    if ingest_seconds > 0 and selected("ingest.sustained_1khz"):
+        results["ingest.sustained_1khz"] = ingest_benchmark(ingest_seconds, redis_client)
+        print(f"  {'ingest.sustained_1khz':32s} {format_result(results['ingest.sustained_1khz'])}")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat
+        },
+        "benchmarks": results
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """One-line summary of a benchmark result"""
+    if "skipped" in result:
+        return f"skipped ({result['skipped']})"
+    line = f"p50 {result['p50_us']:10.2f} us  p95 {result['p95_us']:10.2f} us  p99 {result['p99_us']:10.2f} us"
+    if "achieved_rate" in result:
+        line += f"  {result['achieved_rate']:.0f}/{result['target_rate']:.0f} Hz"
+    return line
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Hardware-free GolfIMU benchmarks")
+    parser.add_argument("-k", "--filter", action="append", dest="names",
+                        help="Only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--repeat", type=int, default=BENCHMARK_REPEAT,
+                        help="Timed samples per micro-benchmark")
+    parser.add_argument("--ingest-seconds", type=float, default=BENCHMARK_INGEST_SECONDS,
+                        help="Length of the sustained 1 kHz ingest run (0 skips it)")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Compare against a saved result and exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    print("🏌️  GolfIMU Benchmarks")
+    print("=" * 50)
+
+    result = run_suite(args.names, args.repeat, args.ingest_seconds, benchmark_redis_client())
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare_results(result, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (revision {baseline['meta'].get('git_revision')}):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"  {row['benchmark']:32s} {row['metric']:14s} {row['change']:+7.1%}  {flag}")
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
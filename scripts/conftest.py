@@ -0,0 +1,4 @@
+"""
+Pytest configuration for the scripts and their tests
+"""
+from backend.tests.conftest import spool_dir  # noqa: F401
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+GolfIMU firmware emulator
+Opens a Linux pseudo-terminal that behaves like a Teensy running
+GolfIMU_Firmware.ino. It answers the same commands and streams IMU frames,
+so SerialManager and the C reader run without hardware.
+"""
+
+import argparse
+import json
+import os
+import select
+import sys
+import threading
+import time
+import tty
+from collections import deque
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from backend.frame_codec import FRAME_FIELDS, encode_binary_frames, encode_json_frames
+from backend.session_replay import load_session_recording
+from backend.swing_generator import generate_swings
+
+FIRMWARE_BANNER = [
+    "GolfIMU Backend-Compatible Firmware",
+    "Version: 1.0.0",
+    "Test Mode: ENABLED",
+    "Impact Detection: DISABLED",
+    "BNO08x connected!",
+    "Sensors enabled. Ready for backend connection.",
+    "Commands: CONFIG:, START_MONITORING, STOP_MONITORING, REQUEST_SWING",
+    "Mode Commands: ENABLE_IMPACT, DISABLE_IMPACT, TEST_MODE, PRODUCTION_MODE",
+]
+
+IMPACT_COOLDOWN_S = 1.0
+
+
+def synthetic_frames(sample_rate: float = IMU_SAMPLE_RATE_HZ, seconds: float = 2.0,
+                     seed: int = 0) -> np.ndarray:
+    """Address at rest followed by one generated swing and its impact.
+
+    Returns:
+        Frame values in ``FRAME_FIELDS`` order, shape (N, 13)
+    """
+    swing_time = (SYNTH_TEMPO + 1.0) * SYNTH_DOWNSWING_TIME + SYNTH_FOLLOW_THROUGH_TIME
+    swings = generate_swings(1, sample_rate, address_time=max(seconds - swing_time, SYNTH_ADDRESS_TIME),
+                             seed=seed)
+    return swings.frames(0)
+
+
+def load_recording(path: str) -> np.ndarray:
+    """Load recorded frames from a capture or session file.
+
+    Accepts C reader captures (JSON or binary) and ``imu_{session}.jsonl``
+    data files.
+
+    Returns:
+        Frame values in ``FRAME_FIELDS`` order, shape (N, 13)
+    """
+    return load_session_recording(path)[1]
+
+
+class FirmwareEmulator:
+    """Emulated Teensy firmware behind a pseudo-terminal"""
+
+    def __init__(self, sample_rate: float = IMU_SAMPLE_RATE_HZ,
+                 baudrate: int = EMULATOR_BAUDRATE,
+                 frame_format: str = EMULATOR_FRAME_FORMAT,
+                 frames: Optional[np.ndarray] = None,
+                 loop: bool = True):
+        """Initialize the emulator.
+
+        Args:
+            sample_rate: Frames per second to stream
+            baudrate: Link throttle in baud (0 streams as fast as the pty drains)
+            frame_format: "json" or "binary"
+            frames: Frame values to stream (synthetic swing if None)
+            loop: Restart from the first frame after the last one
+        """
+        if frame_format not in ("json", "binary"):
+            raise ValueError(f"Unknown frame format: {frame_format}")
+
+        self.sample_rate = float(sample_rate)
+        self.baudrate = baudrate
+        self.frame_format = frame_format
+        self.frames = np.asarray(frames if frames is not None else synthetic_frames(sample_rate),
+                                 dtype=np.float64).reshape(-1, len(FRAME_FIELDS))
+        self.loop = loop
+
+        # Firmware state
+        self.monitoring_enabled = False
+        self.impact_detection_enabled = False
+        self.test_mode = True
+        self.impact_threshold = 30.0
+        self.session_config = {}
+        self._last_impact = -IMPACT_COOLDOWN_S
+
+        # Injected swings: (frames, impact row) streamed ahead of the regular frames
+        self._injected: deque = deque()
+        self._injection: Optional[np.ndarray] = None
+        self._injection_impact = -1
+        self._injection_row = 0
+        self.impact_times: List[float] = []
+
+        # Statistics
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.bytes_sent = 0
+        self.commands: List[str] = []
+
+        self.port: Optional[str] = None
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._tx = bytearray()
+        self._rx = bytearray()
+        self._tokens = 0.0
+        self._token_time = 0.0
+
+    def __enter__(self) -> "FirmwareEmulator":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> str:
+        """Open the pseudo-terminal and start streaming.
+
+        Returns:
+            Path of the serial device to connect to
+        """
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+
+        for line in FIRMWARE_BANNER:
+            self._queue_line(line)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="firmware-emulator", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self):
+        """Stop streaming and close the pseudo-terminal"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def handle_command(self, command: str) -> List[str]:
+        """Apply a command the way handleCommand() does.
+
+        Returns:
+            Response lines
+        """
+        command = command.strip()
+        self.commands.append(command)
+
+        if command.startswith("CONFIG:"):
+            config_json = command[7:]
+            try:
+                self.session_config = json.loads(config_json)
+                self.impact_threshold = float(self.session_config.get("impact_threshold", self.impact_threshold))
+            except (ValueError, TypeError, AttributeError):
+                pass
+            return [f"Config received: {config_json}"]
+        if command == "START_MONITORING":
+            self.monitoring_enabled = True
+            lines = ["Swing monitoring started"]
+            if self.test_mode:
+                lines.append("Test mode: All swing data will be logged (no impact detection needed)")
+            return lines
+        if command == "STOP_MONITORING":
+            self.monitoring_enabled = False
+            return ["Swing monitoring stopped"]
+        if command == "REQUEST_SWING":
+            return ["Swing data requested"]
+        if command in ("ENABLE_IMPACT", "PRODUCTION_MODE"):
+            self.impact_detection_enabled, self.test_mode = True, False
+            return ["Impact detection ENABLED - Production mode" if command == "ENABLE_IMPACT"
+                    else "Production mode ENABLED - Impact detection active"]
+        if command in ("DISABLE_IMPACT", "TEST_MODE"):
+            self.impact_detection_enabled, self.test_mode = False, True
+            return ["Impact detection DISABLED - Test mode" if command == "DISABLE_IMPACT"
+                    else "Test mode ENABLED - No impact detection needed"]
+        if command == "STATUS":
+            return [
+                f"Monitoring: {'ON' if self.monitoring_enabled else 'OFF'}",
+                f"Test Mode: {'ON' if self.test_mode else 'OFF'}",
+                f"Impact Detection: {'ON' if self.impact_detection_enabled else 'OFF'}",
+            ]
+        return [
+            f"Unknown command: {command}",
+            "Available commands: CONFIG:, START_MONITORING, STOP_MONITORING, REQUEST_SWING",
+            "Mode commands: ENABLE_IMPACT, DISABLE_IMPACT, TEST_MODE, PRODUCTION_MODE, STATUS",
+        ]
+
+    def inject(self, frames: np.ndarray, impact_index: Optional[int] = None):
+        """Stream frames ahead of the regular ones, e.g. a swing on demand.
+
+        The ``time.perf_counter`` instant the impact frame is sent is
+        appended to ``impact_times``.
+
+        Args:
+            frames: Frame values in ``FRAME_FIELDS`` order, shape (N, 13)
+            impact_index: Row of the impact frame
+        """
+        frames = np.asarray(frames, dtype=np.float64).reshape(-1, len(FRAME_FIELDS))
+        self._injected.append((frames, -1 if impact_index is None else impact_index))
+
+    def _next_frame(self, index: int) -> Tuple[Optional[np.ndarray], bool]:
+        """Next frame to send: injected frames first, then the regular ones.
+
+        Returns:
+            Tuple of (frame values or None when the frames ran out,
+            whether the frame was injected)
+        """
+        if self._injection is None and self._injected:
+            self._injection, self._injection_impact = self._injected.popleft()
+            self._injection_row = 0
+
+        if self._injection is not None:
+            values = self._injection[self._injection_row]
+            if self._injection_row == self._injection_impact:
+                self.impact_times.append(time.perf_counter())
+            self._injection_row += 1
+            if self._injection_row >= len(self._injection):
+                self._injection = None
+            return values, True
+
+        if not self.loop and index >= len(self.frames):
+            return None, False
+        return self.frames[index % len(self.frames)], False
+
+    def _queue_line(self, line: str):
+        """Queue a status line the way Serial.println() prints it"""
+        self._tx += (line + "\r\n").encode('utf-8')
+
+    def _emit(self, values: np.ndarray, elapsed: float):
+        """Queue one IMU frame (and an impact line if one is detected)"""
+        t_ms = np.array([int(elapsed * 1000)])
+        if self.frame_format == "binary":
+            self._tx += encode_binary_frames(t_ms, values)
+        else:
+            self._tx += encode_json_frames(t_ms, values)
+        self.frames_sent += 1
+
+        if self.monitoring_enabled and self.impact_detection_enabled:
+            magnitude = float(np.linalg.norm(values[0:3]))
+            if magnitude > self.impact_threshold and elapsed - self._last_impact > IMPACT_COOLDOWN_S:
+                self._last_impact = elapsed
+                self._queue_line(f"IMPACT_DETECTED: {magnitude:.1f}g")
+
+    def _link_allowance(self, now: float) -> float:
+        """Bytes the emulated UART can move right now (token bucket)"""
+        if not self.baudrate:
+            return float(len(self._tx))
+
+        rate = self.baudrate / 10.0  # 8N1: 10 bits per byte
+        burst = max(rate * 0.01, 64.0)
+        self._tokens = min(burst, self._tokens + (now - self._token_time) * rate)
+        self._token_time = now
+        return self._tokens
+
+    def _read_commands(self):
+        """Handle complete command lines sent by the host"""
+        try:
+            self._rx += os.read(self._master, 4096)
+        except (BlockingIOError, OSError):
+            return
+
+        while b"\n" in self._rx:
+            line, _, rest = self._rx.partition(b"\n")
+            self._rx = bytearray(rest)
+            command = line.decode('utf-8', errors='ignore').strip()
+            if command:
+                for response in self.handle_command(command):
+                    self._queue_line(response)
+
+    def _write_pending(self, allowance: float):
+        """Write as much queued output as the link and pty accept"""
+        try:
+            written = os.write(self._master, bytes(self._tx[:max(int(allowance), 1)]))
+        except (BlockingIOError, OSError):
+            return
+        del self._tx[:written]
+        self.bytes_sent += written
+        if self.baudrate:
+            self._tokens -= written
+
+    def _run(self):
+        """Emulated firmware loop: commands in, frames out on schedule"""
+        period = 1.0 / self.sample_rate
+        start = next_due = self._token_time = time.perf_counter()
+        index = 0
+
+        while self._running:
+            now = time.perf_counter()
+            while now >= next_due:
+                if not self.loop and index >= len(self.frames) and self._injection is None \
+                        and not self._injected:
+                    next_due = now + period
+                    break
+                # Serial.println() blocks when the TX buffer is full, so
+                # samples arriving meanwhile are lost
+                if len(self._tx) < EMULATOR_TX_BUFFER_BYTES:
+                    values, injected = self._next_frame(index)
+                    if values is not None:
+                        self._emit(values, now - start)
+                    if not injected:
+                        index += 1
+                else:
+                    self.frames_skipped += 1
+                next_due += period
+                if now - next_due > 0.1:
+                    next_due = now
+
+            wait = min(max(next_due - now, 0.0), 0.05)
+            writers = []
+            if self._tx:
+                allowance = self._link_allowance(now)
+                if allowance >= 1:
+                    writers = [self._master]
+                else:
+                    wait = min(wait, (1 - allowance) * 10.0 / self.baudrate)
+
+            try:
+                readable, writable, _ = select.select([self._master], writers, [], wait)
+            except (OSError, ValueError):
+                break
+
+            if readable:
+                self._read_commands()
+            if writable:
+                self._write_pending(self._link_allowance(time.perf_counter()))
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Emulate the GolfIMU firmware on a pseudo-terminal")
+    parser.add_argument("--rate", type=float, default=IMU_SAMPLE_RATE_HZ, help="Frames per second")
+    parser.add_argument("--baud", type=int, default=EMULATOR_BAUDRATE,
+                        help="Link throttle in baud (0 = unthrottled)")
+    parser.add_argument("--format", choices=["json", "binary"], default=EMULATOR_FRAME_FORMAT,
+                        help="Frame format")
+    parser.add_argument("--recording", help="Capture or imu_{session}.jsonl file to replay")
+    parser.add_argument("--once", action="store_true", help="Stream the recording once instead of looping")
+    args = parser.parse_args()
+
+    frames = load_recording(args.recording) if args.recording else None
+    emulator = FirmwareEmulator(args.rate, args.baud, args.format, frames, loop=not args.once)
+
+    print("🏌️  GolfIMU Firmware Emulator")
+    print("=" * 50)
+    print(f"Port:   {emulator.start()}")
+    print(f"Rate:   {args.rate:.0f} Hz ({args.format})")
+    print(f"Link:   {f'{args.baud} baud' if args.baud else 'unthrottled'}")
+    print("Press Ctrl+C to stop\n")
+
+    try:
+        while True:
+            time.sleep(1)
+            print(f"Sent {emulator.frames_sent} frames, {emulator.bytes_sent} bytes"
+                  f" ({emulator.frames_skipped} skipped)")
+    except KeyboardInterrupt:
+        print("\nStopping emulator...")
+    finally:
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
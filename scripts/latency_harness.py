@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Impact-to-metrics latency harness for GolfIMU
+Injects generated swings with a known impact instant through the firmware
+emulator and follows each impact through the live backend: serial receive,
+parse, segmentation, Redis storage, analytics and availability through the
+query API. Reports the per-stage latency breakdown with p50/p95/p99.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import redis
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from benchmark import benchmark_redis_client, remove_session_keys
+from firmware_emulator import FirmwareEmulator
+from backend.latency_trace import LATENCY_TRACER, latency_breakdown
+from backend.main import GolfIMUBackend
+from backend.swing_generator import generate_swings, sample_swing_parameters
+
+POLL_INTERVAL_S = 0.0005
+
+
+def _wait_for(predicate, timeout: float):
+    """Poll until ``predicate`` returns something truthy or time runs out"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        result = predicate()
+        if result:
+            return result
+        time.sleep(POLL_INTERVAL_S)
+    return None
+
+
+def run_harness(swings: int = LATENCY_HARNESS_SWINGS, gap: float = LATENCY_HARNESS_GAP_S,
+                timeout: float = LATENCY_HARNESS_TIMEOUT_S, frame_format: str = EMULATOR_FRAME_FORMAT,
+                redis_client: Optional[redis.Redis] = None, seed: int = 0) -> Dict[str, Any]:
+    """Measure impact-to-metrics latency over many injected swings.
+
+    Args:
+        swings: Number of swings to inject
+        gap: Rest between swings
+        timeout: Wait for each swing's metrics before counting it as missed
+        frame_format: Emulator frame format ("json" or "binary")
+        redis_client: Client for the benchmark Redis DB
+        seed: Seed for the generated swings
+
+    Returns:
+        Latency breakdown (see ``latency_breakdown``) plus the number of
+        missed swings, or ``{"skipped": reason}`` without Redis
+    """
+    if redis_client is None:
+        return {"skipped": "redis-server not reachable"}
+
+    generated = generate_swings(swings, IMU_SAMPLE_RATE_HZ, seed=seed, **sample_swing_parameters(swings, seed))
+    # The club rests at address between injected swings
+    emulator = FirmwareEmulator(IMU_SAMPLE_RATE_HZ, frame_format=frame_format,
+                                frames=generated.frames(0)[:1])
+    port = emulator.start()
+
+    backend = GolfIMUBackend()
+    backend.redis_manager.redis_client = redis_client
+    backend.start_session("latency_harness", "driver", DEFAULT_CLUB_LENGTH_M, DEFAULT_CLUB_MASS_KG)
+    session = backend.session_manager.get_current_session()
+    monitor = threading.Thread(target=backend.start_stream_monitoring, name="stream-monitor", daemon=True)
+    traces = []
+
+    try:
+        if not backend.connect_arduino(port):
+            return {"skipped": "could not connect to the firmware emulator"}
+
+        LATENCY_TRACER.reset()
+        monitor.start()
+        time.sleep(gap)
+
+        for i in range(swings):
+            seen = set(LATENCY_TRACER.traces())
+            emulator.inject(generated.frames(i), generated.impact_index)
+
+            swing_id = _wait_for(lambda: next((trace_id for trace_id in LATENCY_TRACER.traces()
+                                               if trace_id not in seen), None), timeout)
+            if swing_id and _wait_for(
+                    lambda: backend.redis_manager.get_processed_metrics(session, swing_id), timeout):
+                LATENCY_TRACER.set_impact(swing_id, emulator.impact_times[i])
+                traces.append(LATENCY_TRACER.traces()[swing_id])
+            else:
+                print(f"  Swing {i + 1}: no metrics within {timeout:.1f}s")
+            time.sleep(gap)
+    finally:
+        backend.running = False
+        if monitor.is_alive():
+            monitor.join(timeout=timeout)
+        backend.disconnect_arduino()
+        backend.analytics_pipeline.shutdown()
+        emulator.stop()
+        remove_session_keys(redis_client, session.session_id, session.user_id)
+
+    report = latency_breakdown(traces)
+    report["missed"] = swings - len(traces)
+    return report
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Measure GolfIMU impact-to-metrics latency")
+    parser.add_argument("--swings", type=int, default=LATENCY_HARNESS_SWINGS, help="Swings to inject")
+    parser.add_argument("--gap", type=float, default=LATENCY_HARNESS_GAP_S, help="Rest between swings (s)")
+    parser.add_argument("--timeout", type=float, default=LATENCY_HARNESS_TIMEOUT_S,
+                        help="Wait for each swing's metrics (s)")
+    parser.add_argument("--format", choices=["json", "binary"], default=EMULATOR_FRAME_FORMAT,
+                        help="Emulator frame format")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    print("🏌️  GolfIMU Impact-to-Metrics Latency")
+    print("=" * 50)
+
+    report = run_harness(args.swings, args.gap, args.timeout, args.format, benchmark_redis_client())
+    if "skipped" in report:
+        print(f"Skipped: {report['skipped']}")
+        return
+
+    print(f"\n{report['swings']} swings measured, {report['missed']} missed")
+    print(f"  {'stage':15s} {'p50':>10s} {'p95':>10s} {'p99':>10s}   since impact (step p50)")
+    for stage, latency in report["stages"].items():
+        since, step = latency["since_impact"], latency["step"]
+        print(f"  {stage:15s} {since['p50_ms']:7.2f} ms {since['p95_ms']:7.2f} ms {since['p99_ms']:7.2f} ms"
+              f"   ({step['p50_ms']:.2f} ms)")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Reprocess stored swings for GolfIMU
+Recomputes processed metrics for every stored swing after analyzers change.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from backend.reprocessing import CHECKPOINT_FILE, SwingReprocessor
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Recompute metrics for stored swings")
+    parser.add_argument("--session", action="append", dest="sessions",
+                        help="Session id to reprocess (repeatable, default: all)")
+    parser.add_argument("--workers", type=int, default=REPROCESS_WORKERS,
+                        help="Worker processes (1 runs inline)")
+    parser.add_argument("--chunk-size", type=int, default=REPROCESS_CHUNK_SIZE,
+                        help="Swings per work unit")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE,
+                        help="Checkpoint file used to resume")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore the checkpoint and reprocess everything")
+    args = parser.parse_args()
+
+    print("🏌️  GolfIMU Swing Reprocessing")
+    print("=" * 50)
+
+    reprocessor = SwingReprocessor(
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint
+    )
+
+    try:
+        report = reprocessor.run(args.sessions, resume=not args.restart)
+    except KeyboardInterrupt:
+        print("\nInterrupted - rerun to resume from the checkpoint")
+        sys.exit(1)
+
+    print(f"Sessions:    {report['sessions']}")
+    print(f"Swings:      {report['swings']}")
+    print(f"Failed:      {report['failed']}")
+    print(f"Elapsed:     {report['elapsed']:.2f} s")
+    print(f"Throughput:  {report['swings_per_second']:.1f} swings/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,16 +31,8 @@ from global_config import *
 
 from backend.main import GolfIMUBackend
 from backend.config import settings
+from backend.structured_log import configure_logging, shutdown_logging
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format=LOG_FORMAT,
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
@@ -258,6 +250,15 @@ class GolfIMUSystemRunner:
         else:
             logger.warning(f"Unknown command type: {cmd_type}")
     
+    def _profile_command(self, args):
+        """Handle ``profile start [mode]`` / ``profile stop``"""
+        if args[:1] == ['start']:
+            self.backend.start_profiling(args[1] if len(args) > 1 else 'sampling')
+        elif args[:1] == ['stop']:
+            self.backend.stop_profiling()
+        else:
+            print("Usage: profile start [sampling|cprofile] | profile stop")
+    
     def _print_status(self):
         """Print current system status"""
         with self.status_lock:
@@ -351,6 +352,8 @@ class GolfIMUSystemRunner:
         print("  stop_monitor    - Stop swing monitoring")
         print("  recent_swings   - Show recent swings")
         print("  statistics      - Show swing statistics")
+        print("  profile start [sampling|cprofile] / profile stop - Profile the running system")
+        print("  memsnap         - Write a memory allocation snapshot")
         print("  quit            - Exit the system")
         
         while self.running:
@@ -386,6 +389,10 @@ class GolfIMUSystemRunner:
                             print(f"{key}: {value}")
                     except Exception as e:
                         logger.error(f"Error getting statistics: {e}")
+                elif command.startswith('profile'):
+                    self._profile_command(command.split()[1:])
+                elif command == 'memsnap':
+                    self.backend.memory_snapshot()
                 elif command:
                     print(f"Unknown command: {command}")
                     
@@ -417,6 +424,7 @@ class GolfIMUSystemRunner:
 
 def main():
     """Main entry point"""
+    configure_logging(console_format=LOG_FORMAT)
     print("🏌️  GolfIMU System Runner")
     print("=" * 50)
     
@@ -440,6 +448,7 @@ def main():
         sys.exit(1)
     finally:
         runner.stop()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
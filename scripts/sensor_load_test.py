@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Multi-sensor load test for GolfIMU
+Streams generated swings from many emulated sensors at once into one
+SensorHub and measures per-sensor ingest rate, fairness, swings analyzed
+and Redis round trips. The emulators run in separate processes, so the
+measured process only does the backend's work.
+"""
+
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import redis
+
+# Add scripts directory to path for imports
+script_dir = Path(__file__).parent
+sys.path.insert(0, str(script_dir))
+
+# Import common utilities
+from utils import setup_project_paths
+
+# Setup project paths
+project_root = setup_project_paths()
+
+# Import global configuration
+from global_config import *
+
+from benchmark import benchmark_redis_client, remove_session_keys
+from firmware_emulator import FirmwareEmulator
+from backend.analytics_pipeline import AnalyticsPipeline
+from backend.models import SessionConfig
+from backend.redis_manager import RedisManager
+from backend.sensor_hub import SensorHub
+from backend.swing_generator import generate_swings
+
+WARMUP_S = 1.0
+SWINGS_PER_SENSOR = 4
+REST_S = 1.0
+
+
+def sensor_frames(seed: int, sample_rate: float = IMU_SAMPLE_RATE_HZ) -> np.ndarray:
+    """A few generated swings, each followed by a rest at address"""
+    swings = generate_swings(SWINGS_PER_SENSOR, sample_rate, seed=seed)
+    rest = int(REST_S * sample_rate)
+    return np.vstack([np.vstack((swings.frames(i), np.repeat(swings.frames(i)[:1], rest, axis=0)))
+                      for i in range(len(swings))])
+
+
+def run_emulators(first_seed: int, count: int, frame_format: str, ports, stop_event, results):
+    """Emulator process: stream ``count`` sensors until ``stop_event`` is set"""
+    emulators = [FirmwareEmulator(IMU_SAMPLE_RATE_HZ, frame_format=frame_format,
+                                  frames=sensor_frames(first_seed + i)) for i in range(count)]
+    for i, emulator in enumerate(emulators):
+        ports.put((first_seed + i, emulator.start()))
+    stop_event.wait()
+    for i, emulator in enumerate(emulators):
+        emulator.stop()
+        results.put((first_seed + i, emulator.frames_sent, emulator.frames_skipped))
+
+
+def run_load_test(sensors: int = LOAD_TEST_SENSORS, seconds: float = LOAD_TEST_SECONDS,
+                  frame_format: str = EMULATOR_FRAME_FORMAT, redis_client: Optional[redis.Redis] = None,
+                  per_process: int = LOAD_TEST_EMULATORS_PER_PROCESS) -> Dict[str, Any]:
+    """Stream ``sensors`` emulated sensors into one hub for ``seconds``.
+
+    Args:
+        sensors: Number of emulated sensors, each at ``IMU_SAMPLE_RATE_HZ``
+        seconds: Measured duration (after a warm-up)
+        frame_format: Emulator frame format ("json" or "binary")
+        redis_client: Client for the benchmark Redis DB
+        per_process: Emulated sensors per emulator process
+
+    Returns:
+        Per-sensor rates and swings plus totals, or ``{"skipped": reason}``
+        without Redis
+    """
+    if redis_client is None:
+        return {"skipped": "redis-server not reachable"}
+
+    context = multiprocessing.get_context("spawn")
+    ports, results, stop_event = context.Queue(), context.Queue(), context.Event()
+    processes = [context.Process(target=run_emulators, name=f"emulators-{first}", daemon=True,
+                                 args=(first, min(per_process, sensors - first), frame_format,
+                                       ports, stop_event, results))
+                 for first in range(0, sensors, per_process)]
+    for process in processes:
+        process.start()
+
+    redis_manager = RedisManager()
+    redis_manager.redis_client = redis_client
+    pipeline = AnalyticsPipeline()
+    hub = SensorHub(redis_manager, pipeline)
+    sessions: List[SessionConfig] = []
+    try:
+        for _ in range(sensors):
+            index, port = ports.get(timeout=60)
+            session = SessionConfig(user_id=f"load_test_{index}", club_id="driver",
+                                    club_length=DEFAULT_CLUB_LENGTH_M, club_mass=DEFAULT_CLUB_MASS_KG)
+            sessions.append(session)
+            redis_manager.store_session_config(session)
+            if not hub.add_sensor(f"sensor{index:02d}", port, session, frame_format):
+                return {"skipped": f"could not open emulated sensor {index}"}
+
+        hub.start()
+        time.sleep(WARMUP_S)
+        before = hub.status()
+        start = time.perf_counter()
+        time.sleep(seconds)
+        after = hub.status()
+        elapsed = time.perf_counter() - start
+    finally:
+        stop_event.set()
+        hub.stop()
+        pipeline.shutdown()
+        for session in sessions:
+            remove_session_keys(redis_client, session.session_id, session.user_id)
+
+    emulated = {}
+    for _ in processes:
+        for _ in range(per_process):
+            try:
+                index, sent, skipped = results.get(timeout=10)
+            except Exception:
+                break
+            emulated[f"sensor{index:02d}"] = {"frames_sent": sent, "frames_skipped": skipped}
+    for process in processes:
+        process.join(timeout=10)
+
+    per_sensor = {}
+    for name, sensor in after["sensors"].items():
+        first = before["sensors"][name]
+        per_sensor[name] = {
+            "rate": (sensor["samples"] - first["samples"]) / elapsed,
+            "swings_analyzed": sensor["swings_analyzed"],
+            "frames_skipped": emulated.get(name, {}).get("frames_skipped", 0),
+        }
+    rates = [sensor["rate"] for sensor in per_sensor.values()]
+    return {
+        "sensors": sensors,
+        "target_rate": IMU_SAMPLE_RATE_HZ,
+        "elapsed": elapsed,
+        "total_rate": sum(rates),
+        "min_rate": min(rates),
+        "max_rate": max(rates),
+        "fairness": min(rates) / max(rates) if max(rates) else 0.0,
+        "swings_analyzed": sum(sensor["swings_analyzed"] for sensor in per_sensor.values()),
+        "frames_skipped": sum(sensor["frames_skipped"] for sensor in per_sensor.values()),
+        "redis_flushes_per_s": (after["flushes"] - before["flushes"]) / elapsed,
+        "per_sensor": per_sensor,
+    }
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Load-test one GolfIMU backend with many sensors")
+    parser.add_argument("--sensors", type=int, default=LOAD_TEST_SENSORS, help="Emulated sensors")
+    parser.add_argument("--seconds", type=float, default=LOAD_TEST_SECONDS, help="Measured duration (s)")
+    parser.add_argument("--format", choices=["json", "binary"], default=EMULATOR_FRAME_FORMAT,
+                        help="Emulator frame format")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    print("🏌️  GolfIMU Multi-Sensor Load Test")
+    print("=" * 50)
+
+    report = run_load_test(args.sensors, args.seconds, args.format, benchmark_redis_client())
+    if "skipped" in report:
+        print(f"Skipped: {report['skipped']}")
+        return
+
+    print(f"\n{report['sensors']} sensors at {report['target_rate']} Hz for {report['elapsed']:.1f}s")
+    print(f"  total rate      {report['total_rate']:10.0f} samples/s")
+    print(f"  per sensor      {report['min_rate']:10.0f} .. {report['max_rate']:.0f} samples/s "
+          f"(fairness {report['fairness']:.2f})")
+    print(f"  swings analyzed {report['swings_analyzed']:10d}")
+    print(f"  frames skipped  {report['frames_skipped']:10d} (by the emulated firmware)")
+    print(f"  Redis flushes   {report['redis_flushes_per_s']:10.1f} /s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts.api_load_test module
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+# Add scripts directory to path for imports
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+pytest.importorskip("httpx")
+from api_load_test import run_load_test
+from backend.tests.test_api import IndexedRedisClient
+
+
+class TestApiLoadTest:
+    """Test the HTTP API load test"""
+
+    def test_skipped_without_redis(self):
+        """Test the load test is skipped when no Redis server is reachable"""
+        assert "skipped" in run_load_test(users=1, seconds=0.1, redis_client=None)
+
+    def test_clients_load_every_endpoint(self):
+        """Test every task is served without failures and the session keys are removed"""
+        client = IndexedRedisClient()
+
+        report = run_load_test(users=2, seconds=1.0, swings=3, redis_client=client)
+
+        assert report["failures"] == 0
+        assert all(task["requests"] > 0 for task in report["per_task"].values())
+        assert report["total"]["rps"] > 0
+        assert not client.scan_iter("*")
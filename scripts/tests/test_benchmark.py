@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts.benchmark module
+"""
+
+import json
+import pytest
+from pathlib import Path
+import sys
+
+# Add scripts directory to path for imports
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+from benchmark import compare_results, ingest_benchmark, micro_benchmarks, run_suite, summarize, time_callable
+
+
+class TestTiming:
+    """Test timing and summary helpers"""
+
+    def test_summarize(self):
+        """Test percentiles are reported in microseconds"""
+        summary = summarize([i * 1e-6 for i in range(1, 101)])
+
+        assert summary["p50_us"] == pytest.approx(50.5)
+        assert summary["p99_us"] == pytest.approx(99.01)
+        assert summary["min_us"] == pytest.approx(1.0)
+        assert summary["max_us"] == pytest.approx(100.0)
+        assert summary["samples"] == 100
+
+    def test_time_callable_per_item(self):
+        """Test results are per item and every sample is timed"""
+        calls = []
+        result = time_callable(lambda: calls.append(1), items=10, repeat=5, target_ms=0.1)
+
+        assert result["samples"] == 5
+        assert len(calls) > 5
+        assert 0 < result["p50_us"] <= result["max_us"]
+
+
+class TestCompareResults:
+    """Test regression detection against a baseline"""
+
+    def result(self, **benchmarks):
+        return {"meta": {}, "benchmarks": benchmarks}
+
+    def test_slowdown_past_threshold(self):
+        """Test a latency increase past the threshold is a regression"""
+        baseline = self.result(a={"p50_us": 10.0}, b={"p50_us": 10.0})
+        current = self.result(a={"p50_us": 14.0}, b={"p50_us": 11.0})
+
+        rows = {row["benchmark"]: row for row in compare_results(current, baseline, threshold=0.25)}
+
+        assert rows["a"]["regression"]
+        assert rows["a"]["change"] == pytest.approx(0.4)
+        assert not rows["b"]["regression"]
+
+    def test_rate_drop_is_regression(self):
+        """Test a lower achieved rate is a regression and a higher one is not"""
+        baseline = self.result(slow={"achieved_rate": 1000.0}, fast={"achieved_rate": 1000.0})
+        current = self.result(slow={"achieved_rate": 600.0}, fast={"achieved_rate": 2000.0})
+
+        rows = {row["benchmark"]: row for row in compare_results(current, baseline, threshold=0.25)}
+
+        assert rows["slow"]["regression"]
+        assert not rows["fast"]["regression"]
+
+    def test_skipped_and_new_benchmarks_ignored(self):
+        """Test skipped or missing baselines are not compared"""
+        baseline = self.result(a={"skipped": "no redis"})
+        current = self.result(a={"p50_us": 10.0}, new={"p50_us": 10.0})
+
+        assert compare_results(current, baseline) == []
+
+
+class TestSuite:
+    """Test running benchmarks"""
+
+    def test_run_suite_filtered(self):
+        """Test the selected benchmarks run and the result is JSON"""
+        result = run_suite(["decode.json"], repeat=3, ingest_seconds=0)
+
+        assert set(result["benchmarks"]) == {"decode.json_frame"}
+        assert result["benchmarks"]["decode.json_frame"]["samples"] == 3
+        assert result["meta"]["repeat"] == 3
+        json.dumps(result)
+
+    def test_every_stage_covered(self):
+        """Test parse, store, encode/decode and every analyzer have a benchmark"""
+        names = set(micro_benchmarks(repeat=1))
+
+        assert {"decode.json_frame", "decode.binary_frames", "redis.store_imu_data",
+                "swing.encode_json", "swing.from_bytes", "analyze.pipeline"} <= names
+        assert any(name.startswith("analyze.") and name != "analyze.pipeline" for name in names)
+
+    def test_redis_skipped_without_server(self):
+        """Test Redis benchmarks are skipped instead of failing"""
+        benchmarks = micro_benchmarks(repeat=1, redis_client=None)
+
+        assert "skipped" in benchmarks["redis.store_swing_data"]()
+        assert "skipped" in ingest_benchmark(1.0, redis_client=None)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts.firmware_emulator module
+"""
+
+import pytest
+import shutil
+import signal
+import subprocess
+import time
+from pathlib import Path
+import sys
+import os
+from unittest.mock import patch
+
+import numpy as np
+import serial
+
+# Add scripts directory to path for imports
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+from firmware_emulator import FirmwareEmulator, load_recording, synthetic_frames
+from backend.frame_codec import decode_binary_frames, encode_binary_frames, encode_json_frames
+from backend.models import SessionConfig
+from backend.serial_manager import SerialManager
+
+
+def read_until(fd_reader, predicate, timeout=2.0):
+    """Read lines from a serial connection until one matches"""
+    deadline = time.time() + timeout
+    lines = []
+    while time.time() < deadline:
+        line = fd_reader.readline().decode('utf-8', errors='ignore').strip()
+        lines.append(line)
+        if predicate(line):
+            return lines
+    raise AssertionError(f"Timed out, got: {lines[-10:]}")
+
+
+@pytest.fixture
+def connected_manager():
+    """SerialManager connected to a running emulator"""
+    emulator = FirmwareEmulator(sample_rate=500)
+    emulator.start()
+    manager = SerialManager()
+    with patch('backend.serial_manager.time.sleep'):
+        assert manager.connect(emulator.port) is True
+    yield manager, emulator
+    manager.disconnect()
+    emulator.stop()
+
+
+class TestFirmwareEmulator:
+    """Test the emulated firmware protocol"""
+
+    def test_command_responses(self):
+        """Test commands answer like handleCommand()"""
+        emulator = FirmwareEmulator()
+
+        assert emulator.handle_command("START_MONITORING")[0] == "Swing monitoring started"
+        assert emulator.monitoring_enabled is True
+        assert emulator.handle_command("PRODUCTION_MODE") == ["Production mode ENABLED - Impact detection active"]
+        assert emulator.impact_detection_enabled is True and emulator.test_mode is False
+        assert emulator.handle_command("TEST_MODE") == ["Test mode ENABLED - No impact detection needed"]
+        assert emulator.handle_command("STATUS") == ["Monitoring: ON", "Test Mode: ON", "Impact Detection: OFF"]
+        assert emulator.handle_command("BOGUS")[0] == "Unknown command: BOGUS"
+
+    def test_config_sets_threshold(self):
+        """Test CONFIG: is echoed and its threshold applied"""
+        emulator = FirmwareEmulator()
+        response = emulator.handle_command('CONFIG:{"impact_threshold": 45.0}')
+
+        assert response == ['Config received: {"impact_threshold": 45.0}']
+        assert emulator.impact_threshold == 45.0
+
+    def test_unknown_format_rejected(self):
+        """Test only JSON and binary frames are supported"""
+        with pytest.raises(ValueError):
+            FirmwareEmulator(frame_format="csv")
+
+    def test_load_recording_formats(self, tmp_path):
+        """Test JSON and binary captures load to the same frames"""
+        frames = synthetic_frames(100, 0.5)
+        t_ms = np.arange(len(frames))
+        (tmp_path / "capture.txt").write_bytes(b"GolfIMU\r\n" + encode_json_frames(t_ms, frames))
+        (tmp_path / "capture.bin").write_bytes(encode_binary_frames(t_ms, frames))
+
+        assert np.allclose(load_recording(str(tmp_path / "capture.txt")), frames, atol=1e-3)
+        assert np.allclose(load_recording(str(tmp_path / "capture.bin")), frames, atol=1e-4)
+
+    def test_baud_throttle(self):
+        """Test the link never beats the emulated baud rate"""
+        with FirmwareEmulator(sample_rate=1000, baudrate=9600) as emulator:
+            connection = serial.Serial(emulator.port, timeout=0.1)
+            start = time.time()
+            received = 0
+            while time.time() - start < 0.5:
+                received += len(connection.read(4096))
+            connection.close()
+
+        # 9600 baud moves 960 bytes/s; allow the boot banner and one burst on top
+        assert received <= 960 * (time.time() - start) + 64 + 400
+        assert emulator.frames_skipped > 0
+
+
+class TestSerialManagerEndToEnd:
+    """Test SerialManager against the emulator"""
+
+    def test_read_imu_data(self, connected_manager):
+        """Test streamed frames parse into IMUData"""
+        manager, _ = connected_manager
+
+        imu_data = None
+        for _ in range(50):
+            imu_data = manager.read_imu_data()
+            if imu_data is not None:
+                break
+
+        assert imu_data is not None
+        assert np.linalg.norm([imu_data.ax, imu_data.ay, imu_data.az]) == pytest.approx(9.81, abs=0.5)
+
+    def test_send_session_config(self, connected_manager):
+        """Test CONFIG: reaches the firmware and is acknowledged"""
+        manager, emulator = connected_manager
+        sample_session_config = SessionConfig(user_id="u", club_id="driver", club_length=1.07,
+                                              club_mass=0.205, impact_threshold=30.0)
+
+        assert manager.send_session_config(sample_session_config) is True
+        read_until(manager.serial_connection, lambda line: line.startswith("Config received:"))
+
+        assert emulator.session_config["session_id"] == sample_session_config.session_id
+
+    def test_monitoring_commands(self, connected_manager):
+        """Test monitoring commands change firmware state"""
+        manager, emulator = connected_manager
+
+        manager.start_swing_monitoring()
+        read_until(manager.serial_connection, lambda line: line == "Swing monitoring started")
+        assert emulator.monitoring_enabled is True
+
+        manager.stop_swing_monitoring()
+        read_until(manager.serial_connection, lambda line: line == "Swing monitoring stopped")
+        assert emulator.monitoring_enabled is False
+
+    def test_injected_swing(self, connected_manager):
+        """Test an injected swing streams ahead of the regular frames with its impact timed"""
+        manager, emulator = connected_manager
+        frames = synthetic_frames(500, 1.0, seed=7)
+        magnitudes = np.linalg.norm(frames[:, 0:3], axis=1)
+        impact_index = int(np.argmax(magnitudes))
+
+        emulator.inject(frames, impact_index)
+        received = False
+        deadline = time.time() + 3.0
+        while time.time() < deadline and not received:
+            imu_data = manager.read_imu_data()
+            if imu_data is not None:
+                magnitude = np.linalg.norm([imu_data.ax, imu_data.ay, imu_data.az])
+                received = magnitude == pytest.approx(magnitudes[impact_index], rel=1e-4)
+
+        assert received
+        assert len(emulator.impact_times) == 1
+
+
+@pytest.fixture(scope="module")
+def reader_binary(tmp_path_factory):
+    """fast_serial_reader.c compiled for this machine"""
+    binary = tmp_path_factory.mktemp("reader") / "fast_serial_reader"
+    subprocess.run(["gcc", "-O2", "-o", str(binary), str(scripts_dir / "fast_serial_reader.c")],
+                   check=True)
+    return binary
+
+
+@pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc not available")
+class TestFastSerialReader:
+    """Test the C reader against the emulator"""
+
+    def capture(self, reader_binary, tmp_path, frame_format):
+        """Run the reader on an emulator for half a second"""
+        output = tmp_path / "capture.txt"
+        with FirmwareEmulator(sample_rate=1000, frame_format=frame_format) as emulator:
+            process = subprocess.Popen([str(reader_binary), emulator.port, str(output)],
+                                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            time.sleep(0.5)
+            process.send_signal(signal.SIGINT)
+            stdout, _ = process.communicate(timeout=5)
+        return output.read_bytes(), stdout.decode()
+
+    def test_json_capture(self, reader_binary, tmp_path):
+        """Test the reader captures and counts JSON frames"""
+        data, stdout = self.capture(reader_binary, tmp_path, "json")
+
+        frames = [line for line in data.split(b"\r\n") if line.startswith(b"{")]
+        assert len(frames) > 100
+        assert "Data collection ended." in stdout
+
+    def test_binary_capture(self, reader_binary, tmp_path):
+        """Test binary frames survive the reader byte for byte"""
+        data, _ = self.capture(reader_binary, tmp_path, "binary")
+
+        t_ms, values, _ = decode_binary_frames(data)
+        assert len(t_ms) > 100
+        assert np.all(np.diff(t_ms) >= 0)
+        assert np.allclose(np.linalg.norm(values[:, 9:13], axis=1), 1.0, atol=1e-4)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts.latency_harness module
+"""
+
+import pytest
+from pathlib import Path
+import sys
+from unittest.mock import MagicMock
+
+# Add scripts directory to path for imports
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+from latency_harness import run_harness
+from backend.latency_trace import LATENCY_TRACER
+
+
+@pytest.fixture
+def hash_redis_client():
+    """Mock Redis client whose metrics hash really stores values"""
+    fields = {}
+    client = MagicMock()
+    pipe = MagicMock()
+    pipe.hset.side_effect = lambda key, field, value: fields.__setitem__((key, field), value)
+    client.pipeline.return_value = pipe
+    client.hget.side_effect = lambda key, field: fields.get((key, field))
+    client.scan_iter.return_value = []
+    return client
+
+
+class TestLatencyHarness:
+    """Test impact-to-metrics latency measurement"""
+
+    def test_skipped_without_redis(self):
+        """Test the harness is skipped when no Redis server is reachable"""
+        assert "skipped" in run_harness(swings=1, redis_client=None)
+
+    def test_breakdown_through_emulator(self, hash_redis_client):
+        """Test injected swings are followed from impact to queryable metrics"""
+        report = run_harness(swings=2, gap=0.2, redis_client=hash_redis_client)
+        LATENCY_TRACER.reset()
+
+        assert report["missed"] == 0
+        assert report["swings"] == 2
+        assert list(report["stages"]) == ["serial_receive", "parse", "segment", "store",
+                                          "analytics", "published", "available"]
+        latencies = [stage["since_impact"]["p50_ms"] for stage in report["stages"].values()]
+        assert latencies == sorted(latencies)
+        assert latencies[0] >= 0
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts.sensor_load_test module
+"""
+
+import pytest
+from pathlib import Path
+import sys
+from unittest.mock import MagicMock
+
+# Add scripts directory to path for imports
+scripts_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(scripts_dir))
+
+from sensor_load_test import run_load_test
+
+
+class TestSensorLoadTest:
+    """Test the multi-sensor load test"""
+
+    def test_skipped_without_redis(self):
+        """Test the load test is skipped when no Redis server is reachable"""
+        assert "skipped" in run_load_test(sensors=1, seconds=0.1, redis_client=None)
+
+    def test_sensors_stream_concurrently(self):
+        """Test every emulated sensor is ingested at close to its rate and the keys are removed"""
+        client = MagicMock()
+        client.scan_iter.return_value = ["leftover"]
+
+        report = run_load_test(sensors=2, seconds=2.0, frame_format="binary", redis_client=client)
+
+        assert report["sensors"] == 2
+        assert set(report["per_sensor"]) == {"sensor00", "sensor01"}
+        assert report["min_rate"] > 0.5 * report["target_rate"]
+        assert report["fairness"] > 0.8
+        assert report["redis_flushes_per_s"] > 0
+        assert client.delete.call_count == 2
@@ -247,6 +247,21 @@ class TestSystemRunnerIntegration:
         assert monitoring_thread.daemon is True
         assert command_thread.daemon is True
     
+    def test_profile_commands(self):
+        """Test profile commands reach the backend"""
+        runner = GolfIMUSystemRunner()
+        runner.backend.start_profiling = Mock(return_value=True)
+        runner.backend.stop_profiling = Mock(return_value={})
+        
+        runner._profile_command(['start', 'cprofile'])
+        runner._profile_command(['stop'])
+        with patch('builtins.print') as mock_print:
+            runner._profile_command([])
+        
+        runner.backend.start_profiling.assert_called_once_with('cprofile')
+        runner.backend.stop_profiling.assert_called_once()
+        mock_print.assert_called()
+    
     def test_status_printing(self):
         """Test status printing"""
         runner = GolfIMUSystemRunner()